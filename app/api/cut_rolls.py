@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List, Dict, Any
@@ -8,6 +9,7 @@ from datetime import datetime
 
 from .base import get_db
 from .. import crud_operations, schemas, models
+from ..services import roll_hierarchy
 from ..services.barcode_generator import BarcodeGenerator
 
 router = APIRouter()
@@ -76,89 +78,95 @@ async def select_cut_rolls_for_production(
             logger.error(f"❌ DEBUG cut-rolls/select - Schema validation error: {validation_error}")
             logger.error(f"❌ DEBUG cut-rolls/select - Expected schema: plan_id (optional), selected_rolls (list), created_by_id (required)")
             raise HTTPException(status_code=422, detail=f"Validation error: {validation_error}")
-        selected_rolls = []
-        inventory_items_created = []
+
+        # Database work runs on the worker thread pool, not the event loop
+        return await run_in_threadpool(_select_cut_rolls, db, selection_request)
+
+    except Exception as e:
+        logger.error(f"Error selecting cut rolls for production: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _select_cut_rolls(db: Session, selection_request: schemas.CutRollSelectionRequest) -> Dict[str, Any]:
+    """Blocking part of select_cut_rolls_for_production: create the inventory items and start production"""
+    selected_rolls = []
+    inventory_items_created = []
+    
+    for roll_selection in selection_request.selected_rolls:
+        # Generate barcode for this cut roll
+        barcode_id = BarcodeGenerator.generate_cut_roll_barcode(db)
         
-        for roll_selection in selection_request.selected_rolls:
-            # Generate barcode for this cut roll
-            barcode_id = BarcodeGenerator.generate_cut_roll_barcode(db)
-            
-            # Create inventory item for each selected cut roll
-            inventory_data = schemas.InventoryMasterCreate(
-                paper_id=roll_selection.paper_id,
-                width_inches=float(roll_selection.width_inches),
-                weight_kg=0.1,  # Small placeholder weight (will be updated during production)
-                roll_type="cut",
-                location="production_floor",
-                qr_code=roll_selection.qr_code,
-                barcode_id=barcode_id,
-                created_by_id=selection_request.created_by_id
-            )
-            
-            inventory_item = crud_operations.create_inventory_item(db, inventory_data)
-            inventory_items_created.append(inventory_item)
-            
-            selected_rolls.append({
-                "inventory_id": str(inventory_item.id),
-                "width_inches": float(inventory_item.width_inches),
-                "paper_id": str(inventory_item.paper_id),
-                "qr_code": inventory_item.qr_code,
-                "barcode_id": inventory_item.barcode_id,
-                "status": inventory_item.status,
-                "expected_pattern": roll_selection.cutting_pattern
-            })
+        # Create inventory item for each selected cut roll
+        inventory_data = schemas.InventoryMasterCreate(
+            paper_id=roll_selection.paper_id,
+            width_inches=float(roll_selection.width_inches),
+            weight_kg=0.1,  # Small placeholder weight (will be updated during production)
+            roll_type="cut",
+            location="production_floor",
+            qr_code=roll_selection.qr_code,
+            barcode_id=barcode_id,
+            created_by_id=selection_request.created_by_id
+        )
         
-        # Update plan status if plan_id provided
-        if selection_request.plan_id:
-            plan = crud_operations.get_plan(db=db, plan_id=selection_request.plan_id)
-            if plan and plan.status == "created":
-                crud_operations.update_plan_status(db=db, plan_id=selection_request.plan_id, new_status="in_progress")
+        inventory_item = crud_operations.create_inventory_item(db, inventory_data)
+        inventory_items_created.append(inventory_item)
         
-        # STEP 3: Update related orders to "in_process" when production starts
-        # Find orders related to this plan and update their status
-        if selection_request.plan_id:
-            from .. import models
-            # Get plan with order links
-            plan_links = db.query(models.PlanOrderLink).filter(
-                models.PlanOrderLink.plan_id == selection_request.plan_id
-            ).all()
-            
-            order_ids = [link.order_id for link in plan_links]
-            for order_id in order_ids:
-                order = crud_operations.get_order(db, order_id)
-                if order and order.status == "created":
-                    # Update order status to in_process
-                    order.status = "in_process"
-                    logger.info(f"✅ Updated order {order_id} status to 'in_process' (Step 3: Start Production)")
-                    
-                    # Also update all order items to "in_process"
-                    for order_item in order.order_items:
-                        if order_item.item_status == "created":
-                            order_item.item_status = "in_process"
-                            order_item.started_production_at = func.now()
-                            logger.info(f"✅ Updated order item {order_item.id} item_status to 'in_process' (Step 3: Start Production)")
-            
-            db.commit()
+        selected_rolls.append({
+            "inventory_id": str(inventory_item.id),
+            "width_inches": float(inventory_item.width_inches),
+            "paper_id": str(inventory_item.paper_id),
+            "qr_code": inventory_item.qr_code,
+            "barcode_id": inventory_item.barcode_id,
+            "status": inventory_item.status,
+            "expected_pattern": roll_selection.cutting_pattern
+        })
+    
+    # Update plan status if plan_id provided
+    if selection_request.plan_id:
+        plan = crud_operations.get_plan(db=db, plan_id=selection_request.plan_id)
+        if plan and plan.status == "created":
+            crud_operations.update_plan_status(db=db, plan_id=selection_request.plan_id, new_status="in_progress")
+    
+    # STEP 3: Update related orders to "in_process" when production starts
+    # Find orders related to this plan and update their status
+    if selection_request.plan_id:
+        from .. import models
+        # Get plan with order links
+        plan_links = db.query(models.PlanOrderLink).filter(
+            models.PlanOrderLink.plan_id == selection_request.plan_id
+        ).all()
         
-        return {
-            "plan_id": str(selection_request.plan_id) if selection_request.plan_id else None,
-            "selected_rolls": selected_rolls,
-            "production_summary": {
-                "total_rolls_selected": len(selected_rolls),
-                "total_inventory_items_created": len(inventory_items_created),
-                "production_status": "initiated",
-                "next_steps": [
-                    "Start cutting production",
-                    "Update weights via QR code scanning",
-                    "Move to warehouse when complete"
-                ]
-            },
-            "message": f"Successfully selected {len(selected_rolls)} cut rolls for production"
-        }
+        order_ids = [link.order_id for link in plan_links]
+        for order_id in order_ids:
+            order = crud_operations.get_order(db, order_id)
+            if order and order.status == "created":
+                # Update order status to in_process
+                order.status = "in_process"
+                logger.info(f"✅ Updated order {order_id} status to 'in_process' (Step 3: Start Production)")
+                
+                # Also update all order items to "in_process"
+                for order_item in order.order_items:
+                    if order_item.item_status == "created":
+                        order_item.item_status = "in_process"
+                        order_item.started_production_at = func.now()
+                        logger.info(f"✅ Updated order item {order_item.id} item_status to 'in_process' (Step 3: Start Production)")
         
-    except Exception as e:
-        logger.error(f"Error selecting cut rolls for production: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        db.commit()
+    
+    return {
+        "plan_id": str(selection_request.plan_id) if selection_request.plan_id else None,
+        "selected_rolls": selected_rolls,
+        "production_summary": {
+            "total_rolls_selected": len(selected_rolls),
+            "total_inventory_items_created": len(inventory_items_created),
+            "production_status": "initiated",
+            "next_steps": [
+                "Start cutting production",
+                "Update weights via QR code scanning",
+                "Move to warehouse when complete"
+            ]
+        },
+        "message": f"Successfully selected {len(selected_rolls)} cut rolls for production"
+    }
 
 @router.get("/cut-rolls/production/{plan_id}", response_model=Dict[str, Any], tags=["Cut Roll Production"])
 def get_cut_roll_production_summary(plan_id: UUID, db: Session = Depends(get_db)):
@@ -187,14 +195,15 @@ def get_cut_roll_production_summary(plan_id: UUID, db: Session = Depends(get_db)
             joinedload(models.InventoryMaster.paper),
             joinedload(models.InventoryMaster.manual_client),
             joinedload(models.InventoryMaster.allocated_order)
-                .joinedload(models.OrderMaster.client),
-            joinedload(models.InventoryMaster.parent_118_roll)
-                .joinedload(models.InventoryMaster.parent_jumbo)
+                .joinedload(models.OrderMaster.client)
         ).filter(
             models.PlanInventoryLink.plan_id == plan_id,
             models.InventoryMaster.roll_type == "cut"
         ).all()
 
+        # Parent 118" and jumbo rolls (with paper) of all cut rolls in one recursive query
+        ancestry = roll_hierarchy.load_ancestors(db, [item.id for item in all_cut_rolls_raw])
+
         # DEBUG: Log all_cut_rolls_raw details
         logger.info(f"🔍 DEBUG: all_cut_rolls_raw contains {len(all_cut_rolls_raw)} items")
         for i, item in enumerate(all_cut_rolls_raw):
@@ -232,10 +241,10 @@ def get_cut_roll_production_summary(plan_id: UUID, db: Session = Depends(get_db)
             jumbo_roll = None
             intermediate_roll = None
 
-            if item.parent_118_roll:
-                intermediate_roll = item.parent_118_roll
-                if intermediate_roll.parent_jumbo:
-                    jumbo_roll = intermediate_roll.parent_jumbo
+            intermediate_roll = ancestry.parent_set(item)
+            if intermediate_roll:
+                jumbo_roll = ancestry.get(intermediate_roll.parent_jumbo_id)
+                if jumbo_roll:
                     parent_jumbo_id = str(jumbo_roll.id)
 
             if parent_jumbo_id:
@@ -381,6 +390,9 @@ def get_cut_roll_production_summary(plan_id: UUID, db: Session = Depends(get_db)
                 client_name = item.allocated_order.client.company_name
                 order_date = item.allocated_order.created_at.isoformat()
 
+            parent_set = ancestry.parent_set(item)
+            parent_jumbo = ancestry.get(parent_set.parent_jumbo_id) if parent_set else None
+
             detailed_item = {
                 "inventory_id": str(item.id),
                 "width_inches": float(item.width_inches),
@@ -397,7 +409,7 @@ def get_cut_roll_production_summary(plan_id: UUID, db: Session = Depends(get_db)
                 } if item.paper else None,
                 "client_name": client_name,
                 "order_date": order_date,
-                "jumbo_roll_frontend_id": item.parent_118_roll.parent_jumbo.frontend_id if item.parent_118_roll and item.parent_118_roll.parent_jumbo else None,
+                "jumbo_roll_frontend_id": parent_jumbo.frontend_id if parent_jumbo else None,
                 "individual_roll_number": item.individual_roll_number,
                 "is_wastage_roll": item.is_wastage_roll
             }
@@ -4,24 +4,41 @@ from typing import List, Dict, Any
 import logging
 
 from .base import get_db
+from ..concurrency import run_in_optimizer_pool
 from .. import schemas
-from ..services.cutting_optimizer import CuttingOptimizer
+from ..services.cutting_optimizer import CuttingOptimizer, SolverConfig
+from ..services.pattern_cache import pattern_cache
+from ..services.optimization_cache import optimization_cache
+from ..services.pattern_index import pattern_index
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+def _build_solver_config(request: schemas.CuttingPlanRequest) -> SolverConfig:
+    """Overlay request solver settings on the optimizer defaults"""
+    config = SolverConfig()
+    if request.solver_config:
+        for field, value in request.solver_config.model_dump(exclude_none=True).items():
+            setattr(config, field, value)
+    return config
+
 # ============================================================================
 # CUTTING ALGORITHM ENDPOINTS
 # ============================================================================
 
 @router.post("/cutting/generate-plan", response_model=Dict[str, Any], tags=["Cutting Algorithm"])
-def generate_cutting_plan(
+async def generate_cutting_plan(
     request: schemas.CuttingPlanRequest,
     db: Session = Depends(get_db)
 ):
     """Generate cutting plan from roll specifications"""
+    # Long solve: runs on the optimizer thread pool, not the request one
+    return await run_in_optimizer_pool(_generate_cutting_plan, request, db)
+
+def _generate_cutting_plan(request: schemas.CuttingPlanRequest, db: Session):
+    """Blocking part of generate_cutting_plan"""
     try:
-        optimizer = CuttingOptimizer()
+        optimizer = CuttingOptimizer(solver_config=_build_solver_config(request))
         
         # Convert request to optimizer format
         order_requirements = []
@@ -40,7 +57,8 @@ def generate_cutting_plan(
             order_requirements=order_requirements,
             pending_orders=request.pending_orders or [],
             available_inventory=request.available_inventory or [],
-            interactive=False
+            interactive=False,
+            algorithm=request.algorithm.value
         )
         
         return result
@@ -137,7 +155,18 @@ def get_cutting_algorithms():
                         "Simplified trim handling (1-20\" accepted, >20\" pending)",
                         "No waste inventory creation",
                         "Master-based architecture support"
-                    ]
+                    ],
+                    "solver_config_defaults": {
+                        "time_limit_seconds": SolverConfig.time_limit_seconds,
+                        "num_workers": SolverConfig.num_workers,
+                        "relative_gap_limit": SolverConfig.relative_gap_limit,
+                        "use_greedy_hint": SolverConfig.use_greedy_hint
+                    },
+                    "solver_modes": {
+                        "ilp": "OR-Tools CP-SAT over every feasible pattern (default)",
+                        "tracking": "Greedy pattern tracking against remaining demand",
+                        "column_generation": "Gilmore-Gomory column generation (GLOP LP master + knapsack pricing, CP-SAT integer phase) for wide width mixes"
+                    }
                 }
             ],
             "constraints": {
@@ -155,14 +184,57 @@ def get_cutting_algorithms():
         logger.error(f"Error getting algorithm information: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/cutting/pattern-cache", response_model=Dict[str, Any], tags=["Cutting Algorithm"])
+def get_pattern_cache_stats():
+    """Get size and hit/miss counters of the shared cutting pattern cache"""
+    return pattern_cache.stats()
+
+@router.delete("/cutting/pattern-cache", response_model=Dict[str, Any], tags=["Cutting Algorithm"])
+def clear_pattern_cache():
+    """Clear the shared cutting pattern cache"""
+    pattern_cache.clear()
+    return {"message": "Pattern cache cleared", **pattern_cache.stats()}
+
+@router.get("/cutting/pattern-index", response_model=Dict[str, Any], tags=["Cutting Algorithm"])
+def get_pattern_index_stats():
+    """Get entry counts and hit/miss counters of the persisted pattern index"""
+    return pattern_index.stats()
+
+@router.post("/cutting/pattern-index/rebuild", response_model=Dict[str, Any], tags=["Cutting Algorithm"])
+def rebuild_pattern_index(db: Session = Depends(get_db)):
+    """Rebuild the pattern index from historical order widths per paper spec"""
+    try:
+        written = pattern_index.build_from_history(db)
+        return {"message": f"Pattern index rebuilt with {written} entries", **pattern_index.stats()}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error rebuilding pattern index: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/cutting/result-cache", response_model=Dict[str, Any], tags=["Cutting Algorithm"])
+def get_result_cache_stats():
+    """Get size and hit/miss counters of the optimization result cache"""
+    return optimization_cache.stats()
+
+@router.delete("/cutting/result-cache", response_model=Dict[str, Any], tags=["Cutting Algorithm"])
+def clear_result_cache(db: Session = Depends(get_db)):
+    """Clear the optimization result cache (both tiers)"""
+    optimization_cache.clear(db)
+    return {"message": "Optimization result cache cleared", **optimization_cache.stats()}
+
 @router.post("/cutting/generate-with-selection", response_model=Dict[str, Any], tags=["Cutting Algorithm"])
-def generate_plan_with_selection(
+async def generate_plan_with_selection(
     request: schemas.CuttingPlanWithSelectionRequest,
     db: Session = Depends(get_db)
 ):
     """Generate plan with cut roll selection in one step"""
+    # Long solve: runs on the optimizer thread pool, not the request one
+    return await run_in_optimizer_pool(_generate_plan_with_selection, request, db)
+
+def _generate_plan_with_selection(request: schemas.CuttingPlanWithSelectionRequest, db: Session):
+    """Blocking part of generate_plan_with_selection"""
     try:
-        optimizer = CuttingOptimizer()
+        optimizer = CuttingOptimizer(solver_config=_build_solver_config(request))
         
         # First generate the cutting plan
         order_requirements = []
@@ -180,7 +252,8 @@ def generate_plan_with_selection(
             order_requirements=order_requirements,
             pending_orders=request.pending_orders or [],
             available_inventory=request.available_inventory or [],
-            interactive=False
+            interactive=False,
+            algorithm=request.algorithm.value
         )
         
         # Apply selection criteria if provided
@@ -1,107 +1,75 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc
+from sqlalchemy import desc
 from typing import Dict, List, Any
 import logging
 from datetime import datetime, timedelta
 
 from .base import get_db
+from ..database import get_async_db
 from .. import models, schemas, crud_operations
+from ..services.dashboard_metrics import MetricsNotReadyError, dashboard_metrics
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.get("/dashboard/summary", tags=["Dashboard"])
-def get_dashboard_summary(db: Session = Depends(get_db)):
+async def get_dashboard_summary(db: AsyncSession = Depends(get_async_db)):
     """
     Get comprehensive dashboard summary with all key metrics
     """
+    return await db.run_sync(_get_dashboard_summary)
+
+def _get_dashboard_summary(db: Session):
+    """Body of get_dashboard_summary, run on the session from get_async_db"""
     try:
+        # Counters are maintained from committed status transitions and
+        # periodically reconciled with the database (see dashboard_metrics)
+        metrics = dashboard_metrics.snapshot(db)
+        counters, windowed = metrics["counters"], metrics["windowed"]
+        count = dashboard_metrics.count
+
         # Orders Summary
-        total_orders = db.query(models.OrderMaster).count()
-        pending_orders = db.query(models.OrderMaster).filter(
-            models.OrderMaster.status == schemas.OrderStatus.CREATED.value
-        ).count()
-        processing_orders = db.query(models.OrderMaster).filter(
-            models.OrderMaster.status == schemas.OrderStatus.IN_PROCESS.value
-        ).count()
-        completed_orders = db.query(models.OrderMaster).filter(
-            models.OrderMaster.status == schemas.OrderStatus.COMPLETED.value
-        ).count()
+        total_orders = count(counters, "order_master")
+        pending_orders = count(counters, "order_master", schemas.OrderStatus.CREATED.value)
+        processing_orders = count(counters, "order_master", schemas.OrderStatus.IN_PROCESS.value)
+        completed_orders = count(counters, "order_master", schemas.OrderStatus.COMPLETED.value)
         
         # Pending Order Items Summary
-        pending_items = db.query(models.PendingOrderItem).filter(
-            models.PendingOrderItem._status == "pending"
-        ).count()
-        pending_quantity = db.query(func.sum(models.PendingOrderItem.quantity_pending)).filter(
-            models.PendingOrderItem._status == "pending"
-        ).scalar() or 0
-        
-        high_priority_pending = db.query(models.PendingOrderItem).filter(
-            models.PendingOrderItem._status == "pending",
-            models.PendingOrderItem.created_at < datetime.utcnow() - timedelta(days=3)
-        ).count()
+        pending_items = count(counters, "pending_order_item", "pending")
+        pending_quantity = count(counters, "pending_quantity", "pending")
+        high_priority_pending = windowed["high_priority_pending"]
         
         # Plans Summary (exclude deleted plans)
-        total_plans = db.query(models.PlanMaster).filter(
-            models.PlanMaster.status != "deleted"
-        ).count()
-        planned_status = db.query(models.PlanMaster).filter(
-            models.PlanMaster.status == schemas.PlanStatus.PLANNED.value
-        ).count()
-        in_progress_plans = db.query(models.PlanMaster).filter(
-            models.PlanMaster.status == schemas.PlanStatus.IN_PROGRESS.value
-        ).count()
-        completed_plans = db.query(models.PlanMaster).filter(
-            models.PlanMaster.status == schemas.PlanStatus.COMPLETED.value
-        ).count()
+        total_plans = count(counters, "plan_master") - count(counters, "plan_master", "deleted")
+        planned_status = count(counters, "plan_master", schemas.PlanStatus.PLANNED.value)
+        in_progress_plans = count(counters, "plan_master", schemas.PlanStatus.IN_PROGRESS.value)
+        completed_plans = count(counters, "plan_master", schemas.PlanStatus.COMPLETED.value)
         
         # Inventory Summary
-        available_inventory = db.query(models.InventoryMaster).filter(
-            models.InventoryMaster.status == schemas.InventoryStatus.AVAILABLE.value
-        ).count()
-        jumbo_rolls = db.query(models.InventoryMaster).filter(
-            models.InventoryMaster.roll_type == schemas.RollType.JUMBO.value,
-            models.InventoryMaster.status == schemas.InventoryStatus.AVAILABLE.value
-        ).count()
-        cut_rolls = db.query(models.InventoryMaster).filter(
-            models.InventoryMaster.roll_type == schemas.RollType.CUT.value,
-            models.InventoryMaster.status == schemas.InventoryStatus.AVAILABLE.value
-        ).count()
+        available = schemas.InventoryStatus.AVAILABLE.value
+        available_inventory = count(counters, "inventory_master", available)
+        jumbo_rolls = counters.get(("inventory_master", available, schemas.RollType.JUMBO.value), 0)
+        cut_rolls = counters.get(("inventory_master", available, schemas.RollType.CUT.value), 0)
         
         # Production Orders Summary
-        total_production = db.query(models.ProductionOrderMaster).count()
-        pending_production = db.query(models.ProductionOrderMaster).filter(
-            models.ProductionOrderMaster.status == schemas.ProductionOrderStatus.PENDING.value
-        ).count()
-        in_progress_production = db.query(models.ProductionOrderMaster).filter(
-            models.ProductionOrderMaster.status == schemas.ProductionOrderStatus.IN_PROGRESS.value
-        ).count()
-        completed_production = db.query(models.ProductionOrderMaster).filter(
-            models.ProductionOrderMaster.status == schemas.ProductionOrderStatus.COMPLETED.value
-        ).count()
+        total_production = count(counters, "production_order_master")
+        pending_production = count(counters, "production_order_master", schemas.ProductionOrderStatus.PENDING.value)
+        in_progress_production = count(counters, "production_order_master", schemas.ProductionOrderStatus.IN_PROGRESS.value)
+        completed_production = count(counters, "production_order_master", schemas.ProductionOrderStatus.COMPLETED.value)
         
-        # Recent Activity (last 7 days)
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        recent_orders = db.query(models.OrderMaster).filter(
-            models.OrderMaster.created_at >= week_ago
-        ).count()
-        recent_plans = db.query(models.PlanMaster).filter(
-            models.PlanMaster.created_at >= week_ago,
-            models.PlanMaster.status != "deleted"
-        ).count()
-        recent_production = db.query(models.ProductionOrderMaster).filter(
-            models.ProductionOrderMaster.created_at >= week_ago
-        ).count()
+        # Recent Activity (last 7 days) - refreshed on reconciliation
+        recent_orders = windowed["recent_orders"]
+        recent_plans = windowed["recent_plans"]
+        recent_production = windowed["recent_production"]
         
         # Paper Types Summary
-        paper_types = db.query(models.PaperMaster).count()
+        paper_types = count(counters, "paper_master")
         
         # Client Summary
-        total_clients = db.query(models.ClientMaster).count()
-        active_clients = db.query(func.count(func.distinct(models.OrderMaster.client_id))).filter(
-            models.OrderMaster.created_at >= week_ago
-        ).scalar() or 0
+        total_clients = count(counters, "client_master")
+        active_clients = windowed["active_clients"]
         
         return {
             "status": "success",
@@ -151,15 +119,36 @@ def get_dashboard_summary(db: Session = Depends(get_db)):
             "timestamp": datetime.utcnow().isoformat()
         }
         
+    except MetricsNotReadyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         logger.error(f"Error getting dashboard summary: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/dashboard/metrics", response_model=Dict[str, Any], tags=["Dashboard"])
+def get_dashboard_metrics_stats():
+    """Get reconciliation counters of the precomputed dashboard metrics"""
+    return dashboard_metrics.stats()
+
+@router.post("/dashboard/metrics/reconcile", response_model=Dict[str, Any], tags=["Dashboard"])
+def reconcile_dashboard_metrics(db: Session = Depends(get_db)):
+    """Recount the dashboard metrics from the database now"""
+    try:
+        dashboard_metrics.reconcile(db)
+        return {"message": "Dashboard metrics reconciled", **dashboard_metrics.stats()}
+    except Exception as e:
+        logger.error(f"Error reconciling dashboard metrics: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/dashboard/recent-activity", tags=["Dashboard"])
-def get_recent_activity(limit: int = 10, db: Session = Depends(get_db)):
+async def get_recent_activity(limit: int = 10, db: AsyncSession = Depends(get_async_db)):
     """
     Get recent activity across all modules
     """
+    return await db.run_sync(_get_recent_activity, limit)
+
+def _get_recent_activity(db: Session, limit: int):
+    """Body of get_recent_activity, run on the session from get_async_db"""
     try:
         activities = []
         
@@ -234,10 +223,14 @@ def get_recent_activity(limit: int = 10, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/dashboard/alerts", tags=["Dashboard"])
-def get_dashboard_alerts(db: Session = Depends(get_db)):
+async def get_dashboard_alerts(db: AsyncSession = Depends(get_async_db)):
     """
     Get system alerts and notifications
     """
+    return await db.run_sync(_get_dashboard_alerts)
+
+def _get_dashboard_alerts(db: Session):
+    """Body of get_dashboard_alerts, run on the session from get_async_db"""
     try:
         alerts = []
         
@@ -28,7 +28,7 @@ def validate_uuid(uuid_string: str) -> UUID:
         )
 
 @router.get("/deletion-logs/test", tags=["Deletion Logs"])
-async def test_deletion_logs():
+def test_deletion_logs():
     """Test endpoint to verify CRUD module loading"""
     try:
         # Try to create a new instance directly
@@ -45,7 +45,7 @@ async def test_deletion_logs():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/deletion-logs", tags=["Deletion Logs"])
-async def get_deletion_logs(
+def get_deletion_logs(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     plan_id: Optional[str] = Query(None, description="Filter by plan ID"),
@@ -78,7 +78,7 @@ async def get_deletion_logs(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/deletion-logs/plan/{plan_id}", tags=["Deletion Logs"])
-async def get_deletion_logs_by_plan(
+def get_deletion_logs_by_plan(
     plan_id: str,
     db: Session = Depends(get_db)
 ):
@@ -92,7 +92,7 @@ async def get_deletion_logs_by_plan(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/deletion-logs/user/{user_id}", tags=["Deletion Logs"])
-async def get_deletion_logs_by_user(
+def get_deletion_logs_by_user(
     user_id: str,
     db: Session = Depends(get_db)
 ):
@@ -106,7 +106,7 @@ async def get_deletion_logs_by_user(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/deletion-logs/recent", tags=["Deletion Logs"])
-async def get_recent_deletion_logs(
+def get_recent_deletion_logs(
     limit: int = Query(10, ge=1, le=50, description="Number of recent logs to return"),
     db: Session = Depends(get_db)
 ):
@@ -118,7 +118,7 @@ async def get_recent_deletion_logs(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/deletion-logs/export", tags=["Deletion Logs"])
-async def export_deletion_logs(
+def export_deletion_logs(
     start_date: Optional[str] = Query(None, description="Start date filter (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date filter (YYYY-MM-DD)"),
     deletion_reason: Optional[str] = Query(None, description="Filter by deletion reason"),
@@ -203,7 +203,7 @@ async def export_deletion_logs(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/deletion-logs/{log_id}", tags=["Deletion Logs"])
-async def get_deletion_log_by_id(
+def get_deletion_log_by_id(
     log_id: str,
     db: Session = Depends(get_db)
 ):
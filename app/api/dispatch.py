@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import desc, and_, or_, update
 from typing import List, Optional
@@ -7,18 +8,44 @@ from datetime import datetime, date
 import uuid
 
 from .base import get_db
+from ..database import get_async_db
 from .. import models, schemas
 from ..crud_operations import get_client
+from ..services.batch_lookup import count_by_keys, existing_keys, load_by_keys, load_grouped
+from ..services.keyset_pagination import InvalidCursorError, keyset_page
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+
+def wastage_frontend_id(qr_code: Optional[str]) -> Optional[str]:
+    """Wastage frontend_id from a wastage cut roll QR code (WCR_{wastage_frontend_id}_{plan_id})."""
+    if qr_code and qr_code.startswith('WCR_'):
+        parts = qr_code.split('_')
+        if len(parts) >= 2:
+            return parts[1]
+    return None
+
+
+def _load_dispatch_item_rolls(db: Session, dispatch_items: List[models.DispatchItem]):
+    """Inventory rolls by id and manual cut rolls by barcode for a dispatch's items (one query each)."""
+    inventory_by_id = load_by_keys(
+        db, models.InventoryMaster, models.InventoryMaster.id,
+        [item.inventory_id for item in dispatch_items]
+    )
+    manual_rolls_by_barcode = load_by_keys(
+        db, models.ManualCutRoll, models.ManualCutRoll.barcode_id,
+        [item.barcode_id for item in dispatch_items
+         if not item.inventory_id and item.barcode_id and item.barcode_id.startswith('CR_')]
+    )
+    return inventory_by_id, manual_rolls_by_barcode
+
 # ============================================================================
 # DISPATCH HISTORY ENDPOINTS
 # ============================================================================
 
 @router.get("/dispatch/history", tags=["Dispatch History"])
-def get_dispatch_history(
+async def get_dispatch_history(
     skip: int = 0,
     limit: int = 50,
     client_id: Optional[str] = None,
@@ -26,16 +53,46 @@ def get_dispatch_history(
     from_date: Optional[str] = None,
     to_date: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get dispatch history with filtering and pagination.
+    Pass next_cursor back as cursor for constant-cost keyset paging (skip is ignored then).
+    """
+    return await db.run_sync(
+        _get_dispatch_history,
+        skip=skip,
+        limit=limit,
+        client_id=client_id,
+        status=status,
+        from_date=from_date,
+        to_date=to_date,
+        search=search,
+        cursor=cursor,
+        include_total=include_total
+    )
+
+def _get_dispatch_history(
+    db: Session,
+    skip: int,
+    limit: int,
+    client_id: Optional[str],
+    status: Optional[str],
+    from_date: Optional[str],
+    to_date: Optional[str],
+    search: Optional[str],
+    cursor: Optional[str],
+    include_total: bool
 ):
-    """Get dispatch history with filtering and pagination"""
+    """Body of get_dispatch_history, run on the session from get_async_db"""
     try:
         # Base query with relationships
         query = db.query(models.DispatchRecord).options(
             joinedload(models.DispatchRecord.client),
             joinedload(models.DispatchRecord.primary_order),
-            joinedload(models.DispatchRecord.created_by),
-            joinedload(models.DispatchRecord.dispatch_items)
+            joinedload(models.DispatchRecord.created_by)
         )
         
         # Apply filters
@@ -79,20 +136,28 @@ def get_dispatch_history(
             )
         
         # Get total count before pagination
-        total_count = query.count()
+        total_count = query.count() if include_total else None
+        
+        # Apply pagination and ordering (newest dispatch first, id breaks ties)
+        dispatches, next_cursor = keyset_page(
+            query,
+            [(models.DispatchRecord.dispatch_date, True), (models.DispatchRecord.id, True)],
+            limit,
+            cursor=cursor,
+            offset=skip
+        )
         
-        # Apply pagination and ordering
-        dispatches = query.order_by(desc(models.DispatchRecord.dispatch_date)).offset(skip).limit(limit).all()
+        # Payment slip flags and item counts for the whole page (one query each)
+        dispatch_ids = [dispatch.id for dispatch in dispatches]
+        dispatches_with_slip = existing_keys(
+            db, models.PaymentSlipMaster.dispatch_record_id, dispatch_ids,
+            models.PaymentSlipMaster.is_deleted != True  # Exclude soft-deleted
+        )
+        items_counts = count_by_keys(db, models.DispatchItem.dispatch_record_id, dispatch_ids)
         
         # Format response
         dispatch_list = []
         for dispatch in dispatches:
-            # Check if payment slip exists for this dispatch (exclude soft-deleted)
-            payment_slip_exists = db.query(models.PaymentSlipMaster).filter(
-                models.PaymentSlipMaster.dispatch_record_id == dispatch.id,
-                models.PaymentSlipMaster.is_deleted != True
-            ).first() is not None
-
             dispatch_list.append({
                 "id": str(dispatch.id),
                 "frontend_id": dispatch.frontend_id,
@@ -123,19 +188,22 @@ def get_dispatch_history(
                 } if dispatch.created_by else None,
                 "created_at": dispatch.created_at.isoformat() if dispatch.created_at else None,
                 "delivered_at": dispatch.delivered_at.isoformat() if dispatch.delivered_at else None,
-                "items_count": len(dispatch.dispatch_items) if dispatch.dispatch_items else 0,
-                "has_payment_slip": payment_slip_exists  # Flag indicating if payment slip exists
+                "items_count": items_counts.get(dispatch.id, 0),
+                "has_payment_slip": dispatch.id in dispatches_with_slip  # Flag indicating if payment slip exists
             })
         
         return {
             "dispatches": dispatch_list,
             "total_count": total_count,
-            "current_page": (skip // limit) + 1 if limit > 0 else 1,
-            "total_pages": (total_count + limit - 1) // limit if limit > 0 else 1,
-            "has_next": skip + limit < total_count,
-            "has_previous": skip > 0
+            "current_page": None if cursor else (skip // limit) + 1 if limit > 0 else 1,
+            "total_pages": (total_count + limit - 1) // limit if limit > 0 and total_count is not None else None,
+            "has_next": next_cursor is not None,
+            "has_previous": bool(cursor) or skip > 0,
+            "next_cursor": next_cursor
         }
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -222,6 +290,22 @@ def get_dispatch_details(
         if not dispatch:
             raise HTTPException(status_code=404, detail="Dispatch record not found")
         
+        # Resolve wastage reels, allocated orders and manual cut rolls for all items at once
+        wastage_by_frontend_id = load_by_keys(
+            db, models.WastageInventory, models.WastageInventory.frontend_id,
+            [wastage_frontend_id(item.qr_code) for item in dispatch.dispatch_items]
+        )
+        orders_by_id = load_by_keys(
+            db, models.OrderMaster, models.OrderMaster.id,
+            [item.inventory.allocated_to_order_id for item in dispatch.dispatch_items if item.inventory],
+            options=[joinedload(models.OrderMaster.client)]
+        )
+        manual_rolls_by_barcode = load_by_keys(
+            db, models.ManualCutRoll, models.ManualCutRoll.barcode_id,
+            [item.barcode_id for item in dispatch.dispatch_items
+             if not item.inventory and item.barcode_id and item.barcode_id.startswith('CR_')]
+        )
+        
         # Format dispatch items
         items = []
         for item in dispatch.dispatch_items:
@@ -235,55 +319,33 @@ def get_dispatch_details(
             if (item.barcode_id and item.barcode_id.startswith('SCR')) or \
                (item.qr_code and item.qr_code.startswith('WCR_')):
                 is_wastage_item = True
-                try:
-                    # Parse QR code: WCR_{wastage_frontend_id}_{plan_id}
-                    qr_to_parse = item.qr_code if item.qr_code else ""
-
-                    if qr_to_parse.startswith('WCR_'):
-                        parts = qr_to_parse.split('_')
-                        if len(parts) >= 2:
-                            wastage_frontend_id = parts[1]
-
-                            # Query WastageInventory by frontend_id
-                            wastage_item = db.query(models.WastageInventory).filter(
-                                models.WastageInventory.frontend_id == wastage_frontend_id
-                            ).first()
-
-                            if wastage_item:
-                                reel_no = wastage_item.reel_no
-                                logger.debug(f"Found reel_no '{reel_no}' for wastage item QR: {item.qr_code}")
-                            else:
-                                logger.warning(f"WastageInventory not found for frontend_id: {wastage_frontend_id}")
-                except Exception as e:
-                    logger.error(f"Error parsing QR code or fetching wastage reel_no: {e}")
+                # QR code format: WCR_{wastage_frontend_id}_{plan_id}
+                frontend_id = wastage_frontend_id(item.qr_code)
+                if frontend_id:
+                    wastage_item = wastage_by_frontend_id.get(frontend_id)
+                    if wastage_item:
+                        reel_no = wastage_item.reel_no
+                        logger.debug(f"Found reel_no '{reel_no}' for wastage item QR: {item.qr_code}")
+                    else:
+                        logger.warning(f"WastageInventory not found for frontend_id: {frontend_id}")
 
-            # Fetch actual client name if inventory exists and is allocated to an order
+            # Actual client name if inventory exists and is allocated to an order
             client_name = None
             if inventory and inventory.allocated_to_order_id:
-                try:
-                    order = db.query(models.OrderMaster).filter(
-                        models.OrderMaster.id == inventory.allocated_to_order_id
-                    ).first()
-                    if order and order.client:
-                        client_name = order.client.company_name
-                        logger.debug(f"Found client '{client_name}' for item {item.barcode_id}")
-                except Exception as e:
-                    logger.error(f"Error fetching client for item {item.barcode_id}: {e}")
+                order = orders_by_id.get(inventory.allocated_to_order_id)
+                if order and order.client:
+                    client_name = order.client.company_name
+                    logger.debug(f"Found client '{client_name}' for item {item.barcode_id}")
 
-            # Fetch manual cut roll ID if this is a manual cut roll item
+            # Manual cut roll ID if this is a manual cut roll item
             manual_cut_roll_id = None
             if not inventory and item.barcode_id and item.barcode_id.startswith('CR_'):
-                try:
-                    manual_roll = db.query(models.ManualCutRoll).filter(
-                        models.ManualCutRoll.barcode_id == item.barcode_id
-                    ).first()
-                    if manual_roll:
-                        manual_cut_roll_id = str(manual_roll.id)
-                        logger.debug(f"Found manual_cut_roll ID '{manual_cut_roll_id}' for barcode {item.barcode_id}")
-                    else:
-                        logger.warning(f"Manual cut roll not found for barcode: {item.barcode_id}")
-                except Exception as e:
-                    logger.error(f"Error fetching manual cut roll for barcode {item.barcode_id}: {e}")
+                manual_roll = manual_rolls_by_barcode.get(item.barcode_id)
+                if manual_roll:
+                    manual_cut_roll_id = str(manual_roll.id)
+                    logger.debug(f"Found manual_cut_roll ID '{manual_cut_roll_id}' for barcode {item.barcode_id}")
+                else:
+                    logger.warning(f"Manual cut roll not found for barcode: {item.barcode_id}")
 
             items.append({
                 "id": str(item.id),
@@ -381,6 +443,12 @@ def get_dispatch_items_with_rates(
         if not dispatch:
             raise HTTPException(status_code=404, detail="Dispatch record not found")
 
+        # Order items of every allocated order, fetched once for all dispatch items
+        order_items_by_order = load_grouped(
+            db, models.OrderItem, models.OrderItem.order_id,
+            [item.inventory.allocated_to_order_id for item in dispatch.dispatch_items if item.inventory]
+        )
+
         # Process each dispatch item to get rate
         items_with_rates = []
         logger.info(f"Processing {len(dispatch.dispatch_items)} dispatch items for dispatch {dispatch_id}")
@@ -393,9 +461,7 @@ def get_dispatch_items_with_rates(
             # Try to get rate from inventory allocation
             if item.inventory_id:
                 logger.info(f"[Item {idx + 1}] Has inventory_id: {item.inventory_id}")
-                inventory = db.query(models.InventoryMaster).filter(
-                    models.InventoryMaster.id == item.inventory_id
-                ).first()
+                inventory = item.inventory  # Eager loaded with the dispatch
 
                 if inventory:
                     logger.info(f"[Item {idx + 1}] Inventory found - paper_id: {inventory.paper_id}, allocated_to_order_id: {inventory.allocated_to_order_id}")
@@ -404,11 +470,10 @@ def get_dispatch_items_with_rates(
                         # Find OrderItem by order_id, width_inches, and paper_id
                         logger.info(f"[Item {idx + 1}] Searching OrderItem with: order_id={inventory.allocated_to_order_id}, width={item.width_inches}, paper_id={inventory.paper_id}")
 
-                        order_item = db.query(models.OrderItem).filter(
-                            models.OrderItem.order_id == inventory.allocated_to_order_id,
-                            models.OrderItem.width_inches == item.width_inches,
-                            models.OrderItem.paper_id == inventory.paper_id
-                        ).first()
+                        order_item = next((
+                            order_item for order_item in order_items_by_order.get(inventory.allocated_to_order_id, [])
+                            if order_item.width_inches == item.width_inches and order_item.paper_id == inventory.paper_id
+                        ), None)
 
                         if order_item:
                             logger.info(f"[Item {idx + 1}] OrderItem found - rate: {order_item.rate}")
@@ -525,8 +590,8 @@ def get_payment_slip_preview_id(
         # Determine table key based on payment type
         table_key = "payment_slip_bill" if payment_type == 'bill' else "payment_slip_cash"
 
-        # Generate preview ID using FrontendIDGenerator (BI-00001-25 or CI-00001-25)
-        preview_id = FrontendIDGenerator.generate_frontend_id(table_key, db)
+        # Preview the next ID (BI-00001-25 or CI-00001-25) without consuming it
+        preview_id = FrontendIDGenerator.preview_frontend_id(table_key, db)
 
         return {
             "preview_id": preview_id,
@@ -644,15 +709,14 @@ def create_payment_slip(
 
         logger.info(f"Marking {len(dispatch_items)} dispatch items as 'billed'")
 
+        inventory_by_id, manual_rolls_by_barcode = _load_dispatch_item_rolls(db, dispatch_items)
         inventory_updated = 0
         manual_roll_updated = 0
 
         for dispatch_item in dispatch_items:
             # Update InventoryMaster status if linked
             if dispatch_item.inventory_id:
-                inventory = db.query(models.InventoryMaster).filter(
-                    models.InventoryMaster.id == dispatch_item.inventory_id
-                ).first()
+                inventory = inventory_by_id.get(dispatch_item.inventory_id)
 
                 if inventory:
                     inventory.status = "billed"
@@ -661,9 +725,7 @@ def create_payment_slip(
 
             # Update ManualCutRoll status if linked via barcode_id
             elif dispatch_item.barcode_id and dispatch_item.barcode_id.startswith('CR_'):
-                manual_roll = db.query(models.ManualCutRoll).filter(
-                    models.ManualCutRoll.barcode_id == dispatch_item.barcode_id
-                ).first()
+                manual_roll = manual_rolls_by_barcode.get(dispatch_item.barcode_id)
 
                 if manual_roll:
                     manual_roll.status = "billed"
@@ -822,6 +884,7 @@ def delete_payment_slip(
 
         logger.info(f"Reverting status for {len(dispatch_items)} dispatch items")
 
+        inventory_by_id, manual_rolls_by_barcode = _load_dispatch_item_rolls(db, dispatch_items)
         inventory_reverted = 0
         manual_roll_reverted = 0
 
@@ -829,9 +892,7 @@ def delete_payment_slip(
         for dispatch_item in dispatch_items:
             # Revert InventoryMaster status if linked
             if dispatch_item.inventory_id:
-                inventory = db.query(models.InventoryMaster).filter(
-                    models.InventoryMaster.id == dispatch_item.inventory_id
-                ).first()
+                inventory = inventory_by_id.get(dispatch_item.inventory_id)
 
                 if inventory and inventory.status == "billed":
                     inventory.status = "used"
@@ -840,9 +901,7 @@ def delete_payment_slip(
 
             # Revert ManualCutRoll status if linked via barcode_id
             elif dispatch_item.barcode_id and dispatch_item.barcode_id.startswith('CR_'):
-                manual_roll = db.query(models.ManualCutRoll).filter(
-                    models.ManualCutRoll.barcode_id == dispatch_item.barcode_id
-                ).first()
+                manual_roll = manual_rolls_by_barcode.get(dispatch_item.barcode_id)
 
                 if manual_roll and manual_roll.status == "billed":
                     manual_roll.status = "used"
@@ -17,6 +17,7 @@ from ..schemas import (
     InventoryItemUpdate,
     PaginatedInventoryItemsResponse
 )
+from ..services.keyset_pagination import InvalidCursorError, keyset_page
 
 router = APIRouter()
 
@@ -32,6 +33,8 @@ def get_inventory_items(
     end_date: Optional[date] = Query(None, description="Filter by stock date (end)"),
     min_weight: Optional[float] = Query(None, description="Minimum weight filter"),
     max_weight: Optional[float] = Query(None, description="Maximum weight filter"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset paging, overrides page)"),
+    include_total: bool = Query(True, description="Count matching rows (skip for cheaper cursor paging)"),
     db: Session = Depends(get_db)
 ):
     """Get paginated list of inventory items with optional filters"""
@@ -78,25 +81,26 @@ def get_inventory_items(
     if filters:
         query = query.filter(and_(*filters))
     
-    # Order by stock_id descending (newest first)
-    query = query.order_by(InventoryItem.stock_id.desc())
-    
     # Get total count
-    total = query.count()
+    total = query.count() if include_total else None
     
-    # Apply pagination
+    # Apply pagination, ordered by stock_id descending (newest first)
     offset = (page - 1) * per_page
-    items = query.offset(offset).limit(per_page).all()
+    try:
+        items, next_cursor = keyset_page(query, [(InventoryItem.stock_id, True)], per_page, cursor=cursor, offset=offset)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Calculate total pages
-    total_pages = (total + per_page - 1) // per_page
+    total_pages = (total + per_page - 1) // per_page if total is not None else None
     
     return PaginatedInventoryItemsResponse(
         items=items,
         total=total,
-        page=page,
+        page=None if cursor else page,
         per_page=per_page,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
     )
 
 @router.get("/stats")
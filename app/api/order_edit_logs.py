@@ -13,7 +13,7 @@ router = APIRouter()
 
 
 @router.get("/order-edit-logs", response_model=Dict[str, Any])
-async def get_order_edit_logs(
+def get_order_edit_logs(
     request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -63,7 +63,7 @@ async def get_order_edit_logs(
 
 
 @router.get("/order-edit-logs/order/{order_id}", response_model=List[Dict[str, Any]])
-async def get_order_edit_logs_by_order(
+def get_order_edit_logs_by_order(
     order_id: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -86,7 +86,7 @@ async def get_order_edit_logs_by_order(
 
 
 @router.get("/order-edit-logs/recent", response_model=List[Dict[str, Any]])
-async def get_recent_order_edit_logs(
+def get_recent_order_edit_logs(
     limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db)
 ):
@@ -102,7 +102,7 @@ async def get_recent_order_edit_logs(
 
 
 @router.get("/order-edit-logs/actions", response_model=List[str])
-async def get_order_edit_log_actions(
+def get_order_edit_log_actions(
     db: Session = Depends(get_db)
 ):
     """
@@ -126,14 +126,15 @@ def create_order_edit_log(
     old_value: Optional[Any] = None,
     new_value: Optional[Any] = None,
     description: Optional[str] = None,
-    request: Optional[Request] = None
+    request: Optional[Request] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None
 ):
     """
     Helper function to create order edit log entries
-    """
-    ip_address = None
-    user_agent = None
 
+    Callers off the event loop pass ip_address/user_agent instead of the request.
+    """
     if request:
         # Get IP address from request
         ip_address = request.client.host if request.client else None
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, text, desc
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from uuid import UUID
 import logging
 import json
@@ -27,13 +28,19 @@ async def create_order(request: Request, db: Session = Depends(get_db)):
         request_data = await request.json()
         logger.info(f"Creating order with data: {request_data}")
         
-        return crud_operations.create_order_with_items(db=db, order_data=request_data)
+        # Database work runs on the worker thread pool, not the event loop
+        return await run_in_threadpool(_create_order, db, request_data)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error creating order: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _create_order(db: Session, request_data: Dict[str, Any]) -> schemas.OrderMaster:
+    """Blocking part of create_order (response validated here so lazy loads stay off the event loop)"""
+    order = crud_operations.create_order_with_items(db=db, order_data=request_data)
+    return schemas.OrderMaster.model_validate(order)
+
 @router.get("/orders/list-for-dispatch", tags=["Order Master"])
 def get_orders_for_dispatch(
     search: str = None,
@@ -215,38 +222,44 @@ async def update_order(
     try:
         # Parse request body to get user info
         request_body = await request.json()
-        edited_by_id = request_body.get("edited_by_id")  # Get user ID from request
-
-        # Extract only the order update fields (remove edited_by_id)
-        order_data = {k: v for k, v in request_body.items() if k != "edited_by_id"}
-        order_update = schemas.OrderMasterUpdate(**order_data)
-
-        # Get the order first to check status
-        order = crud_operations.get_order(db=db, order_id=order_id)
-        if not order:
-            raise HTTPException(status_code=404, detail="Order not found")
 
-        # Only allow updates of orders in 'created' status
-        if order.status != "created":
-            raise HTTPException(
-                status_code=400,
-                detail=f"Cannot update order with status '{order.status}'. Only orders with status 'created' can be updated."
-            )
-
-        # Perform the update
-        updated_order = crud_operations.update_order(db=db, order_id=order_id, order_update=order_update)
-        if not updated_order:
-            raise HTTPException(status_code=500, detail="Failed to update order")
-
-        # Note: Individual field change logging removed - only tracking order items changes
-
-        return updated_order
+        # Database work runs on the worker thread pool, not the event loop
+        return await run_in_threadpool(_update_order, db, order_id, request_body)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error updating order: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _update_order(db: Session, order_id: UUID, request_body: Dict[str, Any]) -> schemas.OrderMaster:
+    """Blocking part of update_order (response validated here so lazy loads stay off the event loop)"""
+    edited_by_id = request_body.get("edited_by_id")  # Get user ID from request
+
+    # Extract only the order update fields (remove edited_by_id)
+    order_data = {k: v for k, v in request_body.items() if k != "edited_by_id"}
+    order_update = schemas.OrderMasterUpdate(**order_data)
+
+    # Get the order first to check status
+    order = crud_operations.get_order(db=db, order_id=order_id)
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+
+    # Only allow updates of orders in 'created' status
+    if order.status != "created":
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot update order with status '{order.status}'. Only orders with status 'created' can be updated."
+        )
+
+    # Perform the update
+    updated_order = crud_operations.update_order(db=db, order_id=order_id, order_update=order_update)
+    if not updated_order:
+        raise HTTPException(status_code=500, detail="Failed to update order")
+
+    # Note: Individual field change logging removed - only tracking order items changes
+
+    return schemas.OrderMaster.model_validate(updated_order)
+
 @router.put("/orders/{order_id}/with-items", response_model=schemas.OrderMaster, tags=["Order Master"])
 async def update_order_with_items(
     order_id: UUID,
@@ -259,124 +272,131 @@ async def update_order_with_items(
         raw_data = await request.json()
         logger.info(f"Raw request data for order {order_id}: {raw_data}")
 
-        # Extract user ID for logging
-        edited_by_id = raw_data.get("edited_by_id")
-
-        # Remove edited_by_id from the data before parsing with Pydantic
-        order_data = {k: v for k, v in raw_data.items() if k != "edited_by_id"}
+        # Client details for the edit log; the Request itself stays on the event loop
+        ip_address = request.client.host if request.client else None
+        user_agent = request.headers.get("user-agent")
 
-        # Try to parse with Pydantic schema
-        try:
-            order_update = schemas.OrderMasterUpdateWithItems(**order_data)
-            logger.info(f"Successfully parsed order update: {order_update}")
-        except Exception as parse_error:
-            logger.error(f"Pydantic validation error: {parse_error}")
-            raise HTTPException(status_code=422, detail=f"Validation error: {str(parse_error)}")
-
-        # Get the order first to check status
-        order = crud_operations.get_order(db=db, order_id=order_id)
-        if not order:
-            raise HTTPException(status_code=404, detail="Order not found")
+        # Database work runs on the worker thread pool, not the event loop
+        return await run_in_threadpool(_update_order_with_items, db, order_id, raw_data, ip_address, user_agent)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating order with items: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Only allow updates of orders in 'created' status
-        if order.status != "created":
-            raise HTTPException(
-                status_code=400,
-                detail=f"Cannot update order with status '{order.status}'. Only orders with status 'created' can be updated."
-            )
+def _update_order_with_items(
+    db: Session,
+    order_id: UUID,
+    raw_data: Dict[str, Any],
+    ip_address: Optional[str],
+    user_agent: Optional[str]
+) -> schemas.OrderMaster:
+    """Blocking part of update_order_with_items (response validated here so lazy loads stay off the event loop)"""
+    # Extract user ID for logging
+    edited_by_id = raw_data.get("edited_by_id")
+
+    # Remove edited_by_id from the data before parsing with Pydantic
+    order_data = {k: v for k, v in raw_data.items() if k != "edited_by_id"}
+
+    # Try to parse with Pydantic schema
+    try:
+        order_update = schemas.OrderMasterUpdateWithItems(**order_data)
+        logger.info(f"Successfully parsed order update: {order_update}")
+    except Exception as parse_error:
+        logger.error(f"Pydantic validation error: {parse_error}")
+        raise HTTPException(status_code=422, detail=f"Validation error: {str(parse_error)}")
 
-        # Track old order items for logging
-        old_items = [
-            {
-                "paper_id": str(item.paper_id),
-                "width_inches": float(item.width_inches),
-                "quantity_rolls": item.quantity_rolls,
-                "rate": float(item.rate)
-            }
-            for item in order.order_items
-        ]
+    # Get the order first to check status
+    order = crud_operations.get_order(db=db, order_id=order_id)
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
 
-        # Perform the update with items
-        updated_order = crud_operations.update_order_with_items(db=db, order_id=order_id, order_update=order_update)
-        if not updated_order:
-            raise HTTPException(status_code=500, detail="Failed to update order")
+    # Only allow updates of orders in 'created' status
+    if order.status != "created":
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot update order with status '{order.status}'. Only orders with status 'created' can be updated."
+        )
 
-        # Track new order items for logging
-        new_items = [
-            {
-                "paper_id": str(item.paper_id),
-                "width_inches": float(item.width_inches),
-                "quantity_rolls": item.quantity_rolls,
-                "rate": float(item.rate)
-            }
-            for item in updated_order.order_items
-        ]
+    # Track old order items for logging
+    old_items = [
+        {
+            "paper_id": str(item.paper_id),
+            "width_inches": float(item.width_inches),
+            "quantity_rolls": item.quantity_rolls,
+            "rate": float(item.rate)
+        }
+        for item in order.order_items
+    ]
+
+    # Perform the update with items
+    updated_order = crud_operations.update_order_with_items(db=db, order_id=order_id, order_update=order_update)
+    if not updated_order:
+        raise HTTPException(status_code=500, detail="Failed to update order")
+
+    # Track new order items for logging
+    new_items = [
+        {
+            "paper_id": str(item.paper_id),
+            "width_inches": float(item.width_inches),
+            "quantity_rolls": item.quantity_rolls,
+            "rate": float(item.rate)
+        }
+        for item in updated_order.order_items
+    ]
 
-        # Log the order items update using separate database session
-        try:
-            from sqlalchemy.orm import sessionmaker
-            from ..database import engine
+    # Log the order items update on the same session: the update is already committed,
+    # and a second session would hold another connection while this one is checked out
+    try:
+        # Use the actual user ID if provided, otherwise fall back to system user
+        user_id_for_logging = edited_by_id
 
-            # Create separate session for logging
-            LogSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-            log_db = LogSession()
+        if not user_id_for_logging:
+            # Fall back to system user if no user ID provided
+            system_user = db.query(models.UserMaster).filter(
+                models.UserMaster.username == "system"
+            ).first()
 
-            try:
-                # Use the actual user ID if provided, otherwise fall back to system user
-                user_id_for_logging = edited_by_id
-
-                if not user_id_for_logging:
-                    # Fall back to system user if no user ID provided
-                    system_user = log_db.query(models.UserMaster).filter(
-                        models.UserMaster.username == "system"
-                    ).first()
-
-                    if not system_user:
-                        logger.warning("No system user found, creating one for logging")
-                        system_user = models.UserMaster(
-                            name="System User",
-                            username="system",
-                            password_hash="system",
-                            role="system",
-                            contact="system@localhost",
-                            department="System",
-                            status="active"
-                        )
-                        log_db.add(system_user)
-                        log_db.commit()
-                        log_db.refresh(system_user)
-
-                    user_id_for_logging = str(system_user.id)
-
-                logger.info(f"Logging order items update for order {order_id} by user {user_id_for_logging}")
-
-                # Log order items update only
-                create_order_edit_log(
-                    db=log_db,
-                    order_id=str(order_id),
-                    edited_by_id=user_id_for_logging,
-                    action="update_order_items",
-                    field_name="order_items",
-                    old_value=old_items,
-                    new_value=new_items,
-                    description=f"Updated order items: {len(old_items)} -> {len(new_items)} items",
-                    request=request
+            if not system_user:
+                logger.warning("No system user found, creating one for logging")
+                system_user = models.UserMaster(
+                    name="System User",
+                    username="system",
+                    password_hash="system",
+                    role="system",
+                    contact="system@localhost",
+                    department="System",
+                    status="active"
                 )
-                logger.info("Successfully logged order items update")
+                db.add(system_user)
+                db.commit()
+                db.refresh(system_user)
+
+            user_id_for_logging = str(system_user.id)
+
+        logger.info(f"Logging order items update for order {order_id} by user {user_id_for_logging}")
+
+        # Log order items update only
+        create_order_edit_log(
+            db=db,
+            order_id=str(order_id),
+            edited_by_id=user_id_for_logging,
+            action="update_order_items",
+            field_name="order_items",
+            old_value=old_items,
+            new_value=new_items,
+            description=f"Updated order items: {len(old_items)} -> {len(new_items)} items",
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+        logger.info("Successfully logged order items update")
 
-            finally:
-                log_db.close()
+    except Exception as log_error:
+        # Log the error but don't fail the main operation (already committed)
+        db.rollback()
+        logger.error(f"Failed to log order items update: {log_error}", exc_info=True)
 
-        except Exception as log_error:
-            # Log the error but don't fail the main operation
-            logger.error(f"Failed to log order items update: {log_error}", exc_info=True)
-
-        return updated_order
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error updating order with items: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return schemas.OrderMaster.model_validate(updated_order)
 
 @router.patch("/orders/{order_id}/status", tags=["Order Master"])
 def update_order_status(
@@ -1146,123 +1166,128 @@ async def create_gupta_completion_order(
     try:
         # Parse request data
         request_data = await request.json()
-        required_rolls = request_data.get("required_rolls", [])
-        created_by_id = request_data.get("created_by_id")
-        notes = request_data.get("notes", "Partial jumbo completion order")
-        
-        if not required_rolls:
-            raise HTTPException(status_code=400, detail="required_rolls cannot be empty")
+
+        # Database work runs on the worker thread pool, not the event loop
+        return await run_in_threadpool(_create_gupta_completion_order, db, request_data)
         
-        if not created_by_id:
-            raise HTTPException(status_code=400, detail="created_by_id is required")
+    except HTTPException:
+        await run_in_threadpool(db.rollback)
+        raise
+    except Exception as e:
+        await run_in_threadpool(db.rollback)
+        logger.error(f"Error creating Gupta completion order: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to create completion order: {str(e)}")
+
+def _create_gupta_completion_order(db: Session, request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Blocking part of create_gupta_completion_order"""
+    required_rolls = request_data.get("required_rolls", [])
+    created_by_id = request_data.get("created_by_id")
+    notes = request_data.get("notes", "Partial jumbo completion order")
+    
+    if not required_rolls:
+        raise HTTPException(status_code=400, detail="required_rolls cannot be empty")
+    
+    if not created_by_id:
+        raise HTTPException(status_code=400, detail="created_by_id is required")
+    
+    # Find Gupta Publishing House client (hardcoded)
+    gupta_client = db.query(models.ClientMaster).filter(
+        models.ClientMaster.company_name.ilike("%Gupta Publishing%")
+    ).first()
+    
+    if not gupta_client:
+        raise HTTPException(
+            status_code=404, 
+            detail="Gupta Publishing House client not found in client master"
+        )
+    
+    logger.info(f"Creating Gupta completion order with {len(required_rolls)} rolls")
+    
+    # Create new order for Gupta Publishing House
+    new_order = models.OrderMaster(
+        client_id=gupta_client.id,
+        status="created",
+        priority="normal", 
+        payment_type="bill",
+        delivery_date=None,
+        created_by_id=created_by_id,
+        created_at=datetime.utcnow()
+    )
+    
+    db.add(new_order)
+    db.flush()  # Get the order ID
+    
+    # Create order items for each required roll
+    order_items = []
+    total_amount = 0
+    
+    for roll_spec in required_rolls:
+        # Extract roll specifications
+        width_inches = float(roll_spec.get("width_inches", 0))
+        paper_id = roll_spec.get("paper_id")
+        rate = float(roll_spec.get("rate", 0))
         
-        # Find Gupta Publishing House client (hardcoded)
-        gupta_client = db.query(models.ClientMaster).filter(
-            models.ClientMaster.company_name.ilike("%Gupta Publishing%")
-        ).first()
+        if width_inches <= 0:
+            raise HTTPException(status_code=400, detail="width_inches must be greater than 0")
         
-        if not gupta_client:
-            raise HTTPException(
-                status_code=404, 
-                detail="Gupta Publishing House client not found in client master"
-            )
+        if not paper_id:
+            raise HTTPException(status_code=400, detail="paper_id is required for each roll")
         
-        logger.info(f"Creating Gupta completion order with {len(required_rolls)} rolls")
+        # Calculate quantities (standard: 1 inch = 13kg)
+        quantity_kg = width_inches * 13
+        amount = quantity_kg * rate
+        total_amount += amount
         
-        # Create new order for Gupta Publishing House
-        new_order = models.OrderMaster(
-            client_id=gupta_client.id,
-            status="created",
-            priority="normal", 
-            payment_type="bill",
-            delivery_date=None,
-            created_by_id=created_by_id,
+        # Create order item
+        order_item = models.OrderItem(
+            order_id=new_order.id,
+            paper_id=paper_id,
+            width_inches=width_inches,
+            quantity_rolls=1,
+            quantity_kg=quantity_kg,
+            rate=rate,
+            amount=amount,
+            quantity_fulfilled=0,
+            quantity_in_pending=0,
+            item_status="created",
             created_at=datetime.utcnow()
         )
         
-        db.add(new_order)
-        db.flush()  # Get the order ID
-        
-        # Create order items for each required roll
-        order_items = []
-        total_amount = 0
-        
-        for roll_spec in required_rolls:
-            # Extract roll specifications
-            width_inches = float(roll_spec.get("width_inches", 0))
-            paper_id = roll_spec.get("paper_id")
-            rate = float(roll_spec.get("rate", 0))
-            
-            if width_inches <= 0:
-                raise HTTPException(status_code=400, detail="width_inches must be greater than 0")
-            
-            if not paper_id:
-                raise HTTPException(status_code=400, detail="paper_id is required for each roll")
-            
-            # Calculate quantities (standard: 1 inch = 13kg)
-            quantity_kg = width_inches * 13
-            amount = quantity_kg * rate
-            total_amount += amount
-            
-            # Create order item
-            order_item = models.OrderItem(
-                order_id=new_order.id,
-                paper_id=paper_id,
-                width_inches=width_inches,
-                quantity_rolls=1,
-                quantity_kg=quantity_kg,
-                rate=rate,
-                amount=amount,
-                quantity_fulfilled=0,
-                quantity_in_pending=0,
-                item_status="created",
-                created_at=datetime.utcnow()
-            )
-            
-            db.add(order_item)
-            order_items.append(order_item)
-        
-        # Commit the transaction
-        db.commit()
-        db.refresh(new_order)
-        
-        # Prepare response
-        response_data = {
-            "order": {
-                "id": str(new_order.id),
-                "frontend_id": new_order.frontend_id,
-                "client_id": str(new_order.client_id),
-                "client_name": gupta_client.company_name,
-                "status": new_order.status,
-                "priority": new_order.priority,
-                "payment_type": new_order.payment_type,
-                "created_at": new_order.created_at.isoformat(),
-                "total_items": len(order_items),
-                "total_amount": total_amount
-            },
-            "order_items": [
-                {
-                    "id": str(item.id),
-                    "paper_id": str(item.paper_id),
-                    "width_inches": float(item.width_inches),
-                    "quantity_rolls": item.quantity_rolls,
-                    "quantity_kg": float(item.quantity_kg),
-                    "rate": float(item.rate),
-                    "amount": float(item.amount)
-                }
-                for item in order_items
-            ],
-            "message": f"Successfully created Gupta completion order {new_order.frontend_id} with {len(order_items)} items"
-        }
-        
-        logger.info(f"Created Gupta completion order: {new_order.frontend_id}")
-        return response_data
-        
-    except HTTPException:
-        db.rollback()
-        raise
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error creating Gupta completion order: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to create completion order: {str(e)}")
-
+        db.add(order_item)
+        order_items.append(order_item)
+    
+    # Commit the transaction
+    db.commit()
+    db.refresh(new_order)
+    
+    # Prepare response
+    response_data = {
+        "order": {
+            "id": str(new_order.id),
+            "frontend_id": new_order.frontend_id,
+            "client_id": str(new_order.client_id),
+            "client_name": gupta_client.company_name,
+            "status": new_order.status,
+            "priority": new_order.priority,
+            "payment_type": new_order.payment_type,
+            "created_at": new_order.created_at.isoformat(),
+            "total_items": len(order_items),
+            "total_amount": total_amount
+        },
+        "order_items": [
+            {
+                "id": str(item.id),
+                "paper_id": str(item.paper_id),
+                "width_inches": float(item.width_inches),
+                "quantity_rolls": item.quantity_rolls,
+                "quantity_kg": float(item.quantity_kg),
+                "rate": float(item.rate),
+                "amount": float(item.amount)
+            }
+            for item in order_items
+        ],
+        "message": f"Successfully created Gupta completion order {new_order.frontend_id} with {len(order_items)} items"
+    }
+    
+    logger.info(f"Created Gupta completion order: {new_order.frontend_id}")
+    return response_data
@@ -8,6 +8,7 @@ import uuid
 
 from .base import get_db
 from .. import models, schemas
+from ..services.batch_lookup import count_by_keys
 from ..services.id_generator import FrontendIDGenerator
 
 router = APIRouter()
@@ -32,9 +33,7 @@ def get_past_dispatch_history(
     """Get past dispatch history with filtering and pagination"""
     try:
         # Base query with relationships
-        query = db.query(models.PastDispatchRecord).options(
-            joinedload(models.PastDispatchRecord.past_dispatch_items)
-        )
+        query = db.query(models.PastDispatchRecord)
         
         # Apply filters
         if client_name and client_name.strip() and client_name != "all":
@@ -84,6 +83,11 @@ def get_past_dispatch_history(
         # Apply pagination and ordering
         dispatches = query.order_by(desc(models.PastDispatchRecord.dispatch_date)).offset(skip).limit(limit).all()
         
+        # Item counts for the whole page in one query
+        items_counts = count_by_keys(
+            db, models.PastDispatchItem.past_dispatch_record_id, [dispatch.id for dispatch in dispatches]
+        )
+        
         # Format response
         dispatch_list = []
         for dispatch in dispatches:
@@ -102,7 +106,7 @@ def get_past_dispatch_history(
                 "total_weight_kg": float(dispatch.total_weight_kg) if dispatch.total_weight_kg else 0.0,
                 "created_at": dispatch.created_at.isoformat() if dispatch.created_at else None,
                 "delivered_at": dispatch.delivered_at.isoformat() if dispatch.delivered_at else None,
-                "items_count": len(dispatch.past_dispatch_items) if dispatch.past_dispatch_items else 0
+                "items_count": items_counts.get(dispatch.id, 0)
             })
         
         return {
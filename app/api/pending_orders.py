@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 from uuid import UUID
+import json
 import logging
 
 from .base import get_db
+from ..concurrency import iterate_in_optimizer_pool, run_in_optimizer_pool
 from .. import crud_operations, schemas
 from ..idempotency import check_idempotency, store_idempotency_response
 
@@ -68,7 +71,7 @@ def get_consolidation_opportunities(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/pending-order-items/roll-suggestions", tags=["Pending Order Items"])
-def get_roll_suggestions(
+async def get_roll_suggestions(
     request_data: Dict[str, Any],
     db: Session = Depends(get_db),
     x_idempotency_key: Optional[str] = Header(None, alias="X-Idempotency-Key")
@@ -78,6 +81,11 @@ def get_roll_suggestions(
     Takes wastage parameter to calculate dynamic target width (124 - wastage).
     Returns suggestions showing existing width + needed width = target width.
     """
+    # Long solve: runs on the optimizer thread pool, not the request one
+    return await run_in_optimizer_pool(_get_roll_suggestions, request_data, db, x_idempotency_key)
+
+def _get_roll_suggestions(request_data: Dict[str, Any], db: Session, x_idempotency_key: Optional[str]):
+    """Blocking part of get_roll_suggestions"""
     try:
         # Check for idempotency key
         if x_idempotency_key:
@@ -124,6 +132,39 @@ def get_roll_suggestions(
         logger.error(f"Error generating roll suggestions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/pending-order-items/roll-suggestions/stream", tags=["Pending Order Items"])
+def stream_roll_suggestions(
+    request_data: Dict[str, Any],
+    db: Session = Depends(get_db)
+):
+    """
+    Streaming variant of /pending-order-items/roll-suggestions.
+    Returns NDJSON: a "start" record, one "spec" record per paper spec as soon as
+    it is solved, and a final "summary" record. Responses are not idempotency-cached.
+    """
+    wastage = request_data.get('wastage', 0)
+
+    if not isinstance(wastage, (int, float)) or wastage < 0:
+        raise HTTPException(
+            status_code=400,
+            detail="Wastage must be a non-negative number"
+        )
+
+    from ..services.pending_optimizer import PendingOptimizer
+    optimizer = PendingOptimizer(db=db)
+
+    def generate():
+        try:
+            for record in optimizer.iter_roll_suggestions(wastage):
+                yield json.dumps(record, default=str) + "\n"
+        except Exception as e:
+            # Headers are already sent, so failures are reported in-band
+            logger.error(f"Error streaming roll suggestions: {e}")
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+
+    # Records are produced by the solver, so the stream iterates on the optimizer thread pool
+    return StreamingResponse(iterate_in_optimizer_pool(generate()), media_type="application/x-ndjson")
+
 @router.post("/pending-orders/start-production", response_model=schemas.StartProductionResponse, tags=["Pending Order Items"])
 def start_production_from_pending_orders(
     request_data: Dict[str, Any],  # Accept raw data to debug validation issues
@@ -1,12 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import func
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional
 from datetime import datetime
 import logging
 
 from .base import get_db
+from ..database import get_async_db
 from .. import crud_operations, schemas, models
+from ..services.barcode_registry import INVENTORY, MANUAL, barcode_registry, scan_order
+from ..services.batch_lookup import chunked, load_by_keys
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -16,55 +20,33 @@ logger = logging.getLogger(__name__)
 # ============================================================================
 
 @router.get("/qr/{qr_code}", response_model=Dict[str, Any], tags=["QR Code Management"])
-def scan_qr_code(qr_code: str, db: Session = Depends(get_db)):
+async def scan_qr_code(qr_code: str, db: AsyncSession = Depends(get_async_db)):
     """Scan QR code or barcode and return cut roll details (checks both InventoryMaster and ManualCutRoll tables)"""
+    return await db.run_sync(_scan_qr_code, qr_code)
+
+def _scan_qr_code(db: Session, qr_code: str):
+    """Body of scan_qr_code, run on the session from get_async_db"""
     try:
-        # Determine search order based on barcode prefix
-        # For barcodes starting with "CR_", check ManualCutRoll first
-        check_manual_first = qr_code.startswith("CR_")
-
-        matching_item = None
-        manual_roll = None
-
-        if check_manual_first:
-            # Check ManualCutRoll table first for CR_ prefixed barcodes
-            manual_roll = db.query(models.ManualCutRoll).options(
-                joinedload(models.ManualCutRoll.paper),
-                joinedload(models.ManualCutRoll.client),
-                joinedload(models.ManualCutRoll.created_by)
-            ).filter(models.ManualCutRoll.barcode_id == qr_code).first()
-
-            # If not found in ManualCutRoll, check InventoryMaster as fallback
-            if not manual_roll:
-                matching_item = db.query(models.InventoryMaster).options(
+        # One registry lookup, then the roll itself (CR_ codes check ManualCutRoll first)
+        source, roll = barcode_registry.resolve(
+            db, qr_code, scan_order(qr_code),
+            options={
+                INVENTORY: [
                     joinedload(models.InventoryMaster.paper),
                     joinedload(models.InventoryMaster.created_by),
+                    joinedload(models.InventoryMaster.manual_client),
                     joinedload(models.InventoryMaster.allocated_order).joinedload(models.OrderMaster.client),
                     joinedload(models.InventoryMaster.parent_118_roll).joinedload(models.InventoryMaster.parent_jumbo)
-                ).filter(
-                    (models.InventoryMaster.qr_code == qr_code) |
-                    (models.InventoryMaster.barcode_id == qr_code)
-                ).first()
-        else:
-            # Default behavior: Check InventoryMaster first
-            matching_item = db.query(models.InventoryMaster).options(
-                joinedload(models.InventoryMaster.paper),
-                joinedload(models.InventoryMaster.created_by),
-                joinedload(models.InventoryMaster.manual_client),
-                joinedload(models.InventoryMaster.allocated_order).joinedload(models.OrderMaster.client),
-                joinedload(models.InventoryMaster.parent_118_roll).joinedload(models.InventoryMaster.parent_jumbo)
-            ).filter(
-                (models.InventoryMaster.qr_code == qr_code) |
-                (models.InventoryMaster.barcode_id == qr_code)
-            ).first()
-
-            # If not found in InventoryMaster, check ManualCutRoll table
-            if not matching_item:
-                manual_roll = db.query(models.ManualCutRoll).options(
+                ],
+                MANUAL: [
                     joinedload(models.ManualCutRoll.paper),
                     joinedload(models.ManualCutRoll.client),
                     joinedload(models.ManualCutRoll.created_by)
-                ).filter(models.ManualCutRoll.barcode_id == qr_code).first()
+                ]
+            }
+        )
+        matching_item = roll if source == INVENTORY else None
+        manual_roll = roll if source == MANUAL else None
 
         if not matching_item and not manual_roll:
             raise HTTPException(status_code=404, detail="QR code or barcode not found in inventory or manual cut rolls")
@@ -190,229 +172,305 @@ def update_weight_via_qr(
 ):
     """Update cut roll weight via QR code scan (supports both production and manual cut rolls)"""
     try:
-        # Determine search order based on barcode prefix
-        # For barcodes starting with "CR_", check ManualCutRoll first
-        check_manual_first = weight_update.qr_code.startswith("CR_")
-
-        matching_item = None
-        manual_roll = None
-
-        if check_manual_first:
-            # Check ManualCutRoll table first for CR_ prefixed barcodes
-            manual_roll = db.query(models.ManualCutRoll).options(
-                joinedload(models.ManualCutRoll.paper)
-            ).filter(models.ManualCutRoll.barcode_id == weight_update.qr_code).first()
-
-            # If not found in ManualCutRoll, check InventoryMaster as fallback
-            if not manual_roll:
-                matching_item = db.query(models.InventoryMaster).options(
-                    joinedload(models.InventoryMaster.paper)
-                ).filter(
-                    (models.InventoryMaster.qr_code == weight_update.qr_code) |
-                    (models.InventoryMaster.barcode_id == weight_update.qr_code)
-                ).first()
-        else:
-            # Default behavior: Check InventoryMaster first
-            matching_item = db.query(models.InventoryMaster).options(
-                joinedload(models.InventoryMaster.paper)
-            ).filter(
-                (models.InventoryMaster.qr_code == weight_update.qr_code) |
-                (models.InventoryMaster.barcode_id == weight_update.qr_code)
-            ).first()
-
-            # If not found in InventoryMaster, check ManualCutRoll table
-            if not matching_item:
-                manual_roll = db.query(models.ManualCutRoll).options(
-                    joinedload(models.ManualCutRoll.paper)
-                ).filter(models.ManualCutRoll.barcode_id == weight_update.qr_code).first()
-
-        if not matching_item and not manual_roll:
-            raise HTTPException(status_code=404, detail="QR code or barcode not found in inventory or manual cut rolls")
-
-        # Handle manual cut roll weight update
-        if manual_roll:
-            old_weight = manual_roll.weight_kg
-            manual_roll.weight_kg = weight_update.weight_kg
-            manual_roll.updated_at = datetime.utcnow()
-
-            # If provided, update location
-            if weight_update.location:
-                manual_roll.location = weight_update.location
-
-            # Auto-update status to 'available' when weight is added
-            if manual_roll.weight_kg > 0.1 and manual_roll.status != "used":  # Real weight added
-                manual_roll.status = "available"
-                logger.info(f"🔄 Auto-updated manual cut roll {manual_roll.id} status to 'available' after weight update")
-
-            # Check and update weight in DispatchItem if it exists (check both qr_code and barcode_id)
-            dispatch_item_updated = False
-            dispatch_item = db.query(models.DispatchItem).filter(
-                (models.DispatchItem.qr_code == weight_update.qr_code) |
-                (models.DispatchItem.barcode_id == weight_update.qr_code)
-            ).first()
-
-            if dispatch_item:
-                dispatch_item.weight_kg = weight_update.weight_kg
-                dispatch_item_updated = True
-                logger.info(f" Updated weight in DispatchItem {dispatch_item.id} for code {weight_update.qr_code}")
-
-            db.commit()
-            db.refresh(manual_roll)
-
-            response_data = {
-                "inventory_id": str(manual_roll.id),
-                "qr_code": None,
-                "barcode_id": manual_roll.barcode_id,
-                "is_manual": True,
-                "weight_update": {
-                    "old_weight_kg": float(old_weight),
-                    "new_weight_kg": float(manual_roll.weight_kg),
-                    "weight_difference": float(manual_roll.weight_kg - old_weight),
-                    "is_first_time_weight": old_weight <= 0.1 and manual_roll.weight_kg > 0.1
-                },
-                "current_status": manual_roll.status,
-                "current_location": manual_roll.location,
-                "updated_at": manual_roll.created_at.isoformat() if manual_roll.created_at else None,
-                "message": f"Manual cut roll weight updated successfully from {old_weight}kg to {manual_roll.weight_kg}kg"
+        # One registry lookup, then the roll itself (CR_ codes check ManualCutRoll first)
+        source, roll = barcode_registry.resolve(
+            db, weight_update.qr_code, scan_order(weight_update.qr_code),
+            options={
+                INVENTORY: [joinedload(models.InventoryMaster.paper)],
+                MANUAL: [joinedload(models.ManualCutRoll.paper)]
             }
+        )
 
-            # Add dispatch item update info to response
-            if dispatch_item_updated and dispatch_item:
-                response_data["dispatch_item_update"] = {
-                    "dispatch_item_id": str(dispatch_item.id),
-                    "dispatch_record_id": str(dispatch_item.dispatch_record_id),
-                    "updated": True,
-                    "message": "Weight also updated in dispatch record"
-                }
+        if not roll:
+            raise HTTPException(status_code=404, detail="QR code or barcode not found in inventory or manual cut rolls")
 
-            return response_data
-        
-        # Update weight
-        old_weight = matching_item.weight_kg
-        matching_item.weight_kg = weight_update.weight_kg
-        matching_item.updated_at = datetime.utcnow()
-
-        # If provided, update location
-        if weight_update.location:
-            matching_item.location = weight_update.location
-        
-        # AUTOMATIC STATUS UPDATE: When weight is added, automatically set status to 'available'
-        # This means the cut roll is now ready for dispatch
-        if matching_item.weight_kg > 0.1 and matching_item.status != "used":  # Real weight added
-            matching_item.status = "available"
-            logger.info(f"🔄 Auto-updated inventory {matching_item.id} status to 'available' after weight update")
-        
-        # STEP 4: When weight is added, find related order items and set them to "in_warehouse"
-        # Find order items that match this cut roll's specifications
-        order_items = []  # Initialize to avoid scope issues
-        logger.info(f"🔍 Inventory item paper relationship: {matching_item.paper is not None}, weight: {matching_item.weight_kg}")
-        if matching_item.paper and matching_item.weight_kg > 0.1:  # Real weight added
-            paper = matching_item.paper
-            logger.info(f"🔍 Looking for order items with paper_id={paper.id}, width={matching_item.width_inches}")
-            
-            # If this roll is linked to a specific order, use it directly
-            if matching_item.allocated_to_order_id:
-                order_items = db.query(models.OrderItem).join(models.OrderMaster).filter(
-                    models.OrderItem.order_id == matching_item.allocated_to_order_id,
-                    models.OrderItem.paper_id == paper.id,
-                    models.OrderItem.width_inches == float(matching_item.width_inches),
-                    models.OrderItem.item_status == "in_process"
-                ).all()
-                logger.info(f"🔍 Found {len(order_items)} order items via allocated_to_order_id={matching_item.allocated_to_order_id}")
-            else:
-                # Fallback: blind match by paper + width across all in_process orders
-                order_items = db.query(models.OrderItem).join(models.OrderMaster).filter(
-                    models.OrderItem.paper_id == paper.id,
-                    models.OrderItem.width_inches == float(matching_item.width_inches),
-                    models.OrderMaster.status == "in_process",
-                    models.OrderItem.item_status == "in_process"
-                ).all()
-                logger.info(f"🔍 Found {len(order_items)} matching order items (blind match, no allocated_to_order_id)")
-            
-            # Update the first matching order item with quantity fulfillment logic
-            if order_items:
-                order_item = order_items[0]
-                
-                # STEP 5: Increment quantity_fulfilled for first-time weight updates
-                if old_weight <= 0.1 and matching_item.weight_kg > 0.1:  # First time getting real weight
-                    if order_item.quantity_fulfilled < order_item.quantity_rolls:
-                        order_item.quantity_fulfilled += 1
-                        logger.info(f"📈 Incremented quantity_fulfilled for order item {order_item.id}: {order_item.quantity_fulfilled}/{order_item.quantity_rolls}")
-                        
-                        # Only change status when ALL required rolls are fulfilled
-                        if order_item.quantity_fulfilled >= order_item.quantity_rolls:
-                            order_item.item_status = "in_warehouse"
-                            order_item.moved_to_warehouse_at = func.now()
-                            logger.info(f"🏭 Order item {order_item.id} moved to 'in_warehouse' - ALL rolls fulfilled!")
-                        else:
-                            # Keep in "in_process" until all rolls are weighed
-                            logger.info(f"⏳ Order item {order_item.id} remains 'in_process' - needs {order_item.quantity_rolls - order_item.quantity_fulfilled} more rolls")
-                
-                logger.info(f"Updated order item {order_item.id} - status: '{order_item.item_status}', fulfilled: {order_item.quantity_fulfilled}/{order_item.quantity_rolls}")
-                
-                # STEP 6: Check if entire order is now completed based on quantity fulfillment
-                order = order_item.order
-                if order and old_weight <= 0.1 and matching_item.weight_kg > 0.1:  # Only check on first-time weight update
-                    # Check if all order items are fully fulfilled by quantity (in "in_warehouse" status)
-                    all_items_fulfilled = all(
-                        oi.quantity_fulfilled >= oi.quantity_rolls 
-                        for oi in order.order_items
-                    )
-                    
-                    # Check if all order items are now in warehouse (ready for dispatch)
-                    all_items_in_warehouse = all(
-                        oi.item_status == "in_warehouse"
-                        for oi in order.order_items
-                    )
-                    
-                    if all_items_fulfilled and all_items_in_warehouse and order.status != "completed":
-                        order.status = "in_process"  # Keep as in_process until actually dispatched
-                        order.updated_at = func.now()
-                        logger.info(f"🏭 Order {order.id} - all items in warehouse, ready for dispatch!")
-        
-        # Check and update weight in DispatchItem if it exists (check both qr_code and barcode_id)
-        dispatch_item_updated = False
+        # Check both qr_code and barcode_id of DispatchItem
         dispatch_item = db.query(models.DispatchItem).filter(
             (models.DispatchItem.qr_code == weight_update.qr_code) |
             (models.DispatchItem.barcode_id == weight_update.qr_code)
         ).first()
 
+        update = apply_weight_update(db, source, roll, weight_update, dispatch_item)
+        if source == INVENTORY and dispatch_item:
+            refresh_dispatch_totals(db, [dispatch_item.dispatch_record_id])
 
+        db.commit()
+        db.refresh(roll)
 
-        if dispatch_item:
-            dispatch_item.weight_kg = weight_update.weight_kg
-            dispatch_item_updated = True
-            dispatch_record = db.query(models.DispatchRecord).filter(
-                models.DispatchRecord.id == dispatch_item.dispatch_record_id
-            ).first()
-            if dispatch_record:
-                dispatch_record.updated_at = datetime.utcnow()
-                # Convert all weights to float before summing to avoid Decimal/float mismatch
-                dispatch_record.total_weight_kg = sum(float(item.weight_kg) for item in dispatch_record.dispatch_items)
-            logger.info(f"📦 Updated weight in DispatchItem {dispatch_item.id} for code {weight_update.qr_code}")
+        return weight_update_response(source, roll, update)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating weight for QR code {weight_update.qr_code}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.put("/qr/update-weight/batch", response_model=Dict[str, Any], tags=["QR Code Management"])
+def update_weights_via_qr_batch(
+    batch: schemas.QRWeightBatchUpdate,
+    db: Session = Depends(get_db)
+):
+    """
+    Update the weights of several scanned rolls in one request (production and manual cut rolls).
+    All codes are resolved together and the updates are committed in one transaction;
+    unknown codes are reported per item and do not block the others.
+    """
+    try:
+        codes = [item.qr_code for item in batch.items]
+
+        # One registry lookup and one load per roll table for the whole batch
+        resolved = barcode_registry.resolve_many(db, codes, options={
+            INVENTORY: [joinedload(models.InventoryMaster.paper)],
+            MANUAL: [joinedload(models.ManualCutRoll.paper)]
+        })
+
+        # Dispatch items of the scanned codes, by qr_code and barcode_id
+        dispatch_items = {}
+        for chunk in chunked(code for code in codes if code in resolved):
+            for dispatch_item in db.query(models.DispatchItem).filter(
+                models.DispatchItem.qr_code.in_(chunk) | models.DispatchItem.barcode_id.in_(chunk)
+            ).all():
+                for key in (dispatch_item.qr_code, dispatch_item.barcode_id):
+                    if key in chunk:
+                        dispatch_items.setdefault(key, dispatch_item)
+
+        # A roll scanned more than once in the batch (by QR code or barcode) keeps its last weight
+        last_scan = {}
+        for index, weight_update in enumerate(batch.items):
+            source, roll = resolved.get(weight_update.qr_code, (None, None))
+            if roll:
+                last_scan[(source, roll.id)] = index
+
+        # Apply in scan order
+        updates = []
+        touched_dispatch_records = set()
+        for index, weight_update in enumerate(batch.items):
+            source, roll = resolved.get(weight_update.qr_code, (None, None))
+            if not roll or last_scan[(source, roll.id)] != index:
+                updates.append((weight_update, source, None, None))
+                continue
+
+            dispatch_item = dispatch_items.get(weight_update.qr_code)
+            update = apply_weight_update(db, source, roll, weight_update, dispatch_item)
+            if source == INVENTORY and dispatch_item:
+                touched_dispatch_records.add(dispatch_item.dispatch_record_id)
+            if update["order_items"]:
+                db.flush()  # Later rolls of the same order item must see this fulfillment
+            updates.append((weight_update, source, roll, update))
+
+        refresh_dispatch_totals(db, touched_dispatch_records)
+        db.flush()
+
+        # Responses are built from the flushed session state before committing, so a
+        # response error cannot follow a commit that already saved the weights
+        results = []
+        for weight_update, source, roll, update in updates:
+            if not roll:
+                results.append({
+                    "scanned_code": weight_update.qr_code,
+                    "success": False,
+                    "error": "Superseded by a later scan of the same roll in this batch" if source
+                    else "QR code or barcode not found in inventory or manual cut rolls"
+                })
+                continue
+            results.append({"scanned_code": weight_update.qr_code, "success": True, **weight_update_response(source, roll, update)})
 
         db.commit()
-        db.refresh(matching_item)
 
+        updated = sum(1 for result in results if result["success"])
+        logger.info(f"⚖️ BATCH WEIGHT UPDATE: {updated}/{len(results)} rolls updated")
+
+        return {
+            "results": results,
+            "summary": {
+                "total": len(results),
+                "updated": updated,
+                "failed": len(results) - updated
+            }
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error in batch weight update: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def apply_weight_update(
+    db: Session,
+    source: str,
+    roll: Any,
+    weight_update: schemas.QRWeightUpdate,
+    dispatch_item: Optional[models.DispatchItem]
+) -> Dict[str, Any]:
+    """
+    Apply a scanned weight to a production or manual cut roll (no commit).
+    Sets the roll available, advances order item fulfillment on the first real
+    weight of a production roll and copies the weight to its dispatch item.
+
+    Returns:
+        Update context for weight_update_response
+    """
+    old_weight = roll.weight_kg
+    roll.weight_kg = weight_update.weight_kg
+    roll.updated_at = datetime.utcnow()
+
+    # If provided, update location
+    if weight_update.location:
+        roll.location = weight_update.location
+
+    # AUTOMATIC STATUS UPDATE: When weight is added, automatically set status to 'available'
+    # This means the cut roll is now ready for dispatch
+    if roll.weight_kg > 0.1 and roll.status != "used":  # Real weight added
+        roll.status = "available"
+        if source == MANUAL:
+            logger.info(f"🔄 Auto-updated manual cut roll {roll.id} status to 'available' after weight update")
+        else:
+            logger.info(f"🔄 Auto-updated inventory {roll.id} status to 'available' after weight update")
+
+    order_items = []  # Initialize to avoid scope issues
+    if source == INVENTORY:
+        order_items = _advance_order_fulfillment(db, roll, old_weight)
+
+    # Update weight in DispatchItem if it exists
+    if dispatch_item:
+        dispatch_item.weight_kg = weight_update.weight_kg
+        logger.info(f"📦 Updated weight in DispatchItem {dispatch_item.id} for code {weight_update.qr_code}")
+
+    return {"old_weight": old_weight, "order_items": order_items, "dispatch_item": dispatch_item}
+
+
+def _advance_order_fulfillment(db: Session, matching_item: models.InventoryMaster, old_weight) -> List[models.OrderItem]:
+    """
+    STEP 4-6: When weight is added, find the order items this cut roll belongs to,
+    count it as fulfilled on its first real weight and move the item to warehouse
+    once all its rolls are weighed.
+    """
+    order_items = []
+    logger.info(f"🔍 Inventory item paper relationship: {matching_item.paper is not None}, weight: {matching_item.weight_kg}")
+    if matching_item.paper and matching_item.weight_kg > 0.1:  # Real weight added
+        paper = matching_item.paper
+        logger.info(f"🔍 Looking for order items with paper_id={paper.id}, width={matching_item.width_inches}")
+
+        # If this roll is linked to a specific order, use it directly
+        if matching_item.allocated_to_order_id:
+            order_items = db.query(models.OrderItem).join(models.OrderMaster).filter(
+                models.OrderItem.order_id == matching_item.allocated_to_order_id,
+                models.OrderItem.paper_id == paper.id,
+                models.OrderItem.width_inches == float(matching_item.width_inches),
+                models.OrderItem.item_status == "in_process"
+            ).all()
+            logger.info(f"🔍 Found {len(order_items)} order items via allocated_to_order_id={matching_item.allocated_to_order_id}")
+        else:
+            # Fallback: blind match by paper + width across all in_process orders
+            order_items = db.query(models.OrderItem).join(models.OrderMaster).filter(
+                models.OrderItem.paper_id == paper.id,
+                models.OrderItem.width_inches == float(matching_item.width_inches),
+                models.OrderMaster.status == "in_process",
+                models.OrderItem.item_status == "in_process"
+            ).all()
+            logger.info(f"🔍 Found {len(order_items)} matching order items (blind match, no allocated_to_order_id)")
+
+        # Update the first matching order item with quantity fulfillment logic
+        if order_items:
+            order_item = order_items[0]
+
+            # STEP 5: Increment quantity_fulfilled for first-time weight updates
+            if old_weight <= 0.1 and matching_item.weight_kg > 0.1:  # First time getting real weight
+                if order_item.quantity_fulfilled < order_item.quantity_rolls:
+                    order_item.quantity_fulfilled += 1
+                    logger.info(f"📈 Incremented quantity_fulfilled for order item {order_item.id}: {order_item.quantity_fulfilled}/{order_item.quantity_rolls}")
+
+                    # Only change status when ALL required rolls are fulfilled
+                    if order_item.quantity_fulfilled >= order_item.quantity_rolls:
+                        order_item.item_status = "in_warehouse"
+                        order_item.moved_to_warehouse_at = func.now()
+                        logger.info(f"🏭 Order item {order_item.id} moved to 'in_warehouse' - ALL rolls fulfilled!")
+                    else:
+                        # Keep in "in_process" until all rolls are weighed
+                        logger.info(f"⏳ Order item {order_item.id} remains 'in_process' - needs {order_item.quantity_rolls - order_item.quantity_fulfilled} more rolls")
+
+            logger.info(f"Updated order item {order_item.id} - status: '{order_item.item_status}', fulfilled: {order_item.quantity_fulfilled}/{order_item.quantity_rolls}")
+
+            # STEP 6: Check if entire order is now completed based on quantity fulfillment
+            order = order_item.order
+            if order and old_weight <= 0.1 and matching_item.weight_kg > 0.1:  # Only check on first-time weight update
+                # Check if all order items are fully fulfilled by quantity (in "in_warehouse" status)
+                all_items_fulfilled = all(
+                    oi.quantity_fulfilled >= oi.quantity_rolls
+                    for oi in order.order_items
+                )
+
+                # Check if all order items are now in warehouse (ready for dispatch)
+                all_items_in_warehouse = all(
+                    oi.item_status == "in_warehouse"
+                    for oi in order.order_items
+                )
+
+                if all_items_fulfilled and all_items_in_warehouse and order.status != "completed":
+                    order.status = "in_process"  # Keep as in_process until actually dispatched
+                    order.updated_at = func.now()
+                    logger.info(f"🏭 Order {order.id} - all items in warehouse, ready for dispatch!")
+
+    return order_items
+
+
+def refresh_dispatch_totals(db: Session, dispatch_record_ids: Iterable[Any]) -> None:
+    """Recompute total_weight_kg of dispatch records whose item weights changed."""
+    for dispatch_record in load_by_keys(
+        db, models.DispatchRecord, models.DispatchRecord.id, dispatch_record_ids,
+        options=[selectinload(models.DispatchRecord.dispatch_items)]
+    ).values():
+        dispatch_record.updated_at = datetime.utcnow()
+        # Convert all weights to float before summing to avoid Decimal/float mismatch
+        dispatch_record.total_weight_kg = sum(float(item.weight_kg) for item in dispatch_record.dispatch_items)
+
+
+def weight_update_response(source: str, roll: Any, update: Dict[str, Any]) -> Dict[str, Any]:
+    """Response of an applied weight update (roll refreshed after the commit, or flushed but not yet committed)."""
+    old_weight = update["old_weight"]
+    order_items = update["order_items"]
+    dispatch_item = update["dispatch_item"]
+
+    if source == MANUAL:
+        response_data = {
+            "inventory_id": str(roll.id),
+            "qr_code": None,
+            "barcode_id": roll.barcode_id,
+            "is_manual": True,
+            "weight_update": {
+                "old_weight_kg": float(old_weight),
+                "new_weight_kg": float(roll.weight_kg),
+                "weight_difference": float(roll.weight_kg) - float(old_weight),
+                "is_first_time_weight": old_weight <= 0.1 and roll.weight_kg > 0.1
+            },
+            "current_status": roll.status,
+            "current_location": roll.location,
+            "updated_at": roll.created_at.isoformat() if roll.created_at else None,
+            "message": f"Manual cut roll weight updated successfully from {old_weight}kg to {roll.weight_kg}kg"
+        }
+    else:
         # Build response with fulfillment information
         response_data = {
-            "inventory_id": str(matching_item.id),
-            "qr_code": matching_item.qr_code,
-            "barcode_id": matching_item.barcode_id,
+            "inventory_id": str(roll.id),
+            "qr_code": roll.qr_code,
+            "barcode_id": roll.barcode_id,
             "weight_update": {
                 "old_weight_kg": float(old_weight),
-                "new_weight_kg": float(matching_item.weight_kg),
-                "weight_difference": float(matching_item.weight_kg - old_weight),
-                "is_first_time_weight": old_weight <= 0.1 and matching_item.weight_kg > 0.1
+                "new_weight_kg": float(roll.weight_kg),
+                "weight_difference": float(roll.weight_kg) - float(old_weight),
+                "is_first_time_weight": old_weight <= 0.1 and roll.weight_kg > 0.1
             },
-            "current_status": matching_item.status,
-            "current_location": matching_item.location,
-            "updated_at": matching_item.created_at.isoformat(),
-            "message": f"Weight updated successfully from {old_weight}kg to {matching_item.weight_kg}kg"
+            "current_status": roll.status,
+            "current_location": roll.location,
+            "updated_at": roll.created_at.isoformat(),
+            "message": f"Weight updated successfully from {old_weight}kg to {roll.weight_kg}kg"
         }
 
         # Add fulfillment information if order items were updated
-        if matching_item.paper and matching_item.weight_kg > 0.1 and order_items:
+        if roll.paper and roll.weight_kg > 0.1 and order_items:
             order_item = order_items[0]
             response_data["fulfillment_update"] = {
                 "order_item_id": str(order_item.id),
@@ -425,22 +483,16 @@ def update_weight_via_qr(
                 "is_order_completed": order_item.order.status == "completed" if order_item.order else False
             }
 
-        # Add dispatch item update info to response
-        if dispatch_item_updated and dispatch_item:
-            response_data["dispatch_item_update"] = {
-                "dispatch_item_id": str(dispatch_item.id),
-                "dispatch_record_id": str(dispatch_item.dispatch_record_id),
-                "updated": True,
-                "message": "Weight also updated in dispatch record"
-            }
+    # Add dispatch item update info to response
+    if dispatch_item:
+        response_data["dispatch_item_update"] = {
+            "dispatch_item_id": str(dispatch_item.id),
+            "dispatch_record_id": str(dispatch_item.dispatch_record_id),
+            "updated": True,
+            "message": "Weight also updated in dispatch record"
+        }
 
-        return response_data
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error updating weight for QR code {weight_update.qr_code}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return response_data
 
 @router.post("/qr/generate", response_model=Dict[str, Any], tags=["QR Code Management"])
 def generate_qr_code(
@@ -493,48 +545,33 @@ def generate_qr_code(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/barcode/{barcode_id}", response_model=Dict[str, Any], tags=["Barcode Management"])
-def scan_barcode(barcode_id: str, db: Session = Depends(get_db)):
+async def scan_barcode(barcode_id: str, db: AsyncSession = Depends(get_async_db)):
     """Scan barcode and return cut roll details (checks both InventoryMaster and ManualCutRoll tables)"""
+    return await db.run_sync(_scan_barcode, barcode_id)
+
+def _scan_barcode(db: Session, barcode_id: str):
+    """Body of scan_barcode, run on the session from get_async_db"""
     try:
-        # Determine search order based on barcode prefix
-        # For barcodes starting with "CR_", check ManualCutRoll first
-        check_manual_first = barcode_id.startswith("CR_")
-
-        matching_item = None
-        manual_roll = None
-
-        if check_manual_first:
-            # Check ManualCutRoll table first for CR_ prefixed barcodes
-            manual_roll = db.query(models.ManualCutRoll).options(
-                joinedload(models.ManualCutRoll.paper),
-                joinedload(models.ManualCutRoll.client),
-                joinedload(models.ManualCutRoll.created_by)
-            ).filter(models.ManualCutRoll.barcode_id == barcode_id).first()
-
-            # If not found in ManualCutRoll, check InventoryMaster as fallback
-            if not manual_roll:
-                matching_item = db.query(models.InventoryMaster).options(
+        # One registry lookup, then the roll itself (CR_ codes check ManualCutRoll first)
+        source, roll = barcode_registry.resolve(
+            db, barcode_id, scan_order(barcode_id),
+            options={
+                INVENTORY: [
                     joinedload(models.InventoryMaster.paper),
                     joinedload(models.InventoryMaster.created_by),
                     joinedload(models.InventoryMaster.allocated_order).joinedload(models.OrderMaster.client),
                     joinedload(models.InventoryMaster.parent_118_roll).joinedload(models.InventoryMaster.parent_jumbo)
-                ).filter(models.InventoryMaster.barcode_id == barcode_id).first()
-        else:
-            # Default behavior: Check InventoryMaster first
-            matching_item = db.query(models.InventoryMaster).options(
-                joinedload(models.InventoryMaster.paper),
-                joinedload(models.InventoryMaster.created_by),
-                joinedload(models.InventoryMaster.allocated_order).joinedload(models.OrderMaster.client),
-                joinedload(models.InventoryMaster.parent_118_roll).joinedload(models.InventoryMaster.parent_jumbo)
-            ).filter(models.InventoryMaster.barcode_id == barcode_id).first()
-
-            # If not found in InventoryMaster, check ManualCutRoll table
-            if not matching_item:
-                manual_roll = db.query(models.ManualCutRoll).options(
+                ],
+                MANUAL: [
                     joinedload(models.ManualCutRoll.paper),
                     joinedload(models.ManualCutRoll.client),
                     joinedload(models.ManualCutRoll.created_by)
-                ).filter(models.ManualCutRoll.barcode_id == barcode_id).first()
+                ]
+            },
+            barcode_only=True
+        )
+        matching_item = roll if source == INVENTORY else None
+        manual_roll = roll if source == MANUAL else None
 
         if not matching_item and not manual_roll:
             raise HTTPException(status_code=404, detail="Barcode not found in inventory or manual cut rolls")
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc, and_, or_, text, case
+from sqlalchemy import func, desc, and_, or_, text, case, select
 from typing import Dict, List, Any, Optional
 import logging
 import uuid
@@ -8,7 +9,11 @@ import json
 from datetime import datetime, timedelta
 
 from .base import get_db
+from ..database import get_async_db
 from .. import models, schemas
+from ..services.aggregation import combined_scalars, count_if
+from ..services.keyset_pagination import InvalidCursorError, keyset_page
+from ..services.report_queries import ParentRoll, cut_roll_rows_query, format_cut_roll_rows
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -435,20 +440,20 @@ def get_reports_summary(db: Session = Depends(get_db)):
     Get overall reports summary with key metrics for all report types.
     """
     try:
-        # Get counts for each dimension
-        total_papers = db.query(func.count(func.distinct(models.PaperMaster.id))).join(
-            models.OrderItem, models.OrderItem.paper_id == models.PaperMaster.id
-        ).scalar() or 0
-        
-        total_clients = db.query(func.count(func.distinct(models.ClientMaster.id))).join(
-            models.OrderMaster, models.OrderMaster.client_id == models.ClientMaster.id
-        ).scalar() or 0
-        
-        # Date range of orders
-        date_range = db.query(
-            func.min(models.OrderMaster.created_at),
-            func.max(models.OrderMaster.created_at)
-        ).first()
+        # Dimension counts and order date range in one round trip
+        dimensions = combined_scalars(db, {
+            "total_papers": db.query(func.count(func.distinct(models.PaperMaster.id))).join(
+                models.OrderItem, models.OrderItem.paper_id == models.PaperMaster.id
+            ),
+            "total_clients": db.query(func.count(func.distinct(models.ClientMaster.id))).join(
+                models.OrderMaster, models.OrderMaster.client_id == models.ClientMaster.id
+            ),
+            "first_order": db.query(func.min(models.OrderMaster.created_at)),
+            "last_order": db.query(func.max(models.OrderMaster.created_at))
+        })
+        total_papers = dimensions["total_papers"] or 0
+        total_clients = dimensions["total_clients"] or 0
+        date_range = (dimensions["first_order"], dimensions["last_order"])
         
         # Overall totals
         overall_totals = db.query(
@@ -457,7 +462,7 @@ def get_reports_summary(db: Session = Depends(get_db)):
             func.sum(models.OrderItem.quantity_kg),
             func.sum(models.OrderItem.amount),
             # Completion metrics
-            func.sum(case((models.OrderMaster.status == 'completed', 1), else_=0)),
+            count_if(models.OrderMaster.status == 'completed'),
             func.sum(models.OrderItem.quantity_fulfilled)
         ).join(
             models.OrderItem, models.OrderItem.order_id == models.OrderMaster.id
@@ -3884,11 +3889,27 @@ def get_cut_rolls_weight_update_report(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Newest first; id breaks created_at ties so keyset pages never skip or repeat rows
+CUT_ROLL_SORT_KEY = [(models.InventoryMaster.created_at, True), (models.InventoryMaster.id, True)]
+
+
+def _linked_plan_exists(plan_condition):
+    """EXISTS test for a plan linked to the roll that matches plan_condition (one row per roll)."""
+    return (
+        select(models.PlanInventoryLink.id)
+        .join(models.PlanMaster, models.PlanInventoryLink.plan_id == models.PlanMaster.id)
+        .where(models.PlanInventoryLink.inventory_id == models.InventoryMaster.id, plan_condition)
+        .exists()
+    )
+
+
 @router.get("/reports/all-cut-rolls", tags=["All Cut Rolls Report"])
-def get_all_cut_rolls_report(
+async def get_all_cut_rolls_report(
     page: int = Query(1, ge=1, description="Page number (starts from 1)"),
     page_size: int = Query(100, ge=1, le=1000, description="Items per page (max 1000)"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset paging, overrides page)"),
+    include_total: bool = Query(True, description="Count matching rows (skip for cheaper cursor paging)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     All Cut Rolls Report with Pagination
@@ -3899,149 +3920,76 @@ def get_all_cut_rolls_report(
     - Parent jumbo roll information
     - Associated plan information (plan frontend_id)
     - Paper specifications (GSM, BF, Shade)
-    - Pagination metadata (total items, total pages, current page)
+    - Pagination metadata (total items, total pages, current page, next_cursor)
     - Client-side filtering can be applied on the frontend
+
+    Pass next_cursor back as cursor to fetch the following page at constant
+    cost however deep it is; page numbers keep working without a cursor.
     """
+    return await db.run_sync(
+        _get_all_cut_rolls_report,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        include_total=include_total
+    )
+
+def _get_all_cut_rolls_report(
+    db: Session,
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    include_total: bool
+):
+    """Body of get_all_cut_rolls_report, run on the session from get_async_db"""
     try:
         # Calculate offset for pagination
         offset = (page - 1) * page_size
 
-        # Base query to get all cut rolls
-        base_query = db.query(models.InventoryMaster).options(
-            joinedload(models.InventoryMaster.paper),
-            joinedload(models.InventoryMaster.parent_118_roll).joinedload(models.InventoryMaster.parent_jumbo),
-            joinedload(models.InventoryMaster.plan_inventory).joinedload(models.PlanInventoryLink.plan),
-            joinedload(models.InventoryMaster.allocated_order).joinedload(models.OrderMaster.client)
-        ).filter(
+        # Base query projecting the report columns of all cut rolls
+        base_query = cut_roll_rows_query(db).filter(
             models.InventoryMaster.roll_type == 'cut'
         )
 
-        # Get total count for pagination
-        total_count = base_query.count()
+        # Get total count for pagination (plain count, none of the report joins)
+        total_count = db.query(func.count(models.InventoryMaster.id)).filter(
+            models.InventoryMaster.roll_type == 'cut'
+        ).scalar() if include_total else None
 
         # Get paginated results ordered by creation date (newest first)
-        cut_rolls = base_query.order_by(
-            models.InventoryMaster.created_at.desc()
-        ).offset(offset).limit(page_size).all()
+        cut_rolls, next_cursor = keyset_page(base_query, CUT_ROLL_SORT_KEY, page_size, cursor=cursor, offset=offset)
 
         # Calculate pagination metadata
-        total_pages = (total_count + page_size - 1) // page_size  # Ceiling division
-
-        # Process cut rolls data
-        cut_rolls_data = []
-        for cut_roll in cut_rolls:
-            # Get paper specifications
-            paper = cut_roll.paper
-            paper_specs = {
-                "gsm": paper.gsm if paper else 0,
-                "bf": float(paper.bf) if paper and paper.bf else 0,
-                "shade": paper.shade if paper else "Unknown",
-                "type": paper.type if paper else "Unknown"
-            }
-
-            # Get parent 11-inch roll information
-            parent_118_roll = cut_roll.parent_118_roll
-            parent_118_info = None
-            parent_jumbo_info = None
-
-            if parent_118_roll:
-                parent_118_info = {
-                    "id": str(parent_118_roll.id),
-                    "barcode_id": parent_118_roll.barcode_id or "N/A",
-                    "width_inches": float(parent_118_roll.width_inches),
-                    "weight_kg": float(parent_118_roll.weight_kg) if parent_118_roll.weight_kg else 0,
-                    "roll_sequence": parent_118_roll.roll_sequence
-                }
-
-                # Get parent jumbo roll information
-                parent_jumbo = parent_118_roll.parent_jumbo
-                if parent_jumbo:
-                    parent_jumbo_info = {
-                        "id": str(parent_jumbo.id),
-                        "barcode_id": parent_jumbo.barcode_id or "N/A",
-                        "width_inches": float(parent_jumbo.width_inches),
-                    }
-                else:
-                    # If no jumbo parent, check if 118 roll itself is a jumbo
-                    if parent_118_roll.roll_type == 'jumbo':
-                        parent_jumbo_info = {
-                            "id": str(parent_118_roll.id),
-                            "barcode_id": parent_118_roll.barcode_id or "N/A",
-                            "weight_kg": float(parent_118_roll.weight_kg) if parent_118_roll.weight_kg else 0
-                        }
-
-            # Get plan information
-            plan_info = None
-            if cut_roll.plan_inventory:
-                for plan_link in cut_roll.plan_inventory:
-                    if plan_link.plan:
-                        plan_info = {
-                            "frontend_id": plan_link.plan.frontend_id or "N/A",
-                            "status": plan_link.plan.status,
-                            "created_at": plan_link.plan.created_at.isoformat() if plan_link.plan.created_at else None
-                        }
-                        break  # Take the first plan found
-
-            # Get allocated order and client information
-            order_info = None
-            if cut_roll.allocated_order:
-                allocated_order = cut_roll.allocated_order
-                order_info = {
-                    "id": str(allocated_order.id),
-                    "frontend_id": allocated_order.frontend_id or "N/A",
-                    "client_company_name": allocated_order.client.company_name if allocated_order.client else "N/A"
-                }
-
-            # Compile cut roll data
-            cut_roll_data = {
-                "id": str(cut_roll.id),
-                "barcode_id": cut_roll.barcode_id or "N/A",
-                "width_inches": float(cut_roll.width_inches),
-                "weight_kg": float(cut_roll.weight_kg) if cut_roll.weight_kg else 0,
-                "location": cut_roll.location or "N/A",
-                "status": cut_roll.status,
-                "created_at": cut_roll.created_at.isoformat() if cut_roll.created_at else None,
-                "updated_at": cut_roll.updated_at.isoformat() if cut_roll.updated_at else None,
-                "production_date": cut_roll.production_date.isoformat() if cut_roll.production_date else None,
-                "roll_sequence": cut_roll.roll_sequence,
-                "individual_roll_number": cut_roll.individual_roll_number,
+        total_pages = (total_count + page_size - 1) // page_size if total_count is not None else None  # Ceiling division
 
-                # Related data
-                "paper_specs": paper_specs,
-                "parent_118_roll": parent_118_info,
-                "parent_jumbo_roll": parent_jumbo_info,
-                "plan_info": plan_info,
-                "allocated_order": order_info,
-
-                # Source tracking
-                "source_type": cut_roll.source_type,
-                "is_wastage_roll": cut_roll.is_wastage_roll
-            }
-
-            cut_rolls_data.append(cut_roll_data)
+        # Format cut rolls data (plan lookups batched per page)
+        cut_rolls_data = format_cut_roll_rows(db, cut_rolls, with_wastage_details=False)
 
         return {
             "success": True,
             "data": {
                 "cut_rolls": cut_rolls_data,
                 "pagination": {
-                    "current_page": page,
+                    "current_page": None if cursor else page,
                     "page_size": page_size,
                     "total_items": total_count,
                     "total_pages": total_pages,
-                    "has_next": page < total_pages,
-                    "has_previous": page > 1
+                    "has_next": next_cursor is not None,
+                    "has_previous": bool(cursor) or page > 1,
+                    "next_cursor": next_cursor
                 }
             }
         }
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in all cut rolls report: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/reports/all-cut-rolls-filtered", tags=["All Cut Rolls Report"])
-def get_all_cut_rolls_filtered_report(
+async def get_all_cut_rolls_filtered_report(
     # Filter parameters
     omni_search: Optional[str] = Query(None, description="Search across barcode, paper name, client, order, plan"),
     status_filter: Optional[str] = Query(None, description="Status filter: all, weight_updated, available, cutting, used"),
@@ -4055,7 +4003,12 @@ def get_all_cut_rolls_filtered_report(
     from_production_date: Optional[str] = Query(None, description="Production date from (ISO format UTC)"),
     to_production_date: Optional[str] = Query(None, description="Production date to (ISO format UTC)"),
 
-    db: Session = Depends(get_db)
+    # Optional keyset pagination
+    page_size: Optional[int] = Query(None, ge=1, le=1000, description="Items per page (omit for all results)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    include_total: bool = Query(True, description="Count matching rows (skip for cheaper cursor paging)"),
+
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     All Cut Rolls Report with Server-Side Filtering (No Pagination)
@@ -4081,7 +4034,46 @@ def get_all_cut_rolls_filtered_report(
     Returns:
     - ALL filtered cut rolls with related data (no pagination)
     - Total count of results
+
+    With page_size (or cursor) the results are paged by (created_at, id) and
+    next_cursor points at the following page.
     """
+    return await db.run_sync(
+        _get_all_cut_rolls_filtered_report,
+        omni_search=omni_search,
+        status_filter=status_filter,
+        paper_name=paper_name,
+        gsm=gsm,
+        width=width,
+        location=location,
+        client_name=client_name,
+        order_id=order_id,
+        plan_id=plan_id,
+        from_production_date=from_production_date,
+        to_production_date=to_production_date,
+        page_size=page_size,
+        cursor=cursor,
+        include_total=include_total
+    )
+
+def _get_all_cut_rolls_filtered_report(
+    db: Session,
+    omni_search: Optional[str],
+    status_filter: Optional[str],
+    paper_name: Optional[str],
+    gsm: Optional[int],
+    width: Optional[float],
+    location: Optional[str],
+    client_name: Optional[str],
+    order_id: Optional[str],
+    plan_id: Optional[str],
+    from_production_date: Optional[str],
+    to_production_date: Optional[str],
+    page_size: Optional[int],
+    cursor: Optional[str],
+    include_total: bool
+):
+    """Body of get_all_cut_rolls_filtered_report, run on the session from get_async_db"""
     try:
         # Check if at least one filter is applied
         # Note: omni_search, paper_name, width, location removed (now client-side)
@@ -4105,14 +4097,8 @@ def get_all_cut_rolls_filtered_report(
                 }
             }
 
-        # Base query to get all cut rolls with eager loading
-        base_query = db.query(models.InventoryMaster).options(
-            joinedload(models.InventoryMaster.paper),
-            joinedload(models.InventoryMaster.manual_client),
-            joinedload(models.InventoryMaster.parent_118_roll).joinedload(models.InventoryMaster.parent_jumbo),
-            joinedload(models.InventoryMaster.plan_inventory).joinedload(models.PlanInventoryLink.plan),
-            joinedload(models.InventoryMaster.allocated_order).joinedload(models.OrderMaster.client)
-        ).filter(
+        # Base query projecting the report columns of all cut rolls
+        base_query = cut_roll_rows_query(db).filter(
             models.InventoryMaster.roll_type == 'cut'
         )
 
@@ -4187,16 +4173,12 @@ def get_all_cut_rolls_filtered_report(
                 base_query = base_query.filter(models.OrderMaster.frontend_id == order_id)
 
         # Plan ID filter (exact match)
+        # A roll can be linked to several plans, so match with EXISTS instead of a
+        # join - a join repeats the roll per plan before the count and LIMIT/OFFSET
         if plan_id:
-            base_query = base_query.join(
-                models.PlanInventoryLink,
-                models.InventoryMaster.id == models.PlanInventoryLink.inventory_id,
-                isouter=True
-            ).join(
-                models.PlanMaster,
-                models.PlanInventoryLink.plan_id == models.PlanMaster.id,
-                isouter=True
-            ).filter(models.PlanMaster.frontend_id == plan_id)
+            base_query = base_query.filter(
+                _linked_plan_exists(models.PlanMaster.frontend_id == plan_id)
+            )
 
         # Paper name filter (partial match, case-insensitive)
         if paper_name:
@@ -4223,29 +4205,13 @@ def get_all_cut_rolls_filtered_report(
                     models.OrderMaster.client_id == models.ClientMaster.id
                 )
 
-            if not plan_id:  # Join plan if not already joined
-                base_query = base_query.outerjoin(
-                    models.PlanInventoryLink,
-                    models.InventoryMaster.id == models.PlanInventoryLink.inventory_id
-                ).outerjoin(
-                    models.PlanMaster,
-                    models.PlanInventoryLink.plan_id == models.PlanMaster.id
-                )
-
             if not any([gsm, paper_name]):  # Join paper if not already joined
                 base_query = base_query.outerjoin(
                     models.PaperMaster,
                     models.InventoryMaster.paper_id == models.PaperMaster.id
                 )
 
-            # Create parent roll alias for searching
-            Parent118 = models.InventoryMaster
-
-            base_query = base_query.outerjoin(
-                Parent118,
-                models.InventoryMaster.parent_118_roll_id == Parent118.id
-            )
-
+            # Parent 118 roll is already joined (aliased) by the report projection
             # Apply omni search filter
             base_query = base_query.filter(
                 or_(
@@ -4253,157 +4219,36 @@ def get_all_cut_rolls_filtered_report(
                     models.PaperMaster.name.ilike(search_term),
                     models.ClientMaster.company_name.ilike(search_term),
                     models.OrderMaster.frontend_id.ilike(search_term),
-                    models.PlanMaster.frontend_id.ilike(search_term),
-                    Parent118.barcode_id.ilike(search_term)
+                    _linked_plan_exists(models.PlanMaster.frontend_id.ilike(search_term)),
+                    ParentRoll.barcode_id.ilike(search_term)
                 )
             )
 
-        # Get total count
-        total_count = base_query.count()
+        # Get total count (unpaged results are counted as they are formatted)
+        total_count = base_query.count() if include_total and (page_size or cursor) else None
 
-        # Get ALL filtered results ordered by creation date (newest first)
-        # No pagination - returns all matching records
-        cut_rolls = base_query.order_by(
-            models.InventoryMaster.created_at.desc()
-        ).all()
-
-        # Process cut rolls data (same as original endpoint)
-        cut_rolls_data = []
-        for cut_roll in cut_rolls:
-            # Get paper specifications
-            paper = cut_roll.paper
-            paper_specs = {
-                "paper_name": paper.name if paper else "Unknown",
-                "gsm": paper.gsm if paper else 0,
-                "bf": float(paper.bf) if paper and paper.bf else 0,
-                "shade": paper.shade if paper else "Unknown",
-                "type": paper.type if paper else "Unknown"
-            }
-
-            # Get parent 11-inch roll information
-            parent_118_roll = cut_roll.parent_118_roll
-            parent_118_info = None
-            parent_jumbo_info = None
-
-            if parent_118_roll:
-                parent_118_info = {
-                    "id": str(parent_118_roll.id),
-                    "frontend_id": parent_118_roll.frontend_id or "N/A",
-                    "barcode_id": parent_118_roll.barcode_id or "N/A",
-                    "width_inches": float(parent_118_roll.width_inches),
-                    "weight_kg": float(parent_118_roll.weight_kg) if parent_118_roll.weight_kg else 0,
-                    "roll_sequence": parent_118_roll.roll_sequence
-                }
-
-                # Get parent jumbo roll information
-                parent_jumbo = parent_118_roll.parent_jumbo
-                if parent_jumbo:
-                    parent_jumbo_info = {
-                        "id": str(parent_jumbo.id),
-                        "frontend_id": parent_jumbo.frontend_id or "N/A",
-                        "barcode_id": parent_jumbo.barcode_id or "N/A",
-                        "width_inches": float(parent_jumbo.width_inches),
-                        "weight_kg": float(parent_jumbo.weight_kg) if parent_jumbo.weight_kg else 0
-                    }
-                else:
-                    # If no jumbo parent, check if 118 roll itself is a jumbo
-                    if parent_118_roll.roll_type == 'jumbo':
-                        parent_jumbo_info = {
-                            "id": str(parent_118_roll.id),
-                            "frontend_id": parent_118_roll.frontend_id or "N/A",
-                            "barcode_id": parent_118_roll.barcode_id or "N/A",
-                            "width_inches": float(parent_118_roll.width_inches),
-                            "weight_kg": float(parent_118_roll.weight_kg) if parent_118_roll.weight_kg else 0
-                        }
-
-            # Get plan information
-            plan_info = None
-            if cut_roll.plan_inventory:
-                for plan_link in cut_roll.plan_inventory:
-                    if plan_link.plan:
-                        plan_info = {
-                            "id": str(plan_link.plan.id),
-                            "frontend_id": plan_link.plan.frontend_id or "N/A",
-                            "name": plan_link.plan.name or "N/A",
-                            "status": plan_link.plan.status,
-                            "created_at": plan_link.plan.created_at.isoformat() if plan_link.plan.created_at else None
-                        }
-                        break  # Take the first plan found
-
-            # Get allocated order and client information
-            order_info = None
-            if cut_roll.allocated_order:
-                allocated_order = cut_roll.allocated_order
-                order_info = {
-                    "id": str(allocated_order.id),
-                    "frontend_id": allocated_order.frontend_id or "N/A",
-                    "client_company_name": allocated_order.client.company_name if allocated_order.client else "N/A"
-                }
-            
-            # New : cut roll can have client without order through manual client id
-            if cut_roll.manual_client:
-                if not order_info:
-                    order_info = {
-                        "id": None,
-                        "frontend_id": None,
-                        "client_company_name": cut_roll.manual_client.company_name
-                    }
-            wastage_details = None
-            if cut_roll.is_wastage_roll and cut_roll.qr_code:
-            # QR code format: WCR_{wastage_frontend_id}_{plan_id}
-            # Extract wastage frontend_id from QR code
-                parts = cut_roll.qr_code.split('_')
-                if len(parts) >= 2 and parts[0] == 'WCR':
-                    wastage_frontend_id = parts[1]
-
-                # Query wastage_inventory for this frontend_id
-                    wastage = db.query(models.WastageInventory).filter(
-                        models.WastageInventory.frontend_id == wastage_frontend_id
-                    ).first()
-
-                    if wastage:
-                        wastage_details = {
-                            "source": "Stock",
-                            "reel_no": wastage.reel_no or wastage.barcode_id,
-                            "wastage_barcode": wastage.barcode_id,
-                            "wastage_frontend_id": wastage.frontend_id
-                        }
-
-            # Compile cut roll data
-            cut_roll_data = {
-                "id": str(cut_roll.id),
-                "frontend_id": cut_roll.frontend_id or "N/A",
-                "barcode_id": cut_roll.barcode_id or "N/A",
-                "width_inches": float(cut_roll.width_inches),
-                "weight_kg": float(cut_roll.weight_kg) if cut_roll.weight_kg else 0,
-                "location": cut_roll.location or "N/A",
-                "status": cut_roll.status,
-                "created_at": cut_roll.created_at.isoformat() if cut_roll.created_at else None,
-                "updated_at": cut_roll.updated_at.isoformat() if cut_roll.updated_at else None,
-                "production_date": cut_roll.production_date.isoformat() if cut_roll.production_date else None,
-                "roll_sequence": cut_roll.roll_sequence,
-                "individual_roll_number": cut_roll.individual_roll_number,
-
-                # Related data
-                "paper_specs": paper_specs,
-                "parent_118_roll": parent_118_info,
-                "parent_jumbo_roll": parent_jumbo_info,
-                "plan_info": plan_info,
-                "allocated_order": order_info,
-                "wastage_details": wastage_details,
-
-                # Source tracking
-                "source_type": cut_roll.source_type,
-                "is_wastage_roll": cut_roll.is_wastage_roll
-            }
+        next_cursor = None
+        if page_size or cursor:
+            # Keyset page ordered by creation date (newest first)
+            cut_rolls, next_cursor = keyset_page(base_query, CUT_ROLL_SORT_KEY, page_size or 100, cursor=cursor)
+        else:
+            # Get ALL filtered results ordered by creation date (newest first)
+            # No pagination - returns all matching records
+            cut_rolls = base_query.order_by(
+                models.InventoryMaster.created_at.desc()
+            ).all()
 
-            cut_rolls_data.append(cut_roll_data)
+        # Format cut rolls data (plan and wastage lookups batched per page)
+        cut_rolls_data = format_cut_roll_rows(db, cut_rolls)
+        if not (page_size or cursor):
+            total_count = len(cut_rolls_data)
 
         return {
             "success": True,
             "data": {
                 "cut_rolls": cut_rolls_data,
                 "total_items": total_count,
+                "next_cursor": next_cursor,
                 "filters_applied": {
                     "omni_search": omni_search,
                     "status_filter": status_filter,
@@ -4420,6 +4265,8 @@ def get_all_cut_rolls_filtered_report(
             }
         }
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in filtered cut rolls report: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -4603,14 +4450,8 @@ def get_cut_rolls_with_stats(
                 }
             }
 
-        # Base query to get all cut rolls with eager loading
-        base_query = db.query(models.InventoryMaster).options(
-            joinedload(models.InventoryMaster.paper),
-            joinedload(models.InventoryMaster.manual_client),
-            joinedload(models.InventoryMaster.parent_118_roll).joinedload(models.InventoryMaster.parent_jumbo),
-            joinedload(models.InventoryMaster.plan_inventory).joinedload(models.PlanInventoryLink.plan),
-            joinedload(models.InventoryMaster.allocated_order).joinedload(models.OrderMaster.client)
-        ).filter(
+        # Base query projecting the report columns of all cut rolls
+        base_query = cut_roll_rows_query(db).filter(
             models.InventoryMaster.roll_type == 'cut'
         )
 
@@ -4629,13 +4470,11 @@ def get_cut_rolls_with_stats(
             except ValueError:
                 logger.warning(f"Invalid to_production_date format: {to_production_date}")
 
-        # Get total count
-        total_count = base_query.count()
-
         # Get ALL filtered results ordered by creation date (newest first)
         cut_rolls = base_query.order_by(
             models.InventoryMaster.created_at.desc()
         ).all()
+        total_count = len(cut_rolls)
 
         # Calculate statistics
         total_weight = 0
@@ -4652,138 +4491,8 @@ def get_cut_rolls_with_stats(
                 status_counts[status] = 0
             status_counts[status] += 1
 
-        # Process cut rolls data (same as original endpoint)
-        cut_rolls_data = []
-        for cut_roll in cut_rolls:
-            # Get paper specifications
-            paper = cut_roll.paper
-            paper_specs = {
-                "paper_name": paper.name if paper else "Unknown",
-                "gsm": paper.gsm if paper else 0,
-                "bf": float(paper.bf) if paper and paper.bf else 0,
-                "shade": paper.shade if paper else "Unknown",
-                "type": paper.type if paper else "Unknown"
-            }
-
-            # Get parent 11-inch roll information
-            parent_118_roll = cut_roll.parent_118_roll
-            parent_118_info = None
-            parent_jumbo_info = None
-
-            if parent_118_roll:
-                parent_118_info = {
-                    "id": str(parent_118_roll.id),
-                    "frontend_id": parent_118_roll.frontend_id or "N/A",
-                    "barcode_id": parent_118_roll.barcode_id or "N/A",
-                    "width_inches": float(parent_118_roll.width_inches),
-                    "weight_kg": float(parent_118_roll.weight_kg) if parent_118_roll.weight_kg else 0,
-                    "roll_sequence": parent_118_roll.roll_sequence
-                }
-
-                # Get parent jumbo roll information
-                parent_jumbo = parent_118_roll.parent_jumbo
-                if parent_jumbo:
-                    parent_jumbo_info = {
-                        "id": str(parent_jumbo.id),
-                        "frontend_id": parent_jumbo.frontend_id or "N/A",
-                        "barcode_id": parent_jumbo.barcode_id or "N/A",
-                        "width_inches": float(parent_jumbo.width_inches),
-                        "weight_kg": float(parent_jumbo.weight_kg) if parent_jumbo.weight_kg else 0
-                    }
-                else:
-                    # If no jumbo parent, check if 118 roll itself is a jumbo
-                    if parent_118_roll.roll_type == 'jumbo':
-                        parent_jumbo_info = {
-                            "id": str(parent_118_roll.id),
-                            "frontend_id": parent_118_roll.frontend_id or "N/A",
-                            "barcode_id": parent_118_roll.barcode_id or "N/A",
-                            "width_inches": float(parent_118_roll.width_inches),
-                            "weight_kg": float(parent_118_roll.weight_kg) if parent_118_roll.weight_kg else 0
-                        }
-
-            # Get plan information
-            plan_info = None
-            if cut_roll.plan_inventory:
-                for plan_link in cut_roll.plan_inventory:
-                    if plan_link.plan:
-                        plan_info = {
-                            "id": str(plan_link.plan.id),
-                            "frontend_id": plan_link.plan.frontend_id or "N/A",
-                            "name": plan_link.plan.name or "N/A",
-                            "status": plan_link.plan.status,
-                            "created_at": plan_link.plan.created_at.isoformat() if plan_link.plan.created_at else None
-                        }
-                        break  # Take the first plan found
-
-            # Get allocated order and client information
-            order_info = None
-            if cut_roll.allocated_order:
-                allocated_order = cut_roll.allocated_order
-                order_info = {
-                    "id": str(allocated_order.id),
-                    "frontend_id": allocated_order.frontend_id or "N/A",
-                    "client_company_name": allocated_order.client.company_name if allocated_order.client else "N/A"
-                }
-
-            # New : cut roll can have client without order through manual client id
-            if cut_roll.manual_client:
-                if not order_info:
-                    order_info = {
-                        "id": None,
-                        "frontend_id": None,
-                        "client_company_name": cut_roll.manual_client.company_name
-                    }
-
-            wastage_details = None
-            if cut_roll.is_wastage_roll and cut_roll.qr_code:
-                # QR code format: WCR_{wastage_frontend_id}_{plan_id}
-                # Extract wastage frontend_id from QR code
-                parts = cut_roll.qr_code.split('_')
-                if len(parts) >= 2 and parts[0] == 'WCR':
-                    wastage_frontend_id = parts[1]
-
-                    # Query wastage_inventory for this frontend_id
-                    wastage = db.query(models.WastageInventory).filter(
-                        models.WastageInventory.frontend_id == wastage_frontend_id
-                    ).first()
-
-                    if wastage:
-                        wastage_details = {
-                            "source": "Stock",
-                            "reel_no": wastage.reel_no or wastage.barcode_id,
-                            "wastage_barcode": wastage.barcode_id,
-                            "wastage_frontend_id": wastage.frontend_id
-                        }
-
-            # Compile cut roll data
-            cut_roll_data = {
-                "id": str(cut_roll.id),
-                "frontend_id": cut_roll.frontend_id or "N/A",
-                "barcode_id": cut_roll.barcode_id or "N/A",
-                "width_inches": float(cut_roll.width_inches),
-                "weight_kg": float(cut_roll.weight_kg) if cut_roll.weight_kg else 0,
-                "location": cut_roll.location or "N/A",
-                "status": cut_roll.status,
-                "created_at": cut_roll.created_at.isoformat() if cut_roll.created_at else None,
-                "updated_at": cut_roll.updated_at.isoformat() if cut_roll.updated_at else None,
-                "production_date": cut_roll.production_date.isoformat() if cut_roll.production_date else None,
-                "roll_sequence": cut_roll.roll_sequence,
-                "individual_roll_number": cut_roll.individual_roll_number,
-
-                # Related data
-                "paper_specs": paper_specs,
-                "parent_118_roll": parent_118_info,
-                "parent_jumbo_roll": parent_jumbo_info,
-                "plan_info": plan_info,
-                "allocated_order": order_info,
-                "wastage_details": wastage_details,
-
-                # Source tracking
-                "source_type": cut_roll.source_type,
-                "is_wastage_roll": cut_roll.is_wastage_roll
-            }
-
-            cut_rolls_data.append(cut_roll_data)
+        # Format cut rolls data (plan and wastage lookups batched per page)
+        cut_rolls_data = format_cut_roll_rows(db, cut_rolls)
 
         return {
             "success": True,
@@ -7,6 +7,9 @@ import logging
 
 from .base import get_db
 from .. import models, schemas
+from ..services import roll_hierarchy
+from ..services.batch_lookup import load_by_keys
+from ..services.roll_hierarchy import RollTree
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -91,20 +94,17 @@ def track_roll_comprehensive(
             }
         }
 
-        # Load parent relationships separately
-        if inventory_item.parent_jumbo_id:
-            parent_jumbo = db.query(models.InventoryMaster).filter(
-                models.InventoryMaster.id == inventory_item.parent_jumbo_id
-            ).first()
-            if parent_jumbo:
-                result["production_info"]["jumbo_hierarchy"]["parent_jumbo_frontend_id"] = parent_jumbo.frontend_id
+        # Parents and siblings come from the roll's hierarchy, loaded in one recursive query
+        has_parent = inventory_item.parent_jumbo_id or inventory_item.parent_118_roll_id
+        family = roll_hierarchy.load_family(db, inventory_item.id) if has_parent else RollTree([])
 
-        if inventory_item.parent_118_roll_id:
-            parent_118 = db.query(models.InventoryMaster).filter(
-                models.InventoryMaster.id == inventory_item.parent_118_roll_id
-            ).first()
-            if parent_118:
-                result["production_info"]["jumbo_hierarchy"]["parent_118_roll_frontend_id"] = parent_118.frontend_id
+        parent_jumbo = family.get(inventory_item.parent_jumbo_id)
+        if parent_jumbo:
+            result["production_info"]["jumbo_hierarchy"]["parent_jumbo_frontend_id"] = parent_jumbo.frontend_id
+
+        parent_118 = family.get(inventory_item.parent_118_roll_id)
+        if parent_118:
+            result["production_info"]["jumbo_hierarchy"]["parent_118_roll_frontend_id"] = parent_118.frontend_id
 
         # Weight tracking information
         result["weight_info"] = {
@@ -271,12 +271,10 @@ def track_roll_comprehensive(
 
         # Find sibling rolls from same parent
         if inventory_item.parent_jumbo_id:
-            sibling_rolls = db.query(models.InventoryMaster).options(
-                joinedload(models.InventoryMaster.paper)
-            ).filter(
-                models.InventoryMaster.parent_jumbo_id == inventory_item.parent_jumbo_id,
-                models.InventoryMaster.id != inventory_item.id
-            ).all()
+            sibling_rolls = [
+                roll for roll in family.with_parent_jumbo(inventory_item.parent_jumbo_id)
+                if roll.id != inventory_item.id
+            ]
 
             for sibling in sibling_rolls[:5]:  # Limit to 5 related rolls
                 related_rolls.append({
@@ -405,6 +403,17 @@ def search_rolls_by_specifications(
 
         logger.info(f"🔍 Found {len(rolls)} rolls matching specifications")
 
+        # Allocated orders and plan links of all found rolls, one query each
+        orders_by_id = load_by_keys(
+            db, models.OrderMaster, models.OrderMaster.id,
+            [roll.allocated_to_order_id for roll in rolls]
+        )
+        plan_links_by_roll = load_by_keys(
+            db, models.PlanInventoryLink, models.PlanInventoryLink.inventory_id,
+            [roll.id for roll in rolls],
+            options=[joinedload(models.PlanInventoryLink.plan)]
+        )
+
         results = []
         for roll in rolls:
             # Calculate width difference for display
@@ -413,9 +422,7 @@ def search_rolls_by_specifications(
             # Get order information
             order_info = None
             if roll.allocated_to_order_id:
-                order = db.query(models.OrderMaster).filter(
-                    models.OrderMaster.id == roll.allocated_to_order_id
-                ).first()
+                order = orders_by_id.get(roll.allocated_to_order_id)
                 if order:
                     order_info = {
                         "order_id": str(order.id),
@@ -425,11 +432,7 @@ def search_rolls_by_specifications(
 
             # Get plan information
             plan_info = None
-            plan_link = db.query(models.PlanInventoryLink).options(
-                joinedload(models.PlanInventoryLink.plan)
-            ).filter(
-                models.PlanInventoryLink.inventory_id == roll.id
-            ).first()
+            plan_link = plan_links_by_roll.get(roll.id)
             if plan_link and plan_link.plan:
                 plan = plan_link.plan
                 plan_info = {
@@ -681,18 +684,21 @@ def track_roll_hierarchy(
             } if inventory_item.paper else None
         }
 
-        # Build hierarchy based on roll type
+        # Build hierarchy based on roll type (whole tree loaded in one recursive query)
         if inventory_item.roll_type == "jumbo":
             # Searched item is a JUMBO ROLL
-            result["hierarchy"] = build_jumbo_hierarchy(db, inventory_item)
+            tree = roll_hierarchy.load_subtree(db, [inventory_item.id])
+            result["hierarchy"] = build_jumbo_hierarchy(db, inventory_item, tree)
 
         elif inventory_item.roll_type == "118":
             # Searched item is a 118" / SET ROLL
-            result["hierarchy"] = build_set_hierarchy(db, inventory_item)
+            tree = roll_hierarchy.load_family(db, inventory_item.id)
+            result["hierarchy"] = build_set_hierarchy(db, inventory_item, tree)
 
         elif inventory_item.roll_type == "cut":
             # Searched item is a CUT ROLL
-            result["hierarchy"] = build_cut_roll_hierarchy(db, inventory_item)
+            tree = roll_hierarchy.load_family(db, inventory_item.id)
+            result["hierarchy"] = build_cut_roll_hierarchy(db, inventory_item, tree)
 
         else:
             # Unknown roll type, return basic info
@@ -709,8 +715,9 @@ def track_roll_hierarchy(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def build_jumbo_hierarchy(db: Session, jumbo_roll: models.InventoryMaster) -> Dict[str, Any]:
+def build_jumbo_hierarchy(db: Session, jumbo_roll: models.InventoryMaster, tree: Optional[RollTree] = None) -> Dict[str, Any]:
     """Build hierarchy starting from a Jumbo Roll"""
+    tree = tree or roll_hierarchy.load_subtree(db, [jumbo_roll.id])
     hierarchy = {
         "jumbo_roll": {
             "id": str(jumbo_roll.id),
@@ -731,43 +738,14 @@ def build_jumbo_hierarchy(db: Session, jumbo_roll: models.InventoryMaster) -> Di
         "total_cut_rolls": 0
     }
 
-    # Get all 118" rolls from this jumbo
-    set_rolls = db.query(models.InventoryMaster).options(
-        joinedload(models.InventoryMaster.paper)
-    ).filter(
-        models.InventoryMaster.parent_jumbo_id == jumbo_roll.id,
-        models.InventoryMaster.roll_type == "118"
-    ).order_by(models.InventoryMaster.individual_roll_number).all()
+    # All 118" rolls from this jumbo
+    set_rolls = tree.sets_of(jumbo_roll.id)
 
     total_cut_rolls = 0
 
     for set_roll in set_rolls:
-        # Get all cut rolls from this SET
-        cut_rolls = db.query(models.InventoryMaster).options(
-            joinedload(models.InventoryMaster.paper)
-        ).filter(
-            models.InventoryMaster.parent_118_roll_id == set_roll.id,
-            models.InventoryMaster.roll_type == "cut"
-        ).order_by(models.InventoryMaster.width_inches).all()
-
-        cut_rolls_data = []
-        for cut_roll in cut_rolls:
-            cut_rolls_data.append({
-                "id": str(cut_roll.id),
-                "barcode_id": cut_roll.barcode_id,
-                "width_inches": float(cut_roll.width_inches),
-                "weight_kg": float(cut_roll.weight_kg),
-                "status": cut_roll.status,
-                "location": cut_roll.location,
-                "is_wastage_roll": cut_roll.is_wastage_roll,
-                "created_at": cut_roll.created_at.isoformat(),
-                "paper_specs": {
-                    "name": cut_roll.paper.name,
-                    "gsm": cut_roll.paper.gsm,
-                    "bf": float(cut_roll.paper.bf),
-                    "shade": cut_roll.paper.shade
-                } if cut_roll.paper else None
-            })
+        # All cut rolls from this SET
+        cut_rolls_data = [format_hierarchy_cut_roll(cut_roll) for cut_roll in tree.cuts_of(set_roll.id)]
 
         total_cut_rolls += len(cut_rolls_data)
 
@@ -791,8 +769,9 @@ def build_jumbo_hierarchy(db: Session, jumbo_roll: models.InventoryMaster) -> Di
     return hierarchy
 
 
-def build_set_hierarchy(db: Session, set_roll: models.InventoryMaster) -> Dict[str, Any]:
+def build_set_hierarchy(db: Session, set_roll: models.InventoryMaster, tree: Optional[RollTree] = None) -> Dict[str, Any]:
     """Build hierarchy starting from a 118" / SET Roll"""
+    tree = tree or roll_hierarchy.load_family(db, set_roll.id)
     hierarchy = {
         "parent_jumbo_roll": None,
         "current_set_roll": {
@@ -816,74 +795,42 @@ def build_set_hierarchy(db: Session, set_roll: models.InventoryMaster) -> Dict[s
         "sibling_sets": []
     }
 
-    # Get parent jumbo roll
-    if set_roll.parent_jumbo_id:
-        parent_jumbo = db.query(models.InventoryMaster).options(
-            joinedload(models.InventoryMaster.paper)
-        ).filter(
-            models.InventoryMaster.id == set_roll.parent_jumbo_id
-        ).first()
-
-        if parent_jumbo:
-            hierarchy["parent_jumbo_roll"] = {
-                "id": str(parent_jumbo.id),
-                "barcode_id": parent_jumbo.barcode_id,
-                "frontend_id": parent_jumbo.frontend_id,
-                "width_inches": float(parent_jumbo.width_inches),
-                "weight_kg": float(parent_jumbo.weight_kg),
-                "status": parent_jumbo.status,
-                "location": parent_jumbo.location
-            }
-
-            # Get sibling SET rolls from the same jumbo
-            sibling_sets = db.query(models.InventoryMaster).filter(
-                models.InventoryMaster.parent_jumbo_id == parent_jumbo.id,
-                models.InventoryMaster.roll_type == "118",
-                models.InventoryMaster.id != set_roll.id
-            ).order_by(models.InventoryMaster.individual_roll_number).all()
-
-            for sibling in sibling_sets:
-                hierarchy["sibling_sets"].append({
-                    "id": str(sibling.id),
-                    "barcode_id": sibling.barcode_id,
-                    "individual_roll_number": sibling.individual_roll_number,
-                    "roll_sequence": sibling.roll_sequence,
-                    "status": sibling.status
-                })
-
-    # Get all cut rolls from this SET
-    cut_rolls = db.query(models.InventoryMaster).options(
-        joinedload(models.InventoryMaster.paper)
-    ).filter(
-        models.InventoryMaster.parent_118_roll_id == set_roll.id,
-        models.InventoryMaster.roll_type == "cut"
-    ).order_by(models.InventoryMaster.width_inches).all()
+    # Parent jumbo roll
+    parent_jumbo = tree.get(set_roll.parent_jumbo_id)
+    if parent_jumbo:
+        hierarchy["parent_jumbo_roll"] = {
+            "id": str(parent_jumbo.id),
+            "barcode_id": parent_jumbo.barcode_id,
+            "frontend_id": parent_jumbo.frontend_id,
+            "width_inches": float(parent_jumbo.width_inches),
+            "weight_kg": float(parent_jumbo.weight_kg),
+            "status": parent_jumbo.status,
+            "location": parent_jumbo.location
+        }
 
-    for cut_roll in cut_rolls:
-        hierarchy["cut_rolls_from_this_set"].append({
-            "id": str(cut_roll.id),
-            "barcode_id": cut_roll.barcode_id,
-            "width_inches": float(cut_roll.width_inches),
-            "weight_kg": float(cut_roll.weight_kg),
-            "status": cut_roll.status,
-            "location": cut_roll.location,
-            "is_wastage_roll": cut_roll.is_wastage_roll,
-            "created_at": cut_roll.created_at.isoformat(),
-            "paper_specs": {
-                "name": cut_roll.paper.name,
-                "gsm": cut_roll.paper.gsm,
-                "bf": float(cut_roll.paper.bf),
-                "shade": cut_roll.paper.shade
-            } if cut_roll.paper else None
-        })
+        # Sibling SET rolls from the same jumbo
+        for sibling in tree.sets_of(parent_jumbo.id):
+            if sibling.id == set_roll.id:
+                continue
+            hierarchy["sibling_sets"].append({
+                "id": str(sibling.id),
+                "barcode_id": sibling.barcode_id,
+                "individual_roll_number": sibling.individual_roll_number,
+                "roll_sequence": sibling.roll_sequence,
+                "status": sibling.status
+            })
 
+    # All cut rolls from this SET
+    cut_rolls = tree.cuts_of(set_roll.id)
+    hierarchy["cut_rolls_from_this_set"] = [format_hierarchy_cut_roll(cut_roll) for cut_roll in cut_rolls]
     hierarchy["total_cut_rolls"] = len(cut_rolls)
 
     return hierarchy
 
 
-def build_cut_roll_hierarchy(db: Session, cut_roll: models.InventoryMaster) -> Dict[str, Any]:
+def build_cut_roll_hierarchy(db: Session, cut_roll: models.InventoryMaster, tree: Optional[RollTree] = None) -> Dict[str, Any]:
     """Build hierarchy starting from a Cut Roll"""
+    tree = tree or roll_hierarchy.load_family(db, cut_roll.id)
     hierarchy = {
         "parent_jumbo_roll": None,
         "parent_set_roll": None,
@@ -907,75 +854,70 @@ def build_cut_roll_hierarchy(db: Session, cut_roll: models.InventoryMaster) -> D
         "all_sets_from_jumbo": []
     }
 
-    # Get parent SET roll
-    if cut_roll.parent_118_roll_id:
-        parent_set = db.query(models.InventoryMaster).filter(
-            models.InventoryMaster.id == cut_roll.parent_118_roll_id
-        ).first()
+    # Parent SET roll
+    parent_set = tree.parent_set(cut_roll)
+    if parent_set:
+        hierarchy["parent_set_roll"] = {
+            "id": str(parent_set.id),
+            "barcode_id": parent_set.barcode_id,
+            "individual_roll_number": parent_set.individual_roll_number,
+            "roll_sequence": parent_set.roll_sequence,
+            "status": parent_set.status
+        }
 
-        if parent_set:
-            hierarchy["parent_set_roll"] = {
-                "id": str(parent_set.id),
-                "barcode_id": parent_set.barcode_id,
-                "individual_roll_number": parent_set.individual_roll_number,
-                "roll_sequence": parent_set.roll_sequence,
-                "status": parent_set.status
+        # Sibling cut rolls from the same SET
+        for sibling in tree.cuts_of(parent_set.id):
+            if sibling.id == cut_roll.id:
+                continue
+            hierarchy["sibling_cut_rolls"].append({
+                "id": str(sibling.id),
+                "barcode_id": sibling.barcode_id,
+                "width_inches": float(sibling.width_inches),
+                "weight_kg": float(sibling.weight_kg),
+                "status": sibling.status,
+                "is_wastage_roll": sibling.is_wastage_roll
+            })
+
+        # Parent jumbo roll
+        parent_jumbo = tree.get(parent_set.parent_jumbo_id)
+        if parent_jumbo:
+            hierarchy["parent_jumbo_roll"] = {
+                "id": str(parent_jumbo.id),
+                "barcode_id": parent_jumbo.barcode_id,
+                "frontend_id": parent_jumbo.frontend_id,
+                "status": parent_jumbo.status
             }
 
-            # Get sibling cut rolls from the same SET
-            sibling_cuts = db.query(models.InventoryMaster).options(
-                joinedload(models.InventoryMaster.paper)
-            ).filter(
-                models.InventoryMaster.parent_118_roll_id == parent_set.id,
-                models.InventoryMaster.roll_type == "cut",
-                models.InventoryMaster.id != cut_roll.id
-            ).order_by(models.InventoryMaster.width_inches).all()
-
-            for sibling in sibling_cuts:
-                hierarchy["sibling_cut_rolls"].append({
-                    "id": str(sibling.id),
-                    "barcode_id": sibling.barcode_id,
-                    "width_inches": float(sibling.width_inches),
-                    "weight_kg": float(sibling.weight_kg),
-                    "status": sibling.status,
-                    "is_wastage_roll": sibling.is_wastage_roll
+            # All SET rolls from this jumbo with their cut roll counts
+            for set_roll in tree.sets_of(parent_jumbo.id):
+                hierarchy["all_sets_from_jumbo"].append({
+                    "id": str(set_roll.id),
+                    "barcode_id": set_roll.barcode_id,
+                    "individual_roll_number": set_roll.individual_roll_number,
+                    "roll_sequence": set_roll.roll_sequence,
+                    "status": set_roll.status,
+                    "cut_rolls_count": len(tree.cuts_of(set_roll.id)),
+                    "is_current_parent": set_roll.id == parent_set.id
                 })
 
-            # Get parent jumbo roll
-            if parent_set.parent_jumbo_id:
-                parent_jumbo = db.query(models.InventoryMaster).filter(
-                    models.InventoryMaster.id == parent_set.parent_jumbo_id
-                ).first()
-
-                if parent_jumbo:
-                    hierarchy["parent_jumbo_roll"] = {
-                        "id": str(parent_jumbo.id),
-                        "barcode_id": parent_jumbo.barcode_id,
-                        "frontend_id": parent_jumbo.frontend_id,
-                        "status": parent_jumbo.status
-                    }
+    return hierarchy
+
 
-                    # Get all SET rolls from this jumbo
-                    all_sets = db.query(models.InventoryMaster).filter(
-                        models.InventoryMaster.parent_jumbo_id == parent_jumbo.id,
-                        models.InventoryMaster.roll_type == "118"
-                    ).order_by(models.InventoryMaster.individual_roll_number).all()
-
-                    for set_roll in all_sets:
-                        # Count cut rolls in each SET
-                        cut_count = db.query(func.count(models.InventoryMaster.id)).filter(
-                            models.InventoryMaster.parent_118_roll_id == set_roll.id,
-                            models.InventoryMaster.roll_type == "cut"
-                        ).scalar()
-
-                        hierarchy["all_sets_from_jumbo"].append({
-                            "id": str(set_roll.id),
-                            "barcode_id": set_roll.barcode_id,
-                            "individual_roll_number": set_roll.individual_roll_number,
-                            "roll_sequence": set_roll.roll_sequence,
-                            "status": set_roll.status,
-                            "cut_rolls_count": cut_count,
-                            "is_current_parent": set_roll.id == parent_set.id
-                        })
-
-    return hierarchy
\ No newline at end of file
+def format_hierarchy_cut_roll(cut_roll: models.InventoryMaster) -> Dict[str, Any]:
+    """Cut roll entry of a jumbo / SET hierarchy"""
+    return {
+        "id": str(cut_roll.id),
+        "barcode_id": cut_roll.barcode_id,
+        "width_inches": float(cut_roll.width_inches),
+        "weight_kg": float(cut_roll.weight_kg),
+        "status": cut_roll.status,
+        "location": cut_roll.location,
+        "is_wastage_roll": cut_roll.is_wastage_roll,
+        "created_at": cut_roll.created_at.isoformat(),
+        "paper_specs": {
+            "name": cut_roll.paper.name,
+            "gsm": cut_roll.paper.gsm,
+            "bf": float(cut_roll.paper.bf),
+            "shade": cut_roll.paper.shade
+        } if cut_roll.paper else None
+    }
@@ -8,6 +8,7 @@ import logging
 from ..database import get_db
 from .. import models, schemas
 from ..services.barcode_generator import BarcodeGenerator
+from ..services.keyset_pagination import InvalidCursorError, keyset_page
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -20,6 +21,8 @@ def get_wastage_inventory(
     per_page: int = Query(20, ge=1, le=1000, description="Items per page"),
     search: Optional[str] = Query(None, description="Search by frontend_id, barcode_id, or paper specs"),
     status: Optional[str] = Query(None, description="Filter by status"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset paging, overrides page)"),
+    include_total: bool = Query(True, description="Count matching rows (skip for cheaper cursor paging)"),
     db: Session = Depends(get_db)
 ):
     """Get paginated list of wastage inventory items"""
@@ -42,22 +45,31 @@ def get_wastage_inventory(
             query = query.filter(models.WastageInventory.status == status)
         
         # Get total count
-        total = query.count()
+        total = query.count() if include_total else None
         
-        # Apply pagination and ordering
-        items = query.order_by(models.WastageInventory.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+        # Apply pagination and ordering (newest first, id breaks ties)
+        items, next_cursor = keyset_page(
+            query,
+            [(models.WastageInventory.created_at, True), (models.WastageInventory.id, True)],
+            per_page,
+            cursor=cursor,
+            offset=(page - 1) * per_page
+        )
         
         # Calculate pagination info
-        total_pages = (total + per_page - 1) // per_page
+        total_pages = (total + per_page - 1) // per_page if total is not None else None
         
         return {
             "items": items,
             "total": total,
-            "page": page,
+            "page": None if cursor else page,
             "per_page": per_page,
-            "total_pages": total_pages
+            "total_pages": total_pages,
+            "next_cursor": next_cursor
         }
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting wastage inventory: {e}")
         raise HTTPException(status_code=500, detail=str(e))
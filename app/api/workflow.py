@@ -4,6 +4,7 @@ from typing import List, Dict, Any
 import logging
 
 from .base import get_db
+from ..concurrency import run_in_optimizer_pool
 from .. import crud_operations, schemas
 from ..services.workflow_manager import WorkflowManager
 
@@ -29,11 +30,16 @@ def create_cutting_plan(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/workflow/generate-plan", response_model=schemas.WorkflowResult, tags=["Workflow Management"])
-def generate_cutting_plan_from_workflow(
+async def generate_cutting_plan_from_workflow(
     request_data: Dict[str, Any],
     db: Session = Depends(get_db)
 ):
     """Generate cutting plan using workflow manager"""
+    # Long solve: runs on the optimizer thread pool, not the request one
+    return await run_in_optimizer_pool(_generate_cutting_plan_from_workflow, request_data, db)
+
+def _generate_cutting_plan_from_workflow(request_data: Dict[str, Any], db: Session):
+    """Blocking part of generate_cutting_plan_from_workflow"""
     try:
         workflow = WorkflowManager(db=db, user_id=request_data.get("user_id"))
         return workflow.generate_plan_from_orders(request_data)
@@ -44,11 +50,16 @@ def generate_cutting_plan_from_workflow(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/workflow/process-orders", tags=["Workflow Management"])
-def process_multiple_orders(
+async def process_multiple_orders(
     request_data: Dict[str, Any],
     db: Session = Depends(get_db)
 ):
     """NEW FLOW: Process multiple orders with 3-input optimization"""
+    # Long solve: runs on the optimizer thread pool, not the request one
+    return await run_in_optimizer_pool(_process_multiple_orders, request_data, db)
+
+def _process_multiple_orders(request_data: Dict[str, Any], db: Session):
+    """Blocking part of process_multiple_orders"""
     try:
         import uuid
         order_ids = [uuid.UUID(id_str) for id_str in request_data.get("order_ids", [])]
@@ -72,11 +83,16 @@ def process_multiple_orders(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/workflow/gsm-wise-process", tags=["GSM-Wise Planning"])
-def gsm_wise_process(
+async def gsm_wise_process(
     request_data: Dict[str, Any],
     db: Session = Depends(get_db)
 ):
     """GSM-Wise Planning: accepts paper_spec_ids, resolves matching created orders, runs optimizer."""
+    # Long solve: runs on the optimizer thread pool, not the request one
+    return await run_in_optimizer_pool(_gsm_wise_process, request_data, db)
+
+def _gsm_wise_process(request_data: Dict[str, Any], db: Session):
+    """Blocking part of gsm_wise_process"""
     try:
         import uuid
         from .. import models
@@ -0,0 +1,209 @@
+"""
+Concurrency - Bounded thread pool for blocking work and event loop lag reporting
+
+Database work in this app is synchronous SQLAlchemy and runs on the anyio
+worker thread pool: FastAPI runs plain `def` endpoints there, and async
+endpoints hand their session work to it (starlette's run_in_threadpool, or
+run_sync on the session from database.get_async_db while the optional async
+engine is off). Blocking calls left on the event loop stall every request on
+the uvicorn worker.
+
+Optimizer solves (CP-SAT / ILP plan generation, roll suggestions) and the NDJSON
+streams that iterate them hold a thread for seconds to minutes, so they run on
+a separate limiter of OPTIMIZER_THREADPOOL_SIZE threads (run_in_optimizer_pool,
+iterate_in_optimizer_pool). A burst of plan runs then waits for an optimizer
+thread instead of taking every thread from the scan and weight endpoints.
+
+The default pool is capped at DB_THREADPOOL_SIZE (default: connection pool size
++ overflow - DB_CONNECTION_HEADROOM - OPTIMIZER_THREADPOOL_SIZE), so both pools
+together never hold more connections than the headroom leaves, and excess
+requests wait for a free thread rather than for a connection. A few paths check out a second connection while
+their thread holds one (the SQL tier of OptimizationResultCache writes in its
+own short session so it never commits the caller's work); the headroom keeps
+connections free for them, so those checkouts cannot deadlock with every
+connection held by a thread waiting for another one. Other short-lived users
+(the pattern index background build, startup) share the same headroom.
+
+EventLoopLagMonitor samples how late the loop wakes up from a short sleep and
+logs a warning when a blocking call holds it longer than EVENT_LOOP_LAG_WARN_MS.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import functools
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, TypeVar
+
+import anyio
+import anyio.to_thread
+
+from .database import DB_POOL_SIZE, DB_MAX_OVERFLOW
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DB_CONNECTION_HEADROOM = int(os.getenv("DB_CONNECTION_HEADROOM", "2"))  # connections not given a worker thread
+OPTIMIZER_THREADPOOL_SIZE = int(os.getenv("OPTIMIZER_THREADPOOL_SIZE", "2"))
+DB_THREADPOOL_SIZE = int(os.getenv(
+    "DB_THREADPOOL_SIZE",
+    str(max(1, DB_POOL_SIZE + DB_MAX_OVERFLOW - DB_CONNECTION_HEADROOM - OPTIMIZER_THREADPOOL_SIZE))
+))
+EVENT_LOOP_LAG_INTERVAL = float(os.getenv("EVENT_LOOP_LAG_INTERVAL", "0.5"))  # seconds between samples
+EVENT_LOOP_LAG_WARN_MS = float(os.getenv("EVENT_LOOP_LAG_WARN_MS", "200"))
+EVENT_LOOP_LAG_REPORT_INTERVAL = float(os.getenv("EVENT_LOOP_LAG_REPORT_INTERVAL", "300"))  # seconds
+
+
+# Limiter for optimizer solves and streams; created on the event loop (anyio 3 needs a running loop)
+_optimizer_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+def configure_threadpool(size: int = DB_THREADPOOL_SIZE, optimizer_size: int = OPTIMIZER_THREADPOOL_SIZE) -> None:
+    """Cap the worker thread pools used by sync endpoints and the optimizer (call on the event loop)."""
+    global _optimizer_limiter
+    anyio.to_thread.current_default_thread_limiter().total_tokens = size
+    if _optimizer_limiter is None:
+        _optimizer_limiter = anyio.CapacityLimiter(optimizer_size)
+    else:
+        _optimizer_limiter.total_tokens = optimizer_size
+    logger.info(
+        f"🧵 THREADPOOL: {size} worker threads + {optimizer_size} optimizer threads "
+        f"(DB pool {DB_POOL_SIZE} + overflow {DB_MAX_OVERFLOW}, {DB_CONNECTION_HEADROOM} kept for second checkouts)"
+    )
+    if size + optimizer_size > DB_POOL_SIZE + DB_MAX_OVERFLOW - DB_CONNECTION_HEADROOM:
+        logger.warning(
+            "⚠️ THREADPOOL: More worker threads than connections left after the headroom - "
+            "threads may wait on a connection checkout"
+        )
+
+
+def _get_optimizer_limiter() -> anyio.CapacityLimiter:
+    global _optimizer_limiter
+    if _optimizer_limiter is None:  # configure_threadpool not called (e.g. app without the startup hook)
+        _optimizer_limiter = anyio.CapacityLimiter(OPTIMIZER_THREADPOOL_SIZE)
+    return _optimizer_limiter
+
+
+async def run_in_optimizer_pool(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """run_in_threadpool on the optimizer limiter, for long solves."""
+    return await anyio.to_thread.run_sync(functools.partial(func, *args, **kwargs), limiter=_get_optimizer_limiter())
+
+
+_STOP = object()
+
+
+async def iterate_in_optimizer_pool(iterator: Iterator[T]) -> AsyncIterator[T]:
+    """iterate_in_threadpool on the optimizer limiter, for NDJSON streams of solver output."""
+    limiter = _get_optimizer_limiter()
+    while True:
+        item = await anyio.to_thread.run_sync(next, iterator, _STOP, limiter=limiter)
+        if item is _STOP:
+            break
+        yield item
+
+
+def threadpool_stats() -> Dict[str, Any]:
+    """Current use of the worker and optimizer thread pools."""
+    statistics = anyio.to_thread.current_default_thread_limiter().statistics()
+    optimizer = _get_optimizer_limiter().statistics()
+    return {
+        "size": statistics.total_tokens,
+        "busy": statistics.borrowed_tokens,
+        "waiting": statistics.tasks_waiting,
+        "optimizer": {
+            "size": optimizer.total_tokens,
+            "busy": optimizer.borrowed_tokens,
+            "waiting": optimizer.tasks_waiting
+        }
+    }
+
+
+class EventLoopLagMonitor:
+    """Measures event loop responsiveness by timing a periodic sleep."""
+
+    def __init__(
+        self,
+        interval: float = EVENT_LOOP_LAG_INTERVAL,
+        warn_ms: float = EVENT_LOOP_LAG_WARN_MS,
+        report_interval: float = EVENT_LOOP_LAG_REPORT_INTERVAL
+    ):
+        self.interval = interval
+        self.warn_ms = warn_ms
+        self.report_interval = report_interval
+        self._task: Optional[asyncio.Task] = None
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self.window_started = time.monotonic()
+        self.window_samples = 0
+        self.window_total_ms = 0.0
+        self.window_max_ms = 0.0
+        self.window_slow = 0
+
+    def start(self) -> None:
+        """Start sampling on the running event loop (no-op if already running)."""
+        if self._task and not self._task.done():
+            return
+        self._reset_window()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"⏱️ EVENT LOOP LAG: Monitoring every {self.interval}s, warning above {self.warn_ms}ms")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record((loop.time() - started - self.interval) * 1000)
+
+    def record(self, lag_ms: float) -> None:
+        lag_ms = max(lag_ms, 0.0)
+        self.last_ms = lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+        self.window_samples += 1
+        self.window_total_ms += lag_ms
+        self.window_max_ms = max(self.window_max_ms, lag_ms)
+
+        if lag_ms > self.warn_ms:
+            self.window_slow += 1
+            logger.warning(
+                f"⚠️ EVENT LOOP LAG: Loop blocked for {lag_ms:.0f}ms "
+                f"(threadpool {threadpool_stats()}) - blocking work in an async endpoint?"
+            )
+
+        if time.monotonic() - self.window_started >= self.report_interval:
+            stats = self.stats()
+            logger.info(
+                f"⏱️ EVENT LOOP LAG: avg {stats['window_avg_ms']}ms, max {stats['window_max_ms']}ms, "
+                f"{stats['window_slow_samples']}/{stats['window_samples']} samples above {self.warn_ms}ms"
+            )
+            self._reset_window()
+
+    def stats(self) -> Dict[str, Any]:
+        """Lag figures for the current report window and since startup."""
+        return {
+            "running": bool(self._task and not self._task.done()),
+            "last_ms": round(self.last_ms, 1),
+            "max_ms": round(self.max_ms, 1),
+            "window_seconds": round(time.monotonic() - self.window_started),
+            "window_samples": self.window_samples,
+            "window_avg_ms": round(self.window_total_ms / self.window_samples, 1) if self.window_samples else 0.0,
+            "window_max_ms": round(self.window_max_ms, 1),
+            "window_slow_samples": self.window_slow,
+            "warn_ms": self.warn_ms
+        }
+
+
+# Shared process-wide instance
+loop_lag_monitor = EventLoopLagMonitor()
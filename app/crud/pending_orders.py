@@ -1126,17 +1126,31 @@ def start_production_from_pending_orders_impl(db: Session, *, request_data) -> D
         else:
             logger.warning(f"📦 SKIPPED: Cut roll {i+1} has no individual_roll_number")
             
+    # Paper records per (gsm, bf, shade), shared by the hierarchy and cut roll loops
+    paper_records = {}
+    for gsm, bf, shade in list(paper_spec_groups) + [(c.get("gsm"), c.get("bf"), c.get("shade")) for c in selected_cut_rolls_dict]:
+        if (gsm, bf, shade) not in paper_records:
+            paper_records[(gsm, bf, shade)] = db.query(models.PaperMaster).filter(
+                models.PaperMaster.gsm == gsm,
+                models.PaperMaster.bf == bf,
+                models.PaperMaster.shade == shade
+            ).first()
+
+    # Reserve barcodes and frontend IDs for the whole hierarchy in one block per sequence
+    jumbo_total = sum((len(rolls) + 2) // 3 for spec_key, rolls in paper_spec_groups.items() if paper_records[spec_key])
+    roll_118_total = sum(len(rolls) for spec_key, rolls in paper_spec_groups.items() if paper_records[spec_key])
+    cut_total = sum(1 for c in selected_cut_rolls_dict if paper_records[(c.get("gsm"), c.get("bf"), c.get("shade"))])
+    jumbo_barcodes = iter(BarcodeGenerator.reserve_barcodes(db, "jumbo", jumbo_total))
+    roll_118_barcodes = iter(BarcodeGenerator.reserve_barcodes(db, "118_roll", roll_118_total))
+    cut_roll_barcodes = iter(BarcodeGenerator.reserve_barcodes(db, "cut_roll", cut_total))
+    inventory_frontend_ids = iter(FrontendIDGenerator.reserve_frontend_ids("inventory_master", jumbo_total + roll_118_total + cut_total, db))
+
     # Create inventory hierarchy
     
     for spec_key, cut_rolls_for_spec in paper_spec_groups.items():
         gsm, bf, shade = spec_key
         
-        # Find matching paper record
-        paper_record = db.query(models.PaperMaster).filter(
-            models.PaperMaster.gsm == gsm,
-            models.PaperMaster.bf == bf,
-            models.PaperMaster.shade == shade
-        ).first()
+        paper_record = paper_records[spec_key]
         
         if not paper_record:
             logger.warning(f"❌ No paper record found for {gsm}gsm {bf}bf {shade}")
@@ -1156,7 +1170,7 @@ def start_production_from_pending_orders_impl(db: Session, *, request_data) -> D
         # Create jumbo rolls for this paper specification
         for jumbo_idx in range(spec_jumbo_count):
             virtual_jumbo_qr = f"VIRTUAL_JUMBO_{uuid4().hex[:8].upper()}"
-            virtual_jumbo_barcode = BarcodeGenerator.generate_jumbo_roll_barcode(db)
+            virtual_jumbo_barcode = next(jumbo_barcodes)
             jumbo_roll = models.InventoryMaster(
                 paper_id=paper_record.id,
                 width_inches=jumbo_roll_width,
@@ -1165,7 +1179,7 @@ def start_production_from_pending_orders_impl(db: Session, *, request_data) -> D
                 status="consumed",
                 qr_code=virtual_jumbo_qr,
                 barcode_id=virtual_jumbo_barcode,
-                frontend_id=FrontendIDGenerator.generate_frontend_id("inventory_master", db),
+                frontend_id=next(inventory_frontend_ids),
                 created_by_id=UUID(created_by_id),
                 created_at=datetime.utcnow(),
                 location="Virtual Production"
@@ -1186,7 +1200,7 @@ def start_production_from_pending_orders_impl(db: Session, *, request_data) -> D
             # Create 118" rolls for each assigned individual_roll_number
             for seq, roll_num in enumerate(assigned_roll_numbers, 1):
                 virtual_118_qr = f"VIRTUAL_118_{uuid4().hex[:8].upper()}"
-                virtual_118_barcode = BarcodeGenerator.generate_118_roll_barcode(db)
+                virtual_118_barcode = next(roll_118_barcodes)
                 roll_118 = models.InventoryMaster(
                     paper_id=paper_record.id,
                     width_inches=jumbo_roll_width,
@@ -1195,7 +1209,7 @@ def start_production_from_pending_orders_impl(db: Session, *, request_data) -> D
                     status="consumed",
                     qr_code=virtual_118_qr,
                     barcode_id=virtual_118_barcode,
-                    frontend_id=FrontendIDGenerator.generate_frontend_id("inventory_master", db),
+                    frontend_id=next(inventory_frontend_ids),
                     created_by_id=UUID(created_by_id),
                     created_at=datetime.utcnow(),
                     location="Virtual Production",
@@ -1216,11 +1230,7 @@ def start_production_from_pending_orders_impl(db: Session, *, request_data) -> D
         try:
             
             # Find the paper record for this cut roll
-            cut_roll_paper = db.query(models.PaperMaster).filter(
-                models.PaperMaster.gsm == cut_roll["gsm"],
-                models.PaperMaster.bf == cut_roll["bf"], 
-                models.PaperMaster.shade == cut_roll["shade"]
-            ).first()
+            cut_roll_paper = paper_records[(cut_roll["gsm"], cut_roll["bf"], cut_roll["shade"])]
             
             if not cut_roll_paper:
                 logger.error(f"❌ No paper found for GSM={cut_roll['gsm']}, BF={cut_roll['bf']}, Shade={cut_roll['shade']} - skipping")
@@ -1248,8 +1258,8 @@ def start_production_from_pending_orders_impl(db: Session, *, request_data) -> D
                 logger.warning(f"⚠️ Cut roll has no individual_roll_number, cannot link to 118\" roll")
             
             # Create the cut roll inventory record
-            barcode_id = BarcodeGenerator.generate_cut_roll_barcode(db)
-            frontend_id = FrontendIDGenerator.generate_frontend_id("inventory_master", db)
+            barcode_id = next(cut_roll_barcodes)
+            frontend_id = next(inventory_frontend_ids)
             
             # Link cut roll to order
             if cut_roll.get("is_manual_cut", False):
@@ -1363,12 +1373,13 @@ def start_production_from_pending_orders_impl(db: Session, *, request_data) -> D
     # Link inventory items to plan
     created_plan_links = []
     valid_inventory_items = [item for item in created_inventory if item and item.id is not None]
+    plan_inventory_link_frontend_ids = iter(FrontendIDGenerator.reserve_frontend_ids("plan_inventory_link", len(valid_inventory_items), db))
     
     for inventory_item in valid_inventory_items:
         try:
             plan_link = models.PlanInventoryLink(
                 id=uuid4(),
-                frontend_id=FrontendIDGenerator.generate_frontend_id("plan_inventory_link", db),
+                frontend_id=next(plan_inventory_link_frontend_ids),
                 plan_id=db_plan.id,
                 inventory_id=inventory_item.id,
                 quantity_used=1.0  # Default quantity
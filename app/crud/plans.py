@@ -365,17 +365,36 @@ class CRUDPlan(CRUDBase[models.PlanMaster, schemas.PlanMasterCreate, schemas.Pla
         for spec_key, roll_groups in paper_spec_groups.items():
             spec_to_118_rolls[spec_key] = list(roll_groups.keys())
         
+        # Find paper records up front so barcodes and frontend IDs for the whole
+        # jumbo / 118" / cut roll hierarchy can be reserved in one block per sequence
+        spec_paper_records = {
+            (gsm, bf, shade): db.query(models.PaperMaster).filter(
+                models.PaperMaster.gsm == gsm,
+                models.PaperMaster.bf == bf,
+                models.PaperMaster.shade == shade
+            ).first()
+            for (gsm, bf, shade) in spec_to_118_rolls
+        }
+        jumbo_total = sum((len(roll_numbers) + 2) // 3 for spec_key, roll_numbers in spec_to_118_rolls.items() if spec_paper_records[spec_key])
+        roll_118_total = sum(len(roll_numbers) for spec_key, roll_numbers in spec_to_118_rolls.items() if spec_paper_records[spec_key])
+
+        from ..services.id_generator import FrontendIDGenerator
+        jumbo_barcodes = iter(BarcodeGenerator.reserve_barcodes(db, "jumbo", jumbo_total))
+        roll_118_barcodes = iter(BarcodeGenerator.reserve_barcodes(db, "118_roll", roll_118_total))
+        cut_roll_barcodes = iter(BarcodeGenerator.reserve_barcodes(db, "cut_roll", len(selected_cut_rolls)))
+        inventory_frontend_ids = iter(FrontendIDGenerator.reserve_frontend_ids(
+            "inventory_master", jumbo_total + roll_118_total + len(selected_cut_rolls), db
+        ))
+        plan_inventory_link_frontend_ids = iter(FrontendIDGenerator.reserve_frontend_ids(
+            "plan_inventory_link", len(selected_cut_rolls), db
+        ))
+
         # Create jumbo rolls for each paper specification separately
         jumbo_creation_summary = {}
         for spec_idx, ((gsm, bf, shade), roll_numbers) in enumerate(spec_to_118_rolls.items(), 1):
             jumbo_creation_summary[f"{gsm}gsm_{shade}"] = {"roll_count": len(roll_numbers), "jumbo_count": 0}
             
-            # Find paper record
-            paper_record = db.query(models.PaperMaster).filter(
-                models.PaperMaster.gsm == gsm,
-                models.PaperMaster.bf == bf,
-                models.PaperMaster.shade == shade
-            ).first()
+            paper_record = spec_paper_records[(gsm, bf, shade)]
             
             if not paper_record:
                 logger.warning(f"Could not find paper record for GSM={gsm}, BF={bf}, Shade={shade}")
@@ -389,8 +408,9 @@ class CRUDPlan(CRUDBase[models.PlanMaster, schemas.PlanMasterCreate, schemas.Pla
             # Create jumbo rolls for this paper specification
             for jumbo_idx in range(spec_jumbo_count):
                 virtual_jumbo_qr = f"VIRTUAL_JUMBO_{uuid.uuid4().hex[:8].upper()}"
-                virtual_jumbo_barcode = BarcodeGenerator.generate_jumbo_roll_barcode(db)
+                virtual_jumbo_barcode = next(jumbo_barcodes)
                 jumbo_roll = models.InventoryMaster(
+                    frontend_id=next(inventory_frontend_ids),
                     paper_id=paper_record.id,
                     width_inches=jumbo_roll_width,
                     weight_kg=0,
@@ -417,8 +437,9 @@ class CRUDPlan(CRUDBase[models.PlanMaster, schemas.PlanMasterCreate, schemas.Pla
                 # Create 118" rolls for the assigned individual roll numbers
                 for seq, roll_num in enumerate(assigned_roll_numbers, 1):
                     virtual_118_qr = f"VIRTUAL_118_{uuid.uuid4().hex[:8].upper()}"
-                    virtual_118_barcode = BarcodeGenerator.generate_118_roll_barcode(db)
+                    virtual_118_barcode = next(roll_118_barcodes)
                     roll_118 = models.InventoryMaster(
+                        frontend_id=next(inventory_frontend_ids),
                         paper_id=paper_record.id,
                         width_inches=jumbo_roll_width,
                         weight_kg=0,
@@ -473,7 +494,7 @@ class CRUDPlan(CRUDBase[models.PlanMaster, schemas.PlanMasterCreate, schemas.Pla
         for cut_roll in selected_cut_rolls:
             # Generate barcode for this cut roll
             import uuid
-            barcode_id = BarcodeGenerator.generate_cut_roll_barcode(db)
+            barcode_id = next(cut_roll_barcodes)
             
             # Find parent 118" roll for this cut roll based on individual_roll_number
             individual_roll_number = cut_roll.get("individual_roll_number")
@@ -638,6 +659,7 @@ class CRUDPlan(CRUDBase[models.PlanMaster, schemas.PlanMasterCreate, schemas.Pla
                     cut_roll['source_type'] = 'regular_order'
             
             inventory_item = models.InventoryMaster(
+                frontend_id=next(inventory_frontend_ids),
                 paper_id=cut_roll_paper_id,
                 width_inches=cut_roll_width,
                 weight_kg=0,  # Will be updated via QR scan
@@ -660,6 +682,7 @@ class CRUDPlan(CRUDBase[models.PlanMaster, schemas.PlanMasterCreate, schemas.Pla
             
             # Create plan-inventory link to associate this inventory item with the plan
             plan_inventory_link = models.PlanInventoryLink(
+                frontend_id=next(plan_inventory_link_frontend_ids),
                 plan_id=plan_id,
                 inventory_id=inventory_item.id,
                 quantity_used=1.0  # One roll used
@@ -1985,6 +2008,21 @@ def create_hybrid_production(db: Session, hybrid_data: dict):
         roll_counter = 0
         created_cut_rolls = []  # Track cut roll inventory items for pending resolution
 
+        # Reserve barcodes and frontend IDs for every selected jumbo, 118" set and cut roll in one block each
+        from ..services.id_generator import FrontendIDGenerator
+        jumbo_total = sum(
+            1
+            for spec in paper_specs
+            for jumbo in spec['jumbos']
+            if any(s.get('is_selected', True) for s in jumbo['sets'])
+        )
+        roll_total = jumbo_total + len(selected_sets) + total_cuts
+        jumbo_barcodes = iter(BarcodeGenerator.reserve_barcodes(db, "jumbo", jumbo_total))
+        set_barcodes = iter(BarcodeGenerator.reserve_barcodes(db, "118_roll", len(selected_sets)))
+        cut_barcodes = iter(BarcodeGenerator.reserve_barcodes(db, "cut_roll", total_cuts))
+        inventory_frontend_ids = iter(FrontendIDGenerator.reserve_frontend_ids("inventory_master", roll_total, db))
+        plan_inventory_link_frontend_ids = iter(FrontendIDGenerator.reserve_frontend_ids("plan_inventory_link", roll_total, db))
+
         # Process paper specs
         for spec in paper_specs:
             gsm, bf, shade = spec['gsm'], spec['bf'], spec['shade']
@@ -2006,8 +2044,9 @@ def create_hybrid_production(db: Session, hybrid_data: dict):
                     continue
 
                 # Create jumbo (124")
-                jumbo_barcode = BarcodeGenerator.generate_jumbo_roll_barcode(db)
+                jumbo_barcode = next(jumbo_barcodes)
                 jumbo_roll = models.InventoryMaster(
+                    frontend_id=next(inventory_frontend_ids),
                     width_inches=124,
                     paper_id=paper.id,
                     weight_kg=0,  # Will be updated during production
@@ -2022,6 +2061,7 @@ def create_hybrid_production(db: Session, hybrid_data: dict):
 
                 # Link jumbo to plan
                 db.add(models.PlanInventoryLink(
+                    frontend_id=next(plan_inventory_link_frontend_ids),
                     plan_id=plan.id,
                     inventory_id=jumbo_roll.id,
                     quantity_used=1.0
@@ -2050,8 +2090,9 @@ def create_hybrid_production(db: Session, hybrid_data: dict):
                         continue
 
                     # Only generate barcode and create 118" roll if set has cuts
-                    set_barcode = BarcodeGenerator.generate_118_roll_barcode(db)
+                    set_barcode = next(set_barcodes)
                     inter = models.InventoryMaster(
+                        frontend_id=next(inventory_frontend_ids),
                         width_inches=planning_width,
                         paper_id=paper.id,
                         weight_kg=0,
@@ -2068,6 +2109,7 @@ def create_hybrid_production(db: Session, hybrid_data: dict):
 
                     # Link 118" roll to plan
                     db.add(models.PlanInventoryLink(
+                        frontend_id=next(plan_inventory_link_frontend_ids),
                         plan_id=plan.id,
                         inventory_id=inter.id,
                         quantity_used=1.0
@@ -2075,7 +2117,7 @@ def create_hybrid_production(db: Session, hybrid_data: dict):
 
                     # Create cut rolls
                     for cut in roll_set['cuts']:
-                        cut_barcode = BarcodeGenerator.generate_cut_roll_barcode(db)
+                        cut_barcode = next(cut_barcodes)
 
                         # Determine status: "available" for wastage, "cutting" otherwise
                         is_wastage = cut.get('is_wastage', False)
@@ -2126,6 +2168,7 @@ def create_hybrid_production(db: Session, hybrid_data: dict):
                                 logger.warning(f"⚠️ PENDING VALIDATION: Invalid UUID format for pending_id: {cut.get('source_pending_id')}")
 
                         cut_roll = models.InventoryMaster(
+                            frontend_id=next(inventory_frontend_ids),
                             width_inches=cut['width_inches'],
                             paper_id=paper.id,
                             weight_kg=1 if cut['source'] == 'manual_order' else 0,
@@ -2149,6 +2192,7 @@ def create_hybrid_production(db: Session, hybrid_data: dict):
 
                         # Link cut roll to plan
                         db.add(models.PlanInventoryLink(
+                            frontend_id=next(plan_inventory_link_frontend_ids),
                             plan_id=plan.id,
                             inventory_id=cut_roll.id,
                             quantity_used=cut.get('quantity', 1)
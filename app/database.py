@@ -4,6 +4,7 @@ from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -21,6 +22,30 @@ DATABASE_URL = os.getenv(
 
 logger.info(f"Using database URL: {DATABASE_URL}")
 
+# Connection pool size; the request thread pool is sized from these (see concurrency.py)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "2"))
+
+# Optional async engine for the read-heavy endpoints (see get_async_db). Needs an
+# async driver: aioodbc for SQL Server, aiosqlite for a local SQLite stand-in.
+ASYNC_DB_ENABLED = os.getenv("ASYNC_DB_ENABLED", "false").lower() == "true"
+ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", "20"))
+
+
+def _async_database_url(url: str) -> str:
+    """Async driver URL for a sync DATABASE_URL (pyodbc -> aioodbc, sqlite -> aiosqlite)."""
+    for sync_prefix, async_prefix in (
+        ("mssql+pyodbc://", "mssql+aioodbc://"),
+        ("sqlite+pysqlite://", "sqlite+aiosqlite://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_database_url(DATABASE_URL)
+
 try:
     # Create engine with optimized connection pooling settings
     # For ODBC connection strings, we need to be more careful with connection args
@@ -28,8 +53,8 @@ try:
         # Using ODBC connection string format
         engine = create_engine(
             DATABASE_URL,
-            pool_size=8,          # Compromise: some savings, decent concurrency
-            max_overflow=2,       # Allow 2 extra connections for bursts
+            pool_size=DB_POOL_SIZE,          # Compromise: some savings, decent concurrency
+            max_overflow=DB_MAX_OVERFLOW,    # Extra connections for bursts
             pool_pre_ping=True,
             pool_recycle=1800,    # Recycle every 30 min
             echo=False  # Set to True for SQL debugging
@@ -38,8 +63,8 @@ try:
         # Using standard SQLAlchemy format
         engine = create_engine(
             DATABASE_URL,
-            pool_size=8,          # Compromise: some savings, decent concurrency
-            max_overflow=2,       # Allow 2 extra connections for bursts
+            pool_size=DB_POOL_SIZE,          # Compromise: some savings, decent concurrency
+            max_overflow=DB_MAX_OVERFLOW,    # Extra connections for bursts
             pool_pre_ping=True,
             pool_recycle=1800,    # Recycle every 30 min
             connect_args={"timeout": 30}
@@ -72,4 +97,85 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# ============================================================================
+# ASYNC SESSION PATH (read-only endpoints)
+# ============================================================================
+
+async_engine = None
+AsyncSessionLocal = None
+
+if ASYNC_DB_ENABLED:
+    try:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        pool_args = {} if ASYNC_DATABASE_URL.startswith("sqlite") else {
+            "pool_size": ASYNC_DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_recycle": 1800
+        }
+        async_engine = create_async_engine(ASYNC_DATABASE_URL, pool_pre_ping=True, **pool_args)
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+        logger.info(f"Async database engine enabled: {async_engine.url.drivername}")
+    except Exception as e:  # Async driver (aioodbc / aiosqlite) or greenlet not installed
+        logger.warning(f"Async database engine unavailable, read endpoints use the thread pool: {e}")
+        async_engine = None
+        AsyncSessionLocal = None
+
+
+class ThreadPoolSession:
+    """
+    Stand-in for AsyncSession when the async engine is disabled: run_sync runs
+    the function on a regular session in the worker thread pool.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(self._run, fn, *args, **kwargs)
+
+    def _run(self, fn, *args, **kwargs):
+        try:
+            return fn(self.sync_session, *args, **kwargs)
+        finally:
+            # Hand the connection back before the thread is released; holding it until
+            # the dependency closes lets waiting threads starve the pool
+            self.sync_session.close()
+
+    def close(self):
+        self.sync_session.close()  # No connection left to release after run_sync
+
+
+# Dependency to get a session for read-only async endpoints
+async def get_async_db():
+    """
+    Yields an AsyncSession on the async engine (ASYNC_DB_ENABLED), otherwise a
+    ThreadPoolSession. Endpoints run their ORM code with `await db.run_sync(fn, ...)`,
+    which calls fn(session, ...): on the async engine it runs on the event loop
+    without a worker thread, with lazy loads still available.
+
+    Because fn may run on the event loop thread, it must never wait on a
+    threading lock that another thread can hold across I/O: a blocked fn
+    stops every request, including the one that would release the lock. Only
+    take locks that guard in-memory state briefly (no queries inside), or use
+    acquire(blocking=False) and fall back (see DashboardMetrics.snapshot).
+    Audited run_sync bodies: dashboard summary / recent activity / alerts
+    (dashboard_metrics, non-blocking), QR and barcode scans (barcode_registry,
+    lock-free), dispatch history and all-cut-rolls reports (lock-free).
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield session
+        return
+
+    if SessionLocal is None:
+        raise SQLAlchemyError("Database connection not available")
+
+    db = ThreadPoolSession(SessionLocal())
+    try:
+        yield db
+    finally:
+        db.close()
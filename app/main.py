@@ -13,6 +13,7 @@ logger = logging.getLogger(__name__)
 # Import router after logging is configured
 from .api_router import api_router
 from . import database, init_db
+from .concurrency import configure_threadpool, loop_lag_monitor, threadpool_stats
 
 app = FastAPI(
     title="Paper Roll Management System",
@@ -65,6 +66,10 @@ async def startup_event():
     """
     Initialize the database on startup.
     """
+    # Size the request and optimizer thread pools to the DB pool and start reporting event loop lag
+    configure_threadpool()
+    loop_lag_monitor.start()
+
     logger.info("Initializing database...")
     try:
         # Create tables if they don't exist
@@ -75,13 +80,72 @@ async def startup_event():
             
             # Initialize default data
             init_db.init_db()
+
+            # Bring the frontend ID and barcode counters up to date with existing rows
+            from .services.id_generator import FrontendIDGenerator
+            from .services.barcode_generator import BarcodeGenerator
+            db = database.SessionLocal()
+            try:
+                FrontendIDGenerator.backfill_sequences(db)
+                BarcodeGenerator.backfill_sequences(db)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to backfill ID and barcode sequences: {e}")
+            finally:
+                db.close()
+
+            # Register rolls written outside the ORM in the barcode registry
+            from .services.barcode_registry import barcode_registry
+            db = database.SessionLocal()
+            try:
+                barcode_registry.reconcile(db)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to reconcile barcode registry: {e}")
+            finally:
+                db.close()
+
+            # First dashboard recount, so readers never wait for it inside a request
+            from .services.dashboard_metrics import dashboard_metrics
+            db = database.SessionLocal()
+            try:
+                dashboard_metrics.reconcile(db)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to reconcile dashboard metrics: {e}")
+            finally:
+                db.close()
+
+            # Load the persisted cutting pattern index (rebuilt in the background when stale)
+            from .services.pattern_index import pattern_index
+            pattern_index.start_background_build(database.SessionLocal)
     except SQLAlchemyError as e:
         logger.error(f"Failed to initialize database: {e}")
 
+    # Create the spec group solver pool up front (workers come from a forkserver, not this process)
+    from .services.cutting_optimizer import start_spec_group_pool
+    start_spec_group_pool()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await loop_lag_monitor.stop()
+    from .services.cutting_optimizer import shutdown_spec_group_pool
+    shutdown_spec_group_pool()
+    if database.async_engine is not None:
+        await database.async_engine.dispose()
+
 @app.get("/")
 async def root():
     return {"message": "Paper Roll Management System API is Live"}
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/health/runtime")
+async def runtime_health():
+    """Event loop lag and worker thread pool usage."""
+    return {
+        "event_loop": loop_lag_monitor.stats(),
+        "threadpool": threadpool_stats()
+    }
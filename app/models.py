@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Table, Text, Boolean, Numeric, Enum, event, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Table, Text, Boolean, Numeric, Enum, event, JSON, UniqueConstraint, Index
 from sqlalchemy.orm import relationship, Session
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER
@@ -84,6 +84,57 @@ class IdempotencyKey(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     expires_at = Column(DateTime, nullable=False)  # Auto-expire after 24 hours
 
+# Optimization Result Cache - Optional shared tier for cached cutting results
+class OptimizationResultCache(Base):
+    __tablename__ = "optimization_result_cache"
+
+    id = Column(UNIQUEIDENTIFIER, primary_key=True, default=uuid.uuid4, index=True)
+    cache_key = Column(String(64), unique=True, nullable=False, index=True)  # SHA256 of demand vector + jumbo width + algorithm
+    algorithm = Column(String(50), nullable=True)
+    jumbo_width = Column(Float, nullable=True)
+    result = Column(JSON, nullable=False)  # Serialized match_combos result
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+# Cutting Pattern Index - Precomputed feasible patterns per jumbo width and width catalogue
+class CuttingPatternIndex(Base):
+    __tablename__ = "cutting_pattern_index"
+
+    id = Column(UNIQUEIDENTIFIER, primary_key=True, default=uuid.uuid4, index=True)
+    index_key = Column(String(64), unique=True, nullable=False, index=True)  # SHA256 of jumbo width + width set + limits
+    jumbo_width = Column(Numeric(6, 2), nullable=False, index=True)
+    width_set = Column(String(2000), nullable=False)  # Comma-separated widths, e.g. "20.00,24.50,30.00"
+    trim_cap = Column(Numeric(6, 2), nullable=False)
+    max_lanes = Column(Integer, nullable=False)
+    patterns = Column(JSON, nullable=False)  # Lane tuples in hundredths of an inch
+    pattern_count = Column(Integer, nullable=False, default=0)
+    source_spec = Column(String(100), nullable=True)  # "gsm/shade/bf" catalogue the width set came from
+    built_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+# Frontend ID Sequences - Last issued counter per ID / barcode sequence and year
+class FrontendIDSequence(Base):
+    __tablename__ = "frontend_id_sequence"
+    __table_args__ = (UniqueConstraint("sequence_name", "year", name="uq_frontend_id_sequence_name_year"),)
+
+    id = Column(UNIQUEIDENTIFIER, primary_key=True, default=uuid.uuid4, index=True)
+    sequence_name = Column(String(50), nullable=False)  # FrontendIDGenerator.ID_PATTERNS key ("order_master") or "barcode_<type>" ("barcode_cut_roll")
+    year = Column(String(2), nullable=False, default="")  # Two-digit year suffix, "" for sequences without one
+    last_value = Column(Integer, nullable=False, default=0)  # Last counter handed out
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+# Barcode Registry - Scanned barcode / QR code -> roll row across the roll tables
+class BarcodeRegistryEntry(Base):
+    __tablename__ = "barcode_registry"
+    __table_args__ = (UniqueConstraint("code", "source_table", "entity_id", name="uq_barcode_registry_code_source_entity"),)
+
+    id = Column(UNIQUEIDENTIFIER, primary_key=True, default=uuid.uuid4)
+    code = Column(String(255), nullable=False, index=True)  # Barcode or QR code as scanned
+    code_type = Column(String(10), nullable=False)  # barcode, qr
+    source_table = Column(String(50), nullable=False)  # inventory_master, manual_cut_roll, wastage_inventory
+    entity_id = Column(UNIQUEIDENTIFIER, nullable=False, index=True)  # Row id in source_table
+    roll_type = Column(String(20), nullable=True)  # jumbo, 118, cut, manual_cut, wastage
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
 # ============================================================================
 # MASTER TABLES - Core reference data
 # ============================================================================
@@ -393,6 +444,8 @@ class PendingOrderItem(Base):
 # Inventory Master - Manages both jumbo and cut rolls
 class InventoryMaster(Base):
     __tablename__ = "inventory_master"
+    # Keyset pagination of the cut roll reports (roll_type filter, newest first)
+    __table_args__ = (Index("ix_inventory_master_roll_type_created_at_id", "roll_type", "created_at", "id"),)
     
     id = Column(UNIQUEIDENTIFIER, primary_key=True, default=uuid.uuid4, index=True)
     frontend_id = Column(String(50), unique=True, nullable=True, index=True)  # INV-001, INV-002, etc.
@@ -600,6 +653,8 @@ class DispatchRecord(Base):
     Track bulk dispatch of cut rolls with vehicle and driver details
     """
     __tablename__ = "dispatch_record"
+    # Keyset pagination of the dispatch history (newest dispatch first)
+    __table_args__ = (Index("ix_dispatch_record_dispatch_date_id", "dispatch_date", "id"),)
 
     id = Column(UNIQUEIDENTIFIER, primary_key=True, default=uuid.uuid4, index=True)
     frontend_id = Column(String(50), unique=True, nullable=True, index=True)  # DSP-2025-001, etc.
@@ -793,6 +848,8 @@ class WastageInventory(Base):
     Generated during production when trim/waste is between 9-21 inches
     """
     __tablename__ = "wastage_inventory"
+    # Keyset pagination of the wastage list (newest first)
+    __table_args__ = (Index("ix_wastage_inventory_created_at_id", "created_at", "id"),)
 
     id = Column(UNIQUEIDENTIFIER, primary_key=True, default=uuid.uuid4, index=True)
     frontend_id = Column(String(50), unique=True, nullable=True, index=True)  # WS-00001, WS-00002, etc.
@@ -1107,4 +1164,71 @@ models_with_serial_no = [
 ]
 
 for model in models_with_serial_no:
-    event.listen(model, 'before_insert', generate_serial_no_on_insert)
\ No newline at end of file
+    event.listen(model, 'before_insert', generate_serial_no_on_insert)
+
+
+# ============================================================================
+# DASHBOARD METRICS - Status transitions maintain the dashboard counters
+# ============================================================================
+
+# Model -> attributes whose values place a row in the dashboard counters
+DASHBOARD_METRIC_ATTRIBUTES = {
+    OrderMaster: ("status",),
+    PendingOrderMaster: ("status",),
+    PendingOrderItem: ("_status", "quantity_pending"),
+    PlanMaster: ("status",),
+    InventoryMaster: ("status", "roll_type"),
+    ProductionOrderMaster: ("status",),
+    PaperMaster: (),
+    ClientMaster: (),
+}
+
+
+def keep_previous_metric_value(target, value, oldvalue, initiator):
+    """No-op set listener; registered with active_history so the replaced value is always loaded."""
+    return value
+
+
+def collect_dashboard_metric_deltas_on_flush(session, flush_context):
+    """
+    SQLAlchemy session event handler that turns status / roll type / pending
+    quantity changes into dashboard counter deltas, held until the commit.
+    """
+    from app.services.dashboard_metrics import dashboard_metrics
+    dashboard_metrics.collect_flush_deltas(session)
+
+
+def apply_dashboard_metric_deltas_on_commit(session):
+    from app.services.dashboard_metrics import dashboard_metrics
+    dashboard_metrics.apply_committed(session)
+
+
+def discard_dashboard_metric_deltas_on_rollback(session):
+    from app.services.dashboard_metrics import dashboard_metrics
+    dashboard_metrics.discard(session)
+
+
+for model, attributes in DASHBOARD_METRIC_ATTRIBUTES.items():
+    for attribute in attributes:
+        event.listen(getattr(model, attribute), 'set', keep_previous_metric_value, active_history=True, retval=True)
+
+event.listen(Session, 'after_flush', collect_dashboard_metric_deltas_on_flush)
+event.listen(Session, 'after_commit', apply_dashboard_metric_deltas_on_commit)
+event.listen(Session, 'after_rollback', discard_dashboard_metric_deltas_on_rollback)
+
+
+# ============================================================================
+# BARCODE REGISTRY - Roll inserts / code changes maintain the scan index
+# ============================================================================
+
+def sync_barcode_registry_on_flush(session, flush_context):
+    """
+    SQLAlchemy session event handler that writes barcode registry entries for
+    inserted rolls and rewrites them when a roll's barcode, QR code or roll type
+    changes, in the same transaction as the roll.
+    """
+    from app.services.barcode_registry import barcode_registry
+    barcode_registry.sync_flush(session)
+
+
+event.listen(Session, 'after_flush', sync_barcode_registry_on_flush)
@@ -777,11 +777,25 @@ class CuttingPlanRequestItem(BaseModel):
     shade: str
     min_length: int = Field(default=1600, gt=0)
 
+class CuttingAlgorithm(str, Enum):
+    ILP = "ilp"
+    TRACKING = "tracking"
+    COLUMN_GENERATION = "column_generation"
+
+class CuttingSolverConfig(BaseModel):
+    """CP-SAT tuning for cutting plan generation (omitted fields use optimizer defaults)"""
+    time_limit_seconds: Optional[float] = Field(None, gt=0, le=300, description="Time budget per CP-SAT solve")
+    num_workers: Optional[int] = Field(None, ge=1, le=64, description="Parallel CP-SAT search workers")
+    relative_gap_limit: Optional[float] = Field(None, ge=0, le=1, description="Stop once within this relative gap of the best bound")
+    use_greedy_hint: Optional[bool] = Field(None, description="Warm-start CP-SAT from the greedy heuristic solution")
+
 class CuttingPlanRequest(BaseModel):
     """Schema for cutting plan generation request"""
     order_requirements: List[CuttingPlanRequestItem]
     pending_orders: Optional[List[Dict[str, Any]]] = None
     available_inventory: Optional[List[Dict[str, Any]]] = None
+    algorithm: CuttingAlgorithm = Field(default=CuttingAlgorithm.ILP, description="Optimization algorithm: ilp, tracking or column_generation")
+    solver_config: Optional[CuttingSolverConfig] = None
 
 class CuttingPlanWithSelectionRequest(CuttingPlanRequest):
     """Schema for cutting plan with selection criteria"""
@@ -793,6 +807,10 @@ class QRWeightUpdate(BaseModel):
     weight_kg: float = Field(..., gt=0)
     location: Optional[str] = None
 
+class QRWeightBatchUpdate(BaseModel):
+    """Schema for updating the weights of several scanned rolls in one request"""
+    items: List[QRWeightUpdate] = Field(..., min_length=1, max_length=200, description="Scanned codes with their weights, applied in scan order")
+
 class BarcodeWeightUpdate(BaseModel):
     """Schema for updating weight via barcode - status automatically set to 'available'"""
     barcode_id: str
@@ -1136,10 +1154,11 @@ class ManualCutRollCreate(BaseModel):
 class PaginatedWastageResponse(BaseModel):
     """Paginated response for wastage inventory"""
     items: List[WastageInventory]
-    total: int
-    page: int
+    total: Optional[int] = None  # None when include_total=false
+    page: Optional[int] = None  # None for cursor pages
     per_page: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # Pass back as cursor for the next page
 
 
 class WastageAllocationOrderInfo(BaseModel):
@@ -1235,10 +1254,11 @@ class InventoryItem(InventoryItemBase):
 class PaginatedInventoryItemsResponse(BaseModel):
     """Paginated response for inventory items"""
     items: List[InventoryItem]
-    total: int
-    page: int
+    total: Optional[int] = None  # None when include_total=false
+    page: Optional[int] = None  # None for cursor pages
     per_page: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # Pass back as cursor for the next page
 
 # ============================================================================
 # PENDING ORDER ALLOCATION SCHEMAS
@@ -0,0 +1,88 @@
+"""
+Aggregation - Single-pass conditional count queries
+
+Summary endpoints used to issue one COUNT query per status (or per filter). These
+helpers fold such counts into one statement per table using
+SUM(CASE WHEN <condition> THEN 1 ELSE 0 END) columns, optionally grouped by a
+status column, and combine unrelated scalar aggregates into one round trip.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+
+def count_if(condition) -> Any:
+    """SUM(CASE WHEN condition THEN 1 ELSE 0 END), 0 on empty tables."""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def conditional_counts(
+    db: Session,
+    model: Any,
+    conditions: Dict[str, Any],
+    aggregates: Optional[Dict[str, Any]] = None,
+    filters: Iterable[Any] = ()
+) -> Dict[str, Any]:
+    """
+    Row count plus one count per condition (and any extra aggregates) in one query.
+
+    Args:
+        db: Database session
+        model: Model to aggregate over
+        conditions: Name -> SQL condition to count rows for
+        aggregates: Name -> aggregate expression (e.g. func.sum(column))
+        filters: WHERE conditions applied to every count
+
+    Returns:
+        {"total": row count, <condition name>: count, <aggregate name>: value}
+    """
+    columns = {"total": func.count(), **{name: count_if(condition) for name, condition in conditions.items()}}
+    columns.update(aggregates or {})
+
+    row = db.query(*columns.values()).select_from(model).filter(*filters).one()
+    return dict(zip(columns.keys(), row))
+
+
+def grouped_counts(
+    db: Session,
+    group_columns: Iterable[Any],
+    conditions: Optional[Dict[str, Any]] = None,
+    filters: Iterable[Any] = ()
+) -> Dict[Any, Dict[str, int]]:
+    """
+    Row count per group plus per-group conditional counts in one GROUP BY query.
+
+    Returns:
+        Group value (tuple when grouping by several columns) -> {"count": n, <condition name>: n}
+    """
+    group_columns = list(group_columns)
+    conditions = conditions or {}
+    names = ["count"] + list(conditions.keys())
+
+    rows = db.query(
+        *group_columns, func.count(), *[count_if(condition) for condition in conditions.values()]
+    ).filter(*filters).group_by(*group_columns).all()
+
+    width = len(group_columns)
+    result = {}
+    for row in rows:
+        key = row[0] if width == 1 else tuple(row[:width])
+        result[key] = dict(zip(names, row[width:]))
+    return result
+
+
+def combined_scalars(db: Session, queries: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run several single-value queries as scalar subqueries of one SELECT.
+
+    Args:
+        queries: Name -> Query or select() returning exactly one column and row
+
+    Returns:
+        Name -> value
+    """
+    subqueries = [query.scalar_subquery() for query in queries.values()]
+    row = db.query(*subqueries).one()
+    return dict(zip(queries.keys(), row))
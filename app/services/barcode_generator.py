@@ -1,9 +1,10 @@
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from .. import models
+from .sequence_service import SequenceService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,8 +16,124 @@ class BarcodeGenerator:
     Format: CR_00001-25 (where 25 is the year)
     Counter resets to 00001 on January 1st of each year.
     Year suffix updates automatically based on current date.
+
+    Sequential barcodes are allocated by SequenceService from per-type counters.
     """
-    
+
+    # Sequential barcode families: barcode type -> (prefix, separator, column holding the barcodes)
+    # CR_00001-25, SET_00001-25, JR_00001-25, WSB-00001-25, SCR-00001-25
+    SEQUENTIAL_BARCODES = {
+        "cut_roll": ("CR", "_", models.InventoryMaster.barcode_id),
+        "118_roll": ("SET", "_", models.InventoryMaster.barcode_id),
+        "jumbo": ("JR", "_", models.InventoryMaster.barcode_id),
+        "wastage": ("WSB", "-", models.WastageInventory.barcode_id),
+        "scrap_cut_roll": ("SCR", "-", models.InventoryMaster.barcode_id),
+    }
+
+    @staticmethod
+    def reserve_barcodes(db: Session, barcode_type: str, count: int) -> List[str]:
+        """
+        Reserve count consecutive barcodes of one type from its sequence counter
+        (barcode_<type> in frontend_id_sequence), seeded once per year from the
+        barcodes already in the table.
+
+        Cut roll numbers skip the range kept for manual cut rolls
+        (8000-9000 in year 25, 0-1000 from year 26).
+
+        Args:
+            db: Database session
+            barcode_type: "cut_roll", "118_roll", "jumbo", "wastage" or "scrap_cut_roll"
+            count: Number of barcodes to reserve
+
+        Returns:
+            Barcodes in ascending order (empty when count <= 0)
+
+        Raises:
+            ValueError: If barcode_type is not a sequential barcode type
+        """
+        if barcode_type not in BarcodeGenerator.SEQUENTIAL_BARCODES:
+            raise ValueError(f"Unsupported barcode type: {barcode_type}. Supported types: {list(BarcodeGenerator.SEQUENTIAL_BARCODES.keys())}")
+        if count <= 0:
+            return []
+
+        prefix, separator, _ = BarcodeGenerator.SEQUENTIAL_BARCODES[barcode_type]
+        current_year = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%y")
+
+        numbers = SequenceService.reserve(
+            db,
+            f"barcode_{barcode_type}",
+            current_year,
+            count,
+            seed=lambda: BarcodeGenerator._scan_max_number(db, barcode_type, current_year),
+            reserved_range=BarcodeGenerator._manual_cut_roll_range(current_year) if barcode_type == "cut_roll" else None
+        )
+
+        reserved = [f"{prefix}{separator}{number:05d}-{current_year}" for number in numbers]
+        if count > 1:
+            logger.info(f"Reserved {count} {barcode_type} barcodes: {reserved[0]} .. {reserved[-1]}")
+        return reserved
+
+    @staticmethod
+    def _manual_cut_roll_range(year: str) -> Tuple[int, int]:
+        """Cut roll numbers kept for manual cut rolls in a year."""
+        return (8000, 9000) if year == "25" else (0, 1000)
+
+    @staticmethod
+    def _scan_max_number(db: Session, barcode_type: str, year: str) -> int:
+        """Highest number used by a barcode type in a year (manual cut roll range excluded)."""
+        prefix, separator, column = BarcodeGenerator.SEQUENTIAL_BARCODES[barcode_type]
+
+        # Get all barcodes for this type and year
+        pattern = f"{prefix}{separator}%-{year}"
+        result = db.query(column).filter(column.like(pattern)).all()
+
+        manual_low, manual_high = BarcodeGenerator._manual_cut_roll_range(year)
+
+        # Extract counter values and find max
+        max_number = 0
+        for row in result:
+            barcode_id = row[0]
+            if barcode_id:
+                try:
+                    # Extract number from CR_00123-25 or WSB-00123-25 format
+                    parts = barcode_id.split("-")
+                    if separator == "_":
+                        if len(parts) < 2 or not parts[0].startswith(f"{prefix}_"):
+                            continue
+                        current_number = int(parts[0][len(prefix) + 1:])
+                    else:
+                        if len(parts) < 3 or parts[0] != prefix:
+                            continue
+                        current_number = int(parts[1])
+
+                    # Skip manual cut roll range
+                    if barcode_type == "cut_roll" and manual_low <= current_number <= manual_high:
+                        continue
+                    max_number = max(max_number, current_number)
+                except (ValueError, AttributeError, IndexError):
+                    continue
+
+        return max_number
+
+    @staticmethod
+    def backfill_sequences(db: Session) -> Dict[str, int]:
+        """
+        Create or catch up the barcode counters for the current year from the
+        barcodes already stored. Safe to run repeatedly. Commits the session.
+
+        Returns:
+            Barcode type -> last number
+        """
+        current_year = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%y")
+        counters = {}
+        for barcode_type in BarcodeGenerator.SEQUENTIAL_BARCODES:
+            scanned = BarcodeGenerator._scan_max_number(db, barcode_type, current_year)
+            counters[barcode_type] = SequenceService.ensure_at_least(db, f"barcode_{barcode_type}", current_year, scanned)
+
+        db.commit()
+        logger.info(f"🔢 BARCODE SEQUENCES: Backfilled {len(counters)} sequences for year {current_year}")
+        return counters
+
     @staticmethod
     def generate_cut_roll_barcode(db: Session) -> str:
         """
@@ -37,80 +154,13 @@ class BarcodeGenerator:
             str: Next barcode ID like CR_00001-25, CR_01001-26, etc.
         """
         try:
-            current_year = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%y")
-
-            # Get all barcodes for the current year
-            pattern = f"CR_%-{current_year}"
-            result = db.query(models.InventoryMaster.barcode_id).filter(
-                models.InventoryMaster.barcode_id.like(pattern)
-            ).all()
-
-            # Extract counter values and find max (excluding manual ranges)
-            max_number = 0
-            for row in result:
-                barcode_id = row[0]
-                if barcode_id:
-                    try:
-                        # Extract number from CR_00123-25 format
-                        parts = barcode_id.split("-")
-                        if len(parts) >= 2 and parts[0].startswith('CR_'):
-                            current_number = int(parts[0][3:])  # Remove 'CR_' prefix
-
-                            # Skip manual cut roll ranges based on year
-                            if current_year == "25":
-                                # Year 25: Skip 8000-9000 range
-                                if current_number < 8000 or current_number > 9000:
-                                    max_number = max(max_number, current_number)
-                            else:
-                                # Year 26+: Skip 0-1000 range
-                                if current_number > 1000:
-                                    max_number = max(max_number, current_number)
-                    except (ValueError, AttributeError, IndexError):
-                        continue
-
-            # Determine starting number based on year
-            if current_year == "25":
-                # Year 25: Start from 1 if no existing rolls
-                if max_number == 0:
-                    next_number = 1
-                else:
-                    next_number = max_number + 1
-
-                # Skip the reserved range for manual cut rolls (8000-9000)
-                if next_number == 8000:
-                    logger.info(f"Reached CR_08000-{current_year}, skipping to CR_09001-{current_year} (manual cut roll range)")
-                    next_number = 9001
-                elif 8000 < next_number <= 9000:
-                    logger.warning(f"Next number {next_number} in reserved manual range, jumping to 9001")
-                    next_number = 9001
-            else:
-                # Year 26+: Start from 1001 to skip manual range (0-1000)
-                if max_number == 0 or max_number < 1001:
-                    next_number = 1001
-                else:
-                    next_number = max_number + 1
-
-                # Safety check: ensure we never use the manual range (0-1000)
-                if next_number <= 1000:
-                    logger.warning(f"Next number {next_number} in reserved manual range (0-1000), jumping to 1001")
-                    next_number = 1001
-
-            # Format as CR_00001-25 (5 digits with leading zeros and year)
-            barcode_id = f"CR_{next_number:05d}-{current_year}"
-
+            barcode_id = BarcodeGenerator.reserve_barcodes(db, "cut_roll", 1)[0]
             logger.info(f"Generated cut roll barcode: {barcode_id}")
             return barcode_id
 
         except Exception as e:
             logger.error(f"Error generating cut roll barcode: {e}")
-            # Fallback to timestamp-based ID
-            import time
-            current_year = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%y")
-            # Use timestamp in safe range (avoid reserved ranges)
-            fallback_number = (int(time.time()) % 90000) + 10000  # Range: 10000-99999
-            fallback_id = f"CR_{fallback_number:05d}-{current_year}"
-            logger.warning(f"Using fallback barcode: {fallback_id}")
-            return fallback_id
+            raise
     
     @staticmethod
     def generate_inventory_barcode(db: Session, roll_type: str = "INV") -> str:
@@ -175,44 +225,13 @@ class BarcodeGenerator:
             str: Next wastage barcode ID like WSB-00001-25, WSB-00002-25, etc.
         """
         try:
-            current_year = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%y")
-
-            # Get all wastage barcodes for the current year
-            pattern = f"WSB-%-{current_year}"
-            result = db.query(models.WastageInventory.barcode_id).filter(
-                models.WastageInventory.barcode_id.like(pattern)
-            ).all()
-
-            # Extract counter values and find max
-            max_number = 0
-            for row in result:
-                barcode_id = row[0]
-                if barcode_id:
-                    try:
-                        # Extract number from WSB-00123-25 format
-                        parts = barcode_id.split("-")
-                        if len(parts) >= 3 and parts[0] == 'WSB':
-                            current_number = int(parts[1])
-                            max_number = max(max_number, current_number)
-                    except (ValueError, AttributeError, IndexError):
-                        continue
-
-            next_number = max_number + 1
-
-            # Format as WSB-00001-25 (5 digits with leading zeros and year)
-            barcode_id = f"WSB-{next_number:05d}-{current_year}"
-
+            barcode_id = BarcodeGenerator.reserve_barcodes(db, "wastage", 1)[0]
             logger.info(f"Generated wastage barcode: {barcode_id}")
             return barcode_id
 
         except Exception as e:
             logger.error(f"Error generating wastage barcode: {e}")
-            # Fallback to timestamp-based ID
-            import time
-            current_year = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%y")
-            fallback_id = f"WSB-{int(time.time()) % 100000:05d}-{current_year}"
-            logger.warning(f"Using fallback wastage barcode: {fallback_id}")
-            return fallback_id
+            raise
 
     @staticmethod
     def generate_manual_cut_roll_barcode(db: Session, reel_no: int) -> str:
@@ -278,44 +297,13 @@ class BarcodeGenerator:
             str: Next SCR barcode ID like SCR-00001-25, SCR-00002-25, etc.
         """
         try:
-            current_year = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%y")
-
-            # Get all SCR barcodes for the current year
-            pattern = f"SCR-%-{current_year}"
-            result = db.query(models.InventoryMaster.barcode_id).filter(
-                models.InventoryMaster.barcode_id.like(pattern)
-            ).all()
-
-            # Extract counter values and find max
-            max_number = 0
-            for row in result:
-                barcode_id = row[0]
-                if barcode_id:
-                    try:
-                        # Extract number from SCR-00123-25 format
-                        parts = barcode_id.split("-")
-                        if len(parts) >= 3 and parts[0] == 'SCR':
-                            current_number = int(parts[1])
-                            max_number = max(max_number, current_number)
-                    except (ValueError, AttributeError, IndexError):
-                        continue
-
-            next_number = max_number + 1
-
-            # Format as SCR-00001-25 (5 digits with leading zeros and year)
-            barcode_id = f"SCR-{next_number:05d}-{current_year}"
-
+            barcode_id = BarcodeGenerator.reserve_barcodes(db, "scrap_cut_roll", 1)[0]
             logger.info(f"Generated scrap cut roll barcode: {barcode_id}")
             return barcode_id
 
         except Exception as e:
             logger.error(f"Error generating scrap cut roll barcode: {e}")
-            # Fallback to timestamp-based ID
-            import time
-            current_year = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%y")
-            fallback_id = f"SCR-{int(time.time()) % 100000:05d}-{current_year}"
-            logger.warning(f"Using fallback SCR barcode: {fallback_id}")
-            return fallback_id
+            raise
 
     @staticmethod
     def validate_barcode_format(barcode_id: str, barcode_type: str = "cut_roll") -> bool:
@@ -417,44 +405,13 @@ class BarcodeGenerator:
             str: Next barcode ID like SET_00001-25, SET_00002-25, etc.
         """
         try:
-            current_year = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%y")
-
-            # Get all SET barcodes for the current year
-            pattern = f"SET_%-{current_year}"
-            result = db.query(models.InventoryMaster.barcode_id).filter(
-                models.InventoryMaster.barcode_id.like(pattern)
-            ).all()
-
-            # Extract counter values and find max
-            max_number = 0
-            for row in result:
-                barcode_id = row[0]
-                if barcode_id:
-                    try:
-                        # Extract number from SET_00123-25 format
-                        parts = barcode_id.split("-")
-                        if len(parts) >= 2 and parts[0].startswith('SET_'):
-                            current_number = int(parts[0][4:])  # Remove 'SET_' prefix
-                            max_number = max(max_number, current_number)
-                    except (ValueError, AttributeError, IndexError):
-                        continue
-
-            next_number = max_number + 1
-
-            # Format as SET_00001-25 (5 digits with leading zeros and year)
-            barcode_id = f"SET_{next_number:05d}-{current_year}"
-
+            barcode_id = BarcodeGenerator.reserve_barcodes(db, "118_roll", 1)[0]
             logger.info(f"Generated 118 roll barcode: {barcode_id}")
             return barcode_id
 
         except Exception as e:
             logger.error(f"Error generating 118 roll barcode: {e}")
-            # Fallback to timestamp-based ID
-            import time
-            current_year = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%y")
-            fallback_id = f"SET_{int(time.time()) % 100000:05d}-{current_year}"
-            logger.warning(f"Using fallback 118 roll barcode: {fallback_id}")
-            return fallback_id
+            raise
 
     @staticmethod
     def generate_jumbo_roll_barcode(db: Session) -> str:
@@ -469,44 +426,13 @@ class BarcodeGenerator:
             str: Next barcode ID like JR_00001-25, JR_00002-25, etc.
         """
         try:
-            current_year = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%y")
-
-            # Get all JR barcodes for the current year
-            pattern = f"JR_%-{current_year}"
-            result = db.query(models.InventoryMaster.barcode_id).filter(
-                models.InventoryMaster.barcode_id.like(pattern)
-            ).all()
-
-            # Extract counter values and find max
-            max_number = 0
-            for row in result:
-                barcode_id = row[0]
-                if barcode_id:
-                    try:
-                        # Extract number from JR_00123-25 format
-                        parts = barcode_id.split("-")
-                        if len(parts) >= 2 and parts[0].startswith('JR_'):
-                            current_number = int(parts[0][3:])  # Remove 'JR_' prefix
-                            max_number = max(max_number, current_number)
-                    except (ValueError, AttributeError, IndexError):
-                        continue
-
-            next_number = max_number + 1
-
-            # Format as JR_00001-25 (5 digits with leading zeros and year)
-            barcode_id = f"JR_{next_number:05d}-{current_year}"
-
+            barcode_id = BarcodeGenerator.reserve_barcodes(db, "jumbo", 1)[0]
             logger.info(f"Generated jumbo roll barcode: {barcode_id}")
             return barcode_id
 
         except Exception as e:
             logger.error(f"Error generating jumbo roll barcode: {e}")
-            # Fallback to timestamp-based ID
-            import time
-            current_year = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%y")
-            fallback_id = f"JR_{int(time.time()) % 100000:05d}-{current_year}"
-            logger.warning(f"Using fallback jumbo roll barcode: {fallback_id}")
-            return fallback_id
+            raise
 
     @staticmethod
     def is_barcode_unique(db: Session, barcode_id: str, table: str = "inventory") -> bool:
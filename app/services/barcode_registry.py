@@ -0,0 +1,304 @@
+"""
+Barcode Registry - One indexed lookup from a scanned code to its roll
+
+The scanner endpoints used to probe InventoryMaster with an OR over qr_code /
+barcode_id and then ManualCutRoll (or the other way round for CR_ codes), so a
+scan cost two to three joined queries. The barcode_registry table maps every
+barcode / QR code of InventoryMaster, ManualCutRoll and WastageInventory to
+(source table, row id, roll type):
+
+- entries are written in the same flush that inserts a roll, and rewritten when
+  its barcode, QR code or roll type changes (session after_flush, models.py)
+- rows written outside the ORM are picked up by reconcile() at startup, which
+  also drops entries whose roll no longer exists
+
+A scan is one seek on barcode_registry.code followed by one primary key load.
+Codes missing from the registry fall back to the old per-table probes, so a
+stale registry can slow a scan down but never make it miss.
+"""
+
+import os
+import uuid
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import inspect, or_
+from sqlalchemy.orm import Session
+
+from .. import models
+from .batch_lookup import chunked, load_by_keys
+
+logger = logging.getLogger(__name__)
+
+BARCODE_REGISTRY_FALLBACK = os.getenv("BARCODE_REGISTRY_FALLBACK", "true").lower() == "true"
+
+INVENTORY = "inventory_master"
+MANUAL = "manual_cut_roll"
+WASTAGE = "wastage_inventory"
+
+# Source table -> model
+SOURCE_MODELS = {
+    INVENTORY: models.InventoryMaster,
+    MANUAL: models.ManualCutRoll,
+    WASTAGE: models.WastageInventory,
+}
+
+# Source table -> columns the entries are built from
+SOURCE_COLUMNS = {
+    INVENTORY: ("id", "barcode_id", "qr_code", "roll_type"),
+    MANUAL: ("id", "barcode_id"),
+    WASTAGE: ("id", "barcode_id"),
+}
+
+# Attributes whose changes rewrite a row's entries
+TRACKED_ATTRIBUTES = ("barcode_id", "qr_code", "roll_type")
+
+Entry = Dict[str, Any]
+
+
+def scan_order(code: str) -> Tuple[str, ...]:
+    """Tables to resolve a scanned code against, in priority order (CR_ codes are manual cut rolls first)."""
+    return (MANUAL, INVENTORY) if code.startswith("CR_") else (INVENTORY, MANUAL)
+
+
+def _entries_of(source: str, roll: Any) -> List[Entry]:
+    """Registry entries for the current codes of a roll (model instance or SOURCE_COLUMNS row)."""
+    if source == INVENTORY:
+        roll_type = roll.roll_type
+        codes = [(roll.barcode_id, "barcode")]
+        if roll.qr_code != roll.barcode_id:
+            codes.append((roll.qr_code, "qr"))
+    else:
+        roll_type = "manual_cut" if source == MANUAL else "wastage"
+        codes = [(roll.barcode_id, "barcode")]
+
+    return [
+        {
+            "id": uuid.uuid4(), "code": code, "code_type": code_type,
+            "source_table": source, "entity_id": roll.id, "roll_type": roll_type
+        }
+        for code, code_type in codes if code
+    ]
+
+
+class BarcodeRegistry:
+    """Maintains and queries the barcode_registry table."""
+
+    def __init__(self, fallback: bool = BARCODE_REGISTRY_FALLBACK):
+        self.fallback = fallback
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def resolve(
+        self,
+        db: Session,
+        code: str,
+        sources: Sequence[str],
+        options: Optional[Dict[str, Iterable[Any]]] = None,
+        barcode_only: bool = False
+    ) -> Tuple[Optional[str], Optional[Any]]:
+        """
+        Roll a scanned code belongs to, trying sources in order.
+
+        Args:
+            db: Database session
+            code: Scanned barcode or QR code
+            sources: Source tables in priority order (see scan_order)
+            options: Source table -> loader options for the roll query
+            barcode_only: Match InventoryMaster on barcode_id only, not qr_code
+
+        Returns:
+            (source table, roll) or (None, None) if the code is unknown
+        """
+        options = options or {}
+        entries = db.query(
+            models.BarcodeRegistryEntry.source_table,
+            models.BarcodeRegistryEntry.entity_id,
+            models.BarcodeRegistryEntry.code_type
+        ).filter(
+            models.BarcodeRegistryEntry.code == code,
+            models.BarcodeRegistryEntry.source_table.in_(sources)
+        ).all()
+
+        for source in sources:
+            for entry in entries:
+                if entry.source_table != source or (barcode_only and entry.code_type != "barcode"):
+                    continue
+                model = SOURCE_MODELS[source]
+                roll = db.query(model).options(*options.get(source, ())).filter(model.id == entry.entity_id).first()
+                if roll:
+                    return source, roll
+
+        if not self.fallback:
+            return None, None
+
+        # Not (or no longer) registered: probe the tables directly
+        for source in sources:
+            model = SOURCE_MODELS[source]
+            if source == INVENTORY and not barcode_only:
+                condition = or_(model.qr_code == code, model.barcode_id == code)
+            else:
+                condition = model.barcode_id == code
+            roll = db.query(model).options(*options.get(source, ())).filter(condition).first()
+            if roll:
+                logger.warning(f"📇 BARCODE REGISTRY: '{code}' found in {source} but not registered - run reconcile")
+                return source, roll
+        return None, None
+
+    def resolve_many(
+        self,
+        db: Session,
+        codes: Iterable[str],
+        options: Optional[Dict[str, Iterable[Any]]] = None
+    ) -> Dict[str, Tuple[str, Any]]:
+        """
+        Rolls of many scanned codes: one registry query, then one load per table.
+        Each code is resolved in its scan_order priority.
+
+        Returns:
+            Code -> (source table, roll) for the codes found
+        """
+        options = options or {}
+        codes = list(dict.fromkeys(code for code in codes if code))
+        registry = models.BarcodeRegistryEntry
+
+        entries: Dict[str, List[Any]] = defaultdict(list)
+        for chunk in chunked(codes):
+            for entry in db.query(registry.code, registry.source_table, registry.entity_id).filter(
+                registry.code.in_(chunk),
+                registry.source_table.in_((INVENTORY, MANUAL))
+            ).all():
+                entries[entry.code].append(entry)
+
+        rolls = {
+            source: load_by_keys(
+                db, SOURCE_MODELS[source], SOURCE_MODELS[source].id,
+                [entry.entity_id for code_entries in entries.values() for entry in code_entries
+                 if entry.source_table == source],
+                options=options.get(source, ())
+            )
+            for source in (INVENTORY, MANUAL)
+        }
+
+        resolved: Dict[str, Tuple[str, Any]] = {}
+        for code in codes:
+            for source in scan_order(code):
+                roll = next(
+                    (rolls[source][entry.entity_id] for entry in entries.get(code, ())
+                     if entry.source_table == source and entry.entity_id in rolls[source]),
+                    None
+                )
+                if roll:
+                    resolved[code] = (source, roll)
+                    break
+
+        unresolved = [code for code in codes if code not in resolved]
+        if unresolved and self.fallback:
+            # Not (or no longer) registered: probe the tables directly, one IN query per table
+            inventory = models.InventoryMaster
+            found: Dict[str, Dict[str, Any]] = {INVENTORY: {}, MANUAL: {}}
+            for chunk in chunked(unresolved):
+                for roll in db.query(inventory).options(*options.get(INVENTORY, ())).filter(
+                    or_(inventory.qr_code.in_(chunk), inventory.barcode_id.in_(chunk))
+                ).all():
+                    found[INVENTORY].setdefault(roll.qr_code, roll)
+                    found[INVENTORY].setdefault(roll.barcode_id, roll)
+            found[MANUAL] = load_by_keys(
+                db, models.ManualCutRoll, models.ManualCutRoll.barcode_id, unresolved,
+                options=options.get(MANUAL, ())
+            )
+            for code in unresolved:
+                for source in scan_order(code):
+                    if code in found[source]:
+                        resolved[code] = (source, found[source][code])
+                        logger.warning(f"📇 BARCODE REGISTRY: '{code}' found in {source} but not registered - run reconcile")
+                        break
+
+        return resolved
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def sync_flush(self, session: Session) -> None:
+        """Write the entries of rolls inserted, re-coded or deleted in a flush (same transaction)."""
+        new_entries: List[Entry] = []
+        stale_ids: List[Any] = []
+
+        for obj in session.new:
+            source = getattr(obj, "__tablename__", None)
+            if source in SOURCE_MODELS:
+                new_entries.extend(_entries_of(source, obj))
+
+        for obj in session.dirty:
+            source = getattr(obj, "__tablename__", None)
+            if source not in SOURCE_MODELS:
+                continue
+            state = inspect(obj)
+            if any(
+                attr in state.attrs and state.attrs[attr].history.has_changes()
+                for attr in TRACKED_ATTRIBUTES
+            ):
+                stale_ids.append(obj.id)
+                new_entries.extend(_entries_of(source, obj))
+
+        for obj in session.deleted:
+            if getattr(obj, "__tablename__", None) in SOURCE_MODELS:
+                stale_ids.append(obj.id)
+
+        if not new_entries and not stale_ids:
+            return
+
+        registry = models.BarcodeRegistryEntry.__table__
+        connection = session.connection()
+        for chunk in chunked(stale_ids):
+            connection.execute(registry.delete().where(registry.c.entity_id.in_(chunk)))
+        if new_entries:
+            connection.execute(registry.insert(), new_entries)
+
+    def reconcile(self, db: Session) -> Dict[str, int]:
+        """
+        Register rolls that have no entries yet and drop entries of deleted rolls.
+        Commits.
+
+        Returns:
+            Source table -> rolls registered, plus "removed" entry count
+        """
+        registry = models.BarcodeRegistryEntry
+        stats: Dict[str, int] = {}
+
+        for source, model in SOURCE_MODELS.items():
+            registered = db.query(registry.id).filter(
+                registry.source_table == source,
+                registry.entity_id == model.id
+            ).exists()
+            has_code = model.barcode_id.isnot(None)
+            if source == INVENTORY:
+                has_code = or_(has_code, model.qr_code.isnot(None))
+            missing = db.query(
+                *[getattr(model, column) for column in SOURCE_COLUMNS[source]]
+            ).filter(has_code, ~registered).all()
+
+            entries = [entry for roll in missing for entry in _entries_of(source, roll)]
+            for start in range(0, len(entries), 1000):
+                db.execute(registry.__table__.insert(), entries[start:start + 1000])
+            stats[source] = len(missing)
+
+        removed = 0
+        for source, model in SOURCE_MODELS.items():
+            removed += db.query(registry).filter(
+                registry.source_table == source,
+                ~db.query(model.id).filter(model.id == registry.entity_id).exists()
+            ).delete(synchronize_session=False)
+        stats["removed"] = removed
+
+        db.commit()
+        logger.info(f"📇 BARCODE REGISTRY: Reconciled - {stats}")
+        return stats
+
+
+# Shared process-wide instance
+barcode_registry = BarcodeRegistry()
@@ -0,0 +1,78 @@
+"""
+Batch Lookup - Resolve related rows for a whole page in one query per relation
+
+List and detail endpoints used to issue a query per row for related data
+(payment slip exists?, allocated order, manual cut roll by barcode, ...). These
+helpers collect the keys of the page first and resolve each relation with one
+IN (...) query, chunked below SQL Server's 2100 bind parameter limit, returning
+dicts the formatting loop can read from.
+"""
+
+from typing import Any, Dict, Iterable, List, Set
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+# Max bind parameters per IN list (SQL Server allows 2100 per statement)
+IN_CHUNK_SIZE = 1000
+
+
+def chunked(keys: Iterable[Any]) -> Iterable[List[Any]]:
+    """Distinct non-null keys in IN-list sized chunks."""
+    values = list(dict.fromkeys(key for key in keys if key is not None))
+    for start in range(0, len(values), IN_CHUNK_SIZE):
+        yield values[start:start + IN_CHUNK_SIZE]
+
+
+def existing_keys(db: Session, key_column: Any, keys: Iterable[Any], *filters: Any) -> Set[Any]:
+    """Keys that have at least one row in key_column's table (matching filters)."""
+    found: Set[Any] = set()
+    for chunk in chunked(keys):
+        found.update(
+            key for (key,) in db.query(key_column).filter(key_column.in_(chunk), *filters).distinct().all()
+        )
+    return found
+
+
+def load_by_keys(
+    db: Session,
+    model: Any,
+    key_column: Any,
+    keys: Iterable[Any],
+    *filters: Any,
+    options: Iterable[Any] = ()
+) -> Dict[Any, Any]:
+    """Key -> first matching model instance (like a per-key .first())."""
+    key_name = key_column.key
+    result: Dict[Any, Any] = {}
+    for chunk in chunked(keys):
+        for obj in db.query(model).options(*options).filter(key_column.in_(chunk), *filters).all():
+            result.setdefault(getattr(obj, key_name), obj)
+    return result
+
+
+def load_grouped(
+    db: Session,
+    model: Any,
+    key_column: Any,
+    keys: Iterable[Any],
+    *filters: Any,
+    options: Iterable[Any] = ()
+) -> Dict[Any, List[Any]]:
+    """Key -> all matching model instances."""
+    key_name = key_column.key
+    result: Dict[Any, List[Any]] = {}
+    for chunk in chunked(keys):
+        for obj in db.query(model).options(*options).filter(key_column.in_(chunk), *filters).all():
+            result.setdefault(getattr(obj, key_name), []).append(obj)
+    return result
+
+
+def count_by_keys(db: Session, key_column: Any, keys: Iterable[Any], *filters: Any) -> Dict[Any, int]:
+    """Key -> number of rows (keys without rows are missing, read with .get(key, 0))."""
+    counts: Dict[Any, int] = {}
+    for chunk in chunked(keys):
+        counts.update(
+            db.query(key_column, func.count()).filter(key_column.in_(chunk), *filters).group_by(key_column).all()
+        )
+    return counts
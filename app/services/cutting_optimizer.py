@@ -1,9 +1,15 @@
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from itertools import product, combinations_with_replacement
 import math
+import multiprocessing
+import os
+import numpy as np
+import threading
 from typing import List, Tuple, Dict, Optional, Set, Union, Any
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
@@ -12,6 +18,9 @@ import uuid
 import logging
 
 from .. import models, schemas, crud_operations
+from .pattern_cache import pattern_cache
+from .optimization_cache import optimization_cache
+from .pattern_index import pattern_index
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +33,13 @@ except ImportError:
     ORTOOLS_AVAILABLE = False
     logger.error("❌ OR-Tools not available - install with: pip install ortools")
 
+# GLOP LP solver (bundled with OR-Tools) drives the column generation master problem
+try:
+    from ortools.linear_solver import pywraplp
+    GLOP_AVAILABLE = True
+except ImportError:
+    GLOP_AVAILABLE = False
+
 # PuLP support commented out - OR-Tools is 3.1x faster and more reliable
 # try:
 #     from pulp import LpProblem, LpVariable, LpMinimize, LpStatus, lpSum, LpInteger
@@ -33,19 +49,92 @@ except ImportError:
 
 SOLVER_AVAILABLE = ORTOOLS_AVAILABLE
 
+PATTERN_SCALE = 100  # Pattern widths are stored in hundredths of an inch
+
+
+def scale_width(width: float) -> int:
+    """Convert a width in inches to integer hundredths (rounded, never truncated)."""
+    return int(round(float(width) * PATTERN_SCALE))
+
+
+def pattern_width_index(widths) -> Tuple[int, ...]:
+    """Canonical width index (sorted, de-duplicated scaled widths) that pattern count vectors align to."""
+    return tuple(sorted({scale_width(w) for w in widths}))
+
+
+def distinct_permutations(values: Tuple[float, ...]):
+    """Yield each distinct ordering of values once, in lexicographic order."""
+    current = sorted(values)
+    while True:
+        yield tuple(current)
+        i = len(current) - 2
+        while i >= 0 and current[i] >= current[i + 1]:
+            i -= 1
+        if i < 0:
+            return
+        j = len(current) - 1
+        while current[j] <= current[i]:
+            j -= 1
+        current[i], current[j] = current[j], current[i]
+        current[i + 1:] = reversed(current[i + 1:])
+
+
 class Pattern:
-    """Represents a cutting pattern for the ILP algorithm"""
-    def __init__(self, lanes: Tuple[float, ...], deckle: float = 118.0):
-        self.lanes = tuple(sorted(lanes, reverse=True))  # Sort for consistency
-        self.total_width = sum(lanes)
-        self.trim = deckle - self.total_width
-        self.coeff = Counter(lanes)  # How many of each width this pattern produces
+    """
+    Represents a cutting pattern for the ILP algorithm.
+    
+    Widths are held as integers in hundredths of an inch, so patterns built from
+    29.9 and 29.900000001 are the same pattern. counts is a fixed-length vector
+    aligned to scaled_widths (the demand width index for the solve), which the
+    ILP and greedy paths consume directly instead of per-pattern dictionaries.
+    """
+    __slots__ = ('scaled_lanes', 'scaled_trim', 'scaled_widths', 'counts', '_hash')
+    
+    def __init__(self, lanes: Tuple[float, ...], deckle: float = 118.0, widths: Optional[Tuple[int, ...]] = None):
+        scaled_lanes = [scale_width(w) for w in lanes]
+        self._init_scaled(scaled_lanes, scale_width(deckle), widths if widths is not None else pattern_width_index(lanes))
+    
+    @classmethod
+    def from_scaled(cls, scaled_lanes: Tuple[int, ...], scaled_deckle: int, widths: Tuple[int, ...]) -> "Pattern":
+        """Build a pattern from already-scaled lanes without float round-trips."""
+        pattern = cls.__new__(cls)
+        pattern._init_scaled(scaled_lanes, scaled_deckle, widths)
+        return pattern
+    
+    def _init_scaled(self, scaled_lanes, scaled_deckle: int, widths: Tuple[int, ...]) -> None:
+        self.scaled_lanes = tuple(sorted(scaled_lanes, reverse=True))  # Sort for consistency
+        self.scaled_trim = scaled_deckle - sum(self.scaled_lanes)
+        self.scaled_widths = widths
+        self.counts = tuple(self.scaled_lanes.count(w) for w in widths)  # How many of each width this pattern produces
+        self._hash = hash(self.scaled_lanes)
+    
+    @property
+    def lanes(self) -> Tuple[float, ...]:
+        return tuple(w / PATTERN_SCALE for w in self.scaled_lanes)
+    
+    @property
+    def total_width(self) -> float:
+        return sum(self.scaled_lanes) / PATTERN_SCALE
+    
+    @property
+    def trim(self) -> float:
+        return self.scaled_trim / PATTERN_SCALE
+    
+    @property
+    def pieces(self) -> int:
+        return len(self.scaled_lanes)
+    
+    def aligned_counts(self, widths: Tuple[int, ...]) -> Tuple[int, ...]:
+        """Count vector for another width index (the stored vector when the index matches)."""
+        if widths is self.scaled_widths or widths == self.scaled_widths:
+            return self.counts
+        return tuple(self.scaled_lanes.count(w) for w in widths)
         
     def __hash__(self):
-        return hash(self.lanes)
+        return self._hash
     
     def __eq__(self, other):
-        return isinstance(other, Pattern) and self.lanes == other.lanes
+        return isinstance(other, Pattern) and self.scaled_lanes == other.scaled_lanes
     
     def __repr__(self):
         return f"Pattern({self.lanes}, trim={self.trim:.2f})"
@@ -64,28 +153,147 @@ class RollSpec:
     bf: float
     shade: str
 
+@dataclass
+class SolverConfig:
+    """CP-SAT tuning for the ILP solve."""
+    time_limit_seconds: float = 30.0   # Hard time budget per CP-SAT solve
+    num_workers: int = min(8, os.cpu_count() or 1)  # Parallel CP-SAT search workers
+    relative_gap_limit: float = 0.0    # Stop early once within this relative gap of the best bound (0 = prove optimal)
+    use_greedy_hint: bool = True       # Warm-start CP-SAT from the greedy heuristic solution
+
 # --- CONFIGURATIONS ---
 DEFAULT_JUMBO_WIDTH = 118  # Default width, can be overridden
 MIN_TRIM = 1
 MAX_TRIM = 20
 MAX_TRIM_WITH_CONFIRMATION = 20
 MAX_ROLLS_PER_JUMBO = 5
+COLUMN_GENERATION_MAX_ITERATIONS = 200
+COLUMN_GENERATION_FULL_ILP_LIMIT = 500  # Full pattern sets up to this size are solved directly when columns fall short
+SMART_SAMPLING_CANDIDATES = 6000  # Candidate count vectors scored per pattern combination (vectorized)
+INCREMENTAL_MAX_DELTA_FRACTION = 0.25  # Demand changes above this share of the spec group are fully re-solved
+INCREMENTAL_REPAIR_NEIGHBOURHOOD = 0.3  # Share of demand released around the change for the repair solve
+INCREMENTAL_TRIM_TOLERANCE = 0.5  # Average trim per set (inches) a repair may add over the previous plan
+REPAIR_WORK_KEY = "incremental_repair"  # Marks residual solves among the spec groups of one batch
+OPTIMIZER_PARALLEL_WORKERS = int(os.getenv("OPTIMIZER_PARALLEL_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Shared process pool for per-spec-group solving (created at application startup, reused across requests).
+# Workers are started by a forkserver (spawn where unavailable), never forked from the multithreaded API
+# process, so they don't inherit its held locks or database handles.
+_spec_group_pool: Optional[ProcessPoolExecutor] = None
+_spec_group_pool_lock = threading.Lock()
+
+def _spec_group_pool_context():
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(start_method)
+
+def _get_spec_group_pool() -> ProcessPoolExecutor:
+    global _spec_group_pool
+    with _spec_group_pool_lock:
+        if _spec_group_pool is None:
+            _spec_group_pool = ProcessPoolExecutor(
+                max_workers=OPTIMIZER_PARALLEL_WORKERS,
+                mp_context=_spec_group_pool_context()
+            )
+        return _spec_group_pool
+
+def start_spec_group_pool() -> None:
+    """Create the spec group pool (called on application startup; scripts create it on first use)."""
+    if OPTIMIZER_PARALLEL_WORKERS > 1:
+        _get_spec_group_pool()
+
+def _discard_spec_group_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next request starts a fresh one (no-op if it was already replaced)."""
+    global _spec_group_pool
+    with _spec_group_pool_lock:
+        if _spec_group_pool is pool:
+            _spec_group_pool = None
+    pool.shutdown(wait=False)
+
+def shutdown_spec_group_pool() -> None:
+    """Stop the spec group worker processes (called on application shutdown)."""
+    global _spec_group_pool
+    with _spec_group_pool_lock:
+        if _spec_group_pool is not None:
+            _spec_group_pool.shutdown(wait=False, cancel_futures=True)
+            _spec_group_pool = None
+
+def _match_combos_worker(jumbo_roll_width: int, solver_config: "SolverConfig", orders: Dict[float, int], interactive: bool, algorithm: str, hint_sets: Optional[List[Tuple[float, ...]]] = None):
+    """Process pool entry point: solve one spec group."""
+    from ..database import SessionLocal
+    pattern_index.ensure_loaded(SessionLocal)
+    optimizer = CuttingOptimizer(jumbo_roll_width=jumbo_roll_width, solver_config=solver_config)
+    return optimizer.match_combos(orders, interactive, algorithm, hint_sets)
 
 class CuttingOptimizer:
-    def __init__(self, jumbo_roll_width: int = DEFAULT_JUMBO_WIDTH):
+    def __init__(
+        self,
+        jumbo_roll_width: int = DEFAULT_JUMBO_WIDTH,
+        solver_config: Optional[SolverConfig] = None,
+        use_result_cache: bool = False,
+        cache_db: Optional[Session] = None
+    ):
         """
         Initialize the cutting optimizer with configuration.
         
         Args:
             jumbo_roll_width: Width of jumbo rolls in inches (default: 118)
+            solver_config: CP-SAT time budget, workers, gap limit and warm-start settings
+            use_result_cache: Reuse cached per-spec results for identical demand vectors
+            cache_db: Optional session for the SQL tier of the result cache
         """
         self.jumbo_roll_width = jumbo_roll_width
+        self.solver_config = solver_config or SolverConfig()
+        self.use_result_cache = use_result_cache
+        self.cache_db = cache_db
+        # spec_key -> (demand, (used, pending, high_trims)) from the last optimize run;
+        # with INCREMENTAL_REPAIR_ENABLED, PlanCalculationService keeps these per order set and
+        # passes them back as previous_solutions
+        self.last_spec_solutions: Dict[tuple, Tuple[Dict[float, int], Tuple]] = {}
     
     def generate_combos(self, sizes: List[float]) -> List[Tuple[Tuple[float, ...], float]]:
         """
         Generate all combos (1 to 3 rolls) with trim calculation.
         Returns combos sorted by: more rolls first, then lower trim.
+        Results are cached process-wide per (width set, jumbo width, trim cap, max lanes)
+        and come from the persisted pattern index when it covers the widths.
+        """
+        cache_key = pattern_cache.make_key(
+            "combos", sizes, self.jumbo_roll_width, MAX_TRIM_WITH_CONFIRMATION, MAX_ROLLS_PER_JUMBO
+        )
+        sorted_combos = pattern_cache.get_or_build(
+            cache_key,
+            lambda: self._indexed_combos(sizes) or self._enumerate_combos(sorted(sizes))
+        )
+        logger.info(f"🔍 COMBO DEBUG: {len(sorted_combos)} valid combos for sizes {sizes}, showing first 10:")
+        for i, (combo, trim) in enumerate(sorted_combos[:10]):
+            logger.info(f"  {i+1}. {combo} → trim={trim}\" ({len(combo)} pieces)")
+        return sorted_combos
+
+    def _indexed_combos(self, sizes: List[float]) -> Optional[List[Tuple[Tuple[float, ...], float]]]:
+        """
+        Combos for generate_combos from the pattern index, or None when not indexed.
+
+        Matches _enumerate_combos exactly: that walks product() over the sorted sizes,
+        so every ordering of a pattern is one entry, and the stable sort keeps them in
+        lexicographic order within the same roll count and trim.
         """
+        if any(scale_width(size) / PATTERN_SCALE != size for size in sizes):
+            return None  # Widths finer than the index scale
+        indexed = pattern_index.lookup(sizes, self.jumbo_roll_width, MAX_TRIM_WITH_CONFIRMATION, MAX_ROLLS_PER_JUMBO)
+        if indexed is None:
+            return None
+
+        entries = []
+        for lanes in indexed:
+            combo = tuple(w / PATTERN_SCALE for w in lanes)
+            trim = round(self.jumbo_roll_width - sum(combo), 2)
+            for ordering in distinct_permutations(combo):
+                entries.append((-len(combo), trim, ordering, combo))
+        entries.sort()
+        return [(combo, trim) for _, trim, _, combo in entries]
+
+    def _enumerate_combos(self, sizes: List[float]) -> List[Tuple[Tuple[float, ...], float]]:
+        """Enumerate combos for generate_combos (uncached)."""
         logger.info(f"🔍 COMBO DEBUG: Generating combos for sizes: {sizes}")
         valid_combos = []
         for r in range(1, MAX_ROLLS_PER_JUMBO + 1):
@@ -99,15 +307,11 @@ class CuttingOptimizer:
                     logger.debug(f"🔍 COMBO DEBUG: Rejected combo: {tuple(sorted(combo))} → {total}\" used, {trim}\" trim (outside 0-20\" range)")
         
         # Prefer: more rolls, then lower trim
-        sorted_combos = sorted(valid_combos, key=lambda x: (-len(x[0]), x[1]))
-        logger.info(f"🔍 COMBO DEBUG: Generated {len(sorted_combos)} valid combos, showing first 10:")
-        for i, (combo, trim) in enumerate(sorted_combos[:10]):
-            logger.info(f"  {i+1}. {combo} → trim={trim}\" ({len(combo)} pieces)")
-        return sorted_combos
+        return sorted(valid_combos, key=lambda x: (-len(x[0]), x[1]))
 
     # === ILP-BASED OPTIMIZATION METHODS ===
     
-    def _solve_cutting_with_ilp(self, demand: Dict[float, int], trim_cap: float = 6.0, max_lanes: int = MAX_ROLLS_PER_JUMBO, exact_quantities: bool = True) -> Dict:
+    def _solve_cutting_with_ilp(self, demand: Dict[float, int], trim_cap: float = 6.0, max_lanes: int = MAX_ROLLS_PER_JUMBO, exact_quantities: bool = True, hint_sets: Optional[List[Tuple[float, ...]]] = None) -> Dict:
         """Main ILP solving method - now enhanced with OR-Tools support."""
         precision = 0.01
         scale_factor = int(1 / precision)
@@ -129,7 +333,7 @@ class CuttingOptimizer:
         # Use OR-Tools CP-SAT solver (3.1x faster than PuLP)
         if ORTOOLS_AVAILABLE:
             logger.info("🚀 Using OR-Tools CP-SAT solver" + (" (EXACT MODE)" if exact_quantities else ""))
-            result = self._solve_ortools_exact(patterns, demand, exact_quantities=exact_quantities)
+            result = self._solve_ortools_exact(patterns, demand, exact_quantities=exact_quantities, hint_sets=hint_sets)
             if result['status'] in ['Optimal', 'Feasible']:
                 return result
                 
@@ -138,11 +342,29 @@ class CuttingOptimizer:
         return self._solve_greedy_exact(patterns, demand)
     
     def _generate_ilp_patterns(self, widths: List[float], trim_cap: float, max_lanes: int, deckle: float, scale_factor: int) -> List[Pattern]:
-        """Generate all feasible cutting patterns for ILP"""
-        patterns = set()
-        scaled_deckle = int(deckle * scale_factor)
-        scaled_widths = [int(w * scale_factor) for w in widths]
-        scaled_trim_cap = int(trim_cap * scale_factor)
+        """Generate all feasible cutting patterns for ILP (cached process-wide per width set and limits, loaded from the pattern index when indexed)"""
+        cache_key = pattern_cache.make_key("ilp", widths, deckle, trim_cap, max_lanes)
+        return pattern_cache.get_or_build(
+            cache_key,
+            lambda: self._indexed_ilp_patterns(widths, trim_cap, max_lanes, deckle)
+            or self._enumerate_ilp_patterns(sorted(widths), trim_cap, max_lanes, deckle, scale_factor)
+        )
+
+    def _indexed_ilp_patterns(self, widths: List[float], trim_cap: float, max_lanes: int, deckle: float) -> Optional[List[Pattern]]:
+        """ILP patterns from the pattern index (same order as enumeration), or None when not indexed."""
+        indexed = pattern_index.lookup(widths, deckle, trim_cap, max_lanes)
+        if indexed is None:
+            return None
+        scaled_deckle = scale_width(deckle)
+        width_index = pattern_width_index(widths)
+        return [Pattern.from_scaled(lanes, scaled_deckle, width_index) for lanes in indexed]
+
+    def _enumerate_ilp_patterns(self, widths: List[float], trim_cap: float, max_lanes: int, deckle: float, scale_factor: int) -> List[Pattern]:
+        """Enumerate feasible ILP patterns (uncached)."""
+        patterns = []
+        scaled_deckle = scale_width(deckle)
+        scaled_widths = pattern_width_index(widths)  # De-duplicated, so every combination is a distinct pattern
+        scaled_trim_cap = scale_width(trim_cap)
         
         # Generate all combinations with repetition up to max_lanes
         for num_lanes in range(1, max_lanes + 1):
@@ -151,23 +373,31 @@ class CuttingOptimizer:
                 if total_scaled <= scaled_deckle:
                     trim_scaled = scaled_deckle - total_scaled
                     if trim_scaled <= scaled_trim_cap:
-                        # Convert back to float widths
-                        float_lanes = tuple(w / scale_factor for w in combo)
-                        pattern = Pattern(float_lanes, deckle)
-                        patterns.add(pattern)
+                        patterns.append(Pattern.from_scaled(combo, scaled_deckle, scaled_widths))
         
-        return list(patterns)
+        return patterns
     
-    def _solve_ortools_exact(self, patterns: List[Pattern], demand: Dict[float, int], time_limit: int = 30, exact_quantities: bool = True) -> Dict:
+    def _solve_ortools_exact(self, patterns: List[Pattern], demand: Dict[float, int], time_limit: Optional[float] = None, exact_quantities: bool = True, hint_sets: Optional[List[Tuple[float, ...]]] = None) -> Dict:
         """
         Solve exact fulfillment using OR-Tools CP-SAT solver.
         Generally 3-10x faster than PuLP with better constraint handling.
+        Time budget, worker count, gap limit and greedy warm-start come from self.solver_config.
+        hint_sets (combos, e.g. from a previous plan) are hinted first, with the greedy
+        solution of the demand they leave filling in the rest of the hint.
         """
         try:
+            config = self.solver_config
             # Create CP-SAT model
             model = cp_model.CpModel()
             solver = cp_model.CpSolver()
-            solver.parameters.max_time_in_seconds = time_limit
+            solver.parameters.max_time_in_seconds = time_limit if time_limit is not None else config.time_limit_seconds
+            solver.parameters.num_workers = config.num_workers
+            solver.parameters.relative_gap_limit = config.relative_gap_limit
+            
+            # Count vectors aligned to the demand width index
+            width_index = pattern_width_index(demand)
+            column = {w: k for k, w in enumerate(width_index)}
+            vectors = [pattern.aligned_counts(width_index) for pattern in patterns]
             
             # Decision variables: how many times to run each pattern
             pattern_vars = {}
@@ -182,15 +412,16 @@ class CuttingOptimizer:
                 width_productions = []
                 patterns_for_width = []
                 
+                k = column[scale_width(width)]
                 for i, pattern in enumerate(patterns):
-                    width_count = pattern.coeff.get(width, 0)  # Use .get() to handle missing keys
+                    width_count = vectors[i][k]
                     if width_count > 0:
                         width_productions.append(pattern_vars[i] * width_count)
-                        patterns_for_width.append(f"Pattern {i} ({pattern.lanes}) produces {width_count}x{width}")
+                        patterns_for_width.append((i, width_count))
                 
                 logger.debug(f"🔍 Width {width} (need {demand[width]}): {len(patterns_for_width)} producing patterns")
-                for pattern_info in patterns_for_width[:3]:  # Show first 3
-                    logger.debug(f"    {pattern_info}")
+                for i, width_count in patterns_for_width[:3]:  # Show first 3
+                    logger.debug(f"    Pattern {i} ({patterns[i].lanes}) produces {width_count}x{width}")
                 
                 if width_productions:
                     # Apply constraints based on exact_quantities mode
@@ -205,14 +436,14 @@ class CuttingOptimizer:
                         logger.debug(f"    ✅ FLEXIBLE MODE: {demand[width]} <= sum <= {demand[width] * 3}")
                 else:
                     logger.error(f"❌ CONSTRAINT ERROR: No patterns can produce width {width}")
-                    logger.debug(f"Available patterns: {[(p.lanes, p.coeff) for p in patterns[:5]]}")
+                    logger.debug(f"Available patterns: {[(p.lanes, p.counts) for p in patterns[:5]]}")
                     return {'status': 'Infeasible', 'message': f'No patterns can produce width {width}'}
             
             # Add overall production constraint to prevent massive over-production
             total_demand = sum(demand.values())
             total_production_terms = []
             for i, pattern in enumerate(patterns):
-                pieces_per_pattern = len(pattern.lanes)  # Number of pieces this pattern produces
+                pieces_per_pattern = pattern.pieces  # Number of pieces this pattern produces
                 total_production_terms.append(pattern_vars[i] * pieces_per_pattern)
             
             if total_production_terms:
@@ -228,9 +459,8 @@ class CuttingOptimizer:
             # Objective: minimize number of patterns first, then trim (scaled to integers for CP-SAT)
             trim_terms = []
             for i, pattern in enumerate(patterns):
-                # Scale trim by 100 to work with integers
-                scaled_trim = int(pattern.trim * 100)
-                trim_terms.append(pattern_vars[i] * scaled_trim)
+                # Trim is already in integer hundredths
+                trim_terms.append(pattern_vars[i] * pattern.scaled_trim)
             
             # Primary objective: minimize number of patterns (prevent over-production)
             total_patterns = sum(pattern_vars)
@@ -239,6 +469,23 @@ class CuttingOptimizer:
             # Weighted objective: heavily prioritize fewer patterns, then minimize trim
             model.Minimize(total_patterns * 10000 + total_trim)
             
+            # Warm start: hint the given sets, then the greedy heuristic solution for the rest
+            hint_counts = self._hint_pattern_counts(patterns, demand, hint_sets) if hint_sets else {}
+            if config.use_greedy_hint:
+                hinted = Counter()
+                for i, times in hint_counts.items():
+                    for scaled in patterns[i].scaled_lanes:
+                        hinted[scaled] += times
+                remaining_demand = {w: qty - hinted[scale_width(w)] for w, qty in demand.items() if qty > hinted[scale_width(w)]}
+                greedy_counts = self._greedy_pattern_counts(patterns, remaining_demand) if remaining_demand else {}
+                if greedy_counts is not None:
+                    for i, times in greedy_counts.items():
+                        hint_counts[i] = hint_counts.get(i, 0) + times
+            if hint_counts:
+                for i in pattern_vars:
+                    model.AddHint(pattern_vars[i], hint_counts.get(i, 0))
+                logger.debug(f"🔍 OR-TOOLS DEBUG: Hinted solution with {sum(hint_counts.values())} sets")
+            
             # Solve the model
             import time
             start_time = time.time()
@@ -286,39 +533,71 @@ class CuttingOptimizer:
     
     def _solve_greedy_exact(self, patterns: List[Pattern], demand: Dict[float, int]) -> Dict:
         """Greedy heuristic for exact fulfillment"""
-        remaining_demand = demand.copy()
+        solution = self._greedy_pattern_counts(patterns, demand)
+        
+        # Check if we satisfied all demand
+        if solution is None:
+            return {'status': 'Infeasible', 'message': 'Greedy heuristic could not satisfy all demand'}
+        
+        return self._build_ilp_production_plan(patterns, solution, demand)
+    
+    def _hint_pattern_counts(self, patterns: List[Pattern], demand: Dict[float, int], hint_sets: List[Tuple[float, ...]]) -> Dict[int, int]:
+        """Pattern index -> times used for the hint sets that are among patterns and fit the demand."""
+        index_by_lanes = {pattern.scaled_lanes: i for i, pattern in enumerate(patterns)}
+        room = Counter({scale_width(w): qty for w, qty in demand.items()})
+        counts = defaultdict(int)
+        for combo in hint_sets:
+            scaled_lanes = tuple(sorted((scale_width(w) for w in combo), reverse=True))
+            i = index_by_lanes.get(scaled_lanes)
+            needed = Counter(scaled_lanes)
+            if i is None or any(room[w] < n for w, n in needed.items()):
+                continue
+            room.subtract(needed)
+            counts[i] += 1
+        return dict(counts)
+
+    def _greedy_pattern_counts(self, patterns: List[Pattern], demand: Dict[float, int]) -> Optional[Dict[int, int]]:
+        """
+        Greedy heuristic pattern counts (indexes into patterns, which is not reordered).
+        
+        Returns:
+            Dict of pattern index -> times used, or None if demand could not be fully satisfied
+        """
+        width_index = pattern_width_index(demand)
+        column = {w: k for k, w in enumerate(width_index)}
+        vectors = [pattern.aligned_counts(width_index) for pattern in patterns]
+        remaining = [0] * len(width_index)
+        for width, qty in demand.items():
+            remaining[column[scale_width(width)]] += qty
         solution = defaultdict(int)
         
         # Sort patterns by efficiency (low trim, high utilization)
-        def pattern_score(p):
+        def pattern_score(i):
+            p = patterns[i]
             utilization = (self.jumbo_roll_width - p.trim) / self.jumbo_roll_width
-            return (p.trim, -utilization)
+            return (p.scaled_trim, -utilization)
         
-        patterns.sort(key=pattern_score)
+        # Patterns producing widths outside the demand can never be applied
+        order = [i for i in sorted(range(len(patterns)), key=pattern_score) if sum(vectors[i]) == patterns[i].pieces]
         
         max_iterations = 1000  # Prevent infinite loops
         iterations = 0
         
-        while any(remaining_demand.values()) and iterations < max_iterations:
+        while any(remaining) and iterations < max_iterations:
             iterations += 1
             best_pattern = None
             best_times = 0
             best_coverage = 0
             
-            for i, pattern in enumerate(patterns):
+            for i in order:
+                vector = vectors[i]
                 # How many times can we run this pattern?
-                max_times = float('inf')
-                for width, count in pattern.coeff.items():
-                    if count > 0:
-                        max_times = min(max_times, remaining_demand.get(width, 0) // count)
-                
-                max_times = max(int(max_times), 0)
+                max_times = min(remaining[k] // count for k, count in enumerate(vector) if count)
                 
                 if max_times > 0:
                     # Score based on coverage and efficiency
-                    coverage = sum(min(pattern.coeff[width] * max_times, remaining_demand.get(width, 0)) 
-                                 for width in pattern.coeff)
-                    efficiency = coverage / (pattern.trim + 0.1)  # Avoid division by zero
+                    coverage = sum(min(count * max_times, remaining[k]) for k, count in enumerate(vector) if count)
+                    efficiency = coverage / (patterns[i].trim + 0.1)  # Avoid division by zero
                     
                     if efficiency > best_coverage:
                         best_pattern = i
@@ -330,16 +609,14 @@ class CuttingOptimizer:
             
             # Apply the best pattern
             solution[best_pattern] += best_times
-            pattern = patterns[best_pattern]
-            
-            for width, count in pattern.coeff.items():
-                remaining_demand[width] = max(0, remaining_demand[width] - count * best_times)
+            for k, count in enumerate(vectors[best_pattern]):
+                if count:
+                    remaining[k] = max(0, remaining[k] - count * best_times)
         
-        # Check if we satisfied all demand
-        if any(remaining_demand.values()):
-            return {'status': 'Infeasible', 'message': 'Greedy heuristic could not satisfy all demand'}
+        if any(remaining):
+            return None
         
-        return self._build_ilp_production_plan(patterns, solution, demand)
+        return dict(solution)
     
     def _build_ilp_production_plan(self, patterns: List[Pattern], solution: Dict[int, int], demand: Dict[float, int]) -> Dict:
         """Build the complete production plan from ILP solution"""
@@ -362,11 +639,13 @@ class CuttingOptimizer:
         avg_trim = total_trim / len(sets) if sets else 0
         
         # Calculate production summary
-        produced = defaultdict(int)
+        width_index = pattern_width_index(demand)
+        produced_by_column = [0] * len(width_index)
         for pattern_idx, count in solution.items():
-            pattern = patterns[pattern_idx]
-            for width, qty in pattern.coeff.items():
-                produced[width] += qty * count
+            for k, qty in enumerate(patterns[pattern_idx].aligned_counts(width_index)):
+                produced_by_column[k] += qty * count
+        column = {w: k for k, w in enumerate(width_index)}
+        produced = {width: produced_by_column[column[scale_width(width)]] for width in demand}
         
         return {
             'status': 'Optimal',
@@ -386,6 +665,222 @@ class CuttingOptimizer:
             'patterns_used': len(solution)
         }
     
+    # === COLUMN GENERATION (GILMORE-GOMORY) ===
+
+    def _solve_cutting_with_column_generation(self, demand: Dict[float, int], trim_cap: float = 6.0, max_lanes: int = MAX_ROLLS_PER_JUMBO, exact_quantities: bool = True, hint_sets: Optional[List[Tuple[float, ...]]] = None) -> Dict:
+        """
+        Gilmore-Gomory column generation for the cutting-stock ILP.
+        Only patterns that improve the LP relaxation are generated, so solve time
+        stays flat as width diversity grows instead of enumerating every pattern.
+
+        1. LP master (GLOP) over the current pattern set gives width duals
+        2. Knapsack pricing (CP-SAT) finds the pattern with the best reduced cost
+        3. Repeat until no pattern improves the LP
+        4. CP-SAT integer solve over the generated patterns (or the full pattern
+           set when it is small); when exact quantities can't be met, a CP-SAT repair seeded with the rounded LP
+           solution returns a partial plan (attached as result['partial'])
+        """
+        if not (ORTOOLS_AVAILABLE and GLOP_AVAILABLE):
+            logger.warning("⚠️ COLUMN GENERATION: OR-Tools GLOP not available - using full pattern ILP")
+            return self._solve_cutting_with_ilp(demand, trim_cap, max_lanes, exact_quantities, hint_sets)
+
+        import time
+        start_time = time.time()
+        scale_factor = 100
+        deckle = self.jumbo_roll_width
+        widths = sorted(demand.keys(), reverse=True)
+        width_index = pattern_width_index(widths)
+
+        # Seed the master with the best single-width pattern for each width
+        patterns: List[Pattern] = []
+        for width in widths:
+            max_copies = min(max_lanes, int(deckle // width))
+            for copies in range(max_copies, 0, -1):
+                if deckle - width * copies <= trim_cap + 1e-9:
+                    patterns.append(Pattern((width,) * copies, deckle, width_index))
+                    break
+
+        lp_solution, duals = {}, {}
+        iterations = 0
+        while iterations < COLUMN_GENERATION_MAX_ITERATIONS:
+            iterations += 1
+            lp_solution, duals, uses_slack = self._solve_column_generation_master(patterns, demand, exact_quantities)
+            if lp_solution is None:
+                return {'status': 'Error', 'message': 'Column generation LP master failed'}
+
+            new_pattern = self._price_column_generation_pattern(widths, duals, demand, trim_cap, max_lanes, scale_factor)
+            if new_pattern is None or new_pattern in patterns:
+                break
+            patterns.append(new_pattern)
+
+        if uses_slack:
+            # Some widths cannot be produced within this trim cap - caller retries with a higher cap
+            return {'status': 'Infeasible', 'message': f'No patterns within {trim_cap}" trim cover all widths'}
+
+        logger.info(f"🧮 COLUMN GENERATION: {len(patterns)} patterns after {iterations} iterations, "
+                    f"LP bound={sum(lp_solution.values()):.2f} sets ({time.time() - start_time:.2f}s)")
+
+        # Integer phase: CP-SAT restricted to the generated columns
+        result = self._solve_ortools_exact(patterns, demand, exact_quantities=exact_quantities, hint_sets=hint_sets)
+        if result['status'] not in ['Optimal', 'Feasible']:
+            # Small width sets: the full pattern set is cheap and often admits an exact plan
+            full_patterns = self._generate_ilp_patterns(widths, trim_cap, max_lanes, deckle, scale_factor)
+            if len(full_patterns) <= COLUMN_GENERATION_FULL_ILP_LIMIT:
+                result = self._solve_ortools_exact(full_patterns, demand, exact_quantities=exact_quantities, hint_sets=hint_sets)
+        if result['status'] not in ['Optimal', 'Feasible']:
+            logger.info("🔧 COLUMN GENERATION: No exact integer solution over generated patterns - running CP-SAT repair")
+            partial = self._repair_column_generation_solution(patterns, lp_solution, demand)
+            if partial['status'] == 'Partial':
+                partial['solver'] = 'Column Generation (GLOP + CP-SAT repair)'
+                partial['patterns_generated'] = len(patterns)
+                partial['solve_time'] = round(time.time() - start_time, 3)
+                # Caller tries a higher trim cap first and only falls back to the partial plan
+                return {'status': 'Infeasible', 'message': 'No exact solution over generated patterns', 'partial': partial}
+            return partial
+
+        result['solver'] = 'Column Generation (GLOP + CP-SAT)'
+        result['patterns_generated'] = len(patterns)
+        result['solve_time'] = round(time.time() - start_time, 3)
+        return result
+
+    def _solve_column_generation_master(self, patterns: List[Pattern], demand: Dict[float, int], exact_quantities: bool) -> Tuple[Optional[Dict[int, float]], Dict[float, float], bool]:
+        """
+        Solve the LP relaxation of the restricted master problem with GLOP.
+        Costs mirror the CP-SAT objective (10000 per set + trim in hundredths).
+        Slack columns with a large penalty keep the LP feasible while the
+        pattern set is still incomplete.
+
+        Returns:
+            Tuple of (pattern_index -> LP value, width -> dual value, slack_used)
+        """
+        solver = pywraplp.Solver.CreateSolver("GLOP")
+        if solver is None:
+            return None, {}, False
+
+        slack_penalty = 10000 * (sum(demand.values()) + 1)
+        pattern_vars = [solver.NumVar(0, solver.infinity(), f"pattern_{i}") for i in range(len(patterns))]
+        slack_vars = {width: solver.NumVar(0, solver.infinity(), f"slack_{width}") for width in demand}
+
+        width_index = pattern_width_index(demand)
+        column = {w: k for k, w in enumerate(width_index)}
+        vectors = [pattern.aligned_counts(width_index) for pattern in patterns]
+
+        constraints = {}
+        for width, qty in demand.items():
+            if exact_quantities:
+                constraint = solver.Constraint(qty, qty)
+            else:
+                constraint = solver.Constraint(qty, solver.infinity())
+            k = column[scale_width(width)]
+            for i in range(len(patterns)):
+                count = vectors[i][k]
+                if count:
+                    constraint.SetCoefficient(pattern_vars[i], count)
+            constraint.SetCoefficient(slack_vars[width], 1)
+            constraints[width] = constraint
+
+        objective = solver.Objective()
+        for i, pattern in enumerate(patterns):
+            objective.SetCoefficient(pattern_vars[i], 10000 + pattern.scaled_trim)
+        for slack in slack_vars.values():
+            objective.SetCoefficient(slack, slack_penalty)
+        objective.SetMinimization()
+
+        if solver.Solve() != pywraplp.Solver.OPTIMAL:
+            return None, {}, False
+
+        lp_solution = {i: var.solution_value() for i, var in enumerate(pattern_vars) if var.solution_value() > 1e-9}
+        duals = {width: constraint.dual_value() for width, constraint in constraints.items()}
+        uses_slack = any(slack.solution_value() > 1e-6 for slack in slack_vars.values())
+        return lp_solution, duals, uses_slack
+
+    def _price_column_generation_pattern(self, widths: List[float], duals: Dict[float, float], demand: Dict[float, int], trim_cap: float, max_lanes: int, scale_factor: int) -> Optional[Pattern]:
+        """
+        Pricing subproblem: bounded knapsack (solved with CP-SAT) for the pattern
+        with the most negative reduced cost under the deckle, trim cap and lane limits.
+
+        Reduced cost of a pattern = 10000 + 100 * trim - sum(dual * count), and
+        trim = deckle - used width, so we maximise sum((dual + 100 * width) * count).
+
+        Returns:
+            Improving Pattern, or None when the LP is already optimal
+        """
+        deckle = self.jumbo_roll_width
+        scaled_deckle = int(round(deckle * scale_factor))
+        scaled_min_used = int(round((deckle - trim_cap) * scale_factor))
+        value_scale = 1000
+
+        model = cp_model.CpModel()
+        counts = {}
+        for width in widths:
+            upper = min(demand[width], max_lanes, int(deckle // width))
+            counts[width] = model.NewIntVar(0, upper, f"count_{width}")
+
+        used = sum(int(round(w * scale_factor)) * counts[w] for w in widths)
+        model.Add(used <= scaled_deckle)
+        model.Add(used >= scaled_min_used)
+        model.Add(sum(counts.values()) >= 1)
+        model.Add(sum(counts.values()) <= max_lanes)
+        model.Maximize(sum(int(round((duals.get(w, 0) + 100 * w) * value_scale)) * counts[w] for w in widths))
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = 5
+        status = solver.Solve(model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return None
+
+        lanes = []
+        value = 0.0
+        for width in widths:
+            count = solver.Value(counts[width])
+            lanes.extend([width] * count)
+            value += (duals.get(width, 0) + 100 * width) * count
+
+        reduced_cost = 10000 + 100 * deckle - value
+        if not lanes or reduced_cost > -1e-6:
+            return None
+        return Pattern(tuple(lanes), deckle, pattern_width_index(widths))
+
+    def _repair_column_generation_solution(self, patterns: List[Pattern], lp_solution: Dict[int, float], demand: Dict[float, int], time_limit: int = 10) -> Dict:
+        """
+        CP-SAT repair when the generated patterns admit no exact integer solution.
+        Maximises the number of pieces produced without any over-production,
+        starting from the rounded-down LP solution. The shortfall is left for
+        the best-fit fallback in match_combos.
+        """
+        model = cp_model.CpModel()
+        max_runs = sum(demand.values())
+        pattern_vars = [model.NewIntVar(0, max_runs, f"pattern_{i}") for i in range(len(patterns))]
+
+        width_index = pattern_width_index(demand)
+        column = {w: k for k, w in enumerate(width_index)}
+        vectors = [pattern.aligned_counts(width_index) for pattern in patterns]
+        for width, qty in demand.items():
+            k = column[scale_width(width)]
+            model.Add(sum(pattern_vars[i] * vectors[i][k] for i in range(len(patterns))) <= qty)
+
+        pieces = sum(pattern_vars[i] * p.pieces for i, p in enumerate(patterns))
+        trim = sum(pattern_vars[i] * p.scaled_trim for i, p in enumerate(patterns))
+        model.Maximize(pieces * 100000 - trim)
+
+        # Rounded-down LP solution is always feasible here - use it as the starting point
+        for i, var in enumerate(pattern_vars):
+            model.AddHint(var, int(math.floor(lp_solution.get(i, 0) + 1e-9)))
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        status = solver.Solve(model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return {'status': 'Infeasible', 'message': f'Column generation repair status: {solver.StatusName(status)}'}
+
+        solution = {i: solver.Value(var) for i, var in enumerate(pattern_vars) if solver.Value(var) > 0}
+        if not solution:
+            return {'status': 'Infeasible', 'message': 'Column generation repair produced no sets'}
+
+        result = self._build_ilp_production_plan(patterns, solution, demand)
+        result['status'] = 'Partial'
+        return result
+
     def _convert_ilp_result_to_internal_format(self, ilp_result: Dict, order_counter: Counter) -> Tuple[List, Counter]:
         """Convert ILP result to the format expected by the rest of the system"""
         patterns_used = []
@@ -497,13 +992,15 @@ class CuttingOptimizer:
         else:
             return patterns_used, remaining_demand
 
-    def match_combos(self, orders: Dict[float, int], interactive: bool = False, algorithm: str = "ilp") -> Tuple[List[Tuple[Tuple[float, ...], float]], Dict[float, int], List[Tuple[Tuple[float, ...], float]]]:
+    def match_combos(self, orders: Dict[float, int], interactive: bool = False, algorithm: str = "ilp", hint_sets: Optional[List[Tuple[float, ...]]] = None) -> Tuple[List[Tuple[Tuple[float, ...], float]], Dict[float, int], List[Tuple[Tuple[float, ...], float]]]:
         """
         Match combos with orders using best-fit algorithm logic.
         
         Args:
             orders: Dictionary of {width: quantity}
             interactive: Whether to prompt user for high trim combos
+            algorithm: "ilp" (default), "tracking" or "column_generation"
+            hint_sets: Optional combos (e.g. from a previous plan) to warm-start CP-SAT with
             
         Returns:
             Tuple of (used_combos, pending_orders, high_trim_log)
@@ -520,10 +1017,11 @@ class CuttingOptimizer:
         # Try direct optimal pattern search first for small-medium problems
         total_demand = sum(order_counter.values())
         
-        if total_demand <= 200:  # Use global optimization for manageable sizes
+        # Column generation scales with demand, so it is not limited to small problems
+        if total_demand <= 200 or algorithm == "column_generation":  # Use global optimization for manageable sizes
             
             # Try direct optimal solution first
-            direct_solution = self._find_direct_optimal_solution(order_counter, algorithm)
+            direct_solution = self._find_direct_optimal_solution(order_counter, algorithm, hint_sets)
             
             if direct_solution:
                 used_patterns, remaining_demand = direct_solution
@@ -956,13 +1454,15 @@ class CuttingOptimizer:
         
         return balance_improvement
 
-    def _find_direct_optimal_solution(self, order_counter: Counter, algorithm="ilp"):
+    def _find_direct_optimal_solution(self, order_counter: Counter, algorithm="ilp", hint_sets=None):
         """
         Optimal solver that supports multiple algorithms.
         
         Args:
             order_counter: Demand for each width
-            algorithm: "ilp" for ILP optimization, "tracking" for user's tracking algorithm
+            algorithm: "ilp" for ILP optimization, "tracking" for user's tracking algorithm,
+                       "column_generation" for Gilmore-Gomory column generation
+            hint_sets: Optional combos hinted to CP-SAT (ILP and column generation)
         """
         if not any(order_counter.values()):
             return None
@@ -974,22 +1474,33 @@ class CuttingOptimizer:
             logger.info(f"🎯 USER TRACKING: Starting with demand={total_demand}, widths={list(order_counter.keys())}")
             return self._find_optimal_solution_with_tracking(order_counter)
             
-        else:  # algorithm == "ilp" (default) - now uses OR-Tools
+        else:  # algorithm == "ilp" (default) or "column_generation" - both use OR-Tools
             # Use OR-Tools optimization (3.1x faster than PuLP)
             demand = {float(width): int(qty) for width, qty in order_counter.items() if qty > 0}
-            logger.info(f"🎯 OR-TOOLS OPTIMIZATION: Starting with demand={total_demand}, widths={list(demand.keys())}")
+            logger.info(f"🎯 OR-TOOLS OPTIMIZATION ({algorithm}): Starting with demand={total_demand}, widths={list(demand.keys())}")
+            
+            if algorithm == "column_generation":
+                solve = self._solve_cutting_with_column_generation
+            else:
+                solve = self._solve_cutting_with_ilp
             
             # Use OR-Tools with progressive trim caps for better solutions
-            result = self._solve_cutting_with_ilp(demand, trim_cap=6.0)  # Start with 6" trim cap
+            result = solve(demand, trim_cap=6.0, hint_sets=hint_sets)  # Start with 6" trim cap
             
             # If 6" fails, try 8" then 10" for better solutions
             if not result or result['status'] not in ['Optimal', 'Feasible']:
                 logger.info("🔄 OR-Tools: Trying higher trim cap (8\") for feasible solution")
-                result = self._solve_cutting_with_ilp(demand, trim_cap=8.0)
+                result = solve(demand, trim_cap=8.0, hint_sets=hint_sets)
                 
             if not result or result['status'] not in ['Optimal', 'Feasible']:
                 logger.info("🔄 OR-Tools: Trying higher trim cap (10\") for feasible solution")  
-                result = self._solve_cutting_with_ilp(demand, trim_cap=10.0)
+                result = solve(demand, trim_cap=10.0, hint_sets=hint_sets)
+            
+            # Column generation: accept the repaired partial plan, best-fit handles the shortfall
+            if result and result['status'] not in ['Optimal', 'Feasible'] and result.get('partial'):
+                logger.info("🔧 COLUMN GENERATION: Using repaired partial plan")
+                result = result['partial']
+                result['status'] = 'Feasible'
             
             if result and result['status'] in ['Optimal', 'Feasible']:
                 logger.info(f"✅ OR-TOOLS OPTIMIZATION: Found solution with {result['summary']['total_sets']} sets, avg trim={result['summary']['avg_trim']:.1f}\"")
@@ -1104,8 +1615,8 @@ class CuttingOptimizer:
                 logger.debug(f"✅ MATH SOLUTION: {total_waste:.1f}\" waste, {satisfaction*100:.1f}% satisfaction")
                 return best_solution
         
-        # Strategy 2: Smart sampling with early termination (max 200 attempts instead of 2000)
-        return self._smart_sampling_optimization(pattern_combo, order_counter, total_demand, max_attempts=200)
+        # Strategy 2: Vectorized smart sampling over a batch of candidate count vectors
+        return self._smart_sampling_optimization(pattern_combo, order_counter, total_demand, max_per_pattern=max_per_pattern)
     
     def _mathematical_count_estimation(self, pattern_combo, order_counter, total_demand):
         """
@@ -1148,12 +1659,15 @@ class CuttingOptimizer:
         
         return None
     
-    def _smart_sampling_optimization(self, pattern_combo, order_counter, total_demand, max_attempts=200):
+    def _smart_sampling_optimization(self, pattern_combo, order_counter, total_demand, max_attempts=SMART_SAMPLING_CANDIDATES, max_per_pattern=None):
         """
-        Optimized sampling with intelligent search space reduction and early termination.
+        Optimized sampling with intelligent search space reduction.
+        Each strategy generates a batch of candidate count vectors, and all
+        candidates are scored at once with NumPy against a pattern x width
+        coefficient matrix, so far more candidates fit in the same latency budget.
         """
-        best_solution = None
-        best_waste = float('inf')
+        if not pattern_combo or total_demand <= 0:
+            return None
         
         # Calculate smart ranges based on demand analysis
         pattern_ranges = []
@@ -1178,122 +1692,107 @@ class CuttingOptimizer:
             self._balanced_strategy
         ]
         
-        attempts_per_strategy = max_attempts // len(strategies)
-        valid_attempts = 0
+        rng = np.random.default_rng()
+        batch_size = max(1, max_attempts // len(strategies))
+        candidates = np.vstack([
+            strategy(pattern_combo, pattern_ranges, order_counter, total_demand, batch_size, rng)
+            for strategy in strategies
+        ])
+        candidates = candidates[candidates.sum(axis=1) > 0]
+        if len(candidates) == 0:
+            return None
         
-        for strategy_idx, strategy in enumerate(strategies):
-            strategy_attempts = 0
-            consecutive_failures = 0
-            
-            for attempt in range(attempts_per_strategy):
-                strategy_attempts += 1
-                
-                # Generate counts using current strategy
-                counts = strategy(pattern_combo, pattern_ranges, order_counter, total_demand, attempt)
-                
-                if not counts or sum(counts) == 0:
-                    consecutive_failures += 1
-                    if consecutive_failures > 10:  # Early termination for poor strategies
-                        break
-                    continue
-                
-                consecutive_failures = 0
-                
-                # Evaluate solution
-                result = self._evaluate_pattern_combination(pattern_combo, counts, order_counter)
-                if result:
-                    valid_attempts += 1
-                    patterns_used, remaining_demand, total_waste, over_satisfaction = result
-                    
-                    # Optimized scoring
-                    total_remaining = sum(remaining_demand.values())
-                    satisfaction_rate = 1 - (total_remaining / total_demand)
-                    
-                    if satisfaction_rate < 0.85:
-                        score = total_waste + (1 - satisfaction_rate) * 500  # Reduced penalty
-                    else:
-                        score = total_waste + over_satisfaction * 2  # Reduced penalty
-                    
-                    if score < best_waste:
-                        best_waste = score
-                        best_solution = (patterns_used, remaining_demand, total_waste)
-                        
-                        # Early termination if excellent solution found
-                        if satisfaction_rate >= 0.95 and total_waste < total_demand * 0.1:
-                            logger.debug(f"🎯 EXCELLENT SOLUTION FOUND: {satisfaction_rate*100:.1f}% satisfaction, {total_waste:.1f}\" waste")
-                            break
-            
-            # Early termination if good solution found
-            if best_solution:
-                _, remaining, waste = best_solution
-                satisfaction = 1 - (sum(remaining.values()) / total_demand)
-                if satisfaction >= 0.9:
-                    break
+        # Score every candidate at once: production per width from the coefficient matrix
+        widths = list(order_counter.keys())
+        coeff = self._pattern_coefficient_matrix(pattern_combo, widths)
+        demand_vector = np.array([order_counter[width] for width in widths], dtype=np.int64)
+        trims = np.array([trim for _, trim in pattern_combo], dtype=np.float64)
+        
+        produced = candidates @ coeff
+        remaining = np.clip(demand_vector - produced, 0, None).sum(axis=1)
+        over_satisfaction = np.clip(produced - demand_vector, 0, None).sum(axis=1)
+        total_waste = candidates @ trims
+        satisfaction_rate = 1 - remaining / total_demand
+        
+        scores = np.where(
+            satisfaction_rate < 0.85,
+            total_waste + (1 - satisfaction_rate) * 500,  # Reduced penalty
+            total_waste + over_satisfaction * 2  # Reduced penalty
+        )
+        best = int(np.argmin(scores))
         
-        logger.debug(f"🚀 OPTIMIZED: {valid_attempts} valid attempts out of {max_attempts}, best solution = {best_solution is not None}")
-        return best_solution
+        patterns_used, remaining_demand, waste, _ = self._evaluate_pattern_combination(
+            pattern_combo, candidates[best].tolist(), order_counter
+        )
+        logger.debug(f"🚀 OPTIMIZED: scored {len(candidates)} candidates, best waste={waste:.1f}\", satisfaction={satisfaction_rate[best]*100:.1f}%")
+        return (patterns_used, remaining_demand, waste)
     
-    def _demand_proportional_strategy(self, pattern_combo, pattern_ranges, order_counter, total_demand, attempt):
+    def _pattern_coefficient_matrix(self, pattern_combo, widths) -> "np.ndarray":
+        """Pattern x width matrix of how many rolls of each width a pattern produces."""
+        width_index = {width: i for i, width in enumerate(widths)}
+        coeff = np.zeros((len(pattern_combo), len(widths)), dtype=np.int64)
+        for p, (pattern, _) in enumerate(pattern_combo):
+            for width in pattern:
+                if width in width_index:
+                    coeff[p, width_index[width]] += 1
+        return coeff
+    
+    def _pattern_range_arrays(self, pattern_ranges):
+        """Split (min, max) pattern ranges into NumPy bound vectors."""
+        mins = np.array([low for low, _ in pattern_ranges], dtype=np.int64)
+        maxs = np.array([high for _, high in pattern_ranges], dtype=np.int64)
+        return mins, maxs
+    
+    def _demand_proportional_strategy(self, pattern_combo, pattern_ranges, order_counter, total_demand, batch_size, rng):
         """Strategy: Allocate counts proportional to how much each pattern satisfies demand."""
-        import random
-        counts = []
+        mins, maxs = self._pattern_range_arrays(pattern_ranges)
         
-        for i, ((pattern, trim), (min_count, max_count)) in enumerate(zip(pattern_combo, pattern_ranges)):
-            # Calculate pattern's contribution to demand
+        # Calculate each pattern's contribution to demand
+        base_counts = []
+        for (pattern, trim), min_count in zip(pattern_combo, mins):
             pattern_contribution = sum(order_counter.get(width, 0) for width in pattern)
             contribution_ratio = pattern_contribution / total_demand if total_demand > 0 else 0
-            
-            # Scale count based on contribution with some randomness
-            base_count = max(min_count, int(contribution_ratio * total_demand / len(pattern)))
-            random_factor = random.uniform(0.8, 1.2)  # ±20% variation
-            count = min(max_count, max(min_count, int(base_count * random_factor)))
-            counts.append(count)
+            base_counts.append(max(min_count, int(contribution_ratio * total_demand / len(pattern))))
         
-        return counts
+        # Scale counts with some randomness
+        random_factor = rng.uniform(0.8, 1.2, size=(batch_size, len(pattern_combo)))  # ±20% variation
+        counts = np.floor(np.array(base_counts) * random_factor).astype(np.int64)
+        return np.clip(counts, mins, maxs)
     
-    def _efficiency_focused_strategy(self, pattern_combo, pattern_ranges, order_counter, total_demand, attempt):
+    def _efficiency_focused_strategy(self, pattern_combo, pattern_ranges, order_counter, total_demand, batch_size, rng):
         """Strategy: Favor patterns with better material efficiency (lower trim)."""
-        import random
-        counts = []
-        
-        # Calculate efficiency scores
-        efficiencies = [(118 - trim) / 118 for _, trim in pattern_combo]
-        max_efficiency = max(efficiencies)
-        
-        for i, ((pattern, trim), (min_count, max_count)) in enumerate(zip(pattern_combo, pattern_ranges)):
-            # Higher counts for more efficient patterns
-            efficiency_bonus = efficiencies[i] / max_efficiency if max_efficiency > 0 else 1
-            base_count = int((min_count + max_count) / 2 * efficiency_bonus)
-            
-            # Add controlled randomness
-            random_factor = random.uniform(0.9, 1.1)  # ±10% variation
-            count = min(max_count, max(min_count, int(base_count * random_factor)))
-            counts.append(count)
-        
-        return counts
+        mins, maxs = self._pattern_range_arrays(pattern_ranges)
+        
+        # Calculate efficiency scores - higher counts for more efficient patterns
+        efficiencies = np.array([(self.jumbo_roll_width - trim) / self.jumbo_roll_width for _, trim in pattern_combo])
+        max_efficiency = efficiencies.max()
+        efficiency_bonus = efficiencies / max_efficiency if max_efficiency > 0 else np.ones(len(pattern_combo))
+        base_counts = np.floor((mins + maxs) / 2 * efficiency_bonus)
+        
+        # Add controlled randomness
+        random_factor = rng.uniform(0.9, 1.1, size=(batch_size, len(pattern_combo)))  # ±10% variation
+        counts = np.floor(base_counts * random_factor).astype(np.int64)
+        return np.clip(counts, mins, maxs)
     
-    def _balanced_strategy(self, pattern_combo, pattern_ranges, order_counter, total_demand, attempt):
+    def _balanced_strategy(self, pattern_combo, pattern_ranges, order_counter, total_demand, batch_size, rng):
         """Strategy: Balance between demand satisfaction and efficiency."""
-        import random
-        counts = []
+        mins, maxs = self._pattern_range_arrays(pattern_ranges)
         
-        for i, ((pattern, trim), (min_count, max_count)) in enumerate(zip(pattern_combo, pattern_ranges)):
-            # Balanced approach: 60% demand-based, 40% efficiency-based
+        # Balanced approach: 60% demand-based, 40% efficiency-based
+        balanced_counts = []
+        for (pattern, trim), min_count, max_count in zip(pattern_combo, mins, maxs):
             pattern_contribution = sum(order_counter.get(width, 0) for width in pattern)
             contribution_ratio = pattern_contribution / total_demand if total_demand > 0 else 0
-            efficiency = (118 - trim) / 118
+            efficiency = (self.jumbo_roll_width - trim) / self.jumbo_roll_width
             
             demand_component = contribution_ratio * total_demand / len(pattern)
             efficiency_component = efficiency * (min_count + max_count) / 2
-            
-            balanced_count = int(0.6 * demand_component + 0.4 * efficiency_component)
-            
-            # Add randomness and apply bounds
-            random_factor = random.uniform(0.85, 1.15)  # ±15% variation  
-            count = min(max_count, max(min_count, int(balanced_count * random_factor)))
-            counts.append(count)
+            balanced_counts.append(int(0.6 * demand_component + 0.4 * efficiency_component))
         
-        return counts
+        # Add randomness and apply bounds
+        random_factor = rng.uniform(0.85, 1.15, size=(batch_size, len(pattern_combo)))  # ±15% variation
+        counts = np.floor(np.array(balanced_counts) * random_factor).astype(np.int64)
+        return np.clip(counts, mins, maxs)
 
 
     def _evaluate_pattern_combination(self, pattern_combo, counts, order_counter):
@@ -1340,7 +1839,8 @@ class CuttingOptimizer:
         pending_orders: List[Dict] = None,
         available_inventory: List[Dict] = None,
         interactive: bool = False,
-        algorithm: str = "ilp"
+        algorithm: str = "ilp",
+        previous_solutions: Optional[Dict[tuple, Tuple[Dict[float, int], Tuple]]] = None
     ) -> Dict:
         """
         NEW FLOW: 3-input/4-output optimization algorithm.
@@ -1352,6 +1852,9 @@ class CuttingOptimizer:
             pending_orders: List of pending orders from previous cycles
             available_inventory: List of available inventory rolls for reuse
             interactive: Whether to prompt user for high trim decisions
+            algorithm: "ilp" (default), "tracking" or "column_generation"
+            previous_solutions: Optional spec_key -> (demand, match result) from an
+                                earlier run (see last_spec_solutions) to repair incrementally
             
         Returns:
             Dict with 3 outputs:
@@ -1513,6 +2016,7 @@ class CuttingOptimizer:
             # First, try to fulfill orders using available inventory
             orders_copy = orders.copy()
             inventory_used = []
+            inventory_cut_rolls = []
             
             logger.info(f"   🔄 OPTIMIZER: Starting inventory fulfillment phase...")
             logger.debug(f"   📦 Orders copy before inventory: {orders_copy}")
@@ -1524,7 +2028,7 @@ class CuttingOptimizer:
                 if inv_width in orders_copy and orders_copy[inv_width] > 0:
                     # Use this inventory item
                     print(f" MATCH! Using inventory for {inv_width}\" (had {orders_copy[inv_width]} orders)")
-                    cut_rolls_generated.append({
+                    inventory_cut_rolls.append({
                         'width': inv_width,
                         'quantity': 1,
                         'gsm': spec['gsm'],
@@ -1552,11 +2056,23 @@ class CuttingOptimizer:
             # Remove used inventory from available list
             remaining_inventory = [inv for inv in inventory if inv not in inventory_used]
             
+            group_data['inventory_cut_rolls'] = inventory_cut_rolls
+            group_data['remaining_orders'] = orders_copy
+        
+        # Spec groups never share rolls - solve them concurrently, merge in spec order below
+        match_results = self._match_spec_groups(spec_groups, interactive, algorithm, previous_solutions)
+        
+        for spec_key, group_data in spec_groups.items():
+            spec = group_data['spec']
+            orders_copy = group_data['remaining_orders']
+            cut_rolls_generated.extend(group_data['inventory_cut_rolls'])
+            
             # Run the matching algorithm for remaining orders
             individual_118_rolls_needed = 0
+            pending, high_trims = {}, []
             if orders_copy:
-                logger.info(f"   🔪 OPTIMIZER: Running cutting algorithm for remaining orders: {orders_copy}")
-                used, pending, high_trims = self.match_combos(orders_copy, interactive, algorithm)
+                logger.info(f"   🔪 OPTIMIZER: Cutting results for spec {spec_key}, remaining orders: {orders_copy}")
+                used, pending, high_trims = match_results[spec_key]
                 logger.info(f"   📊 CUTTING RESULTS: {len(used)} patterns used, {len(list(pending.keys()))} pending widths")
                 
                 # Debug: Show what went to pending and why
@@ -1858,6 +2374,220 @@ class CuttingOptimizer:
             
         return result
 
+    def _match_spec_groups(self, spec_groups: Dict, interactive: bool, algorithm: str, previous_solutions: Optional[Dict] = None) -> Dict[tuple, Tuple[List, Dict, List]]:
+        """
+        Run match_combos for every spec group that still has orders to cut.
+        With use_result_cache, groups whose demand vector was solved before are
+        served from the optimization result cache. With previous_solutions (only
+        passed when INCREMENTAL_REPAIR_ENABLED is set), groups whose demand
+        changed slightly keep most of their previous sets
+        and only the residual demand is solved, hinted with the released sets.
+        A repair that leaves more pending rolls or a worse average trim than
+        the previous plan is replaced by a solve from scratch.
+        Remaining groups are independent, so with more than one group and
+        OPTIMIZER_PARALLEL_WORKERS > 1 they are solved concurrently in the shared
+        process pool. Falls back to sequential solving if the pool fails.
+
+        Returns:
+            Dict of spec_key -> (used, pending, high_trims) as returned by match_combos
+        """
+        work = {
+            spec_key: group_data['remaining_orders']
+            for spec_key, group_data in spec_groups.items()
+            if group_data['remaining_orders']
+        }
+        results = {}
+
+        cache_keys = {}
+        if self.use_result_cache:
+            cache_keys = {
+                spec_key: optimization_cache.make_key(orders, self.jumbo_roll_width, algorithm, self.solver_config)
+                for spec_key, orders in work.items()
+            }
+            for spec_key, cache_key in cache_keys.items():
+                cached = optimization_cache.get(cache_key, self.cache_db)
+                if cached is not None:
+                    logger.info(f"⚡ OPTIMIZER: Reusing cached result for spec {spec_key}")
+                    results[spec_key] = cached
+
+        # Incremental repair (previous_solutions only): keep most of the previous sets and
+        # solve only the residual demand, warm-started from the sets released for it
+        to_solve = {spec_key: orders for spec_key, orders in work.items() if spec_key not in results}
+        repairs = {}
+        for spec_key, orders in to_solve.items():
+            previous = (previous_solutions or {}).get(spec_key)
+            repair = self._plan_incremental_repair(previous, orders) if previous else None
+            if repair is not None:
+                repairs[spec_key] = repair
+
+        solve_work, hints = {}, {}
+        for spec_key, orders in to_solve.items():
+            if spec_key not in repairs:
+                solve_work[spec_key] = orders
+                continue
+            kept, residual, hint_sets = repairs[spec_key]
+            if residual:
+                solve_work[(REPAIR_WORK_KEY, spec_key)] = residual
+                hints[(REPAIR_WORK_KEY, spec_key)] = hint_sets
+        solved = self._solve_spec_groups(solve_work, interactive, algorithm, hints)
+
+        fresh_work = {}
+        for spec_key, orders in to_solve.items():
+            if spec_key not in repairs:
+                results[spec_key] = solved[spec_key]
+                continue
+            kept, residual, _ = repairs[spec_key]
+            kept_high_trims = [(combo, trim) for combo, trim in kept if trim > 6]
+            if residual:
+                used, pending, high_trims = solved[(REPAIR_WORK_KEY, spec_key)]
+                repaired = (kept + used, pending, kept_high_trims + high_trims)
+            else:
+                # The kept sets cover the demand; anything they never produced stays pending
+                produced = Counter(width for combo, _ in kept for width in combo)
+                pending = {w: qty - produced[w] for w, qty in orders.items() if qty > produced[w]}
+                repaired = (kept, pending, kept_high_trims)
+
+            if self._repair_within_previous(repaired, previous_solutions[spec_key][1]):
+                logger.info(f"♻️ INCREMENTAL: Spec {spec_key} keeps {len(kept)} previous sets, re-solved {sum(residual.values())} rolls")
+                results[spec_key] = repaired
+            else:
+                logger.info(f"♻️ INCREMENTAL: Repair of spec {spec_key} is worse than its previous plan - solving from scratch")
+                fresh_work[spec_key] = orders
+
+        if fresh_work:
+            results.update(self._solve_spec_groups(fresh_work, interactive, algorithm))
+
+        # Only fresh solves are cached: a repair depends on the previous solution, not just the demand
+        for spec_key, cache_key in cache_keys.items():
+            if spec_key in to_solve and (spec_key not in repairs or spec_key in fresh_work):
+                optimization_cache.put(cache_key, results[spec_key], algorithm, self.jumbo_roll_width, self.cache_db)
+
+        self.last_spec_solutions = {spec_key: (dict(work[spec_key]), results[spec_key]) for spec_key in results}
+        return results
+
+    @staticmethod
+    def _repair_within_previous(repaired: Tuple[List, Dict, List], previous: Tuple[List, Dict, List]) -> bool:
+        """
+        Whether a repaired plan holds the quality of the plan it was repaired from:
+        no more pending rolls and an average trim per set within
+        INCREMENTAL_TRIM_TOLERANCE of the previous plan.
+        """
+        repaired_used, repaired_pending, _ = repaired
+        previous_used, previous_pending, _ = previous
+        if sum(repaired_pending.values()) > sum(previous_pending.values()):
+            return False
+        if not repaired_used or not previous_used:
+            return True
+        repaired_trim = sum(trim for _, trim in repaired_used) / len(repaired_used)
+        previous_trim = sum(trim for _, trim in previous_used) / len(previous_used)
+        return repaired_trim <= previous_trim + INCREMENTAL_TRIM_TOLERANCE
+
+    def _plan_incremental_repair(self, previous: Tuple[Dict[float, int], Tuple], demand: Dict[float, int]) -> Optional[Tuple[List[Tuple[Tuple[float, ...], float]], Dict[float, int], List[Tuple[float, ...]]]]:
+        """
+        Repair a previous spec group solution for a new demand vector.
+
+        1. Drop previous sets that over-produce the new demand (highest trim first)
+        2. Release a neighbourhood of sets around the changed widths (then the
+           highest-trim sets) so the residual solve has room to mix widths
+        3. Everything not produced by the kept sets is the residual demand
+
+        Returns:
+            (kept sets, residual demand, released sets that fit the residual as a
+            solver hint), or None when the change is too large and the group
+            should be solved from scratch
+        """
+        previous_demand, (previous_used, previous_pending, _) = previous
+        widths = set(previous_demand) | set(demand)
+        changed = {w for w in widths if demand.get(w, 0) != previous_demand.get(w, 0)}
+        if not changed:
+            return list(previous_used), {}, []
+
+        total = sum(demand.values())
+        delta = sum(abs(demand.get(w, 0) - previous_demand.get(w, 0)) for w in changed)
+        if total <= 0 or not previous_used or delta > INCREMENTAL_MAX_DELTA_FRACTION * max(total, sum(previous_demand.values())):
+            return None
+
+        # Lowest trim first, so releasing from the end drops the worst sets
+        kept = sorted(previous_used, key=lambda s: s[1])
+        produced = Counter(width for combo, _ in kept for width in combo)
+
+        for i in range(len(kept) - 1, -1, -1):
+            combo, _ = kept[i]
+            if any(produced[width] > demand.get(width, 0) for width in combo):
+                produced.subtract(combo)
+                kept.pop(i)
+
+        # Rolls the previous plan left pending come back in the residual on top of the neighbourhood
+        target = math.ceil(INCREMENTAL_REPAIR_NEIGHBOURHOOD * total) + sum(previous_pending.values())
+        residual_total = total - sum(min(produced[w], demand[w]) for w in demand)
+        release_order = sorted(
+            range(len(kept)),
+            key=lambda i: (not any(width in changed for width in kept[i][0]), -kept[i][1])
+        )
+        released = set()
+        for i in release_order:
+            if residual_total >= target:
+                break
+            released.add(i)
+            produced.subtract(kept[i][0])
+            residual_total += len(kept[i][0])
+        kept = [s for i, s in enumerate(kept) if i not in released]
+
+        residual = {w: demand[w] - produced[w] for w in demand if demand[w] - produced[w] > 0}
+
+        # Released sets that still fit the residual (lowest trim first) warm-start its solve
+        hint_sets, room = [], Counter(residual)
+        released_sets = Counter(previous_used) - Counter(kept)
+        for (combo, _), count in sorted(released_sets.items(), key=lambda item: item[0][1]):
+            for _ in range(count):
+                needed = Counter(combo)
+                if any(room[width] < n for width, n in needed.items()):
+                    break
+                room.subtract(needed)
+                hint_sets.append(combo)
+        return kept, residual, hint_sets
+
+    def _solve_spec_groups(self, work: Dict[tuple, Dict[float, int]], interactive: bool, algorithm: str, hints: Optional[Dict[tuple, List[Tuple[float, ...]]]] = None) -> Dict[tuple, Tuple[List, Dict, List]]:
+        """Solve spec group demand vectors (optionally with CP-SAT hint sets per key), in the process pool when worthwhile."""
+        results = {}
+        hints = hints or {}
+
+        if len(work) > 1 and OPTIMIZER_PARALLEL_WORKERS > 1:
+            logger.info(f"⚡ OPTIMIZER: Solving {len(work)} spec groups in parallel ({OPTIMIZER_PARALLEL_WORKERS} workers)")
+            # Every pool process runs its own CP-SAT search, so split the search workers
+            # between them instead of oversubscribing the CPU pool-size times over
+            pooled_config = replace(
+                self.solver_config,
+                num_workers=max(1, self.solver_config.num_workers // OPTIMIZER_PARALLEL_WORKERS)
+            )
+            pool = _get_spec_group_pool()
+            futures = {}
+            try:
+                for spec_key, orders in work.items():
+                    futures[spec_key] = pool.submit(_match_combos_worker, self.jumbo_roll_width, pooled_config, orders, interactive, algorithm, hints.get(spec_key))
+            except (BrokenProcessPool, RuntimeError) as e:
+                # Broken, or shut down by a concurrent request that found it broken
+                logger.warning(f"⚠️ OPTIMIZER: Spec group pool unavailable ({e}) - solving the remaining groups in-process")
+                _discard_spec_group_pool(pool)
+
+            for spec_key, future in futures.items():
+                try:
+                    results[spec_key] = future.result()
+                except BrokenProcessPool as e:
+                    # A worker died; only this pool is replaced, and the group is re-solved below
+                    logger.warning(f"⚠️ OPTIMIZER: Spec group pool is broken ({e}) - solving {spec_key} in-process")
+                    _discard_spec_group_pool(pool)
+                except Exception as e:
+                    # A solver error in one group; the pool (and other requests' groups) stay up
+                    logger.warning(f"⚠️ OPTIMIZER: Spec group {spec_key} failed in the pool ({e}) - solving it in-process")
+
+        for spec_key, orders in work.items():
+            if spec_key in results:
+                continue
+            logger.info(f"   🔪 OPTIMIZER: Running cutting algorithm for spec {spec_key}: {orders}")
+            results[spec_key] = self.match_combos(orders, interactive, algorithm, hints.get(spec_key))
+        return results
+
     def generate_optimized_plan(
         self,
         order_requirements: List[Dict],
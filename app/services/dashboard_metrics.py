@@ -0,0 +1,299 @@
+"""
+Dashboard Metrics - In-process aggregate of the dashboard status counters
+
+/dashboard/summary and StatusService.get_status_summary used to recount orders,
+pending items, plans, inventory and production orders on every request. The
+counters are now kept in memory and maintained from the ORM:
+
+- after_flush: status / roll type / pending quantity transitions of the tracked
+  models are turned into counter deltas and parked on the session
+- after_commit: the session's deltas are applied
+- after_rollback: the session's deltas are dropped
+
+Bulk UPDATEs, raw SQL and other worker processes bypass the session events, so
+the aggregate is reconciled against the database (seven single-pass queries)
+whenever it is older than DASHBOARD_METRICS_RECONCILE_SECONDS. One reader runs
+the recount while the others keep serving the current counters. Time-windowed
+metrics (last 7 days, pending older than 3 days) are only refreshed by the
+reconciliation.
+
+The first reconciliation runs at application startup. Readers never wait on
+the recount lock: snapshot() runs inside run_sync on the async engine, where a
+blocked thread is the event loop itself. Until a reconciliation has landed,
+snapshot() raises MetricsNotReadyError and the dashboard answers 503.
+"""
+
+import os
+import threading
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func, inspect
+from sqlalchemy.orm import Session
+
+from .aggregation import combined_scalars, conditional_counts, grouped_counts
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_METRICS_RECONCILE_SECONDS = int(os.getenv("DASHBOARD_METRICS_RECONCILE_SECONDS", 300))
+
+SESSION_DELTAS_KEY = "dashboard_metric_deltas"
+
+MetricKey = Tuple[Any, ...]
+
+
+class MetricsNotReadyError(Exception):
+    """Raised by snapshot() before the first reconciliation has completed."""
+
+
+def _contributions(model: type, values: Dict[str, Any]) -> Dict[MetricKey, int]:
+    """Counter contributions of one row with the given attribute values."""
+    name = model.__tablename__
+    # Column defaults are str Enum members, which do not hash like their values
+    values = {attr: value.value if isinstance(value, Enum) else value for attr, value in values.items()}
+    if name == "pending_order_item":
+        if values.get("_status") != "pending":
+            return {}
+        return {(name, "pending"): 1, ("pending_quantity", "pending"): int(values.get("quantity_pending") or 0)}
+    if name == "inventory_master":
+        return {(name, values.get("status"), values.get("roll_type")): 1}
+    if "status" in values:
+        return {(name, values.get("status")): 1}
+    return {(name,): 1}
+
+
+class DashboardMetrics:
+    """
+    Status counters for the dashboard, updated from committed ORM changes and
+    periodically reconciled with the database.
+    """
+
+    def __init__(self, reconcile_seconds: int = DASHBOARD_METRICS_RECONCILE_SECONDS):
+        self.reconcile_seconds = reconcile_seconds
+        self._counters: Dict[MetricKey, int] = defaultdict(int)
+        self._windowed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._reconcile_lock = threading.Lock()  # Single-flight: one recount at a time
+        self._inflight_deltas: Optional[Dict[MetricKey, int]] = None  # Deltas committed during a recount
+        self.reconciled_at: Optional[datetime] = None
+        self.reconciliations = 0
+        self.applied_commits = 0
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def snapshot(self, db: Session) -> Dict[str, Any]:
+        """
+        Counters and time-windowed metrics, reconciling first when stale.
+        While another reader reconciles, the current counters are served (never
+        waits on the recount lock, so it is safe inside run_sync on the event loop).
+
+        Raises:
+            MetricsNotReadyError: No reconciliation has completed yet
+        """
+        if self.is_stale() and self._reconcile_lock.acquire(blocking=False):
+            try:
+                if self.is_stale():  # Another reader may have just reconciled
+                    self._reconcile(db)
+            finally:
+                self._reconcile_lock.release()
+        with self._lock:
+            if self.reconciled_at is None:
+                raise MetricsNotReadyError("Dashboard metrics are still being counted")
+            return {
+                "counters": dict(self._counters),
+                "windowed": dict(self._windowed),
+                "reconciled_at": self.reconciled_at
+            }
+
+    def is_stale(self) -> bool:
+        return self.reconciled_at is None or datetime.utcnow() - self.reconciled_at > timedelta(seconds=self.reconcile_seconds)
+
+    def reconcile(self, db: Session) -> None:
+        """
+        Recount every counter from the database (waits for a recount already running).
+        Blocks the calling thread, so call it at startup or from a sync endpoint, never from run_sync.
+        """
+        with self._reconcile_lock:
+            self._reconcile(db)
+
+    def _reconcile(self, db: Session) -> None:
+        """
+        Recount every counter from the database; the caller holds _reconcile_lock.
+
+        Deltas committed while the queries run are recorded and added onto the
+        recount. A commit the queries already saw is then counted twice until
+        the next reconciliation, which bounds the error to that window.
+        """
+        with self._lock:
+            self._inflight_deltas = defaultdict(int)
+        try:
+            now, counters, windowed = self._recount(db)
+        except Exception:
+            with self._lock:
+                self._inflight_deltas = None
+            raise
+
+        with self._lock:
+            for key, value in self._inflight_deltas.items():
+                counters[key] += value
+            self._inflight_deltas = None
+            self._counters = counters
+            self._windowed = windowed
+            self.reconciled_at = now
+            self.reconciliations += 1
+        logger.info(f"📊 DASHBOARD METRICS: Reconciled {len(counters)} counters")
+
+    def _recount(self, db: Session) -> Tuple[datetime, Dict[MetricKey, int], Dict[str, int]]:
+        """(recount time, counters, time-windowed metrics) straight from the database."""
+        from .. import models
+
+        now = datetime.utcnow()
+        week_ago = now - timedelta(days=7)
+        counters: Dict[MetricKey, int] = defaultdict(int)
+        windowed: Dict[str, int] = dict.fromkeys(
+            ("high_priority_pending", "recent_orders", "recent_plans", "recent_production", "active_clients"), 0
+        )
+
+        # One GROUP BY per status table, with the 7-day counts folded in
+        recent = {
+            models.OrderMaster: "recent_orders",
+            models.PlanMaster: "recent_plans",
+            models.ProductionOrderMaster: "recent_production"
+        }
+        for model in (models.OrderMaster, models.PendingOrderMaster, models.PlanMaster, models.ProductionOrderMaster):
+            conditions = {"recent": model.created_at >= week_ago} if model in recent else None
+            for status, counts in grouped_counts(db, [model.status], conditions).items():
+                counters[(model.__tablename__, status)] = counts["count"]
+                if model in recent and (model is not models.PlanMaster or status != "deleted"):
+                    windowed[recent[model]] += counts["recent"]
+
+        for (status, roll_type), counts in grouped_counts(
+            db, [models.InventoryMaster.status, models.InventoryMaster.roll_type]
+        ).items():
+            counters[("inventory_master", status, roll_type)] = counts["count"]
+
+        pending = conditional_counts(
+            db, models.PendingOrderItem,
+            {"high_priority": models.PendingOrderItem.created_at < now - timedelta(days=3)},
+            aggregates={"quantity": func.sum(models.PendingOrderItem.quantity_pending)},
+            filters=[models.PendingOrderItem._status == "pending"]
+        )
+        counters[("pending_order_item", "pending")] = pending["total"]
+        counters[("pending_quantity", "pending")] = int(pending["quantity"] or 0)
+        windowed["high_priority_pending"] = pending["high_priority"]
+
+        scalars = combined_scalars(db, {
+            "papers": db.query(func.count(models.PaperMaster.id)),
+            "clients": db.query(func.count(models.ClientMaster.id)),
+            "active_clients": db.query(func.count(func.distinct(models.OrderMaster.client_id))).filter(
+                models.OrderMaster.created_at >= week_ago
+            )
+        })
+        counters[("paper_master",)] = scalars["papers"] or 0
+        counters[("client_master",)] = scalars["clients"] or 0
+        windowed["active_clients"] = scalars["active_clients"] or 0
+        return now, counters, windowed
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance (wired to Session events in models.py)
+    # ------------------------------------------------------------------
+
+    def collect_flush_deltas(self, session: Session) -> None:
+        """Park the counter deltas of the objects in a flush on the session."""
+        from .. import models
+
+        tracked = models.DASHBOARD_METRIC_ATTRIBUTES
+        deltas = None
+
+        for obj, sign_old, sign_new in (
+            [(o, 0, 1) for o in session.new] +
+            [(o, 1, 1) for o in session.dirty] +
+            [(o, 1, 0) for o in session.deleted]
+        ):
+            model = type(obj)
+            if model not in tracked:
+                continue
+            attributes = tracked[model]
+            state = inspect(obj)
+
+            old_values, new_values, changed = {}, {}, False
+            for attr in attributes:
+                history = state.attrs[attr].history
+                if history.has_changes():
+                    changed = True
+                    old_values[attr] = history.deleted[0] if history.deleted else None
+                    new_values[attr] = history.added[0] if history.added else None
+                else:
+                    current = state.dict[attr] if attr in state.dict else getattr(obj, attr)
+                    old_values[attr] = new_values[attr] = current
+            if sign_old and sign_new and not changed:
+                continue  # Dirty but none of the tracked attributes moved
+
+            if deltas is None:
+                deltas = session.info.setdefault(SESSION_DELTAS_KEY, defaultdict(int))
+            if sign_old:
+                for key, value in _contributions(model, old_values).items():
+                    deltas[key] -= value
+            if sign_new:
+                for key, value in _contributions(model, new_values).items():
+                    deltas[key] += value
+
+    def apply_committed(self, session: Session) -> None:
+        """Apply the deltas of a committed session."""
+        deltas = session.info.pop(SESSION_DELTAS_KEY, None)
+        if not deltas:
+            return
+        with self._lock:
+            if self._inflight_deltas is not None:
+                for key, value in deltas.items():
+                    self._inflight_deltas[key] += value
+            if self.reconciled_at is None:
+                return  # The next read recounts anyway
+            for key, value in deltas.items():
+                if value:
+                    self._counters[key] += value
+            self.applied_commits += 1
+
+    def discard(self, session: Session) -> None:
+        """Drop the deltas of a rolled back session."""
+        session.info.pop(SESSION_DELTAS_KEY, None)
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def count(self, counters: Dict[MetricKey, int], table: str, status: Optional[str] = None) -> int:
+        """Row count of a table, optionally for one status (summed over roll types for inventory)."""
+        return sum(
+            value for key, value in counters.items()
+            if key[0] == table and (status is None or (len(key) > 1 and key[1] == status))
+        )
+
+    def status_counts(self, counters: Dict[MetricKey, int], table: str) -> Dict[str, int]:
+        """Status -> row count for a table (zero counts left out)."""
+        result: Dict[str, int] = defaultdict(int)
+        for key, value in counters.items():
+            if key[0] == table and len(key) > 1:
+                result[key[1]] += value
+        return {status: count for status, count in result.items() if count}
+
+    def stats(self) -> Dict[str, Any]:
+        """Reconciliation bookkeeping for monitoring."""
+        with self._lock:
+            return {
+                "counters": len(self._counters),
+                "reconciled_at": self.reconciled_at.isoformat() if self.reconciled_at else None,
+                "reconcile_seconds": self.reconcile_seconds,
+                "reconciliations": self.reconciliations,
+                "reconciling": self._inflight_deltas is not None,
+                "applied_commits": self.applied_commits
+            }
+
+
+# Shared process-wide instance
+dashboard_metrics = DashboardMetrics()
@@ -0,0 +1,112 @@
+"""
+Fill Solver - Exact bounded-knapsack fill for pending roll suggestions
+
+Finds the combination of available pieces that fills a target width with the
+least waste (more pieces on ties) under a piece limit, in one pass.
+
+Widths are integer-scaled (hundredths of an inch) and divided by their common
+GCD, and for every piece count the reachable used widths are kept as a Python
+int bitset, so memory stays bounded by widths x piece limit x target bits.
+Results are memoized per (available width multiset, target width, piece limit),
+which repeats constantly while sets are carved out of the same pending backlog.
+"""
+
+import math
+import logging
+from functools import lru_cache
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+FILL_SCALE = 100  # Hundredths of an inch
+FILL_CACHE_SIZE = 4096
+
+
+def best_fill(available_widths: Dict[float, int], target_width: float, max_pieces: int) -> Dict[float, int]:
+    """
+    Optimal fill of target_width from the available pieces.
+
+    Args:
+        available_widths: Width -> number of pieces available
+        target_width: Width to fill (inches)
+        max_pieces: Maximum number of pieces in the combination
+
+    Returns:
+        Width -> pieces used, or {} when no piece fits
+    """
+    capacity = int(round(target_width * FILL_SCALE))
+    if capacity <= 0 or max_pieces <= 0:
+        return {}
+
+    width_by_scaled = {}
+    items = []
+    for width, count in available_widths.items():
+        scaled = int(round(float(width) * FILL_SCALE))
+        if count <= 0 or scaled <= 0 or scaled > capacity:
+            continue
+        width_by_scaled[scaled] = width
+        # Pieces beyond the piece limit or what fits in the target can never be used
+        items.append((scaled, min(count, max_pieces, capacity // scaled)))
+
+    if not items:
+        return {}
+
+    chosen = _solve_fill(tuple(sorted(items)), capacity, max_pieces)
+    return {width_by_scaled[scaled]: count for scaled, count in chosen}
+
+
+@lru_cache(maxsize=FILL_CACHE_SIZE)
+def _solve_fill(items: Tuple[Tuple[int, int], ...], capacity: int, max_pieces: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    Bounded knapsack over (scaled width, count) items, ascending by width.
+
+    reach[p] is a bitset of the used widths reachable with exactly p pieces.
+    One snapshot per item is kept for reconstruction.
+    """
+    step = 0
+    for scaled, _ in items:
+        step = math.gcd(step, scaled)
+    units = [(scaled // step, count) for scaled, count in items]
+    limit = capacity // step
+    mask = (1 << (limit + 1)) - 1
+
+    reach = [1] + [0] * max_pieces  # 0 pieces -> used width 0
+    snapshots = []
+    for width, count in units:
+        snapshots.append(reach)
+        new_reach = list(reach)
+        for pieces in range(1, max_pieces + 1):
+            bits = new_reach[pieces]
+            for k in range(1, min(count, pieces) + 1):
+                bits |= reach[pieces - k] << (k * width)
+            new_reach[pieces] = bits & mask
+        reach = new_reach
+
+    # Least waste = highest reachable used width; ties go to more pieces
+    best_used, best_pieces = 0, 0
+    for pieces in range(1, max_pieces + 1):
+        if reach[pieces]:
+            used = reach[pieces].bit_length() - 1
+            if used >= best_used:
+                best_used, best_pieces = used, pieces
+    if best_pieces == 0:
+        return ()
+
+    # Walk back through the snapshots, preferring more copies of the wider widths
+    chosen = []
+    used, pieces = best_used, best_pieces
+    for (width, count), previous in zip(reversed(units), reversed(snapshots)):
+        for k in range(min(count, pieces), -1, -1):
+            remaining = used - k * width
+            if remaining >= 0 and (previous[pieces - k] >> remaining) & 1:
+                if k:
+                    chosen.append((width * step, k))
+                used, pieces = remaining, pieces - k
+                break
+    return tuple(chosen)
+
+
+def fill_cache_stats() -> Dict[str, int]:
+    """Memoization counters of the fill solver."""
+    info = _solve_fill.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "entries": info.currsize, "max_entries": info.maxsize}
@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import text, func
-from typing import Dict
+from sqlalchemy import text, func, select
+from typing import Dict, List
 from datetime import datetime
 from zoneinfo import ZoneInfo
 import logging
 
+from .sequence_service import SequenceService
+
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,8 @@ class FrontendIDGenerator:
     Format: PREFIX-00001-25 (where 25 is the year)
     Counter resets to 00001 on January 1st of each year.
     Year suffix updates automatically based on current date.
+
+    Counters are kept per (sequence, year) in the frontend_id_sequence table.
     """
     
     # ID Patterns for each model - year-based format with annual counter reset
@@ -110,13 +114,13 @@ class FrontendIDGenerator:
         },
         "inward_challan": {
             "prefix": "",
-            "column_name": "serial_number",
+            "column_name": "serial_no",
             "description": "Inward Challan Serial Numbers (00001-25, 00002-25, etc.)",
             "serial_only": True
         },
         "outward_challan": {
             "prefix": "",
-            "column_name": "serial_number",
+            "column_name": "serial_no",
             "description": "Outward Challan Serial Numbers (00001-25, 00002-25, etc.)",
             "serial_only": True
         },
@@ -144,6 +148,11 @@ class FrontendIDGenerator:
         """
         Generate a human-readable frontend ID with year suffix and annual counter reset.
 
+        The counter comes from the frontend_id_sequence row for (table, year), which is
+        incremented in place, so each ID costs one row update instead of a LIKE scan
+        over the table. The row stays locked until the caller's transaction ends, so
+        concurrent inserts get distinct values and a rollback gives the number back.
+
         Args:
             table_name: The database table name
             db: SQLAlchemy database session
@@ -159,140 +168,163 @@ class FrontendIDGenerator:
             raise ValueError(f"Unsupported table name: {table_name}. Supported tables: {list(cls.ID_PATTERNS.keys())}")
 
         config = cls.ID_PATTERNS[table_name]
-        prefix = config["prefix"]
-        column_name = config["column_name"]
-        no_year_suffix = config.get("no_year_suffix", False)
+        year = "" if config.get("no_year_suffix", False) else cls._current_year()
 
-        # Handle custom table name override (e.g., payment_slip_bill and payment_slip_cash both use payment_slip_master)
-        actual_table_name = config.get("table_name", table_name)
+        try:
+            next_counter = SequenceService.reserve(
+                db, table_name, year, 1, seed=lambda: cls._scan_max_counter(table_name, year, db)
+            )[0]
+            generated_id = cls._format_id(config, next_counter, year)
 
-        # ============================================================
-        # For tables WITHOUT year suffix (client, user, paper)
-        # ============================================================
-        if no_year_suffix:
-            try:
-                # Simple sequential ID without year suffix: PREFIX-00001, PREFIX-00002, etc.
-                pattern = f"{prefix}-%"
+            logger.debug(f"Generated ID for {table_name}: {generated_id} (year: {year or 'none'}, counter: {next_counter})")
+            return generated_id
 
-                query = text(f"""
-                    SELECT {column_name}
-                    FROM {actual_table_name}
-                    WHERE {column_name} LIKE :pattern
-                """)
+        except Exception as e:
+            logger.error(f"Error generating frontend ID for {table_name}: {e}")
+            raise
 
-                result = db.execute(query, {"pattern": pattern}).fetchall()
+    @classmethod
+    def reserve_frontend_ids(cls, table_name: str, count: int, db: Session) -> List[str]:
+        """
+        Reserve count consecutive frontend IDs with a single counter update.
 
-                # Extract counter values and find max
-                max_counter = 0
-                for row in result:
-                    id_value = row[0]
-                    if id_value:
-                        try:
-                            # Extract counter from format: PREFIX-00123
-                            parts = id_value.split("-")
-                            if len(parts) >= 2:
-                                counter = int(parts[1])
-                                max_counter = max(max_counter, counter)
-                        except (ValueError, IndexError):
-                            continue
+        Bulk inserts assign these to frontend_id up front, so the before_insert
+        listener doesn't allocate one ID per row.
 
-                # Increment counter
-                next_counter = max_counter + 1
-                generated_id = f"{prefix}-{next_counter:05d}"
+        Args:
+            table_name: The database table name
+            count: Number of IDs to reserve
+            db: SQLAlchemy database session
 
-                logger.debug(f"Generated ID for {table_name}: {generated_id} (no year suffix, counter: {next_counter})")
-                return generated_id
+        Returns:
+            IDs in ascending order (empty when count <= 0)
 
-            except Exception as e:
-                logger.error(f"Error generating frontend ID for {table_name}: {e}")
-                raise
+        Raises:
+            ValueError: If table_name is not supported
+        """
+        if table_name not in cls.ID_PATTERNS:
+            raise ValueError(f"Unsupported table name: {table_name}. Supported tables: {list(cls.ID_PATTERNS.keys())}")
+        if count <= 0:
+            return []
 
-        # ============================================================
-        # For tables WITH year suffix (orders, dispatch, etc.)
-        # ============================================================
-        current_year = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%y")
+        config = cls.ID_PATTERNS[table_name]
+        year = "" if config.get("no_year_suffix", False) else cls._current_year()
 
         try:
-            # ============================================================
-            # ACQUIRE APPLICATION LOCK to prevent concurrent ID generation
-            # This prevents race conditions when multiple requests generate IDs simultaneously
-            # ============================================================
-            lock_resource = f"generate_id_{table_name}_{current_year}"
-            acquire_lock = text("""
-                DECLARE @result INT;
-                EXEC @result = sp_getapplock
-                    @Resource = :resource,
-                    @LockMode = 'Exclusive',
-                    @LockOwner = 'Transaction',
-                    @LockTimeout = 10000;
-                SELECT @result as lock_result;
-            """)
-
-            lock_result = db.execute(acquire_lock, {"resource": lock_resource}).scalar()
-
-            if lock_result < 0:
-                logger.error(f"Failed to acquire lock for {table_name}: {lock_result}")
-                raise Exception(f"Could not acquire database lock for ID generation (code: {lock_result})")
-
-            logger.debug(f"Acquired application lock: {lock_resource}")
-            # ============================================================
-
-            # Query to find the highest counter for the current year
-            # Pattern: PREFIX-XXXXX-YY or XXXXX-YY (for serial_only)
-            if config.get("serial_only", False):
-                pattern = f"%-{current_year}"
-            else:
-                pattern = f"{prefix}-%-{current_year}"
-
-            # Get all IDs matching the year pattern with READ UNCOMMITTED to see pending changes
-            query = text(f"""
-                SELECT {column_name}
-                FROM {actual_table_name} WITH (READUNCOMMITTED)
-                WHERE {column_name} LIKE :pattern
-            """)
-
-            result = db.execute(query, {"pattern": pattern}).fetchall()
-
-            # Extract counter values and find max
-            max_counter = 0
-            for row in result:
-                id_value = row[0]
-                if id_value:
-                    try:
-                        # Extract counter from format: PREFIX-00123-25 or 00123-25
-                        parts = id_value.split("-")
-                        if config.get("serial_only", False):
-                            # Format: 00123-25
-                            if len(parts) >= 2:
-                                counter = int(parts[-2])  # Second to last part
-                                max_counter = max(max_counter, counter)
-                        else:
-                            # Format: PREFIX-00123-25
-                            if len(parts) >= 3:
-                                counter = int(parts[-2])  # Second to last part
-                                max_counter = max(max_counter, counter)
-                    except (ValueError, IndexError):
-                        continue
-
-            # Increment counter
-            next_counter = max_counter + 1
+            counters = SequenceService.reserve(
+                db, table_name, year, count, seed=lambda: cls._scan_max_counter(table_name, year, db)
+            )
+            reserved = [cls._format_id(config, counter, year) for counter in counters]
 
-            # Handle serial-only format for challan tables
-            if config.get("serial_only", False):
-                # Format: 00001-25
-                generated_id = f"{next_counter:05d}-{current_year}"
-            else:
-                # Format: PREFIX-00001-25
-                generated_id = f"{prefix}-{next_counter:05d}-{current_year}"
-
-            logger.debug(f"Generated ID for {table_name}: {generated_id} (year: {current_year}, counter: {next_counter})")
-            return generated_id
+            logger.debug(f"Reserved {count} IDs for {table_name}: {reserved[0]} .. {reserved[-1]}")
+            return reserved
 
         except Exception as e:
-            logger.error(f"Error generating frontend ID for {table_name}: {e}")
+            logger.error(f"Error reserving frontend IDs for {table_name}: {e}")
             raise
-    
-    
+
+    @classmethod
+    def preview_frontend_id(cls, table_name: str, db: Session) -> str:
+        """
+        Return the ID the next generate_frontend_id call would hand out, without consuming it.
+
+        Raises:
+            ValueError: If table_name is not supported
+        """
+        if table_name not in cls.ID_PATTERNS:
+            raise ValueError(f"Unsupported table name: {table_name}. Supported tables: {list(cls.ID_PATTERNS.keys())}")
+
+        config = cls.ID_PATTERNS[table_name]
+        year = "" if config.get("no_year_suffix", False) else cls._current_year()
+
+        last_value = SequenceService.current(db, table_name, year)
+        if last_value is None:
+            last_value = cls._scan_max_counter(table_name, year, db)
+        return cls._format_id(config, last_value + 1, year)
+
+    @classmethod
+    def backfill_sequences(cls, db: Session) -> Dict[str, int]:
+        """
+        Create or catch up the frontend_id_sequence rows for the current year from the
+        IDs already stored in each table. Safe to run repeatedly; counters never go down.
+        Commits the session.
+
+        Returns:
+            Sequence name -> last counter value
+        """
+        current_year = cls._current_year()
+        counters = {}
+
+        for table_name, config in cls.ID_PATTERNS.items():
+            year = "" if config.get("no_year_suffix", False) else current_year
+            scanned = cls._scan_max_counter(table_name, year, db)
+            counters[table_name] = SequenceService.ensure_at_least(db, table_name, year, scanned)
+
+        db.commit()
+        logger.info(f"🔢 ID SEQUENCES: Backfilled {len(counters)} sequences for year {current_year}")
+        return counters
+
+    @staticmethod
+    def _current_year() -> str:
+        return datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%y")
+
+    @staticmethod
+    def _format_id(config: Dict[str, str], counter: int, year: str) -> str:
+        """Format a counter as PREFIX-00001-25, PREFIX-00001 (no year suffix) or 00001-25 (serial only)."""
+        if config.get("no_year_suffix", False):
+            return f"{config['prefix']}-{counter:05d}"
+        if config.get("serial_only", False):
+            return f"{counter:05d}-{year}"
+        return f"{config['prefix']}-{counter:05d}-{year}"
+
+    @classmethod
+    def _scan_max_counter(cls, table_name: str, year: str, db: Session) -> int:
+        """
+        Highest counter already used in the table for a year ("" for sequences without
+        a year suffix). Only used to seed and backfill the sequence rows.
+        """
+        config = cls.ID_PATTERNS[table_name]
+        column_name = config["column_name"]
+        actual_table_name = config.get("table_name", table_name)
+
+        if config.get("no_year_suffix", False):
+            pattern = f"{config['prefix']}-%"
+        elif config.get("serial_only", False):
+            pattern = f"%-{year}"
+        else:
+            pattern = f"{config['prefix']}-%-{year}"
+
+        # READ UNCOMMITTED sees IDs of inserts still pending in other transactions
+        hint = " WITH (READUNCOMMITTED)" if SequenceService.is_mssql(db) else ""
+        query = text(f"""
+            SELECT {column_name}
+            FROM {actual_table_name}{hint}
+            WHERE {column_name} LIKE :pattern
+        """)
+
+        result = db.execute(query, {"pattern": pattern}).fetchall()
+
+        # Extract counter values and find max
+        max_counter = 0
+        for row in result:
+            id_value = row[0]
+            if id_value:
+                try:
+                    # Formats: PREFIX-00123, PREFIX-00123-25 or 00123-25
+                    parts = id_value.split("-")
+                    if config.get("no_year_suffix", False):
+                        if len(parts) >= 2:
+                            max_counter = max(max_counter, int(parts[1]))
+                    elif config.get("serial_only", False):
+                        if len(parts) >= 2:
+                            max_counter = max(max_counter, int(parts[-2]))
+                    elif len(parts) >= 3:
+                        max_counter = max(max_counter, int(parts[-2]))
+                except (ValueError, IndexError):
+                    continue
+
+        return max_counter
+
     @classmethod
     def get_all_patterns(cls) -> Dict[str, Dict[str, str]]:
         """
@@ -375,8 +407,16 @@ class FrontendIDGenerator:
         Returns:
             Dictionary with table names and their current counter values for this year
         """
+        from .. import models
+
         status = {}
-        current_year = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%y")
+        current_year = cls._current_year()
+
+        sequence = models.FrontendIDSequence.__table__
+        sequence_counters = {
+            (row.sequence_name, row.year): row.last_value
+            for row in db.execute(select(sequence.c.sequence_name, sequence.c.year, sequence.c.last_value)).fetchall()
+        }
 
         for table_name, config in cls.ID_PATTERNS.items():
             try:
@@ -416,6 +456,7 @@ class FrontendIDGenerator:
                         "current_counter": max_counter,
                         "next_id_will_be": f"{prefix}-{max_counter + 1:05d}",
                         "total": len(result),
+                        "sequence_counter": sequence_counters.get((table_name, "")),
                         "note": "No year suffix - simple sequential format"
                     }
                     continue
@@ -458,7 +499,8 @@ class FrontendIDGenerator:
                     "current_year": current_year,
                     "current_counter": max_counter,
                     "next_id_will_be": f"{prefix}-{max_counter + 1:05d}-{current_year}" if not config.get("serial_only", False) else f"{max_counter + 1:05d}-{current_year}",
-                    "total_this_year": len(result)
+                    "total_this_year": len(result),
+                    "sequence_counter": sequence_counters.get((table_name, current_year))
                 }
 
             except Exception as e:
@@ -0,0 +1,160 @@
+"""
+Keyset Pagination - Seek-based paging with opaque cursors
+
+OFFSET paging makes the database read and throw away every row before the
+requested page, so deep pages of the large report lists got steadily slower.
+Keyset paging instead remembers the sort key of the last row handed out and
+asks for the rows after it:
+
+    WHERE (created_at < :last_created_at)
+       OR (created_at = :last_created_at AND id < :last_id)
+    ORDER BY created_at DESC, id DESC
+
+With an index on the sort columns every page costs the same. The unique last
+column (the primary key) breaks ties so no row is skipped or repeated.
+
+Cursors are base64url-encoded JSON of the last row's key values and are opaque
+to clients: they pass next_cursor back unchanged to get the following page.
+Cursor values are bound with the sort column's type. On SQL Server a DATETIME
+column only stores 1/300 s ticks while the driver sends datetimes at full
+precision, so the tie test "created_at = :last_created_at" could miss the
+boundary row; there the value is also cast to the column type in SQL.
+"""
+
+import base64
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, and_, cast, literal, or_
+from sqlalchemy.orm import Query
+
+# (column, descending) pairs; the last column must be unique
+SortKey = Sequence[Tuple[Any, bool]]
+
+
+class InvalidCursorError(ValueError):
+    """Raised for cursor tokens that were not issued for this sort key."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor token for the sort key values of a row."""
+    tagged = []
+    for value in values:
+        if isinstance(value, datetime):
+            tagged.append(["dt", value.isoformat()])
+        elif isinstance(value, date):
+            tagged.append(["d", value.isoformat()])
+        elif isinstance(value, uuid.UUID):
+            tagged.append(["uuid", str(value)])
+        elif isinstance(value, Decimal):
+            tagged.append(["dec", str(value)])
+        else:
+            tagged.append(["v", value])
+    raw = json.dumps(tagged, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> List[Any]:
+    """
+    Sort key values of a cursor token.
+
+    Raises:
+        InvalidCursorError: If the token is malformed or does not match the sort key
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        tagged = json.loads(raw)
+        values = []
+        for tag, value in tagged:
+            if tag == "dt":
+                values.append(datetime.fromisoformat(value))
+            elif tag == "d":
+                values.append(date.fromisoformat(value))
+            elif tag == "uuid":
+                values.append(uuid.UUID(value))
+            elif tag == "dec":
+                values.append(Decimal(value))
+            else:
+                values.append(value)
+    except Exception:
+        raise InvalidCursorError("Invalid pagination cursor")
+    if len(values) != size:
+        raise InvalidCursorError("Invalid pagination cursor")
+    return values
+
+
+def bind_cursor_value(column: Any, value: Any, dialect_name: Optional[str] = None):
+    """
+    Cursor value as a bound parameter of the column's type. On SQL Server,
+    datetimes are cast to the column type so they compare at the column's
+    precision (DATETIME rounds to 1/300 s).
+    """
+    bound = literal(value, column.type)
+    if dialect_name == "mssql" and isinstance(column.type, DateTime):
+        return cast(bound, column.type)
+    return bound
+
+
+def seek_condition(sort_key: SortKey, values: Sequence[Any], dialect_name: Optional[str] = None):
+    """WHERE clause selecting the rows after values in sort_key order."""
+    bound = [bind_cursor_value(column, value, dialect_name) for (column, _), value in zip(sort_key, values)]
+    clauses = []
+    for position, (column, descending) in enumerate(sort_key):
+        equal_prefix = [sort_key[i][0] == bound[i] for i in range(position)]
+        beyond = column < bound[position] if descending else column > bound[position]
+        clauses.append(and_(*equal_prefix, beyond))
+    return or_(*clauses)
+
+
+def keyset_page(
+    query: Query,
+    sort_key: SortKey,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    key_of: Optional[Callable[[Any], Sequence[Any]]] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    One page of query in sort_key order.
+
+    Pages start after cursor when one is given. Without a cursor the legacy
+    offset is used (0 for the first page), so page-number clients keep working
+    and can switch to the returned cursor at any point.
+
+    Args:
+        query: Filtered query without ORDER BY / OFFSET / LIMIT
+        sort_key: (column, descending) pairs, last one unique
+        limit: Page size
+        cursor: next_cursor of the previous page
+        offset: Rows to skip when no cursor is given
+        key_of: Row -> sort key values (defaults to the row's column attributes)
+
+    Returns:
+        (rows, next_cursor) - next_cursor is None on the last page
+
+    Raises:
+        InvalidCursorError: If the cursor is invalid
+    """
+    if limit <= 0:
+        return [], None
+    if cursor:
+        dialect_name = query.session.get_bind().dialect.name
+        query = query.filter(seek_condition(sort_key, decode_cursor(cursor, len(sort_key)), dialect_name))
+        offset = 0
+
+    order_by = [column.desc() if descending else column.asc() for column, descending in sort_key]
+    query = query.order_by(*order_by)
+    if offset:
+        query = query.offset(offset)
+    rows = query.limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    if key_of is None:
+        key_of = lambda row: [getattr(row, column.key) for column, _ in sort_key]
+    return rows, encode_cursor(key_of(rows[-1]))
@@ -0,0 +1,220 @@
+"""
+Optimization Result Cache - Content-addressed cache for per-spec cutting results
+
+Planners re-run plan calculations with the same order set many times while
+adjusting the UI. The cutting result for a spec group depends only on its demand
+vector (width -> quantity), the jumbo width, the algorithm and the solver config,
+so match_combos results are cached under a hash of exactly those inputs.
+
+Tiers:
+- In-memory LRU (always on, per process)
+- SQL table optimization_result_cache (optional, shared across workers),
+  enabled with OPTIMIZATION_CACHE_SQL=true
+
+Keys are derived from every input match_combos reads, so a change in pending
+items or wastage produces a new demand vector (and key) rather than a stale hit.
+Entries simply age out after OPTIMIZATION_CACHE_TTL_SECONDS; DELETE
+/cutting/result-cache clears both tiers by hand.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_CACHE_SIZE = 512
+DEFAULT_RESULT_CACHE_TTL_SECONDS = 3600
+
+# (used_patterns, pending, high_trims) as returned by CuttingOptimizer.match_combos
+MatchResult = Tuple[List[Tuple[Tuple[float, ...], float]], Dict[float, int], List[Tuple[Tuple[float, ...], float]]]
+
+
+class OptimizationResultCache:
+    """
+    Two-tier cache for match_combos results keyed by a canonical demand hash.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_RESULT_CACHE_SIZE,
+        ttl_seconds: int = DEFAULT_RESULT_CACHE_TTL_SECONDS,
+        sql_enabled: bool = False
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.sql_enabled = sql_enabled
+        self._entries: "OrderedDict[str, Tuple[float, MatchResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.sql_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        demand: Dict[float, int],
+        jumbo_width: float,
+        algorithm: str,
+        solver_config: Any = None
+    ) -> str:
+        """
+        Build the SHA256 cache key for a spec group's demand vector.
+
+        Args:
+            demand: Width -> quantity still to be cut for the spec group
+            jumbo_width: Jumbo roll width in inches
+            algorithm: Optimizer algorithm name
+            solver_config: SolverConfig (or dict) used for the solve
+        """
+        if is_dataclass(solver_config):
+            solver_config = asdict(solver_config)
+        canonical = {
+            "demand": sorted((round(float(width), 2), int(qty)) for width, qty in demand.items() if qty > 0),
+            "jumbo_width": round(float(jumbo_width), 2),
+            "algorithm": algorithm,
+            "solver_config": solver_config or {}
+        }
+        body = json.dumps(canonical, sort_keys=True)
+        return hashlib.sha256(body.encode()).hexdigest()
+
+    def get(self, key: str, db: Optional[Session] = None) -> Optional[MatchResult]:
+        """Look up a result in memory, then (if enabled) in the SQL tier."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._copy(value)
+                del self._entries[key]
+
+        if self.sql_enabled and db is not None:
+            value = self._sql_get(db, key)
+            if value is not None:
+                with self._lock:
+                    self.sql_hits += 1
+                self._remember(key, value)
+                return self._copy(value)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: MatchResult, algorithm: str = "", jumbo_width: float = 0, db: Optional[Session] = None) -> None:
+        """Store a result in memory and (if enabled) in the SQL tier."""
+        self._remember(key, value)
+        if self.sql_enabled and db is not None:
+            self._sql_put(db, key, value, algorithm, jumbo_width)
+
+    def clear(self, db: Optional[Session] = None) -> None:
+        """Drop every cached result in memory and (if enabled) in the SQL tier."""
+        with self._lock:
+            self._entries.clear()
+        if self.sql_enabled and db is not None:
+            self._sql_clear(db)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.sql_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "sql_enabled": self.sql_enabled,
+                "hits": self.hits,
+                "sql_hits": self.sql_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.sql_hits) / lookups, 4) if lookups else 0.0
+            }
+
+    def _remember(self, key: str, value: MatchResult) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _copy(value: MatchResult) -> MatchResult:
+        used, pending, high_trims = value
+        return list(used), dict(pending), list(high_trims)
+
+    # --- SQL tier ---
+
+    def _sql_get(self, db: Session, key: str) -> Optional[MatchResult]:
+        from .. import models
+        try:
+            row = db.query(models.OptimizationResultCache).filter(
+                models.OptimizationResultCache.cache_key == key,
+                models.OptimizationResultCache.expires_at > datetime.utcnow()
+            ).first()
+            return self._deserialize(row.result) if row else None
+        except Exception as e:
+            logger.error(f"Error reading optimization result cache: {e}")
+            return None
+
+    def _sql_put(self, db: Session, key: str, value: MatchResult, algorithm: str, jumbo_width: float) -> None:
+        from .. import models
+        try:
+            # Separate session so caching never commits or rolls back the caller's work.
+            # It takes a second connection while the caller holds one; concurrency.py
+            # keeps DB_CONNECTION_HEADROOM connections outside the thread pool for this
+            with Session(bind=db.get_bind()) as cache_session:
+                cache_session.query(models.OptimizationResultCache).filter(
+                    models.OptimizationResultCache.cache_key == key
+                ).delete()
+                cache_session.add(models.OptimizationResultCache(
+                    cache_key=key,
+                    algorithm=algorithm,
+                    jumbo_width=jumbo_width,
+                    result=self._serialize(value),
+                    expires_at=datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+                ))
+                cache_session.commit()
+        except Exception as e:
+            logger.error(f"Error storing optimization result cache: {e}")
+
+    def _sql_clear(self, db: Session) -> None:
+        from .. import models
+        try:
+            with Session(bind=db.get_bind()) as cache_session:
+                cache_session.query(models.OptimizationResultCache).delete()
+                cache_session.commit()
+        except Exception as e:
+            logger.error(f"Error clearing optimization result cache table: {e}")
+
+    @staticmethod
+    def _serialize(value: MatchResult) -> Dict[str, Any]:
+        used, pending, high_trims = value
+        return {
+            "used": [[list(combo), trim] for combo, trim in used],
+            "pending": [[width, qty] for width, qty in pending.items()],
+            "high_trims": [[list(combo), trim] for combo, trim in high_trims]
+        }
+
+    @staticmethod
+    def _deserialize(data: Dict[str, Any]) -> MatchResult:
+        used = [(tuple(float(w) for w in combo), trim) for combo, trim in data.get("used", [])]
+        pending = {float(width): int(qty) for width, qty in data.get("pending", [])}
+        high_trims = [(tuple(float(w) for w in combo), trim) for combo, trim in data.get("high_trims", [])]
+        return used, pending, high_trims
+
+
+# Shared process-wide instance
+optimization_cache = OptimizationResultCache(
+    max_entries=int(os.getenv("OPTIMIZATION_CACHE_SIZE", DEFAULT_RESULT_CACHE_SIZE)),
+    ttl_seconds=int(os.getenv("OPTIMIZATION_CACHE_TTL_SECONDS", DEFAULT_RESULT_CACHE_TTL_SECONDS)),
+    sql_enabled=os.getenv("OPTIMIZATION_CACHE_SQL", "false").lower() in ("1", "true", "yes")
+)
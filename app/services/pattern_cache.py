@@ -0,0 +1,138 @@
+"""
+Pattern Cache - Process-wide LRU cache for cutting pattern enumeration
+
+Pattern feasibility only depends on the set of widths, the deckle (jumbo width),
+the trim limits and the maximum number of lanes. The same width sets recur across
+most daily plans, so enumerated patterns are cached here and shared by every
+CuttingOptimizer instance in the process.
+
+A single generate_combos entry can hold hundreds of thousands of combos, and
+every spec group pool process keeps its own cache, so the cache is bounded by
+the total number of stored patterns (PATTERN_CACHE_MAX_ITEMS) as well as by
+entry count. Results larger than that bound are returned without being cached.
+"""
+
+import os
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATTERN_CACHE_SIZE = 256
+DEFAULT_PATTERN_CACHE_MAX_ITEMS = 300000  # Patterns/combos stored across all entries, per process
+
+
+class PatternCache:
+    """
+    Bounded, thread-safe LRU cache for enumerated cutting patterns.
+
+    Keys are built with make_key() from the sorted width tuple plus the
+    deckle/trim/lane parameters. Values are treated as immutable - callers
+    receive a shallow copy of cached lists so in-place sorting is safe.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_PATTERN_CACHE_SIZE, max_items: int = DEFAULT_PATTERN_CACHE_MAX_ITEMS):
+        self.max_entries = max(1, max_entries)
+        self.max_items = max(1, max_items)
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.items = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.oversized = 0
+
+    @staticmethod
+    def make_key(
+        kind: str,
+        widths: Iterable[float],
+        deckle: float,
+        trim_cap: float,
+        max_lanes: int
+    ) -> Tuple:
+        """
+        Build a canonical cache key.
+
+        Args:
+            kind: Pattern family (e.g. "ilp", "combos") so different generators don't collide
+            widths: Widths to cut (order does not matter)
+            deckle: Jumbo roll width in inches
+            trim_cap: Maximum trim accepted by the generator
+            max_lanes: Maximum number of cut rolls per pattern
+        """
+        width_key = tuple(sorted(round(float(w), 2) for w in widths))
+        return (kind, width_key, round(float(deckle), 2), round(float(trim_cap), 2), int(max_lanes))
+
+    def get_or_build(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, building and storing it on a miss.
+        The builder runs outside the lock so slow enumerations don't block other threads.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._copy(self._entries[key])
+            self.misses += 1
+
+        value = builder()
+        size = self._size(value)
+
+        with self._lock:
+            if size > self.max_items:
+                self.oversized += 1
+                return self._copy(value)
+            if key in self._entries:
+                self.items -= self._size(self._entries[key])
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self.items += size
+            while len(self._entries) > self.max_entries or self.items > self.max_items:
+                _, evicted = self._entries.popitem(last=False)
+                self.items -= self._size(evicted)
+                self.evictions += 1
+
+        return self._copy(value)
+
+    def clear(self) -> None:
+        """Drop all cached patterns and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.items = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.oversized = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "items": self.items,
+                "max_items": self.max_items,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "oversized": self.oversized,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    @staticmethod
+    def _size(value: Any) -> int:
+        return len(value) if isinstance(value, list) else 1
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        return list(value) if isinstance(value, list) else value
+
+
+# Shared process-wide instance
+pattern_cache = PatternCache(
+    max_entries=int(os.getenv("PATTERN_CACHE_SIZE", DEFAULT_PATTERN_CACHE_SIZE)),
+    max_items=int(os.getenv("PATTERN_CACHE_MAX_ITEMS", DEFAULT_PATTERN_CACHE_MAX_ITEMS))
+)
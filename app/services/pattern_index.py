@@ -0,0 +1,303 @@
+"""
+Pattern Index - Persisted feasible-pattern index per jumbo width and width catalogue
+
+Pattern feasibility only depends on the deckle, the trim limit, the lane limit and
+the widths. The widths ordered for each paper spec (GSM + shade + BF) are a stable
+catalogue, so feasible patterns are precomputed per catalogue from historical
+OrderItem.width_inches and stored in the cutting_pattern_index table.
+
+At startup the index is loaded into memory (and rebuilt in a background thread
+when stale). Lookups for any subset of a catalogue's widths, a lower trim cap or
+fewer lanes are answered by filtering the catalogue entry, so CuttingOptimizer
+doesn't pay the enumeration cost on first requests. Spec group pool processes
+load their own copy on first use (ensure_loaded).
+
+PendingOptimizer is not indexed: its sets are filled by the exact DP in
+fill_solver, which never enumerates patterns, against a deckle of 124" minus
+the requested wastage.
+"""
+
+import os
+import hashlib
+import threading
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+WIDTH_SCALE = 100  # Hundredths of an inch, same scale as cutting_optimizer.PATTERN_SCALE
+
+PATTERN_INDEX_MAX_WIDTHS = int(os.getenv("PATTERN_INDEX_MAX_WIDTHS", 24))  # Most-ordered widths kept per spec
+PATTERN_INDEX_MIN_ORDERS = int(os.getenv("PATTERN_INDEX_MIN_ORDERS", 2))  # Widths ordered fewer times are left out
+PATTERN_INDEX_MAX_PATTERNS = int(os.getenv("PATTERN_INDEX_MAX_PATTERNS", 50000))  # Entries larger than this are skipped
+PATTERN_INDEX_REFRESH_HOURS = int(os.getenv("PATTERN_INDEX_REFRESH_HOURS", 24))
+
+LaneSet = Tuple[int, ...]
+
+
+def _scale(width: float) -> int:
+    return int(round(float(width) * WIDTH_SCALE))
+
+
+class _IndexEntry:
+    """In-memory form of one cutting_pattern_index row."""
+    __slots__ = ("widths", "trim_cap", "max_lanes", "patterns")
+
+    def __init__(self, widths: FrozenSet[int], trim_cap: int, max_lanes: int, patterns: List[LaneSet]):
+        self.widths = widths
+        self.trim_cap = trim_cap
+        self.max_lanes = max_lanes
+        self.patterns = patterns
+
+
+class PatternIndex:
+    """
+    In-memory view of the persisted pattern index with superset lookups.
+
+    Patterns are lane tuples of scaled widths in ascending order, listed by
+    (lane count, lanes) - the same order combinations_with_replacement produces.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, List[_IndexEntry]] = {}
+        self._lock = threading.Lock()
+        self._build_thread: Optional[threading.Thread] = None
+        self.loaded_at: Optional[datetime] = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(deckle: float, widths: Iterable[float], trim_cap: float, max_lanes: int) -> str:
+        """SHA256 key of a (jumbo width, width set, trim cap, max lanes) entry."""
+        width_set = ",".join(f"{w / WIDTH_SCALE:.2f}" for w in sorted({_scale(w) for w in widths}))
+        body = f"{_scale(deckle)}|{width_set}|{_scale(trim_cap)}|{int(max_lanes)}"
+        return hashlib.sha256(body.encode()).hexdigest()
+
+    @staticmethod
+    def enumerate_patterns(widths: Iterable[float], deckle: float, trim_cap: float, max_lanes: int, limit: Optional[int] = None) -> Optional[List[LaneSet]]:
+        """
+        Enumerate every multiset of widths (up to max_lanes) whose total fits the
+        deckle with trim <= trim_cap. Depth-first with pruning on the running width.
+
+        Returns:
+            Lane tuples in (lane count, lanes) order, or None if more than limit patterns exist
+        """
+        scaled_widths = sorted({_scale(w) for w in widths if _scale(w) > 0})
+        scaled_deckle = _scale(deckle)
+        min_used = scaled_deckle - _scale(trim_cap)
+        patterns: List[LaneSet] = []
+
+        def extend(start: int, lanes: List[int], used: int) -> bool:
+            if lanes and used >= min_used:
+                patterns.append(tuple(lanes))
+                if limit is not None and len(patterns) > limit:
+                    return False
+            if len(lanes) == max_lanes:
+                return True
+            for i in range(start, len(scaled_widths)):
+                width = scaled_widths[i]
+                if used + width > scaled_deckle:
+                    break
+                lanes.append(width)
+                ok = extend(i, lanes, used + width)
+                lanes.pop()
+                if not ok:
+                    return False
+            return True
+
+        if not extend(0, [], 0):
+            return None
+        patterns.sort(key=lambda lanes: (len(lanes), lanes))
+        return patterns
+
+    def lookup(self, widths: Iterable[float], deckle: float, trim_cap: float, max_lanes: int) -> Optional[List[LaneSet]]:
+        """
+        Feasible patterns for widths from the smallest indexed catalogue that covers them.
+
+        Returns:
+            Lane tuples (scaled, ascending) in (lane count, lanes) order, or None when no entry covers the request
+        """
+        requested = frozenset(_scale(w) for w in widths)
+        scaled_trim_cap = _scale(trim_cap)
+        scaled_deckle = _scale(deckle)
+
+        with self._lock:
+            candidates = [
+                entry for entry in self._entries.get(scaled_deckle, [])
+                if entry.trim_cap >= scaled_trim_cap and entry.max_lanes >= max_lanes and requested <= entry.widths
+            ]
+            if not requested or not candidates:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry = min(candidates, key=lambda e: len(e.widths))
+
+        min_used = scaled_deckle - scaled_trim_cap
+        return [
+            lanes for lanes in entry.patterns
+            if len(lanes) <= max_lanes and sum(lanes) >= min_used and requested.issuperset(lanes)
+        ]
+
+    def load(self, db: Session) -> int:
+        """Load all persisted entries into memory. Returns the number of entries."""
+        from .. import models
+
+        entries: Dict[int, List[_IndexEntry]] = {}
+        rows = db.query(models.CuttingPatternIndex).all()
+        for row in rows:
+            widths = frozenset(_scale(w) for w in row.width_set.split(",") if w)
+            patterns = [tuple(lanes) for lanes in row.patterns or []]
+            entry = _IndexEntry(widths, _scale(row.trim_cap), int(row.max_lanes), patterns)
+            entries.setdefault(_scale(row.jumbo_width), []).append(entry)
+
+        with self._lock:
+            self._entries = entries
+            self.loaded_at = datetime.utcnow()
+        logger.info(f"📚 PATTERN INDEX: Loaded {len(rows)} entries")
+        return len(rows)
+
+    def build_from_history(self, db: Session, targets: Optional[List[Tuple[float, float, int]]] = None) -> int:
+        """
+        Rebuild the persisted index from historical order widths per paper spec.
+
+        Args:
+            db: Database session (committed by this method)
+            targets: (jumbo width, trim cap, max lanes) combinations to index;
+                     defaults to the cutting optimizer limits
+
+        Returns:
+            Number of entries written
+        """
+        from .. import models
+
+        if targets is None:
+            from .cutting_optimizer import DEFAULT_JUMBO_WIDTH, MAX_TRIM_WITH_CONFIRMATION, MAX_ROLLS_PER_JUMBO
+            targets = [(DEFAULT_JUMBO_WIDTH, MAX_TRIM_WITH_CONFIRMATION, MAX_ROLLS_PER_JUMBO)]
+
+        rows = db.query(
+            models.PaperMaster.gsm,
+            models.PaperMaster.shade,
+            models.PaperMaster.bf,
+            models.OrderItem.width_inches,
+            func.count(models.OrderItem.id)
+        ).join(
+            models.PaperMaster, models.OrderItem.paper_id == models.PaperMaster.id
+        ).group_by(
+            models.PaperMaster.gsm, models.PaperMaster.shade, models.PaperMaster.bf, models.OrderItem.width_inches
+        ).all()
+
+        catalogues: Dict[Tuple, List[Tuple[int, float]]] = {}
+        for gsm, shade, bf, width, orders in rows:
+            if width is None or float(width) <= 0 or orders < PATTERN_INDEX_MIN_ORDERS:
+                continue
+            catalogues.setdefault((gsm, shade, float(bf)), []).append((orders, float(width)))
+
+        written = 0
+        seen_keys = set()
+        for (gsm, shade, bf), counted_widths in catalogues.items():
+            counted_widths.sort(key=lambda item: (-item[0], item[1]))
+            widths = sorted(width for _, width in counted_widths[:PATTERN_INDEX_MAX_WIDTHS])
+
+            for deckle, trim_cap, max_lanes in targets:
+                index_key = self.make_key(deckle, widths, trim_cap, max_lanes)
+                if index_key in seen_keys:
+                    continue  # Another spec has the same catalogue
+                seen_keys.add(index_key)
+
+                patterns = self.enumerate_patterns(widths, deckle, trim_cap, max_lanes, limit=PATTERN_INDEX_MAX_PATTERNS)
+                if patterns is None:
+                    logger.warning(f"⚠️ PATTERN INDEX: Skipping {gsm}/{shade}/{bf} at {deckle}\" - more than {PATTERN_INDEX_MAX_PATTERNS} patterns")
+                    continue
+
+                db.query(models.CuttingPatternIndex).filter(models.CuttingPatternIndex.index_key == index_key).delete()
+                db.add(models.CuttingPatternIndex(
+                    index_key=index_key,
+                    jumbo_width=deckle,
+                    width_set=",".join(f"{w:.2f}" for w in widths),
+                    trim_cap=trim_cap,
+                    max_lanes=max_lanes,
+                    patterns=[list(lanes) for lanes in patterns],
+                    pattern_count=len(patterns),
+                    source_spec=f"{gsm}/{shade}/{bf}",
+                    built_at=datetime.utcnow()
+                ))
+                written += 1
+
+        # Entries for catalogues that no longer exist are dropped
+        if seen_keys:
+            db.query(models.CuttingPatternIndex).filter(
+                ~models.CuttingPatternIndex.index_key.in_(seen_keys)
+            ).delete(synchronize_session=False)
+        db.commit()
+
+        logger.info(f"📚 PATTERN INDEX: Built {written} entries from {len(catalogues)} paper spec catalogues")
+        self.load(db)
+        return written
+
+    def ensure_loaded(self, session_factory: Callable[[], Session]) -> None:
+        """Load the persisted index if this process has none or an outdated copy (spec group pool workers)."""
+        refresh_after = timedelta(hours=PATTERN_INDEX_REFRESH_HOURS)
+        if self.loaded_at is not None and datetime.utcnow() - self.loaded_at < refresh_after:
+            return
+        db = None
+        try:
+            db = session_factory()
+            self.load(db)
+        except Exception as e:
+            # Retry on the next call only after a full refresh interval
+            self.loaded_at = datetime.utcnow()
+            logger.error(f"❌ PATTERN INDEX: Load failed: {e}")
+        finally:
+            if db is not None:
+                db.close()
+
+    def is_stale(self, db: Session) -> bool:
+        """True when the index is empty or older than PATTERN_INDEX_REFRESH_HOURS."""
+        from .. import models
+
+        latest = db.query(func.max(models.CuttingPatternIndex.built_at)).scalar()
+        return latest is None or latest < datetime.utcnow() - timedelta(hours=PATTERN_INDEX_REFRESH_HOURS)
+
+    def start_background_build(self, session_factory: Callable[[], Session]) -> Optional[threading.Thread]:
+        """Load the persisted index and rebuild it in a daemon thread when stale."""
+        if self._build_thread is not None and self._build_thread.is_alive():
+            return self._build_thread
+
+        def run():
+            db = session_factory()
+            try:
+                self.load(db)
+                if self.is_stale(db):
+                    self.build_from_history(db)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"❌ PATTERN INDEX: Background build failed: {e}")
+            finally:
+                db.close()
+
+        self._build_thread = threading.Thread(target=run, name="pattern-index-build", daemon=True)
+        self._build_thread.start()
+        return self._build_thread
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry counts and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": sum(len(entries) for entries in self._entries.values()),
+                "jumbo_widths": sorted(deckle / WIDTH_SCALE for deckle in self._entries),
+                "patterns": sum(len(e.patterns) for entries in self._entries.values() for e in entries),
+                "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+                "building": self._build_thread is not None and self._build_thread.is_alive(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Shared process-wide instance
+pattern_index = PatternIndex()
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, Iterator
 from sqlalchemy.orm import Session
 from datetime import datetime
 from itertools import combinations_with_replacement, permutations
@@ -6,13 +6,18 @@ import uuid
 import logging
 import json
 import math
+import os
 
 from .. import models, crud_operations, schemas
 from .cutting_optimizer import CuttingOptimizer
+from .fill_solver import best_fill
 from .id_generator import FrontendIDGenerator
 
 logger = logging.getLogger(__name__)
 
+# Exact DP fill for each set; set to false to use the heuristic combination search
+PENDING_DP_ENABLED = os.getenv("PENDING_DP_ENABLED", "true").lower() in ("1", "true", "yes")
+
 class PendingOptimizer:
     """
     Optimization service for pending orders that provides preview functionality
@@ -79,58 +84,14 @@ class PendingOptimizer:
             unprocessed_item_details = []
 
             for spec_key, items in spec_groups.items():
-                spec_quantity = sum(item.quantity_pending for item in items)
-                logger.info(f"  → {spec_key[1]} {spec_key[0]}GSM BF{spec_key[2]}: {len(items)} items, {spec_quantity} total quantity")
-
-                # Create jumbo rolls directly from items with improved capacity
-                jumbo_rolls, processed_count, unprocessed_items = self._create_jumbo_rolls_directly_improved(items, target_width)
+                spec_result = self._build_spec_suggestion(spec_key, items, target_width)
 
                 # Track processing statistics
-                total_processed_items += processed_count
-                if unprocessed_items:
-                    unprocessed_item_details.extend(unprocessed_items)
-
-                if jumbo_rolls:
-                    # Validate cuts have proper order info
-                    self._validate_cut_generation(jumbo_rolls)
-
-                    # Count total cuts
-                    spec_cuts = sum(len(s['cuts']) for jr in jumbo_rolls for s in jr['sets'])
-                    total_cuts += spec_cuts
-
-                    spec_suggestion = {
-                        'spec_id': f"spec_{spec_key[0]}_{spec_key[1]}_{spec_key[2]}".replace(" ", "_"),
-                        'paper_spec': {
-                            'gsm': spec_key[0],
-                            'shade': spec_key[1],
-                            'bf': spec_key[2]
-                        },
-                        'target_width': target_width,
-                        'jumbo_rolls': jumbo_rolls,
-                        'pending_order_ids': [str(item.id) for item in items],
-                        'processing_stats': {
-                            'total_input_quantity': spec_quantity,
-                            'processed_quantity': processed_count,
-                            'unprocessed_quantity': len(unprocessed_items),
-                            'processing_efficiency': round((processed_count / spec_quantity) * 100, 1) if spec_quantity > 0 else 0
-                        },
-                        'summary': {
-                            'total_orders': len(set(item.original_order_id for item in items if item.original_order_id)),
-                            'total_jumbo_rolls': len(jumbo_rolls),
-                            'total_118_sets': sum(len(jr['sets']) for jr in jumbo_rolls),
-                            'total_cuts': spec_cuts
-                        }
-                    }
-                    spec_suggestions.append(spec_suggestion)
-                else:
-                    # No jumbo rolls could be created for this spec
-                    logger.warning(f"⚠️ No jumbo rolls generated for spec {spec_key}: {spec_quantity} items remain unprocessed")
-                    unprocessed_item_details.extend([{
-                        'item_id': str(item.id),
-                        'spec': spec_key,
-                        'quantity': item.quantity_pending,
-                        'reason': 'No feasible cutting patterns found'
-                    } for item in items])
+                total_processed_items += spec_result['processed_count']
+                unprocessed_item_details.extend(spec_result['unprocessed_items'])
+                total_cuts += spec_result['total_cuts']
+                if spec_result['spec_suggestion']:
+                    spec_suggestions.append(spec_result['spec_suggestion'])
 
             # Comprehensive processing summary
             unprocessed_quantity = total_pending_quantity - total_processed_items
@@ -169,6 +130,168 @@ class PendingOptimizer:
             logger.error(f"Error generating roll suggestions: {e}")
             raise
 
+    def _build_spec_suggestion(self, spec_key: Tuple, items: List[models.PendingOrderItem], target_width: float) -> Dict[str, Any]:
+        """
+        Build the roll suggestion for one paper spec.
+
+        Returns:
+            Dict with spec_suggestion (None when no jumbo rolls could be created),
+            processed_count, total_cuts and unprocessed_items for this spec
+        """
+        spec_quantity = sum(item.quantity_pending for item in items)
+        logger.info(f"  → {spec_key[1]} {spec_key[0]}GSM BF{spec_key[2]}: {len(items)} items, {spec_quantity} total quantity")
+
+        # Create jumbo rolls directly from items with improved capacity
+        jumbo_rolls, processed_count, unprocessed_items = self._create_jumbo_rolls_directly_improved(items, target_width)
+        unprocessed_items = list(unprocessed_items or [])
+
+        if not jumbo_rolls:
+            # No jumbo rolls could be created for this spec
+            logger.warning(f"⚠️ No jumbo rolls generated for spec {spec_key}: {spec_quantity} items remain unprocessed")
+            unprocessed_items.extend([{
+                'item_id': str(item.id),
+                'spec': spec_key,
+                'quantity': item.quantity_pending,
+                'reason': 'No feasible cutting patterns found'
+            } for item in items])
+            return {'spec_suggestion': None, 'processed_count': processed_count, 'total_cuts': 0, 'unprocessed_items': unprocessed_items}
+
+        # Validate cuts have proper order info
+        self._validate_cut_generation(jumbo_rolls)
+
+        # Count total cuts
+        spec_cuts = sum(len(s['cuts']) for jr in jumbo_rolls for s in jr['sets'])
+
+        spec_suggestion = {
+            'spec_id': f"spec_{spec_key[0]}_{spec_key[1]}_{spec_key[2]}".replace(" ", "_"),
+            'paper_spec': {
+                'gsm': spec_key[0],
+                'shade': spec_key[1],
+                'bf': spec_key[2]
+            },
+            'target_width': target_width,
+            'jumbo_rolls': jumbo_rolls,
+            'pending_order_ids': [str(item.id) for item in items],
+            'processing_stats': {
+                'total_input_quantity': spec_quantity,
+                'processed_quantity': processed_count,
+                'unprocessed_quantity': len(unprocessed_items),
+                'processing_efficiency': round((processed_count / spec_quantity) * 100, 1) if spec_quantity > 0 else 0
+            },
+            'summary': {
+                'total_orders': len(set(item.original_order_id for item in items if item.original_order_id)),
+                'total_jumbo_rolls': len(jumbo_rolls),
+                'total_118_sets': sum(len(jr['sets']) for jr in jumbo_rolls),
+                'total_cuts': spec_cuts
+            }
+        }
+        return {'spec_suggestion': spec_suggestion, 'processed_count': processed_count, 'total_cuts': spec_cuts, 'unprocessed_items': unprocessed_items}
+
+    def iter_roll_suggestions(self, wastage: float) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming variant of get_roll_suggestions.
+
+        Yields one record per paper spec as soon as it is solved, then a final
+        summary record. Pending items are loaded one spec at a time, so memory
+        stays bounded by the largest spec rather than the whole backlog.
+
+        Records:
+            {"type": "start", ...}    target width and backlog totals
+            {"type": "spec", ...}     spec_suggestion (None if nothing could be cut) + unprocessed_items
+            {"type": "summary", ...}  same summary block as get_roll_suggestions
+            {"type": "error", ...}    emitted instead of further records if a spec fails
+        """
+        from sqlalchemy import func
+        from sqlalchemy.orm import joinedload
+
+        target_width = 124 - wastage
+        pending_filter = (
+            models.PendingOrderItem._status == "pending",
+            models.PendingOrderItem.quantity_pending > 0
+        )
+
+        spec_rows = self.db.query(
+            models.PendingOrderItem.gsm,
+            models.PendingOrderItem.shade,
+            models.PendingOrderItem.bf,
+            func.count(models.PendingOrderItem.id),
+            func.sum(models.PendingOrderItem.quantity_pending)
+        ).filter(*pending_filter).group_by(
+            models.PendingOrderItem.gsm, models.PendingOrderItem.shade, models.PendingOrderItem.bf
+        ).all()
+
+        total_items = sum(row[3] for row in spec_rows)
+        total_pending_quantity = int(sum(row[4] or 0 for row in spec_rows))
+        yield {
+            "type": "start",
+            "target_width": target_width,
+            "wastage": wastage,
+            "total_specs": len(spec_rows),
+            "total_pending_input": total_items,
+            "total_input_quantity": total_pending_quantity
+        }
+
+        specs_processed = 0
+        specs_with_unprocessed = 0
+        total_cuts = 0
+        total_processed_items = 0
+
+        for gsm, shade, bf, _, _ in spec_rows:
+            spec_key = (gsm, shade, float(bf))
+            try:
+                items = self.db.query(models.PendingOrderItem).options(
+                    joinedload(models.PendingOrderItem.original_order).joinedload(models.OrderMaster.client)
+                ).filter(
+                    *pending_filter,
+                    models.PendingOrderItem.gsm == gsm,
+                    models.PendingOrderItem.shade == shade,
+                    models.PendingOrderItem.bf == bf
+                ).all()
+                if not items:
+                    continue
+
+                self._validate_order_data_integrity(items)
+                spec_result = self._build_spec_suggestion(spec_key, items, target_width)
+            except Exception as e:
+                logger.error(f"Error streaming roll suggestions for spec {spec_key}: {e}")
+                yield {"type": "error", "paper_spec": {"gsm": gsm, "shade": shade, "bf": float(bf)}, "detail": str(e)}
+                return
+
+            total_processed_items += spec_result['processed_count']
+            total_cuts += spec_result['total_cuts']
+            if spec_result['spec_suggestion']:
+                specs_processed += 1
+                if spec_result['spec_suggestion']['processing_stats']['unprocessed_quantity'] > 0:
+                    specs_with_unprocessed += 1
+
+            yield {
+                "type": "spec",
+                "spec_suggestion": spec_result['spec_suggestion'],
+                "unprocessed_items": spec_result['unprocessed_items']
+            }
+
+            # Loaded items are not needed once their spec has been streamed
+            self.db.expunge_all()
+
+        unprocessed_quantity = total_pending_quantity - total_processed_items
+        logger.info(f"📡 STREAMED SUGGESTIONS: {specs_processed}/{len(spec_rows)} specs, {total_processed_items}/{total_pending_quantity} items processed, {total_cuts} cuts")
+        yield {
+            "type": "summary",
+            "status": "success" if spec_rows else "no_pending_orders",
+            "target_width": target_width,
+            "wastage": wastage,
+            "summary": {
+                "total_pending_input": total_items,
+                "total_input_quantity": total_pending_quantity,
+                "total_processed_quantity": total_processed_items,
+                "unprocessed_quantity": unprocessed_quantity,
+                "processing_rate": round((total_processed_items / total_pending_quantity) * 100, 1) if total_pending_quantity > 0 else 0,
+                "specs_processed": specs_processed,
+                "specs_with_unprocessed": specs_with_unprocessed,
+                "total_cuts": total_cuts
+            }
+        }
+
     def _create_jumbo_rolls_directly_improved(self, items: List[models.PendingOrderItem], target_width: float) -> Tuple[List[Dict], int, List[Dict]]:
         """
         IMPROVED: Create jumbo rolls with dynamic capacity and enhanced algorithm.
@@ -365,176 +488,12 @@ class PendingOptimizer:
 
         return jumbo_rolls, processed_count, unprocessed_items
 
-    def _create_jumbo_rolls_directly(self, items: List[models.PendingOrderItem], target_width: float) -> List[Dict]:
-        """Create jumbo rolls directly from pending items without complex re-validation."""
-        # Convert items to width-quantity pairs while preserving order info
-        width_data = {}
-        for item in items:
-            width = float(item.width_inches)
-            if width not in width_data:
-                width_data[width] = []
-
-            # Store each individual piece with its order info
-            for _ in range(item.quantity_pending):
-                width_data[width].append({
-                    'order_frontend_id': item.original_order.frontend_id if item.original_order else 'Unknown',
-                    'client_name': item.original_order.client.company_name if item.original_order and item.original_order.client else 'Unknown',
-                    'item_id': str(item.id)
-                })
-
-        logger.info(f"    📦 Width inventory: {[(w, len(pieces)) for w, pieces in width_data.items()]}")
-
-        # Create jumbo rolls using optimization
-        jumbo_rolls = []
-        jumbo_number = 1
-
-        while any(len(pieces) > 0 for pieces in width_data.values()) and jumbo_number <= 3:
-            sets = []
-            set_number = 1
-
-            # Create up to 3 sets per jumbo
-            for set_num in range(1, 4):
-                cuts = []
-                cut_number = 1
-                total_width = 0
-
-                # Find best combination for this set
-                best_combo = self._find_best_width_combination(width_data, target_width)
-
-                if not best_combo:
-                    break
-
-                # Create cuts from the combination
-                for width, count in best_combo.items():
-                    for i in range(count):
-                        if width_data[width]:  # Still have pieces of this width
-                            piece_info = width_data[width].pop(0)
-                            cut = {
-                                'cut_id': f"cut_{cut_number}",
-                                'width_inches': width,
-                                'uses_existing': True,
-                                'used_widths': {str(width): 1},
-                                'order_frontend_id': piece_info['order_frontend_id'],
-                                'client_name': piece_info['client_name'],
-                                'description': f"{width}\" from {piece_info['order_frontend_id']} ({piece_info['client_name']})"
-                            }
-                            cuts.append(cut)
-                            total_width += width
-                            cut_number += 1
-
-                if cuts:
-                    waste = target_width - total_width
-                    roll_set = {
-                        'set_id': f"set_{set_number}",
-                        'set_number': set_number,
-                        'target_width': target_width,
-                        'cuts': cuts,
-                        'manual_addition_available': waste > 20.0,
-                        'summary': {
-                            'total_cuts': len(cuts),
-                            'using_existing_cuts': len(cuts),
-                            'total_actual_width': total_width,
-                            'total_waste': waste,
-                            'efficiency': round((total_width / target_width) * 100, 1)
-                        }
-                    }
-                    sets.append(roll_set)
-                    set_number += 1
-                else:
-                    break
-
-            if sets:
-                jumbo_roll = {
-                    'jumbo_id': f"jumbo_{jumbo_number}",
-                    'jumbo_number': jumbo_number,
-                    'target_width': target_width,
-                    'sets': sets,
-                    'summary': {
-                        'total_sets': len(sets),
-                        'total_cuts': sum(len(s['cuts']) for s in sets),
-                        'using_existing_cuts': sum(len(s['cuts']) for s in sets),
-                        'total_actual_width': sum(s['summary']['total_actual_width'] for s in sets),
-                        'total_waste': sum(s['summary']['total_waste'] for s in sets),
-                        'efficiency': round((sum(s['summary']['total_actual_width'] for s in sets) / (target_width * len(sets))) * 100, 1)
-                    }
-                }
-                jumbo_rolls.append(jumbo_roll)
-                jumbo_number += 1
-            else:
-                break
-
-        return jumbo_rolls
-
-    def _find_best_width_combination_improved(self, width_data: Dict[float, List], target_width: float, set_number: int, jumbo_number: int) -> Dict[float, int]:
-        """
-        IMPROVED: Find best combination of available widths to minimize waste with enhanced logic.
-        Features:
-        - Increased combination limit (up to 15 pieces)
-        - Better pattern recognition
-        - Priority for smaller waste
-        - Enhanced logging for debugging
-        """
-        available_widths = {w: len(pieces) for w, pieces in width_data.items() if len(pieces) > 0}
-
-        if not available_widths:
-            return {}
-
-        total_available_pieces = sum(available_widths.values())
-        logger.debug(f"🔍 COMBINATION SEARCH: Jumbo {jumbo_number}, Set {set_number}")
-        logger.debug(f"    Available widths: {available_widths}")
-        logger.debug(f"    Target width: {target_width}, Total pieces: {total_available_pieces}")
-
-        best_combo = {}
-        min_waste = float('inf')
-        best_efficiency = 0
-
-        # IMPROVED: Dynamic maximum pieces based on available pieces and target width
-        # Small widths can have more pieces, large widths fewer pieces
-        avg_width = sum(w * count for w, count in available_widths.items()) / total_available_pieces
-        max_pieces_by_width = max(6, int(target_width / avg_width))
-        max_combination_pieces = min(max_pieces_by_width, min(15, total_available_pieces))
-
-        logger.debug(f"    Max pieces per combination: {max_combination_pieces} (based on avg width: {avg_width:.1f}\")")
-
-        # Try combinations with increasing number of pieces
-        for num_pieces in range(1, max_combination_pieces + 1):
-            combo = self._try_combination_with_priority(available_widths, target_width, num_pieces)
-            if combo:
-                total_width = sum(w * count for w, count in combo.items())
-                waste = target_width - total_width
-                efficiency = (total_width / target_width) * 100
-
-                # IMPROVED: Better scoring algorithm
-                # Prefer combinations with higher efficiency and lower waste
-                score = efficiency - (waste * 0.1)  # Small penalty for waste
-
-                if waste >= 0 and score > (best_efficiency - (min_waste * 0.1)):
-                    best_combo = combo
-                    min_waste = waste
-                    best_efficiency = efficiency
-
-                    logger.debug(f"    ✓ New best combo ({num_pieces} pieces): {combo} → {total_width}\" used, {waste}\" waste, {efficiency:.1f}% efficiency")
-
-                    # FIXED: Remove premature early termination to ensure better combinations are found
-                    # Only terminate for truly exceptional combinations
-                    if waste <= 0.5 and efficiency >= 98:
-                        logger.debug(f"    🎯 Exceptional combination found, stopping search")
-                        break
-                    # Don't terminate early for moderate combinations - let better ones be found
-
-        if best_combo:
-            total_width = sum(w * count for w, count in best_combo.items())
-            logger.debug(f"    ✅ FINAL: Selected combo with {len(best_combo)} widths, {sum(best_combo.values())} pieces")
-            logger.debug(f"    ✅ FINAL: Width usage: {total_width}/{target_width} inches, waste: {min_waste}, efficiency: {best_efficiency:.1f}%")
-        else:
-            logger.debug(f"    ❌ No feasible combination found")
-
-        return best_combo
-
     def _find_best_width_combination_with_piece_priority(self, width_data: Dict[float, List], target_width: float, set_number: int, jumbo_number: int) -> Dict[float, int]:
         """
         MODIFIED: Find combination that maximizes piece usage while maintaining efficiency.
         Prioritizes using more pieces over minimal waste to reduce number of sets.
+        Uses the exact bounded-knapsack fill (fill_solver) unless PENDING_DP_ENABLED is off,
+        in which case the heuristic combination search is used.
         """
         available_widths = {w: len(pieces) for w, pieces in width_data.items() if len(pieces) > 0}
 
@@ -558,6 +517,14 @@ class PendingOptimizer:
 
         logger.debug(f"    Max possible pieces: {max_combination_pieces} (based on min width: {min(available_widths.keys()):.1f}\")")
 
+        # Exact DP: least waste, then most pieces, in one pass (memoized per available multiset)
+        if PENDING_DP_ENABLED:
+            best_combo = best_fill(available_widths, target_width, max_combination_pieces)
+            if best_combo:
+                total_width = sum(w * count for w, count in best_combo.items())
+                logger.info(f"    🧮 DP FILL: {best_combo} → {total_width}\" used, waste: {target_width - total_width:.2f}\"")
+            return best_combo
+
         # Try combinations starting from maximum pieces down to 1
         logger.info(f"    🔍 Testing combos from {max_combination_pieces} pieces down to 1")
         for num_pieces in range(max_combination_pieces, 0, -1):
@@ -745,53 +712,6 @@ class PendingOptimizer:
         logger.debug(f"    ❌ LENIENT: No combination found")
         return {}
 
-    def _find_best_width_combination(self, width_data: Dict[float, List], target_width: float) -> Dict[float, int]:
-        """Find best combination of available widths to minimize waste."""
-        available_widths = {w: len(pieces) for w, pieces in width_data.items() if len(pieces) > 0}
-
-        if not available_widths:
-            return {}
-
-        best_combo = {}
-        min_waste = float('inf')
-
-        # Try combinations with increasing number of pieces (up to 8)
-        for num_pieces in range(1, min(9, sum(available_widths.values()) + 1)):
-            combo = self._try_simple_combination(available_widths, target_width, num_pieces)
-            if combo:
-                total_width = sum(w * count for w, count in combo.items())
-                waste = target_width - total_width
-
-                if 0 <= waste < min_waste:
-                    min_waste = waste
-                    best_combo = combo
-
-                    # If we found a very good fit, stop searching
-                    if waste <= 2.0:
-                        break
-
-        return best_combo
-
-    def _try_simple_combination(self, available_widths: Dict[float, int], target_width: float, num_pieces: int) -> Dict[float, int]:
-        """Try to find a combination using exactly num_pieces."""
-        from itertools import combinations_with_replacement
-
-        widths = list(available_widths.keys())
-
-        for combo in combinations_with_replacement(widths, num_pieces):
-            # Count how many of each width we need
-            needed = {}
-            for width in combo:
-                needed[width] = needed.get(width, 0) + 1
-
-            # Check if we have enough of each width
-            if all(available_widths.get(w, 0) >= needed.get(w, 0) for w in needed):
-                total_width = sum(combo)
-                if total_width <= target_width:
-                    return needed
-
-        return {}
-
     def _validate_order_data_integrity(self, items: List[models.PendingOrderItem]) -> None:
         """Validate that all items have proper order and client relationships."""
         missing_order_count = 0
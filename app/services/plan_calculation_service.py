@@ -7,8 +7,11 @@ the database persistence logic.
 """
 
 from typing import List, Dict, Optional, Any
+from collections import OrderedDict
+import os
 import uuid
 import logging
+import threading
 from sqlalchemy.orm import Session
 
 from .. import crud_operations
@@ -16,6 +19,34 @@ from .cutting_optimizer import CuttingOptimizer
 
 logger = logging.getLogger(__name__)
 
+# Per-spec solutions of the last calculation per order set, so recalculating a plan
+# after an order edit repairs the previous solution instead of solving from scratch.
+# Opt-in: a repair may keep a slightly higher trim than a fresh solve (see _match_spec_groups)
+INCREMENTAL_REPAIR_ENABLED = os.getenv("INCREMENTAL_REPAIR_ENABLED", "false").lower() in ("1", "true", "yes")
+PREVIOUS_SOLUTIONS_MAX_ENTRIES = 256
+_previous_solutions: "OrderedDict[tuple, Dict]" = OrderedDict()
+_previous_solutions_lock = threading.Lock()
+
+
+def _get_previous_solutions(order_set: tuple) -> Optional[Dict]:
+    if not INCREMENTAL_REPAIR_ENABLED:
+        return None
+    with _previous_solutions_lock:
+        solutions = _previous_solutions.get(order_set)
+        if solutions is not None:
+            _previous_solutions.move_to_end(order_set)
+        return solutions
+
+
+def _store_previous_solutions(order_set: tuple, solutions: Dict) -> None:
+    if not INCREMENTAL_REPAIR_ENABLED:
+        return
+    with _previous_solutions_lock:
+        _previous_solutions[order_set] = solutions
+        _previous_solutions.move_to_end(order_set)
+        while len(_previous_solutions) > PREVIOUS_SOLUTIONS_MAX_ENTRIES:
+            _previous_solutions.popitem(last=False)
+
 
 class PlanCalculationService:
     """
@@ -26,7 +57,8 @@ class PlanCalculationService:
     def __init__(self, db: Session, jumbo_roll_width: int = 118):
         self.db = db
         self.jumbo_roll_width = jumbo_roll_width
-        self.optimizer = CuttingOptimizer(jumbo_roll_width=jumbo_roll_width)
+        # Planners re-run calculations with unchanged demand - reuse cached per-spec results
+        self.optimizer = CuttingOptimizer(jumbo_roll_width=jumbo_roll_width, use_result_cache=True, cache_db=db)
     
     def calculate_plan_for_orders(
         self,
@@ -79,13 +111,18 @@ class PlanCalculationService:
                        f"{len(pending_requirements)} pending, {len(available_inventory)} inventory, "
                        f"{len(wastage_allocations)} wastage matches")
 
-            # PURE CALCULATION: Run optimization algorithm with reduced order requirements
+            # PURE CALCULATION: Run optimization algorithm with reduced order requirements,
+            # repairing the last solution for these orders when their demand was edited
+            # (INCREMENTAL_REPAIR_ENABLED only)
+            order_set = ("orders", frozenset(str(order_id) for order_id in order_ids))
             optimization_result = self.optimizer.optimize_with_new_algorithm(
                 order_requirements=reduced_order_requirements,
                 pending_orders=pending_requirements,
                 available_inventory=available_inventory,
-                interactive=False
+                interactive=False,
+                previous_solutions=_get_previous_solutions(order_set)
             )
+            _store_previous_solutions(order_set, self.optimizer.last_spec_solutions)
 
             # ENHANCEMENT: Add client information to pending orders using simple queries
             pending_orders = optimization_result.get('pending_orders', [])
@@ -193,12 +230,19 @@ class PlanCalculationService:
 
             logger.info(f"GSM-WISE CALCULATION: {len(order_requirements)} items, {len(pending_requirements)} pending")
 
+            order_set = (
+                "gsm_wise",
+                frozenset(str(order_id) for order_id in order_ids),
+                frozenset(str(paper_id) for paper_id in paper_ids)
+            )
             optimization_result = self.optimizer.optimize_with_new_algorithm(
                 order_requirements=reduced_order_requirements,
                 pending_orders=pending_requirements,
                 available_inventory=available_inventory,
-                interactive=False
+                interactive=False,
+                previous_solutions=_get_previous_solutions(order_set)
             )
+            _store_previous_solutions(order_set, self.optimizer.last_spec_solutions)
 
             # Same pending order client enrichment as base method
             pending_orders_out = optimization_result.get('pending_orders', [])
@@ -0,0 +1,251 @@
+"""
+Report Queries - Column projections for the cut roll report endpoints
+
+The cut roll reports used to hydrate full InventoryMaster graphs (paper,
+parent_118_roll -> parent_jumbo, plan_inventory -> plan, allocated_order ->
+client, manual_client) and then copy a dozen fields per roll into dicts. Here
+the same data is selected as plain labeled columns through explicit outer joins,
+so rows come back as lightweight tuples with no identity map or relationship
+bookkeeping. The one-to-many plan links and the wastage sources are fetched in
+one batched query each for the whole page (see batch_lookup).
+
+Related tables are joined through aliases, so report filters can still join the
+plain models (PaperMaster, OrderMaster, ...) without clashing.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Query, Session, aliased
+
+from .. import models
+from .batch_lookup import chunked
+
+CutRoll = models.InventoryMaster
+Paper = aliased(models.PaperMaster, name="report_paper")
+ParentRoll = aliased(models.InventoryMaster, name="report_parent_roll")
+ParentJumbo = aliased(models.InventoryMaster, name="report_parent_jumbo")
+AllocatedOrder = aliased(models.OrderMaster, name="report_allocated_order")
+OrderClient = aliased(models.ClientMaster, name="report_order_client")
+ManualClient = aliased(models.ClientMaster, name="report_manual_client")
+
+
+def cut_roll_rows_query(db: Session) -> Query:
+    """
+    Cut roll report rows as labeled column tuples (roll_type filter not applied).
+    The id and created_at labels match the model so keyset paging can read them.
+    """
+    return db.query(
+        CutRoll.id.label("id"),
+        CutRoll.frontend_id.label("frontend_id"),
+        CutRoll.barcode_id.label("barcode_id"),
+        CutRoll.width_inches.label("width_inches"),
+        CutRoll.weight_kg.label("weight_kg"),
+        CutRoll.location.label("location"),
+        CutRoll.status.label("status"),
+        CutRoll.qr_code.label("qr_code"),
+        CutRoll.created_at.label("created_at"),
+        CutRoll.updated_at.label("updated_at"),
+        CutRoll.production_date.label("production_date"),
+        CutRoll.roll_sequence.label("roll_sequence"),
+        CutRoll.individual_roll_number.label("individual_roll_number"),
+        CutRoll.source_type.label("source_type"),
+        CutRoll.is_wastage_roll.label("is_wastage_roll"),
+
+        Paper.id.label("paper_id"),
+        Paper.name.label("paper_name"),
+        Paper.gsm.label("paper_gsm"),
+        Paper.bf.label("paper_bf"),
+        Paper.shade.label("paper_shade"),
+        Paper.type.label("paper_type"),
+
+        ParentRoll.id.label("parent_id"),
+        ParentRoll.frontend_id.label("parent_frontend_id"),
+        ParentRoll.barcode_id.label("parent_barcode_id"),
+        ParentRoll.width_inches.label("parent_width_inches"),
+        ParentRoll.weight_kg.label("parent_weight_kg"),
+        ParentRoll.roll_sequence.label("parent_roll_sequence"),
+        ParentRoll.roll_type.label("parent_roll_type"),
+
+        ParentJumbo.id.label("jumbo_id"),
+        ParentJumbo.frontend_id.label("jumbo_frontend_id"),
+        ParentJumbo.barcode_id.label("jumbo_barcode_id"),
+        ParentJumbo.width_inches.label("jumbo_width_inches"),
+        ParentJumbo.weight_kg.label("jumbo_weight_kg"),
+
+        AllocatedOrder.id.label("order_id"),
+        AllocatedOrder.frontend_id.label("order_frontend_id"),
+        OrderClient.id.label("order_client_id"),
+        OrderClient.company_name.label("order_client_name"),
+        ManualClient.id.label("manual_client_id"),
+        ManualClient.company_name.label("manual_client_name")
+    ).select_from(CutRoll).outerjoin(
+        Paper, CutRoll.paper_id == Paper.id
+    ).outerjoin(
+        ParentRoll, CutRoll.parent_118_roll_id == ParentRoll.id
+    ).outerjoin(
+        ParentJumbo, ParentRoll.parent_jumbo_id == ParentJumbo.id
+    ).outerjoin(
+        AllocatedOrder, CutRoll.allocated_to_order_id == AllocatedOrder.id
+    ).outerjoin(
+        OrderClient, AllocatedOrder.client_id == OrderClient.id
+    ).outerjoin(
+        ManualClient, CutRoll.manual_client_id == ManualClient.id
+    )
+
+
+def load_cut_roll_plans(db: Session, roll_ids: Iterable[Any]) -> Dict[Any, Dict[str, Any]]:
+    """Inventory id -> plan info of its first linked plan, for all rolls at once."""
+    plans: Dict[Any, Dict[str, Any]] = {}
+    for chunk in chunked(roll_ids):
+        rows = db.query(
+            models.PlanInventoryLink.inventory_id,
+            models.PlanMaster.id,
+            models.PlanMaster.frontend_id,
+            models.PlanMaster.name,
+            models.PlanMaster.status,
+            models.PlanMaster.created_at
+        ).join(
+            models.PlanMaster, models.PlanInventoryLink.plan_id == models.PlanMaster.id
+        ).filter(models.PlanInventoryLink.inventory_id.in_(chunk)).all()
+
+        for inventory_id, plan_id, frontend_id, name, status, created_at in rows:
+            plans.setdefault(inventory_id, {  # Take the first plan found
+                "id": str(plan_id),
+                "frontend_id": frontend_id or "N/A",
+                "name": name or "N/A",
+                "status": status,
+                "created_at": created_at.isoformat() if created_at else None
+            })
+    return plans
+
+
+def wastage_frontend_id(row: Any) -> Optional[str]:
+    """Wastage frontend_id encoded in a wastage cut roll's QR code (WCR_{wastage_frontend_id}_{plan_id})."""
+    if not row.is_wastage_roll or not row.qr_code:
+        return None
+    parts = row.qr_code.split('_')
+    if len(parts) >= 2 and parts[0] == 'WCR':
+        return parts[1]
+    return None
+
+
+def load_wastage_sources(db: Session, rows: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+    """Wastage frontend_id -> wastage_details for the wastage rolls among rows."""
+    sources: Dict[str, Dict[str, Any]] = {}
+    for chunk in chunked(wastage_frontend_id(row) for row in rows):
+        for wastage in db.query(
+            models.WastageInventory.frontend_id,
+            models.WastageInventory.barcode_id,
+            models.WastageInventory.reel_no
+        ).filter(models.WastageInventory.frontend_id.in_(chunk)).all():
+            sources[wastage.frontend_id] = {
+                "source": "Stock",
+                "reel_no": wastage.reel_no or wastage.barcode_id,
+                "wastage_barcode": wastage.barcode_id,
+                "wastage_frontend_id": wastage.frontend_id
+            }
+    return sources
+
+
+def format_cut_roll_row(
+    row: Any,
+    plans: Dict[Any, Dict[str, Any]],
+    wastage_sources: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """Report dict of one cut_roll_rows_query row."""
+    paper_specs = {
+        "paper_name": row.paper_name if row.paper_id else "Unknown",
+        "gsm": row.paper_gsm if row.paper_id else 0,
+        "bf": float(row.paper_bf) if row.paper_id and row.paper_bf else 0,
+        "shade": row.paper_shade if row.paper_id else "Unknown",
+        "type": row.paper_type if row.paper_id else "Unknown"
+    }
+
+    parent_118_info = None
+    parent_jumbo_info = None
+    if row.parent_id:
+        parent_118_info = {
+            "id": str(row.parent_id),
+            "frontend_id": row.parent_frontend_id or "N/A",
+            "barcode_id": row.parent_barcode_id or "N/A",
+            "width_inches": float(row.parent_width_inches),
+            "weight_kg": float(row.parent_weight_kg) if row.parent_weight_kg else 0,
+            "roll_sequence": row.parent_roll_sequence
+        }
+        if row.jumbo_id:
+            parent_jumbo_info = {
+                "id": str(row.jumbo_id),
+                "frontend_id": row.jumbo_frontend_id or "N/A",
+                "barcode_id": row.jumbo_barcode_id or "N/A",
+                "width_inches": float(row.jumbo_width_inches),
+                "weight_kg": float(row.jumbo_weight_kg) if row.jumbo_weight_kg else 0
+            }
+        elif row.parent_roll_type == 'jumbo':
+            # If no jumbo parent, the 118 roll itself is the jumbo
+            parent_jumbo_info = {
+                "id": str(row.parent_id),
+                "frontend_id": row.parent_frontend_id or "N/A",
+                "barcode_id": row.parent_barcode_id or "N/A",
+                "width_inches": float(row.parent_width_inches),
+                "weight_kg": float(row.parent_weight_kg) if row.parent_weight_kg else 0
+            }
+
+    order_info = None
+    if row.order_id:
+        order_info = {
+            "id": str(row.order_id),
+            "frontend_id": row.order_frontend_id or "N/A",
+            "client_company_name": row.order_client_name if row.order_client_id else "N/A"
+        }
+    elif row.manual_client_id:
+        # Cut roll can have a client without an order through manual client id
+        order_info = {
+            "id": None,
+            "frontend_id": None,
+            "client_company_name": row.manual_client_name
+        }
+
+    wastage_details = None
+    if wastage_sources is not None:
+        wastage_details = wastage_sources.get(wastage_frontend_id(row))
+
+    return {
+        "id": str(row.id),
+        "frontend_id": row.frontend_id or "N/A",
+        "barcode_id": row.barcode_id or "N/A",
+        "width_inches": float(row.width_inches),
+        "weight_kg": float(row.weight_kg) if row.weight_kg else 0,
+        "location": row.location or "N/A",
+        "status": row.status,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+        "production_date": row.production_date.isoformat() if row.production_date else None,
+        "roll_sequence": row.roll_sequence,
+        "individual_roll_number": row.individual_roll_number,
+
+        # Related data
+        "paper_specs": paper_specs,
+        "parent_118_roll": parent_118_info,
+        "parent_jumbo_roll": parent_jumbo_info,
+        "plan_info": plans.get(row.id),
+        "allocated_order": order_info,
+        "wastage_details": wastage_details,
+
+        # Source tracking
+        "source_type": row.source_type,
+        "is_wastage_roll": row.is_wastage_roll
+    }
+
+
+def format_cut_roll_rows(db: Session, rows: List[Any], with_wastage_details: bool = True) -> List[Dict[str, Any]]:
+    """Report dicts for a page of rows, batching the plan and wastage lookups."""
+    unique_rows = []
+    seen = set()
+    for row in rows:  # Filter joins on one-to-many links can repeat a roll
+        if row.id not in seen:
+            seen.add(row.id)
+            unique_rows.append(row)
+
+    plans = load_cut_roll_plans(db, seen)
+    wastage_sources = load_wastage_sources(db, unique_rows) if with_wastage_details else None
+    return [format_cut_roll_row(row, plans, wastage_sources) for row in unique_rows]
@@ -0,0 +1,154 @@
+"""
+Roll Hierarchy - Jumbo -> 118" set -> cut roll trees in one recursive query
+
+Roll tracking used to walk the production hierarchy one hop at a time: one query
+for the sets of a jumbo, then one per set for its cut rolls, plus separate
+lookups for each parent and sibling. Here the tree is fetched with recursive
+CTEs over InventoryMaster.parent_118_roll_id / parent_jumbo_id and assembled in
+memory:
+
+- load_subtree: a roll and everything produced from it
+- load_ancestors: the parent chain of rolls up to their jumbo
+- load_family: the whole tree a roll belongs to (ancestors up to the jumbo, then
+  the jumbo's full subtree)
+
+A cut roll may carry both parent links; it hangs below its 118" set, and below
+the jumbo directly only when it has no set. Recursion stops after
+MAX_HIERARCHY_DEPTH levels so corrupt parent links cannot loop. The depth
+constants are rendered inline because SQL Server rejects recursive CTEs whose
+anchor and recursive column types differ, which bound parameters can cause.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, func, literal_column, or_, select
+from sqlalchemy.orm import Session, joinedload
+
+from .. import models
+from .batch_lookup import chunked
+
+# Jumbo -> 118" -> cut is 3 levels; leave headroom for deeper chains
+MAX_HIERARCHY_DEPTH = 10
+
+_rolls = models.InventoryMaster.__table__
+
+
+def _sort_value(value: Any):
+    """Sort key that puts None first, like SQL ORDER BY."""
+    return (value is not None, value)
+
+
+def _descendants_cte(anchor):
+    """Recursive CTE of the ids in anchor (a select of id) and all rolls below them."""
+    tree = select(_rolls.c.id, literal_column("0").label("depth")).where(
+        _rolls.c.id.in_(anchor)
+    ).cte("roll_descendants", recursive=True)
+
+    child = _rolls.alias("child_roll")
+    return tree.union_all(
+        select(child.c.id, tree.c.depth + literal_column("1")).where(
+            or_(
+                child.c.parent_118_roll_id == tree.c.id,
+                and_(child.c.parent_jumbo_id == tree.c.id, child.c.parent_118_roll_id.is_(None))
+            ),
+            tree.c.depth < MAX_HIERARCHY_DEPTH
+        )
+    )
+
+
+def _ancestors_cte(roll_ids: List[Any]):
+    """Recursive CTE of the given rolls and their parents up to the jumbo."""
+    chain = select(
+        _rolls.c.id, _rolls.c.parent_118_roll_id, _rolls.c.parent_jumbo_id, literal_column("0").label("depth")
+    ).where(_rolls.c.id.in_(roll_ids)).cte("roll_ancestors", recursive=True)
+
+    parent = _rolls.alias("parent_roll")
+    return chain.union_all(
+        select(parent.c.id, parent.c.parent_118_roll_id, parent.c.parent_jumbo_id, chain.c.depth + literal_column("1")).where(
+            parent.c.id == func.coalesce(chain.c.parent_118_roll_id, chain.c.parent_jumbo_id),
+            chain.c.depth < MAX_HIERARCHY_DEPTH
+        )
+    )
+
+
+class RollTree:
+    """Rolls of one or more hierarchies, indexed for parent/child navigation."""
+
+    def __init__(self, rolls: Iterable[models.InventoryMaster]):
+        self.rolls: Dict[Any, models.InventoryMaster] = {roll.id: roll for roll in rolls}
+
+    def update(self, other: "RollTree") -> None:
+        self.rolls.update(other.rolls)
+
+    def __len__(self) -> int:
+        return len(self.rolls)
+
+    def get(self, roll_id: Any) -> Optional[models.InventoryMaster]:
+        return self.rolls.get(roll_id) if roll_id else None
+
+    def parent_set(self, roll: models.InventoryMaster) -> Optional[models.InventoryMaster]:
+        """118" set a cut roll was cut from."""
+        return self.get(roll.parent_118_roll_id)
+
+    def parent_jumbo(self, roll: models.InventoryMaster) -> Optional[models.InventoryMaster]:
+        """Jumbo a roll descends from (directly or through its 118" set)."""
+        if roll.parent_jumbo_id:
+            return self.get(roll.parent_jumbo_id)
+        parent_set = self.parent_set(roll)
+        return self.get(parent_set.parent_jumbo_id) if parent_set else None
+
+    def sets_of(self, jumbo_id: Any) -> List[models.InventoryMaster]:
+        """118" rolls of a jumbo, by individual roll number."""
+        return sorted(
+            (roll for roll in self.rolls.values() if roll.parent_jumbo_id == jumbo_id and roll.roll_type == "118"),
+            key=lambda roll: _sort_value(roll.individual_roll_number)
+        )
+
+    def cuts_of(self, set_id: Any) -> List[models.InventoryMaster]:
+        """Cut rolls of a 118" set, by width."""
+        return sorted(
+            (roll for roll in self.rolls.values() if roll.parent_118_roll_id == set_id and roll.roll_type == "cut"),
+            key=lambda roll: _sort_value(roll.width_inches)
+        )
+
+    def with_parent_jumbo(self, jumbo_id: Any) -> List[models.InventoryMaster]:
+        """Every roll whose parent_jumbo_id is jumbo_id (sets and directly linked cut rolls)."""
+        return [roll for roll in self.rolls.values() if roll.parent_jumbo_id == jumbo_id]
+
+
+def _load_rolls(db: Session, id_select) -> RollTree:
+    """Rolls whose id is in id_select, with paper, as a RollTree (one statement)."""
+    rolls = db.query(models.InventoryMaster).options(
+        joinedload(models.InventoryMaster.paper)
+    ).filter(models.InventoryMaster.id.in_(id_select)).all()
+    return RollTree(rolls)
+
+
+def load_subtree(db: Session, root_ids: Iterable[Any]) -> RollTree:
+    """Rolls in root_ids and every roll produced from them."""
+    root_ids = [root_id for root_id in root_ids if root_id is not None]
+    if not root_ids:
+        return RollTree([])
+    anchor = select(_rolls.c.id).where(_rolls.c.id.in_(root_ids))
+    return _load_rolls(db, select(_descendants_cte(anchor).c.id))
+
+
+def load_ancestors(db: Session, roll_ids: Iterable[Any]) -> RollTree:
+    """Rolls in roll_ids and their parent chains (118" sets and jumbos)."""
+    tree = RollTree([])
+    for chunk in chunked(roll_ids):
+        tree.update(_load_rolls(db, select(_ancestors_cte(chunk).c.id)))
+    return tree
+
+
+def load_family(db: Session, roll_id: Any) -> RollTree:
+    """
+    The whole hierarchy a roll belongs to: its ancestors up to the topmost roll
+    found, and that roll's full subtree (parents, siblings and children).
+    """
+    ancestors = _ancestors_cte([roll_id])
+    top = select(ancestors.c.id).where(
+        ancestors.c.depth == select(func.max(ancestors.c.depth)).scalar_subquery()
+    )
+    descendants = _descendants_cte(top)
+    return _load_rolls(db, select(descendants.c.id).union(select(ancestors.c.id)))
@@ -0,0 +1,180 @@
+"""
+Sequence Service - Lock-protected counters behind frontend IDs and barcodes
+
+Every human-readable sequence (ORD-00001-25, CR_01001-26, WSB-00001-25, ...) keeps
+its last issued number in one frontend_id_sequence row per (sequence name, year).
+Allocating the next value, or a block of values, touches that single row, so the
+cost stays flat however many rows the sequence already has.
+
+The row stays locked by the allocating transaction until it commits or rolls
+back: concurrent allocations get distinct values, and a rollback hands its
+values back. A row that does not exist yet (new sequence or new year) is seeded
+once from the existing data under an application lock.
+"""
+
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+import uuid
+import logging
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Inclusive (low, high) number range a sequence must never hand out
+ReservedRange = Tuple[int, int]
+
+
+class SequenceService:
+    """
+    Allocation of consecutive values from frontend_id_sequence counters.
+
+    Sequences are addressed by name and two-digit year ("" for sequences that
+    never reset). Seed callbacks return the highest number already in use.
+    """
+
+    @staticmethod
+    def reserve(
+        db: Session,
+        sequence_name: str,
+        year: str,
+        count: int,
+        seed: Callable[[], int],
+        reserved_range: Optional[ReservedRange] = None
+    ) -> List[int]:
+        """
+        Reserve count consecutive values of a sequence.
+
+        Args:
+            db: Database session (the counter row stays locked until it commits)
+            sequence_name: Counter name, e.g. "order_master" or "barcode_cut_roll"
+            year: Two-digit year, "" for sequences without a year suffix
+            count: Number of values to reserve
+            seed: Returns the highest value already used, called once per new row
+            reserved_range: Values to skip over (e.g. the manual cut roll range)
+
+        Returns:
+            Reserved values in ascending order (empty when count <= 0)
+        """
+        if count <= 0:
+            return []
+
+        from .. import models
+
+        sequence = models.FrontendIDSequence.__table__
+        match = (sequence.c.sequence_name == sequence_name) & (sequence.c.year == year)
+
+        if reserved_range is None:
+            # Plain counter - one UPDATE advances and locks the row
+            advance = sequence.update().where(match).values(
+                last_value=sequence.c.last_value + count,
+                updated_at=datetime.utcnow()
+            )
+            if db.execute(advance).rowcount == 0:
+                SequenceService._seed(db, sequence_name, year, seed)
+                db.execute(advance)
+            last_value = db.execute(select(sequence.c.last_value).where(match)).scalar()
+            return list(range(last_value - count + 1, last_value + 1))
+
+        # Counter with a gap - lock the row, read, skip the reserved range, write back
+        lock_row = sequence.update().where(match).values(updated_at=datetime.utcnow())
+        if db.execute(lock_row).rowcount == 0:
+            SequenceService._seed(db, sequence_name, year, seed)
+            db.execute(lock_row)
+        last_value = db.execute(select(sequence.c.last_value).where(match)).scalar()
+
+        values = SequenceService.next_values(last_value, count, reserved_range)
+        db.execute(sequence.update().where(match).values(last_value=values[-1]))
+        return values
+
+    @staticmethod
+    def next_values(last_value: int, count: int, reserved_range: Optional[ReservedRange] = None) -> List[int]:
+        """The count values following last_value, jumping over reserved_range."""
+        values = []
+        value = last_value
+        while len(values) < count:
+            value += 1
+            if reserved_range and reserved_range[0] <= value <= reserved_range[1]:
+                value = reserved_range[1] + 1
+            values.append(value)
+        return values
+
+    @staticmethod
+    def current(db: Session, sequence_name: str, year: str) -> Optional[int]:
+        """Last value handed out, or None when the sequence has no row yet."""
+        from .. import models
+
+        sequence = models.FrontendIDSequence.__table__
+        return db.execute(
+            select(sequence.c.last_value).where(sequence.c.sequence_name == sequence_name, sequence.c.year == year)
+        ).scalar()
+
+    @staticmethod
+    def ensure_at_least(db: Session, sequence_name: str, year: str, value: int) -> int:
+        """
+        Create the counter row or raise it to value; counters never go down.
+        Used to backfill counters from existing data. Does not commit.
+
+        Returns:
+            The counter value after the update
+        """
+        from .. import models
+
+        sequence = models.FrontendIDSequence.__table__
+        match = (sequence.c.sequence_name == sequence_name) & (sequence.c.year == year)
+        stored = db.execute(select(sequence.c.last_value).where(match)).scalar()
+
+        if stored is None:
+            db.execute(sequence.insert().values(
+                id=uuid.uuid4(), sequence_name=sequence_name, year=year, last_value=value, updated_at=datetime.utcnow()
+            ))
+        elif stored < value:
+            db.execute(sequence.update().where(match).values(last_value=value, updated_at=datetime.utcnow()))
+        return max(value, stored or 0)
+
+    @staticmethod
+    def is_mssql(db: Session) -> bool:
+        return db.get_bind().dialect.name == "mssql"
+
+    @staticmethod
+    def acquire_lock(db: Session, resource: str) -> None:
+        """Take a transaction-scoped application lock (SQL Server only)."""
+        if not SequenceService.is_mssql(db):
+            return
+
+        acquire_lock = text("""
+            DECLARE @result INT;
+            EXEC @result = sp_getapplock
+                @Resource = :resource,
+                @LockMode = 'Exclusive',
+                @LockOwner = 'Transaction',
+                @LockTimeout = 10000;
+            SELECT @result as lock_result;
+        """)
+
+        lock_result = db.execute(acquire_lock, {"resource": resource}).scalar()
+
+        if lock_result < 0:
+            logger.error(f"Failed to acquire lock {resource}: {lock_result}")
+            raise Exception(f"Could not acquire database lock for sequence allocation (code: {lock_result})")
+
+        logger.debug(f"Acquired application lock: {resource}")
+
+    @staticmethod
+    def _seed(db: Session, sequence_name: str, year: str, seed: Callable[[], int]) -> None:
+        """Create a missing counter row from the existing data (once per sequence and year)."""
+        from .. import models
+
+        sequence = models.FrontendIDSequence.__table__
+        match = (sequence.c.sequence_name == sequence_name) & (sequence.c.year == year)
+
+        SequenceService.acquire_lock(db, f"frontend_id_sequence_{sequence_name}_{year}")
+        if db.execute(select(sequence.c.id).where(match)).first() is not None:
+            return  # Seeded by another transaction while we waited for the lock
+
+        last_value = seed()
+        db.execute(sequence.insert().values(
+            id=uuid.uuid4(), sequence_name=sequence_name, year=year, last_value=last_value, updated_at=datetime.utcnow()
+        ))
+        logger.info(f"🔢 SEQUENCE: Seeded {sequence_name} (year: {year or 'none'}) at {last_value}")
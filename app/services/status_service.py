@@ -1,6 +1,5 @@
 from typing import Any, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from datetime import datetime
 import uuid
 import logging
@@ -269,61 +268,19 @@ class StatusService:
             Dictionary with status counts for each master table
         """
         try:
-            summary = {
-                "orders": {},
-                "plans": {},
-                "inventory": {},
-                "production_orders": {},
-                "pending_orders": {}
+            # Served from the dashboard counters (maintained from committed
+            # status transitions, reconciled periodically) instead of recounting
+            from .dashboard_metrics import dashboard_metrics
+
+            counters = dashboard_metrics.snapshot(self.db)["counters"]
+            return {
+                "orders": dashboard_metrics.status_counts(counters, "order_master"),
+                "plans": dashboard_metrics.status_counts(counters, "plan_master"),
+                "inventory": dashboard_metrics.status_counts(counters, "inventory_master"),
+                "production_orders": dashboard_metrics.status_counts(counters, "production_order_master"),
+                "pending_orders": dashboard_metrics.status_counts(counters, "pending_order_master")
             }
             
-            # Order statuses
-            order_statuses = self.db.query(
-                models.OrderMaster.status,
-                func.count(models.OrderMaster.id)
-            ).group_by(models.OrderMaster.status).all()
-            
-            for status, count in order_statuses:
-                summary["orders"][status] = count
-            
-            # Plan statuses
-            plan_statuses = self.db.query(
-                models.PlanMaster.status,
-                func.count(models.PlanMaster.id)
-            ).group_by(models.PlanMaster.status).all()
-            
-            for status, count in plan_statuses:
-                summary["plans"][status] = count
-            
-            # Inventory statuses
-            inventory_statuses = self.db.query(
-                models.InventoryMaster.status,
-                func.count(models.InventoryMaster.id)
-            ).group_by(models.InventoryMaster.status).all()
-            
-            for status, count in inventory_statuses:
-                summary["inventory"][status] = count
-            
-            # Production order statuses
-            production_statuses = self.db.query(
-                models.ProductionOrderMaster.status,
-                func.count(models.ProductionOrderMaster.id)
-            ).group_by(models.ProductionOrderMaster.status).all()
-            
-            for status, count in production_statuses:
-                summary["production_orders"][status] = count
-            
-            # Pending order statuses
-            pending_statuses = self.db.query(
-                models.PendingOrderMaster.status,
-                func.count(models.PendingOrderMaster.id)
-            ).group_by(models.PendingOrderMaster.status).all()
-            
-            for status, count in pending_statuses:
-                summary["pending_orders"][status] = count
-            
-            return summary
-            
         except Exception as e:
             logger.error(f"Failed to get status summary: {str(e)}")
             raise
@@ -0,0 +1,104 @@
+"""
+Benchmark Demand Corpora - Reproducible order sets for optimizer benchmarks
+
+Two families of corpora:
+- Generated: seeded random width/quantity mixes (small, medium, large) so the
+  same demand is produced on every machine and Python version
+- Real (anonymized): width and paper-spec distribution taken from the stock
+  sheet in the repo root. Reel numbers, weights and clients are dropped; only
+  (spec, width) frequencies are kept and scaled into order quantities
+
+Each corpus is a list of order requirement dicts in the shape expected by
+CuttingOptimizer.optimize_with_new_algorithm.
+"""
+
+import csv
+import random
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+STOCK_SHEET = REPO_ROOT / "Stock - Sheet1.csv"
+
+# Widths seen on real orders (inches)
+WIDTH_POOL = [
+    15, 17.5, 19, 20, 21, 22, 22.5, 23, 24, 25, 25.5, 26, 26.5, 27, 28, 28.5, 29,
+    29.5, 30, 30.5, 31, 32, 33, 34, 35, 36, 37, 38, 38.5, 40, 42, 45, 48, 50
+]
+
+# (gsm, shade, bf) paper specs
+SPEC_POOL = [
+    (80, "NATURAL", 16.0), (100, "NATURAL", 16.0), (120, "GOLDEN", 18.0),
+    (140, "NATURAL", 16.0), (100, "NATURAL", 18.0), (120, "NATURAL", 16.0),
+    (150, "GOLDEN", 20.0), (180, "NATURAL", 22.0)
+]
+
+
+def _order(width: float, quantity: int, spec: tuple, index: int) -> Dict:
+    gsm, shade, bf = spec
+    return {
+        "width": float(width),
+        "quantity": quantity,
+        "gsm": gsm,
+        "shade": shade,
+        "bf": bf,
+        "order_id": f"bench-order-{index}",
+        "client_name": f"Client {index % 7 + 1}"
+    }
+
+
+def generated_corpus(seed: int, specs: int, widths_per_spec: int, max_quantity: int) -> List[Dict]:
+    """
+    Build a seeded random corpus.
+
+    Args:
+        seed: Random seed (fixes the corpus)
+        specs: Number of paper spec groups
+        widths_per_spec: Distinct widths ordered per spec
+        max_quantity: Upper bound of the per-width quantity
+    """
+    rng = random.Random(seed)
+    orders = []
+    for spec in SPEC_POOL[:specs]:
+        for width in rng.sample(WIDTH_POOL, widths_per_spec):
+            orders.append(_order(width, rng.randint(1, max_quantity), spec, len(orders)))
+    return orders
+
+
+def real_stock_corpus(scale: int = 3) -> List[Dict]:
+    """
+    Anonymized corpus from the stock sheet: each (spec, width) reel count is
+    multiplied by scale to give an order quantity.
+    """
+    if not STOCK_SHEET.exists():
+        raise FileNotFoundError(f"Stock sheet not found: {STOCK_SHEET}")
+
+    counts = Counter()
+    with open(STOCK_SHEET, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            try:
+                spec = (int(row["GSM"]), row["SHADE"].strip().upper(), float(row["BF"]))
+                counts[(spec, float(row["SIZE"]))] += 1
+            except (KeyError, ValueError):
+                continue
+
+    orders = []
+    for (spec, width), reels in sorted(counts.items()):
+        orders.append(_order(width, reels * scale, spec, len(orders)))
+    return orders
+
+
+CORPORA: Dict[str, Callable[[], List[Dict]]] = {
+    "small": lambda: generated_corpus(seed=101, specs=1, widths_per_spec=4, max_quantity=8),
+    "medium": lambda: generated_corpus(seed=202, specs=3, widths_per_spec=8, max_quantity=10),
+    "large": lambda: generated_corpus(seed=303, specs=6, widths_per_spec=12, max_quantity=12),
+    "real_stock": lambda: real_stock_corpus(scale=3),
+}
+
+
+def load_corpus(name: str) -> List[Dict]:
+    """Return the order requirements for a named corpus."""
+    if name not in CORPORA:
+        raise KeyError(f"Unknown corpus '{name}'. Available: {', '.join(CORPORA)}")
+    return CORPORA[name]()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Optimizer Benchmark Suite
+
+Runs the cutting optimizers over the reproducible demand corpora in
+benchmarks/corpora.py and records, per corpus and solver:
+- solve time (best of --repeat runs)
+- distinct cutting patterns used
+- trim % of the 118" sets produced
+- jumbo roll count (3 sets per jumbo, per paper spec)
+- peak Python memory (tracemalloc; native OR-Tools memory is not included)
+
+Results are compared against a JSON baseline with regression thresholds, so
+solver performance changes are measurable. Runs fully offline - no database.
+
+Usage:
+    python -m benchmarks.optimizer_benchmark                     # compare with baseline
+    python -m benchmarks.optimizer_benchmark --update-baseline   # record a new baseline
+    python -m benchmarks.optimizer_benchmark --corpus small --solver cutting_ilp
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import contextlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Spec groups are solved in-process by default so timings and peak memory are
+# comparable between runs (set OPTIMIZER_PARALLEL_WORKERS to benchmark the pool)
+os.environ.setdefault("OPTIMIZER_PARALLEL_WORKERS", "1")
+# The optimizer module imports the ORM models; a throwaway SQLite file keeps the
+# benchmark runnable without a database server (no queries are made)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.gettempdir()) / 'optimizer_benchmark.db'}")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.corpora import CORPORA, load_corpus  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+JUMBO_WIDTH = 118.0
+SETS_PER_JUMBO = 3
+
+# Allowed change relative to the baseline before a metric counts as a regression
+THRESHOLDS = {
+    "solve_time_ratio": 1.5,        # 50% slower
+    "solve_time_slack_seconds": 0.25,  # ignore noise on sub-second solves
+    "peak_memory_ratio": 1.5,
+    "trim_percent_increase": 0.5,   # percentage points
+    "jumbo_count_increase": 0,
+    "pattern_count_ratio": 1.2,
+}
+
+SOLVERS = ["cutting_ilp", "cutting_column_generation", "ortools"]
+
+
+def _spec_key(order: Dict) -> tuple:
+    return (order["gsm"], order["shade"], order["bf"])
+
+
+def _run_cutting_optimizer(orders: List[Dict], algorithm: str) -> Dict[str, Any]:
+    from app.services.cutting_optimizer import CuttingOptimizer, SolverConfig
+
+    # Single CP-SAT worker keeps solutions (and therefore quality metrics) reproducible
+    optimizer = CuttingOptimizer(jumbo_roll_width=JUMBO_WIDTH, solver_config=SolverConfig(num_workers=1))
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = optimizer.optimize_with_new_algorithm(
+            order_requirements=[dict(order) for order in orders],
+            pending_orders=[],
+            available_inventory=[],
+            interactive=False,
+            algorithm=algorithm
+        )
+
+    # One 118" set per (spec, individual_roll_number); patterns are the width tuples of those sets
+    sets = defaultdict(list)
+    trims = {}
+    for roll in result["cut_rolls_generated"]:
+        if roll.get("source") != "cutting":
+            continue
+        set_key = (roll.get("gsm"), roll.get("shade"), roll.get("bf"), roll.get("individual_roll_number"))
+        sets[set_key].append(float(roll["width"]))
+        trims[set_key] = float(roll.get("trim_left", 0))
+
+    sets_per_spec = defaultdict(int)
+    for set_key in sets:
+        sets_per_spec[set_key[:3]] += 1
+
+    return {
+        "sets": len(sets),
+        "patterns": len({tuple(sorted(widths)) for widths in sets.values()}),
+        "total_trim": sum(trims.values()),
+        "jumbo_rolls": sum((count + SETS_PER_JUMBO - 1) // SETS_PER_JUMBO for count in sets_per_spec.values()),
+        "pending_quantity": result["summary"].get("total_pending_quantity", 0),
+    }
+
+
+def _run_ortools_optimizer(orders: List[Dict]) -> Dict[str, Any]:
+    from app.services.ortools_optimizer import ORToolsOptimizer
+
+    optimizer = ORToolsOptimizer(jumbo_width=JUMBO_WIDTH)
+    demand_by_spec = defaultdict(lambda: defaultdict(int))
+    for order in orders:
+        demand_by_spec[_spec_key(order)][float(order["width"])] += order["quantity"]
+
+    sets, total_trim, jumbo_rolls, patterns, infeasible = 0, 0.0, 0, set(), 0
+    for spec, demand in demand_by_spec.items():
+        result = optimizer.solve_cutting_optimization(dict(demand))
+        if result["status"] not in ("Optimal", "Feasible"):
+            infeasible += sum(demand.values())
+            continue
+        spec_sets = result["sets"]
+        sets += len(spec_sets)
+        total_trim += sum(s["trim"] for s in spec_sets)
+        jumbo_rolls += (len(spec_sets) + SETS_PER_JUMBO - 1) // SETS_PER_JUMBO
+        patterns.update((spec, tuple(sorted(s["pattern"]))) for s in spec_sets)
+
+    return {
+        "sets": sets,
+        "patterns": len(patterns),
+        "total_trim": total_trim,
+        "jumbo_rolls": jumbo_rolls,
+        "pending_quantity": infeasible,
+    }
+
+
+def _reset_caches() -> None:
+    """Empty the process-wide pattern and result caches so every run solves cold."""
+    from app.services.pattern_cache import pattern_cache
+    from app.services.optimization_cache import optimization_cache
+
+    pattern_cache.clear()
+    optimization_cache.clear()
+
+
+def run_case(corpus: str, solver: str, repeat: int = 1) -> Dict[str, Any]:
+    """Benchmark one solver on one corpus and return its metrics."""
+    orders = load_corpus(corpus)
+    best_time, peak_memory, metrics = None, 0, {}
+
+    for _ in range(max(1, repeat)):
+        # Repeats would otherwise be served from the caches filled by the first run
+        _reset_caches()
+        tracemalloc.start()
+        start = time.perf_counter()
+        if solver == "ortools":
+            metrics = _run_ortools_optimizer(orders)
+        else:
+            metrics = _run_cutting_optimizer(orders, solver.replace("cutting_", "", 1))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        best_time = elapsed if best_time is None else min(best_time, elapsed)
+        peak_memory = max(peak_memory, peak)
+
+    used_width = metrics["sets"] * JUMBO_WIDTH
+    return {
+        "orders": len(orders),
+        "demand": sum(order["quantity"] for order in orders),
+        "solve_time_seconds": round(best_time, 3),
+        "pattern_count": metrics["patterns"],
+        "sets": metrics["sets"],
+        "trim_percent": round(metrics["total_trim"] / used_width * 100, 3) if used_width else 0.0,
+        "jumbo_count": metrics["jumbo_rolls"],
+        "pending_quantity": metrics["pending_quantity"],
+        "peak_memory_kib": round(peak_memory / 1024, 1),
+    }
+
+
+def compare_with_baseline(results: Dict[str, Dict], baseline: Dict[str, Dict], thresholds: Dict[str, float]) -> List[str]:
+    """Return a human-readable list of regressions (empty when everything is within thresholds)."""
+    regressions = []
+    for case, current in results.items():
+        base = baseline.get(case)
+        if not base:
+            continue
+
+        time_limit = base["solve_time_seconds"] * thresholds["solve_time_ratio"] + thresholds["solve_time_slack_seconds"]
+        if current["solve_time_seconds"] > time_limit:
+            regressions.append(f"{case}: solve time {current['solve_time_seconds']}s > {time_limit:.3f}s (baseline {base['solve_time_seconds']}s)")
+
+        memory_limit = base["peak_memory_kib"] * thresholds["peak_memory_ratio"]
+        if current["peak_memory_kib"] > memory_limit:
+            regressions.append(f"{case}: peak memory {current['peak_memory_kib']} KiB > {memory_limit:.1f} KiB")
+
+        trim_limit = base["trim_percent"] + thresholds["trim_percent_increase"]
+        if current["trim_percent"] > trim_limit:
+            regressions.append(f"{case}: trim {current['trim_percent']}% > {trim_limit:.3f}% (baseline {base['trim_percent']}%)")
+
+        jumbo_limit = base["jumbo_count"] + thresholds["jumbo_count_increase"]
+        if current["jumbo_count"] > jumbo_limit:
+            regressions.append(f"{case}: jumbo rolls {current['jumbo_count']} > {jumbo_limit} (baseline {base['jumbo_count']})")
+
+        pattern_limit = base["pattern_count"] * thresholds["pattern_count_ratio"]
+        if current["pattern_count"] > pattern_limit:
+            regressions.append(f"{case}: patterns {current['pattern_count']} > {pattern_limit:.1f} (baseline {base['pattern_count']})")
+
+        if current["pending_quantity"] > base["pending_quantity"]:
+            regressions.append(f"{case}: pending {current['pending_quantity']} > baseline {base['pending_quantity']}")
+
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the cutting optimizers against a JSON baseline")
+    parser.add_argument("--corpus", action="append", choices=list(CORPORA), help="Corpus to run (repeatable, default: all)")
+    parser.add_argument("--solver", action="append", choices=SOLVERS, help="Solver to run (repeatable, default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case; the fastest time is recorded")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results to the baseline instead of comparing")
+    parser.add_argument("--output", type=Path, help="Also write this run's results to a JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Show optimizer logging")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    # Import the optimizers up front so module import time and memory are not charged to the first case
+    import app.services.cutting_optimizer  # noqa: F401
+    import app.services.ortools_optimizer  # noqa: F401
+
+    results = {}
+    for corpus in args.corpus or list(CORPORA):
+        for solver in args.solver or SOLVERS:
+            case = f"{corpus}/{solver}"
+            results[case] = run_case(corpus, solver, args.repeat)
+            r = results[case]
+            print(f"📊 {case:36s} time={r['solve_time_seconds']:8.3f}s patterns={r['pattern_count']:4d} "
+                  f"trim={r['trim_percent']:6.2f}% jumbos={r['jumbo_count']:4d} pending={r['pending_quantity']:4d} "
+                  f"peak={r['peak_memory_kib']:10.1f}KiB")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"✅ Baseline updated: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"⚠️ No baseline at {args.baseline} - run with --update-baseline first")
+        return 0
+
+    regressions = compare_with_baseline(results, json.loads(args.baseline.read_text()), THRESHOLDS)
+    if regressions:
+        print("❌ Regressions against baseline:")
+        for regression in regressions:
+            print(f"   - {regression}")
+        return 1
+
+    print("✅ All cases within baseline thresholds")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
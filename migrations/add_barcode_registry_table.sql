@@ -0,0 +1,55 @@
+-- Migration: Add barcode_registry table
+-- Date: 2026-10-16
+-- Description: Creates barcode_registry mapping every barcode / QR code of inventory_master,
+--              manual_cut_roll and wastage_inventory to its row, so the scanner endpoints
+--              (/qr/{code}, /qr/update-weight, /barcode/{code}) resolve a scan with one index seek
+
+-- Create barcode_registry table
+CREATE TABLE barcode_registry (
+    id UNIQUEIDENTIFIER PRIMARY KEY DEFAULT NEWID(),
+    code VARCHAR(255) NOT NULL,
+    code_type VARCHAR(10) NOT NULL,
+    source_table VARCHAR(50) NOT NULL,
+    entity_id UNIQUEIDENTIFIER NOT NULL,
+    roll_type VARCHAR(20) NULL,
+    created_at DATETIME NOT NULL DEFAULT GETUTCDATE(),
+    CONSTRAINT uq_barcode_registry_code_source_entity UNIQUE (code, source_table, entity_id)
+);
+
+-- Scan lookups: covering seek on the scanned code
+CREATE INDEX ix_barcode_registry_code
+    ON barcode_registry (code) INCLUDE (source_table, entity_id, code_type);
+
+-- Entry rewrites when a roll is re-coded or deleted
+CREATE INDEX ix_barcode_registry_entity_id
+    ON barcode_registry (entity_id);
+
+-- Backfill existing rolls (BarcodeRegistry.reconcile at startup covers anything written later outside the ORM)
+INSERT INTO barcode_registry (code, code_type, source_table, entity_id, roll_type)
+SELECT barcode_id, 'barcode', 'inventory_master', id, roll_type
+FROM inventory_master
+WHERE barcode_id IS NOT NULL;
+
+INSERT INTO barcode_registry (code, code_type, source_table, entity_id, roll_type)
+SELECT qr_code, 'qr', 'inventory_master', id, roll_type
+FROM inventory_master
+WHERE qr_code IS NOT NULL AND (barcode_id IS NULL OR qr_code <> barcode_id);
+
+INSERT INTO barcode_registry (code, code_type, source_table, entity_id, roll_type)
+SELECT barcode_id, 'barcode', 'manual_cut_roll', id, 'manual_cut'
+FROM manual_cut_roll
+WHERE barcode_id IS NOT NULL;
+
+INSERT INTO barcode_registry (code, code_type, source_table, entity_id, roll_type)
+SELECT barcode_id, 'barcode', 'wastage_inventory', id, 'wastage'
+FROM wastage_inventory
+WHERE barcode_id IS NOT NULL;
+
+-- Add table description
+EXEC sp_addextendedproperty
+    @name = N'MS_Description',
+    @value = N'Scanned code -> roll row index. Written in the same flush as the roll (BarcodeRegistry.sync_flush) and reconciled at startup.',
+    @level0type = N'SCHEMA', @level0name = N'dbo',
+    @level1type = N'TABLE',  @level1name = N'barcode_registry';
+
+PRINT 'Barcode registry table created and backfilled successfully';
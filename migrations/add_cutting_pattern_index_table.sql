@@ -0,0 +1,53 @@
+-- Migration: Add cutting_pattern_index table
+-- Date: 2026-10-16
+-- Description: Creates cutting_pattern_index table holding precomputed feasible cutting patterns
+--              per jumbo width and paper spec width catalogue (built from historical order widths)
+
+-- Create cutting_pattern_index table
+CREATE TABLE cutting_pattern_index (
+    id UNIQUEIDENTIFIER PRIMARY KEY DEFAULT NEWID(),
+    index_key VARCHAR(64) NOT NULL UNIQUE,
+    jumbo_width DECIMAL(6, 2) NOT NULL,
+    width_set VARCHAR(2000) NOT NULL,
+    trim_cap DECIMAL(6, 2) NOT NULL,
+    max_lanes INT NOT NULL,
+    patterns NVARCHAR(MAX) NOT NULL,
+    pattern_count INT NOT NULL DEFAULT 0,
+    source_spec VARCHAR(100) NULL,
+    built_at DATETIME NOT NULL DEFAULT GETUTCDATE()
+);
+
+-- Create indexes for faster lookups
+CREATE UNIQUE INDEX idx_cutting_pattern_index_key ON cutting_pattern_index(index_key);
+CREATE INDEX idx_cutting_pattern_index_jumbo_width ON cutting_pattern_index(jumbo_width);
+
+-- Add comments to columns for documentation
+EXEC sp_addextendedproperty
+    @name = N'MS_Description',
+    @value = N'SHA256 hash of the jumbo width, width set, trim cap and max lanes',
+    @level0type = N'SCHEMA', @level0name = N'dbo',
+    @level1type = N'TABLE',  @level1name = N'cutting_pattern_index',
+    @level2type = N'COLUMN', @level2name = N'index_key';
+
+EXEC sp_addextendedproperty
+    @name = N'MS_Description',
+    @value = N'Comma-separated widths (inches) of the paper spec catalogue the patterns cover',
+    @level0type = N'SCHEMA', @level0name = N'dbo',
+    @level1type = N'TABLE',  @level1name = N'cutting_pattern_index',
+    @level2type = N'COLUMN', @level2name = N'width_set';
+
+EXEC sp_addextendedproperty
+    @name = N'MS_Description',
+    @value = N'Feasible patterns as JSON lane lists in hundredths of an inch',
+    @level0type = N'SCHEMA', @level0name = N'dbo',
+    @level1type = N'TABLE',  @level1name = N'cutting_pattern_index',
+    @level2type = N'COLUMN', @level2name = N'patterns';
+
+-- Add table description
+EXEC sp_addextendedproperty
+    @name = N'MS_Description',
+    @value = N'Precomputed cutting patterns per jumbo width and width catalogue. Rebuilt from order history at startup when older than PATTERN_INDEX_REFRESH_HOURS.',
+    @level0type = N'SCHEMA', @level0name = N'dbo',
+    @level1type = N'TABLE',  @level1name = N'cutting_pattern_index';
+
+PRINT 'Cutting pattern index table created successfully';
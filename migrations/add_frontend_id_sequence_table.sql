@@ -0,0 +1,45 @@
+-- Migration: Add frontend_id_sequence table
+-- Date: 2026-10-16
+-- Description: Creates frontend_id_sequence table holding the last issued counter per frontend ID
+--              sequence and year, replacing the LIKE scan in FrontendIDGenerator.generate_frontend_id
+
+-- Create frontend_id_sequence table
+CREATE TABLE frontend_id_sequence (
+    id UNIQUEIDENTIFIER PRIMARY KEY DEFAULT NEWID(),
+    sequence_name VARCHAR(50) NOT NULL,
+    year VARCHAR(2) NOT NULL DEFAULT '',
+    last_value INT NOT NULL DEFAULT 0,
+    updated_at DATETIME NOT NULL DEFAULT GETUTCDATE(),
+    CONSTRAINT uq_frontend_id_sequence_name_year UNIQUE (sequence_name, year)
+);
+
+-- Add comments to columns for documentation
+EXEC sp_addextendedproperty
+    @name = N'MS_Description',
+    @value = N'FrontendIDGenerator.ID_PATTERNS key, e.g. order_master or payment_slip_bill',
+    @level0type = N'SCHEMA', @level0name = N'dbo',
+    @level1type = N'TABLE',  @level1name = N'frontend_id_sequence',
+    @level2type = N'COLUMN', @level2name = N'sequence_name';
+
+EXEC sp_addextendedproperty
+    @name = N'MS_Description',
+    @value = N'Two-digit year suffix of the IDs, empty for sequences without a year suffix (CL, USR, PAP)',
+    @level0type = N'SCHEMA', @level0name = N'dbo',
+    @level1type = N'TABLE',  @level1name = N'frontend_id_sequence',
+    @level2type = N'COLUMN', @level2name = N'year';
+
+EXEC sp_addextendedproperty
+    @name = N'MS_Description',
+    @value = N'Last counter handed out for the sequence and year',
+    @level0type = N'SCHEMA', @level0name = N'dbo',
+    @level1type = N'TABLE',  @level1name = N'frontend_id_sequence',
+    @level2type = N'COLUMN', @level2name = N'last_value';
+
+-- Add table description
+EXEC sp_addextendedproperty
+    @name = N'MS_Description',
+    @value = N'Frontend ID counters. Rows are seeded from existing IDs on first use and backfilled at startup (FrontendIDGenerator.backfill_sequences).',
+    @level0type = N'SCHEMA', @level0name = N'dbo',
+    @level1type = N'TABLE',  @level1name = N'frontend_id_sequence';
+
+PRINT 'Frontend ID sequence table created successfully';
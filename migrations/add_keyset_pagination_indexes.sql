@@ -0,0 +1,21 @@
+-- Migration: Add keyset pagination indexes
+-- Date: 2026-10-16
+-- Description: Composite indexes matching the (sort column, id) keys used for cursor paging of
+--              /reports/all-cut-rolls(-filtered), /dispatch/history and /wastage, so every page
+--              is an index seek instead of an OFFSET scan
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_inventory_master_roll_type_created_at_id')
+    CREATE INDEX ix_inventory_master_roll_type_created_at_id
+        ON inventory_master (roll_type, created_at, id);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_dispatch_record_dispatch_date_id')
+    CREATE INDEX ix_dispatch_record_dispatch_date_id
+        ON dispatch_record (dispatch_date, id);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_wastage_inventory_created_at_id')
+    CREATE INDEX ix_wastage_inventory_created_at_id
+        ON wastage_inventory (created_at, id);
+
+-- inventory_items pages on its stock_id primary key and needs no extra index
+
+PRINT 'Keyset pagination indexes created successfully';
@@ -0,0 +1,50 @@
+-- Migration: Add optimization_result_cache table
+-- Date: 2026-10-16
+-- Description: Creates optimization_result_cache table used as the optional shared tier
+--              of the cutting optimization result cache (enabled with OPTIMIZATION_CACHE_SQL=true)
+
+-- Create optimization_result_cache table
+CREATE TABLE optimization_result_cache (
+    id UNIQUEIDENTIFIER PRIMARY KEY DEFAULT NEWID(),
+    cache_key VARCHAR(64) NOT NULL UNIQUE,
+    algorithm VARCHAR(50) NULL,
+    jumbo_width FLOAT NULL,
+    result NVARCHAR(MAX) NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT GETUTCDATE(),
+    expires_at DATETIME NOT NULL
+);
+
+-- Create indexes for faster lookups
+CREATE UNIQUE INDEX idx_optimization_result_cache_key ON optimization_result_cache(cache_key);
+CREATE INDEX idx_optimization_result_cache_expires_at ON optimization_result_cache(expires_at);
+
+-- Add comments to columns for documentation
+EXEC sp_addextendedproperty
+    @name = N'MS_Description',
+    @value = N'SHA256 hash of the spec group demand vector, jumbo width, algorithm and solver config',
+    @level0type = N'SCHEMA', @level0name = N'dbo',
+    @level1type = N'TABLE',  @level1name = N'optimization_result_cache',
+    @level2type = N'COLUMN', @level2name = N'cache_key';
+
+EXEC sp_addextendedproperty
+    @name = N'MS_Description',
+    @value = N'Serialized cutting result (patterns used, pending widths, high trim patterns) in JSON format',
+    @level0type = N'SCHEMA', @level0name = N'dbo',
+    @level1type = N'TABLE',  @level1name = N'optimization_result_cache',
+    @level2type = N'COLUMN', @level2name = N'result';
+
+EXEC sp_addextendedproperty
+    @name = N'MS_Description',
+    @value = N'Expiration timestamp (entries expire after OPTIMIZATION_CACHE_TTL_SECONDS)',
+    @level0type = N'SCHEMA', @level0name = N'dbo',
+    @level1type = N'TABLE',  @level1name = N'optimization_result_cache',
+    @level2type = N'COLUMN', @level2name = N'expires_at';
+
+-- Add table description
+EXEC sp_addextendedproperty
+    @name = N'MS_Description',
+    @value = N'Caches cutting optimization results per demand vector. Cleared whenever pending order items or wastage inventory change.',
+    @level0type = N'SCHEMA', @level0name = N'dbo',
+    @level1type = N'TABLE',  @level1name = N'optimization_result_cache';
+
+PRINT 'Optimization result cache table created successfully';
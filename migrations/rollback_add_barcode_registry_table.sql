@@ -0,0 +1,9 @@
+-- Rollback Migration: Drop barcode_registry table
+-- Date: 2026-10-16
+-- Description: Rollback script to remove barcode_registry table
+--              (the scanner endpoints must be reverted to the per-table probes first)
+
+-- Drop the table (drops its indexes and unique constraint with it)
+DROP TABLE IF EXISTS barcode_registry;
+
+PRINT 'Barcode registry table dropped successfully';
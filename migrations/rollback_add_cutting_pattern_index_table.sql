@@ -0,0 +1,12 @@
+-- Rollback Migration: Drop cutting_pattern_index table
+-- Date: 2026-10-16
+-- Description: Rollback script to remove cutting_pattern_index table
+
+-- Drop indexes first
+DROP INDEX IF EXISTS idx_cutting_pattern_index_key ON cutting_pattern_index;
+DROP INDEX IF EXISTS idx_cutting_pattern_index_jumbo_width ON cutting_pattern_index;
+
+-- Drop the table
+DROP TABLE IF EXISTS cutting_pattern_index;
+
+PRINT 'Cutting pattern index table dropped successfully';
@@ -0,0 +1,9 @@
+-- Rollback Migration: Drop frontend_id_sequence table
+-- Date: 2026-10-16
+-- Description: Rollback script to remove frontend_id_sequence table
+--              (FrontendIDGenerator must be reverted to the LIKE scan version first)
+
+-- Drop the table (drops the unique constraint with it)
+DROP TABLE IF EXISTS frontend_id_sequence;
+
+PRINT 'Frontend ID sequence table dropped successfully';
@@ -0,0 +1,14 @@
+-- Rollback Migration: Remove keyset pagination indexes
+-- Date: 2026-10-16
+-- Description: Drops the composite indexes added for cursor paging
+
+IF EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_inventory_master_roll_type_created_at_id')
+    DROP INDEX ix_inventory_master_roll_type_created_at_id ON inventory_master;
+
+IF EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_dispatch_record_dispatch_date_id')
+    DROP INDEX ix_dispatch_record_dispatch_date_id ON dispatch_record;
+
+IF EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_wastage_inventory_created_at_id')
+    DROP INDEX ix_wastage_inventory_created_at_id ON wastage_inventory;
+
+PRINT 'Keyset pagination indexes removed successfully';
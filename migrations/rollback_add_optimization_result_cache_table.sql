@@ -0,0 +1,12 @@
+-- Rollback Migration: Drop optimization_result_cache table
+-- Date: 2026-10-16
+-- Description: Rollback script to remove optimization_result_cache table
+
+-- Drop indexes first
+DROP INDEX IF EXISTS idx_optimization_result_cache_key ON optimization_result_cache;
+DROP INDEX IF EXISTS idx_optimization_result_cache_expires_at ON optimization_result_cache;
+
+-- Drop the table
+DROP TABLE IF EXISTS optimization_result_cache;
+
+PRINT 'Optimization result cache table dropped successfully';
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for keyset pagination: walks every page of a list whose sort
+values repeat across page boundaries and checks that no row is skipped or
+repeated. Runs against an in-memory SQLite database (python test_keyset_pagination.py
+or pytest test_keyset_pagination.py).
+"""
+import sys
+from datetime import datetime, timedelta
+
+sys.path.append('.')
+
+from sqlalchemy import Column, DateTime, Integer, create_engine
+from sqlalchemy.dialects import mssql
+from sqlalchemy.orm import Session, declarative_base
+
+from app.services.keyset_pagination import keyset_page, seek_condition
+
+Base = declarative_base()
+
+
+class Row(Base):
+    __tablename__ = "keyset_row"
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, nullable=False)
+    priority = Column(Integer, nullable=False)
+
+
+def _session() -> Session:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = Session(engine)
+    # Three timestamps with microseconds, each shared by several rows, so ties straddle page boundaries
+    stamps = [datetime(2025, 3, 1, 9, 30, 15, 123456) + timedelta(milliseconds=i) for i in range(3)]
+    db.add_all(
+        Row(id=i, created_at=stamps[i % 3], priority=i % 2)
+        for i in range(1, 24)
+    )
+    db.commit()
+    return db
+
+
+def _walk(db: Session, sort_key, limit: int):
+    """Ids of every page followed by cursor, and the number of pages."""
+    ids, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = keyset_page(db.query(Row), sort_key, limit, cursor=cursor)
+        ids.extend(row.id for row in rows)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+def test_multi_page_traversal_with_duplicate_sort_values():
+    """Newest first with id tie-break: every row exactly once, in ORDER BY order"""
+    db = _session()
+    try:
+        sort_key = [(Row.created_at, True), (Row.id, True)]
+        expected = [row.id for row in db.query(Row).order_by(Row.created_at.desc(), Row.id.desc())]
+
+        for limit in (1, 4, 5, 7):
+            ids, pages = _walk(db, sort_key, limit)
+            assert ids == expected, f"limit {limit}: {ids}"
+            assert pages == -(-len(expected) // limit)
+    finally:
+        db.close()
+
+
+def test_mixed_direction_sort_key_with_duplicates():
+    """Ascending and descending columns in one key, both with repeated values"""
+    db = _session()
+    try:
+        sort_key = [(Row.priority, False), (Row.created_at, True), (Row.id, False)]
+        expected = [
+            row.id for row in db.query(Row).order_by(Row.priority.asc(), Row.created_at.desc(), Row.id.asc())
+        ]
+
+        ids, _ = _walk(db, sort_key, 3)
+        assert ids == expected
+    finally:
+        db.close()
+
+
+def test_sql_server_binds_datetime_cursor_at_column_precision():
+    """On SQL Server the cursor datetime is cast to DATETIME so ties compare at 1/300 s"""
+    condition = seek_condition(
+        [(Row.created_at, True), (Row.id, True)],
+        [datetime(2025, 3, 1, 9, 30, 15, 123456), 7],
+        "mssql"
+    )
+    sql = str(condition.compile(dialect=mssql.dialect()))
+    assert sql.count("CAST(") == 2 and "AS DATETIME)" in sql, sql
+
+
+if __name__ == "__main__":
+    test_multi_page_traversal_with_duplicate_sort_values()
+    test_mixed_direction_sort_key_with_duplicates()
+    test_sql_server_binds_datetime_cursor_at_column_precision()
+    print("✅ Keyset pagination tests passed")